@@ -88,6 +88,8 @@ celery_app.conf.update(
         "celery_tasks.transcode_recording_task": {"queue": "media_processing"},
         "celery_tasks.cleanup_recording_task": {"queue": "media_processing"},
         "celery_tasks.pre_generate_coding_problem_task": {"queue": "llm_evaluation"},
+        "celery_tasks.pre_generate_architecture_problem_task": {"queue": "llm_evaluation"},
+        "celery_tasks.refill_architecture_pool_task": {"queue": "default"},
     },
     # 로깅 설정
     worker_hijack_root_logger=False,
@@ -105,6 +107,11 @@ celery_app.conf.beat_schedule = {
         "task": "celery_tasks.aggregate_statistics_task",
         "schedule": 3600.0,  # 1시간
     },
+    # 매 10분마다 화이트보드 문제 풀 만료 정리 + 보충
+    "refill-architecture-pool": {
+        "task": "celery_tasks.refill_architecture_pool_task",
+        "schedule": 600.0,  # 10분
+    },
 }
 
 
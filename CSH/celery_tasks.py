@@ -24,11 +24,17 @@ from datetime import datetime
 from typing import Dict, List, Optional
 
 # JSON Resilience 유틸리티
-from json_utils import parse_evaluation_json
+from json_utils import EVALUATION_SCHEMA, parse_evaluation_json
 from prompt_templates import (
     EVALUATION_PROMPT as SHARED_EVALUATION_PROMPT,
 )
 
+# 스키마 제약 JSON 생성 (Ollama format + 스트리밍 증분 파서)
+from structured_output import invoke_structured_json
+
+# 단일 스캔 답변 분석 (STAR/기술 키워드, 답변 해시 캐시)
+from answer_analytics import analyze_star_structure, extract_tech_keywords
+
 # 경로 설정
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -209,12 +215,14 @@ def evaluate_answer_task(
             ),
         ]
 
-        response = llm.invoke(messages)
-        response_text = response.content
-
-        # JSON Resilience 파싱
-        evaluation = parse_evaluation_json(
-            response_text, context=f"celery_evaluate_answer[{task_id}]"
+        # 스키마 제약 생성 (Ollama format) + 스트리밍 증분 파싱
+        evaluation = invoke_structured_json(
+            llm,
+            messages,
+            EVALUATION_SCHEMA,
+            parse_evaluation_json,
+            kind="evaluation",
+            context=f"celery_evaluate_answer[{task_id}]",
         )
         evaluation["task_id"] = task_id
         evaluation["evaluated_at"] = datetime.now().isoformat()
@@ -471,77 +479,6 @@ def batch_emotion_analysis_task(
 
 # ========== 리포트 생성 태스크 ==========
 
-STAR_KEYWORDS = {
-    "situation": [
-        "상황",
-        "배경",
-        "당시",
-        "그때",
-        "환경",
-        "상태",
-        "문제",
-        "이슈",
-        "과제",
-    ],
-    "task": ["목표", "과제", "임무", "역할", "담당", "책임", "해야 할", "목적", "미션"],
-    "action": [
-        "행동",
-        "수행",
-        "실행",
-        "처리",
-        "해결",
-        "개발",
-        "구현",
-        "적용",
-        "진행",
-        "시도",
-        "노력",
-    ],
-    "result": [
-        "결과",
-        "성과",
-        "달성",
-        "완료",
-        "개선",
-        "향상",
-        "증가",
-        "감소",
-        "효과",
-        "성공",
-    ],
-}
-
-TECH_KEYWORDS = [
-    "python",
-    "java",
-    "javascript",
-    "react",
-    "vue",
-    "django",
-    "flask",
-    "spring",
-    "aws",
-    "azure",
-    "docker",
-    "kubernetes",
-    "sql",
-    "mongodb",
-    "postgresql",
-    "git",
-    "ci/cd",
-    "api",
-    "rest",
-    "machine learning",
-    "deep learning",
-    "tensorflow",
-    "pytorch",
-    "pandas",
-    "LLM",
-    "RAG",
-    "LangChain",
-    "FastAPI",
-]
-
 
 @celery_app.task(
     bind=True,
@@ -674,32 +611,13 @@ def generate_report_task(
 
 
 def _analyze_star_structure(answers: List[str]) -> Dict:
-    """STAR 기법 분석"""
-    star_analysis = {key: {"count": 0, "examples": []} for key in STAR_KEYWORDS}
-
-    for answer in answers:
-        answer_lower = answer.lower()
-        for element, keywords in STAR_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in answer_lower:
-                    star_analysis[element]["count"] += 1
-                    break
-
-    return star_analysis
+    """STAR 기법 분석 (답변 해시 캐시 공유 — 실시간 경로에서 분석한 결과 재사용)"""
+    return analyze_star_structure(answers)
 
 
 def _extract_keywords(answers: List[str]) -> Dict:
     """키워드 추출"""
-    all_text = " ".join(answers).lower()
-
-    found_tech = []
-    for kw in TECH_KEYWORDS:
-        if kw.lower() in all_text:
-            count = all_text.count(kw.lower())
-            found_tech.append((kw, count))
-
-    found_tech.sort(key=lambda x: x[1], reverse=True)
-
+    found_tech = extract_tech_keywords(answers)
     return {
         "tech_keywords": found_tech[:10],
         "total_tech_mentions": sum(c for _, c in found_tech),
@@ -1282,18 +1200,19 @@ def cleanup_recording_task(
     bind=True,
     max_retries=2,
     default_retry_delay=30,
-    soft_time_limit=180,  # 3분 소프트 타임아웃
-    time_limit=210,  # 3분 30초 하드 타임아웃
+    soft_time_limit=360,  # 6분 소프트 타임아웃 (배치 생성 + 정답 코드 검증)
+    time_limit=420,  # 7분 하드 타임아웃
 )
-def pre_generate_coding_problem_task(self, difficulty: str = "medium"):
+def pre_generate_coding_problem_task(self, difficulty: str = "medium", count: int = 1):
     """
     Celery 백그라운드 태스크: LLM으로 코딩 문제를 사전 생성하여 Redis 풀에 저장합니다.
 
-    서버 시작 시 난이도별로 여러 개 발행되며, 풀이 부족할 때 자동 보충용으로도 사용됩니다.
-    생성된 문제는 Redis List(coding_pool:{difficulty})에 push됩니다.
+    서버 시작 시 난이도별로 발행되며, 풀이 부족할 때 자동 보충용으로도 사용됩니다.
+    LLM 호출 1회로 문제 count개를 생성하고, 정답 코드가 테스트 케이스를 통과한
+    문제만 Redis List(coding_pool:{difficulty})에 push됩니다.
     사용자가 코딩 테스트 페이지를 열면 풀에서 즉시 pop하여 0초 지연으로 제공합니다.
     """
-    print(f"[PreGenerate] 코딩 문제 사전 생성 시작 (난이도: {difficulty})")
+    print(f"[PreGenerate] 코딩 문제 사전 생성 시작 (난이도: {difficulty}, {count}개)")
 
     try:
         from code_execution_service import (
@@ -1302,21 +1221,21 @@ def pre_generate_coding_problem_task(self, difficulty: str = "medium"):
         )
 
         generator = CodingProblemGenerator()
-        problem = generator.generate_sync(difficulty)
+        problems = generator.generate_batch_sync(difficulty, count=count)
 
-        if problem:
-            success = problem_pool.push(difficulty, problem)
+        if problems:
+            pushed = [p.title for p in problems if problem_pool.push(difficulty, p)]
             pool_count = problem_pool.count(difficulty)
-            if success:
+            if pushed:
                 print(
-                    f"[PreGenerate] 문제 생성 완료: '{problem.title}' "
+                    f"[PreGenerate] 문제 {len(pushed)}개 생성 완료: {pushed} "
                     f"(풀 크기: {pool_count})"
                 )
                 _publish_event(
                     "CODING_PROBLEM_POOL_UPDATED",
                     data={
                         "difficulty": difficulty,
-                        "title": problem.title,
+                        "titles": pushed,
                         "pool_size": pool_count,
                     },
                     source="celery_worker",
@@ -1324,15 +1243,15 @@ def pre_generate_coding_problem_task(self, difficulty: str = "medium"):
                 return {
                     "status": "success",
                     "difficulty": difficulty,
-                    "title": problem.title,
+                    "titles": pushed,
                     "pool_size": pool_count,
                 }
             else:
                 print("[PreGenerate] Redis push 실패")
                 return {"status": "redis_error", "difficulty": difficulty}
         else:
-            print("[PreGenerate] LLM 문제 생성 실패 — 재시도")
-            raise self.retry(exc=Exception("LLM 문제 생성 실패"))
+            print("[PreGenerate] 검증을 통과한 문제 없음 — 재시도")
+            raise self.retry(exc=Exception("LLM 문제 생성/검증 실패"))
 
     except SoftTimeLimitExceeded:
         print(f"[PreGenerate] 소프트 타임아웃 ({difficulty})")
@@ -1350,6 +1269,114 @@ def pre_generate_coding_problem_task(self, difficulty: str = "medium"):
             return {"status": "failed", "difficulty": difficulty, "error": str(exc)}
 
 
+# ========== 아키텍처 문제 사전 생성 (Whiteboard Problem Pool) ==========
+
+
+@celery_app.task(
+    name="celery_tasks.pre_generate_architecture_problem_task",
+    bind=True,
+    max_retries=2,
+    default_retry_delay=30,
+    soft_time_limit=180,  # 3분 소프트 타임아웃
+    time_limit=210,  # 3분 30초 하드 타임아웃
+)
+def pre_generate_architecture_problem_task(
+    self, category: str = "web", difficulty: str = "medium"
+):
+    """
+    Celery 백그라운드 태스크: LLM으로 아키텍처 문제를 사전 생성하여 Redis 풀에 저장합니다.
+
+    풀(whiteboard_pool:{category}:{difficulty})에 이미 있거나 최근 출제된 문제와
+    유사하면 저장하지 않고, 최근 제목을 피하도록 한 번 더 생성합니다.
+    """
+    print(f"[PreGenerate] 아키텍처 문제 사전 생성 시작 ({category}/{difficulty})")
+
+    try:
+        from whiteboard_service import (
+            ArchitectureProblemGenerator,
+            architecture_pool,
+        )
+
+        generator = ArchitectureProblemGenerator()
+        status = "llm_error"
+        for _ in range(2):
+            problem = generator.generate_sync(
+                category,
+                difficulty,
+                avoid_titles=architecture_pool.recent_titles(category),
+            )
+            if problem is None:
+                status = "llm_error"
+                break
+            status = architecture_pool.push(problem)
+            if status != "duplicate":
+                break
+
+        if status == "ok":
+            pool_count = architecture_pool.count(category, difficulty)
+            print(
+                f"[PreGenerate] 아키텍처 문제 생성 완료: '{problem.title}' "
+                f"(풀 크기: {pool_count})"
+            )
+            _publish_event(
+                "WHITEBOARD_PROBLEM_POOL_UPDATED",
+                data={
+                    "category": category,
+                    "difficulty": difficulty,
+                    "title": problem.title,
+                    "pool_size": pool_count,
+                },
+                source="celery_worker",
+            )
+            return {
+                "status": "success",
+                "category": category,
+                "difficulty": difficulty,
+                "title": problem.title,
+                "pool_size": pool_count,
+            }
+        if status == "duplicate":
+            print(f"[PreGenerate] 중복 문제만 생성됨 ({category}/{difficulty})")
+            return {"status": "duplicate", "category": category, "difficulty": difficulty}
+        if status == "error":
+            print("[PreGenerate] Redis push 실패")
+            return {"status": "redis_error", "category": category, "difficulty": difficulty}
+
+        print("[PreGenerate] LLM 아키텍처 문제 생성 실패 — 재시도")
+        raise self.retry(exc=Exception("LLM 문제 생성 실패"))
+
+    except SoftTimeLimitExceeded:
+        print(f"[PreGenerate] 소프트 타임아웃 ({category}/{difficulty})")
+        return {"status": "timeout", "category": category, "difficulty": difficulty}
+
+    except self.MaxRetriesExceededError:
+        print(f"[PreGenerate] 최대 재시도 초과 ({category}/{difficulty})")
+        return {"status": "max_retries", "category": category, "difficulty": difficulty}
+
+    except Exception as exc:
+        print(f"[PreGenerate] 에러: {exc}")
+        try:
+            raise self.retry(exc=exc)
+        except self.MaxRetriesExceededError:
+            return {
+                "status": "failed",
+                "category": category,
+                "difficulty": difficulty,
+                "error": str(exc),
+            }
+
+
+@celery_app.task(name="celery_tasks.refill_architecture_pool_task")
+def refill_architecture_pool_task() -> Dict:
+    """주기 작업: 만료된 아키텍처 문제를 정리하고 부족한 풀에 보충 태스크 발행"""
+    from whiteboard_service import refill_all_architecture_pools
+
+    issued = refill_all_architecture_pools()
+    if issued:
+        print(f"[PreGenerate] 아키텍처 문제 풀 보충: {issued}")
+    return {"status": "completed", "issued": issued}
+
+
 # ========== 헬퍼 함수 ==========
 
 
@@ -14,14 +14,19 @@
    - non-root USER: 최소 권한 실행
 2. 코드 보안 검사 (CodeSanitizer)
    - 5개 언어별 위험 패턴 차단 (시스템 명령, 네트워크, 파일 접근 등)
+   - Python: AST 1회 순회로 import/호출 대상 해석, JavaScript: 토큰 1회 순회
+   - 식별자 1회 스캔으로 관련 규칙만 선별 (Java/C/C++ 정규식, Python/JS 정밀 검사)
+   - 같은 코드(소스 해시)는 1회만 검사 (테스트 케이스별 재검사 생략)
 3. 리소스 모니터링 (subprocess fallback)
    - psutil 기반 메모리 모니터링
    - 시간 제한 (timeout)
 4. Python 런타임 SafeImporter (defense in depth)
-5. LLM 자동 코딩 문제 생성 (1회 1문제)
+5. LLM 자동 코딩 문제 생성 (Celery 배치 생성 + 정답 코드 검증 후 풀 저장)
 """
 
+import ast
 import asyncio
+import hashlib
 import json
 import os
 import random
@@ -33,6 +38,7 @@ import tempfile
 import threading
 import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 from typing import Dict, List, Optional, Tuple
@@ -45,7 +51,12 @@ load_dotenv()
 # JSON Resilience 유틸리티
 # FastAPI
 from fastapi import APIRouter, HTTPException
-from json_utils import parse_code_analysis_json
+from json_utils import (
+    CODE_ANALYSIS_SCHEMA,
+    parse_code_analysis_json,
+    resilient_json_parse,
+)
+from structured_output import invoke_structured_json
 from pydantic import BaseModel
 
 # LLM for code analysis
@@ -232,23 +243,490 @@ class CodeSanitizer:
     # 코드 크기 제한 (100KB)
     MAX_CODE_SIZE = 100 * 1024
 
+    # ───── Python AST 규칙 (import/호출 대상을 해석하므로 문자열·주석·re.compile 등은 통과) ─────
+    PY_BLOCKED_MODULES: Dict[str, str] = {
+        **{
+            m: "시스템/네트워크 모듈 사용 금지"
+            for m in ("subprocess", "shutil", "socket", "requests", "urllib", "http.client", "ftplib")
+        },
+        **{
+            m: "저수준 시스템 접근 금지"
+            for m in ("ctypes", "cffi", "_thread", "multiprocessing", "signal")
+        },
+        "builtins": "동적 코드 실행 금지",
+    }
+    PY_BLOCKED_BUILTINS = frozenset(
+        ["exec", "eval", "compile", "__import__", "globals", "locals", "__builtins__"]
+    )
+    # 차단 내장 함수와 이름만 같은 안전한 모듈 속성 (import 별칭이 재바인딩되지 않은 경우만 허용)
+    PY_SAFE_MODULE_ATTRIBUTES = frozenset(["re.compile"])
+    PY_BLOCKED_OS_PREFIXES = (
+        "system", "popen", "exec", "spawn", "remove", "unlink", "rmdir", "chmod", "chown", "kill", "fork",
+    )
+    SYSTEM_PATH_RE = re.compile(r"^/(etc|proc|sys|dev|home|root|var)\b")
+    _PY_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+    _PY_COMPREHENSION_NODES = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+    # ───── JavaScript 토큰 규칙 ─────
+    JS_BLOCKED_MODULES = frozenset(
+        ["child_process", "fs", "net", "http", "https", "dgram", "cluster", "worker_threads", "os", "vm"]
+    )
+    JS_PROCESS_MEMBERS = frozenset(["exit", "env", "cwd", "chdir", "kill"])
+    JS_GLOBAL_OBJECTS = frozenset(["globalThis", "window", "global", "self"])
+    JS_TOKEN_RE = re.compile(
+        r"""
+        (?P<comment>//[^\n]*|/\*[\s\S]*?\*/)
+      | (?P<template>`(?:\\.|[^`\\])*`)
+      | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+      | (?P<ident>[A-Za-z_$][\w$]*)
+      | (?P<number>\d[\w.]*)
+      | (?P<punct>\S)
+        """,
+        re.VERBOSE,
+    )
+    JS_REGEX_LITERAL_RE = re.compile(r"/(?![*/])(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[A-Za-z]*")
+    # 이 키워드 뒤의 '/'는 나눗셈이 아니라 정규식 리터럴 시작
+    JS_REGEX_PREFIX_KEYWORDS = frozenset(
+        ["return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do", "else", "yield", "await"]
+    )
+
+    # 식별자 1회 스캔 → 코드에 등장하는 식별자와 겹치는 규칙만 평가
+    IDENT_RE = re.compile(r"[A-Za-z_$][\w$]*")
+    PY_TRIGGERS = frozenset(
+        [m.split(".")[0] for m in PY_BLOCKED_MODULES] + list(PY_BLOCKED_BUILTINS) + ["os", "open"]
+    )
+    JS_TRIGGERS = frozenset(["require", "import", "from", "eval", "Function", "process"])
+
+    # 검사 결과 메모이제이션 (소스 해시 → 결과)
+    CACHE_SIZE = 1024
+    _compiled: Dict[str, List[Tuple["re.Pattern", frozenset, str]]] = {}
+    _cache: "OrderedDict[bytes, Tuple[bool, Optional[str]]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    cache_hits = 0
+    cache_misses = 0
+
     @classmethod
     def sanitize(cls, code: str, language: str) -> Tuple[bool, Optional[str]]:
-        """코드 보안 검사. (safe, error_message) 반환."""
+        """코드 보안 검사. (safe, error_message) 반환. 같은 코드는 캐시된 결과를 사용."""
         language = language.lower()
+        encoded = code.encode("utf-8")
 
         # 크기 제한
-        if len(code.encode("utf-8")) > cls.MAX_CODE_SIZE:
+        if len(encoded) > cls.MAX_CODE_SIZE:
             return False, "🔒 보안 위반: 코드 크기가 100KB를 초과합니다."
 
-        # 언어별 위험 패턴 검사
-        patterns = cls.DANGEROUS_PATTERNS.get(language, [])
-        for pattern, message in patterns:
-            match = re.search(pattern, code, re.IGNORECASE)
+        key = hashlib.blake2b(language.encode() + b"\0" + encoded, digest_size=16).digest()
+        with cls._cache_lock:
+            cached = cls._cache.get(key)
+            if cached is not None:
+                cls._cache.move_to_end(key)
+                cls.cache_hits += 1
+                return cached
+            cls.cache_misses += 1
+
+        violation = cls._find_violation(code, language)
+        result = (
+            (False, f"🔒 보안 위반: {violation[1]} (감지: '{violation[0]}')")
+            if violation
+            else (True, None)
+        )
+        with cls._cache_lock:
+            cls._cache[key] = result
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return result
+
+    @classmethod
+    def get_stats(cls) -> Dict:
+        return {
+            "cached": len(cls._cache),
+            "cache_hits": cls.cache_hits,
+            "cache_misses": cls.cache_misses,
+        }
+
+    @classmethod
+    def _find_violation(cls, code: str, language: str) -> Optional[Tuple[str, str]]:
+        """(감지된 코드, 위반 메시지) 또는 None"""
+        identifiers = set(cls.IDENT_RE.findall(code))
+        if language == "python":
+            if identifiers.isdisjoint(cls.PY_TRIGGERS):
+                return None
+            try:
+                return cls._scan_python(ast.parse(code), identifiers)
+            except (SyntaxError, ValueError):
+                # 파싱 불가 코드는 실행도 실패하므로 정규식 검사로 대체
+                pass
+        elif language == "javascript":
+            if identifiers.isdisjoint(cls.JS_TRIGGERS):
+                return None
+            return cls._scan_javascript(code, identifiers)
+        return cls._scan_regex(code, language, identifiers)
+
+    @classmethod
+    def _compiled_rules(cls, language: str) -> List[Tuple["re.Pattern", frozenset, str]]:
+        """
+        언어별 규칙을 1회만 컴파일하고, 규칙마다 패턴에 등장하는 단어를 트리거로 색인합니다.
+        규칙이 매칭되려면 트리거 단어 중 하나가 코드의 식별자로 반드시 등장하므로,
+        겹치는 트리거가 없는 규칙은 정규식 스캔을 생략할 수 있습니다.
+        (단일 alternation 정규식은 re 모듈에서 규칙별 스캔보다 오히려 느림)
+        """
+        rules = cls._compiled.get(language)
+        if rules is None:
+            rules = [
+                (
+                    re.compile(pattern, re.IGNORECASE),
+                    frozenset(w.lower() for w in re.findall(r"(?<![\\\w])[A-Za-z_]\w*", pattern)),
+                    message,
+                )
+                for pattern, message in cls.DANGEROUS_PATTERNS.get(language, [])
+            ]
+            cls._compiled[language] = rules
+        return rules
+
+    @classmethod
+    def _scan_regex(
+        cls, code: str, language: str, identifiers: set
+    ) -> Optional[Tuple[str, str]]:
+        """식별자와 트리거가 겹치는 규칙만 정규식으로 검사"""
+        lowered = {name.lower() for name in identifiers}
+        for pattern, triggers, message in cls._compiled_rules(language):
+            if lowered.isdisjoint(triggers):
+                continue
+            match = pattern.search(code)
             if match:
-                return False, f"🔒 보안 위반: {message} (감지: '{match.group()}')"
+                return match.group(), message
+        return None
+
+    @classmethod
+    def _python_module_violation(cls, dotted: str) -> Optional[str]:
+        for module, message in cls.PY_BLOCKED_MODULES.items():
+            if dotted == module or dotted.startswith(module + "."):
+                return message
+        parts = dotted.split(".")
+        if parts[0] == "os" and len(parts) > 1 and parts[1].startswith(cls.PY_BLOCKED_OS_PREFIXES):
+            return "OS 명령 실행 금지"
+        # importlib.__import__, from builtins import exec 등 모듈 경유 내장 함수
+        if dotted not in cls.PY_SAFE_MODULE_ATTRIBUTES and not cls.PY_BLOCKED_BUILTINS.isdisjoint(parts[1:]):
+            return "동적 코드 실행 금지"
+        return None
+
+    @classmethod
+    def _scan_python(cls, tree: ast.AST, identifiers: set) -> Optional[Tuple[str, str]]:
+        """
+        AST 1회 순회: import 별칭을 추적해 호출/속성 대상을 모듈 경로로 해석합니다.
+        (예: import os as o; o.system() → os.system)
+        속성 접근은 순회가 끝난 뒤(별칭 수집 완료 후) 판정하고,
+        내장 함수 이름 사용은 스코프별 가려짐 여부를 따로 판정합니다 (_find_unshadowed_builtin).
+        """
+        aliases: Dict[str, set] = {}
+        rebound = set()  # import 외 방식으로 바인딩된 이름 (별칭 신뢰 불가)
+        attributes: List[ast.Attribute] = []
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    message = cls._python_module_violation(alias.name)
+                    if message:
+                        return f"import {alias.name}", message
+                    if alias.asname:
+                        aliases.setdefault(alias.asname, set()).add(alias.name)
+                    else:
+                        top = alias.name.split(".")[0]
+                        aliases.setdefault(top, set()).add(top)
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module or ""
+                for alias in node.names:
+                    full = f"{module}.{alias.name}" if module else alias.name
+                    message = cls._python_module_violation(module) or cls._python_module_violation(full)
+                    if message:
+                        return f"from {module} import {alias.name}", message
+                    aliases.setdefault(alias.asname or alias.name, set()).add(full)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                rebound.add(node.name)
+            elif isinstance(node, ast.arg):
+                rebound.add(node.arg)
+            elif isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+                rebound.add(node.id)
+            elif isinstance(node, ast.Attribute):
+                attributes.append(node)
+            elif isinstance(node, ast.Call):
+                func = node.func
+                func_name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+                if func_name == "open":
+                    # f-string, 연결 문자열 내부 상수까지 검사
+                    for arg in node.args:
+                        for sub in ast.walk(arg):
+                            if (
+                                isinstance(sub, ast.Constant)
+                                and isinstance(sub.value, str)
+                                and cls.SYSTEM_PATH_RE.match(sub.value)
+                            ):
+                                return f"open('{sub.value}')", "시스템 경로 접근 금지"
+                elif func_name == "import_module" and node.args:
+                    arg = node.args[0]
+                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                        message = cls._python_module_violation(arg.value)
+                        if message:
+                            return f"import_module('{arg.value}')", message
+                elif func_name == "getattr" and len(node.args) >= 2:
+                    arg = node.args[1]
+                    if isinstance(arg, ast.Constant) and arg.value in cls.PY_BLOCKED_BUILTINS:
+                        return f"getattr(..., '{arg.value}')", "동적 코드 실행 금지"
+
+        for node in attributes:
+            parts = []
+            current = node
+            while isinstance(current, ast.Attribute):
+                parts.append(current.attr)
+                current = current.value
+            targets = aliases.get(current.id, ()) if isinstance(current, ast.Name) else ()
+            for target in targets:
+                dotted = ".".join([target] + parts[::-1])
+                message = cls._python_module_violation(dotted)
+                if message:
+                    return dotted, message
+            # builtins.exec, obj.__import__ 등 어떤 객체든 차단 내장 함수 이름의 속성 접근은 금지
+            if node.attr in cls.PY_BLOCKED_BUILTINS:
+                trusted = (
+                    len(targets) == 1
+                    and current.id not in rebound
+                    and ".".join([next(iter(targets))] + parts[::-1]) in cls.PY_SAFE_MODULE_ATTRIBUTES
+                )
+                if not trusted:
+                    return f".{node.attr}", "동적 코드 실행 금지"
+
+        # 차단 내장 함수 이름이 코드에 없으면 스코프 분석 생략
+        name = None if identifiers.isdisjoint(cls.PY_BLOCKED_BUILTINS) else cls._find_unshadowed_builtin(tree)
+        if name:
+            return f"{name}(", "동적 코드 실행 금지"
+        return None
+
+    @classmethod
+    def _outer_children(cls, node: ast.AST) -> List[ast.AST]:
+        """
+        현재 스코프에서 평가되는 자식 노드.
+        중첩 함수/람다/클래스는 본문 대신 정의 시점에 평가되는 데코레이터·기본값·어노테이션·베이스만 반환.
+        """
+        if isinstance(node, cls._PY_FUNCTION_NODES):
+            args = node.args
+            children = [*args.defaults, *(d for d in args.kw_defaults if d is not None)]
+            if not isinstance(node, ast.Lambda):
+                children += [*node.decorator_list, *(n for n in [node.returns] if n is not None)]
+                children += [
+                    a.annotation
+                    for a in [*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg]
+                    if a is not None and a.annotation is not None
+                ]
+            return children
+        if isinstance(node, ast.ClassDef):
+            return [*node.decorator_list, *node.bases, *(k.value for k in node.keywords)]
+        return list(ast.iter_child_nodes(node))
 
-        return True, None
+    @classmethod
+    def _function_locals(cls, node: ast.AST) -> Tuple[set, set]:
+        """
+        함수 지역 이름(매개변수 + 본문 바인딩)과 global/nonlocal 선언 이름.
+        중첩 스코프와 컴프리헨션 내부의 바인딩은 포함하지 않습니다.
+        """
+        args = node.args
+        local_names = {
+            a.arg
+            for a in [*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg]
+            if a is not None
+        }
+        declared = set()
+        stack = list(node.body) if isinstance(node.body, list) else [node.body]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                local_names.add(current.name)
+            elif isinstance(current, ast.Name) and not isinstance(current.ctx, ast.Load):
+                local_names.add(current.id)
+            elif isinstance(current, (ast.Import, ast.ImportFrom)):
+                local_names.update(a.asname or a.name.split(".")[0] for a in current.names)
+            elif isinstance(current, ast.ExceptHandler) and current.name:
+                local_names.add(current.name)
+            elif isinstance(current, (ast.Global, ast.Nonlocal)):
+                declared.update(current.names)
+            if isinstance(current, cls._PY_COMPREHENSION_NODES):
+                continue
+            stack.extend(cls._outer_children(current))
+        return local_names - declared, declared
+
+    @staticmethod
+    def _statement_bindings(stmt: ast.stmt) -> set:
+        """모듈/클래스 최상위 문장이 조건 없이 바인딩하는 이름"""
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return {stmt.name}
+        if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            return {a.asname or a.name.split(".")[0] for a in stmt.names}
+        if isinstance(stmt, ast.Assign):
+            targets = list(stmt.targets)
+        elif isinstance(stmt, ast.AnnAssign) and stmt.value is not None:
+            targets = [stmt.target]
+        else:
+            return set()
+        names = set()
+        while targets:
+            target = targets.pop()
+            if isinstance(target, ast.Name):
+                names.add(target.id)
+            elif isinstance(target, (ast.Tuple, ast.List)):
+                targets.extend(target.elts)
+            elif isinstance(target, ast.Starred):
+                targets.append(target.value)
+        return names
+
+    @classmethod
+    def _find_unshadowed_builtin(cls, tree: ast.Module) -> Optional[str]:
+        """
+        차단 내장 함수 이름이 실제 내장 함수로 해석되는 사용을 스코프별로 찾습니다.
+        - 함수 스코프: 매개변수나 본문 바인딩이 있으면 지역 변수 (내장 함수로 해석되지 않음)
+        - 모듈/클래스 스코프: 사용 이전의 조건 없는 최상위 바인딩만 인정
+        - 어디서든 del 또는 global 선언된 이름은 모듈 수준 바인딩을 인정하지 않음
+        """
+        unsafe = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Del):
+                unsafe.add(node.id)
+            elif isinstance(node, ast.Global):
+                unsafe.update(node.names)
+
+        def check(nodes: List[ast.AST], visible: set, inherited: set) -> Optional[str]:
+            """visible: 현재 위치에서 가려진 이름, inherited: 중첩 함수가 물려받는 가려진 이름"""
+            stack = list(nodes)
+            while stack:
+                node = stack.pop()
+                if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                    if node.id in cls.PY_BLOCKED_BUILTINS and node.id not in visible:
+                        return node.id
+                elif isinstance(node, cls._PY_FUNCTION_NODES):
+                    local_names, declared = cls._function_locals(node)
+                    shadowed = local_names | (inherited - declared)
+                    body = node.body if isinstance(node.body, list) else [node.body]
+                    found = check(body, shadowed, shadowed)
+                    if found:
+                        return found
+                elif isinstance(node, ast.ClassDef):
+                    # 클래스 본문 이름은 메서드에서 보이지 않음
+                    found = check_block(node.body, inherited, in_class=True)
+                    if found:
+                        return found
+                stack.extend(cls._outer_children(node))
+            return None
+
+        def check_block(body: List[ast.stmt], outer: set, in_class: bool) -> Optional[str]:
+            bound = set()
+            for stmt in body:
+                visible = outer | (bound - unsafe)
+                inherited = outer if in_class else visible | (cls._statement_bindings(stmt) - unsafe)
+                found = check([stmt], visible, inherited)
+                if found:
+                    return found
+                bound |= cls._statement_bindings(stmt)
+            return None
+
+        return check_block(tree.body, set(), in_class=False)
+
+    @classmethod
+    def _js_tokens(cls, code: str) -> Tuple[List[Tuple[str, str]], bool]:
+        """
+        주석을 제외한 (종류, 값) 토큰 목록과 모호성 여부.
+        - 템플릿 문자열은 ${} 내부 코드까지 다시 토큰화
+        - '/'는 앞 토큰으로 정규식 리터럴과 나눗셈을 구분 (정규식 안의 따옴표를 문자열로 오인하지 않도록)
+        - 나눗셈 위치의 '/' 뒤 같은 줄에 따옴표가 있거나 정규식 리터럴이 닫히지 않으면 모호함으로 표시
+        """
+        tokens: List[Tuple[str, str]] = []
+        ambiguous = False
+        pos = 0
+        while True:
+            match = cls.JS_TOKEN_RE.search(code, pos)
+            if match is None:
+                break
+            pos = match.end()
+            kind, text = match.lastgroup, match.group()
+            if kind == "comment":
+                continue
+            if kind == "template":
+                tokens.append(("string", text))
+                if "${" in text:
+                    inner, inner_ambiguous = cls._js_tokens(text[1:-1])
+                    tokens.extend(inner)
+                    ambiguous = ambiguous or inner_ambiguous
+                continue
+            if text == "/":
+                prev_kind, prev = tokens[-1] if tokens else ("punct", "")
+                if (prev_kind == "punct" and prev not in (")", "]", "}")) or (
+                    prev_kind == "ident" and prev in cls.JS_REGEX_PREFIX_KEYWORDS
+                ):
+                    literal = cls.JS_REGEX_LITERAL_RE.match(code, match.start())
+                    if literal:
+                        tokens.append(("regex", literal.group()))
+                        pos = literal.end()
+                        continue
+                    ambiguous = True
+                else:
+                    line_end = code.find("\n", pos)
+                    rest = code[pos:] if line_end == -1 else code[pos:line_end]
+                    if any(quote in rest for quote in "'\"`"):
+                        ambiguous = True
+            tokens.append((kind, text))
+        return tokens, ambiguous
+
+    @classmethod
+    def _scan_javascript(cls, code: str, identifiers: set) -> Optional[Tuple[str, str]]:
+        """
+        토큰 1회 순회: require/import 대상 모듈과 eval·Function·process 호출을 판정.
+        토큰화가 모호하면 (정규식 리터럴/나눗셈 구분 불가) 정규식 규칙 검사를 함께 수행합니다.
+        """
+        tokens, ambiguous = cls._js_tokens(code)
+
+        def value(i: int) -> str:
+            return tokens[i][1] if 0 <= i < len(tokens) else ""
+
+        def module_name(i: int) -> Optional[str]:
+            if 0 <= i < len(tokens) and tokens[i][0] == "string":
+                name = tokens[i][1][1:-1]
+                if name.startswith("node:"):
+                    name = name[5:]
+                return name.split("/")[0]
+            return None
+
+        def is_definition(i: int) -> bool:
+            """{ eval(x) { ... } } 같은 메서드 정의인지 (괄호 뒤에 본문 블록)"""
+            depth = 0
+            for j in range(i + 1, len(tokens)):
+                if tokens[j][1] == "(":
+                    depth += 1
+                elif tokens[j][1] == ")":
+                    depth -= 1
+                    if depth == 0:
+                        return value(j + 1) == "{"
+            return False
+
+        for i, (kind, token) in enumerate(tokens):
+            if kind != "ident":
+                continue
+            member_of_object = (
+                value(i - 1) == "." and value(i - 2) not in cls.JS_GLOBAL_OBJECTS
+            ) or (value(i + 1) == "(" and is_definition(i))
+            if token in ("require", "import"):
+                target = module_name(i + 2) if value(i + 1) == "(" else module_name(i + 1)
+                if target in cls.JS_BLOCKED_MODULES:
+                    return f"{token} '{target}'", "시스템/네트워크 모듈 사용 금지"
+            elif token == "from":
+                target = module_name(i + 1)
+                if target in cls.JS_BLOCKED_MODULES:
+                    return f"from '{target}'", "시스템/네트워크 모듈 사용 금지"
+            elif token == "eval" and value(i + 1) == "(" and not member_of_object:
+                return "eval(", "eval 사용 금지"
+            elif token == "Function" and value(i + 1) == "(" and not member_of_object:
+                return "Function(", "동적 함수 생성 금지"
+            elif token == "process" and value(i + 1) == "." and value(i + 2) in cls.JS_PROCESS_MEMBERS:
+                return f"process.{value(i + 2)}", "프로세스 제어 금지"
+        if ambiguous:
+            return cls._scan_regex(code, "javascript", identifiers)
+        return None
 
 
 # ========== 리소스 모니터링 결과 ==========
@@ -348,8 +826,48 @@ PROBLEM_GENERATION_PROMPT = """당신은 코딩 면접 출제 전문가입니다
 }}
 """
 
-# 생성된 문제를 캐시 (problem_id -> CodingProblem)
-_generated_problems: Dict[str, CodingProblem] = {}
+# Celery 배치 생성 프롬프트 — 문제마다 Python 정답 코드를 함께 받아
+# 풀에 넣기 전에 테스트 케이스를 실제로 통과하는지 검증합니다.
+BATCH_PROBLEM_GENERATION_PROMPT = """당신은 코딩 면접 출제 전문가입니다.
+주어진 난이도에 맞는 서로 다른 코딩 문제를 {count}개 생성해주세요.
+
+[난이도: {difficulty}]
+
+[난이도별 기준]
+- easy: 기본 자료구조(배열, 문자열), 반복문, 조건문 활용 문제 (예: 정렬, 탐색, 문자열 처리)
+- medium: 해시맵, 스택/큐, 이진탐색, 투 포인터, 재귀 활용 문제
+- hard: DP, 그래프, 트리, 고급 알고리즘 문제
+
+[요구사항]
+1. 문제는 stdin으로 입력 받고 stdout으로 출력하는 형식이어야 합니다
+2. 입력/출력 형식을 명확히 설명해야 합니다
+3. 예제를 2개 이상 포함해야 합니다
+4. 테스트 케이스를 4개 이상 포함해야 합니다 (예제에 사용한 것 포함)
+5. 힌트를 1~2개 제공해야 합니다
+6. 각 문제마다 stdin을 읽어 정답을 출력하는 Python 3 정답 코드(reference_solution)를 작성해야 합니다
+   - 표준 라이브러리만 사용하고, 모든 예제/테스트 케이스의 출력과 정확히 일치해야 합니다
+7. {count}개 문제는 주제와 알고리즘이 서로 달라야 합니다
+8. 한국어로 작성해주세요
+
+[출력 형식 - 반드시 아래 JSON 형식으로만 응답하세요. 다른 텍스트 없이 JSON만 출력하세요]
+{{
+    "problems": [
+        {{
+            "title": "문제 제목",
+            "difficulty": "{difficulty}",
+            "description": "문제 설명 (입출력 형식 포함)",
+            "examples": [
+                {{"input": "입력값", "output": "출력값", "explanation": "설명"}}
+            ],
+            "test_cases": [
+                {{"input": "입력값", "expected": "기대 출력값"}}
+            ],
+            "hints": ["힌트1", "힌트2"],
+            "reference_solution": "import sys\\n..."
+        }}
+    ]
+}}
+"""
 
 
 # ========== Redis 기반 문제 풀 (Problem Pool) ==========
@@ -361,6 +879,12 @@ _generated_problems: Dict[str, CodingProblem] = {}
 POOL_TARGET_SIZE = int(os.getenv("CODING_POOL_SIZE", "3"))
 # 풀이 이 수치 이하로 떨어지면 보충 태스크를 발행
 POOL_REFILL_THRESHOLD = 1
+# Celery 태스크 1개(LLM 호출 1회)가 생성하는 문제 수
+POOL_BATCH_SIZE = int(os.getenv("CODING_POOL_BATCH_SIZE", "3"))
+# 프로세스 내 LRU에 유지할 출제 문제 수
+PROBLEM_CACHE_SIZE = int(os.getenv("CODING_PROBLEM_CACHE_SIZE", "256"))
+# Redis 문제 저장소 보관 기간 (초) — 지난 문제는 주기적으로 정리
+PROBLEM_STORE_TTL_SEC = int(os.getenv("CODING_PROBLEM_STORE_TTL_SEC", str(3 * 24 * 3600)))
 
 
 class ProblemPool:
@@ -372,28 +896,39 @@ class ProblemPool:
     - push(difficulty, problem): 풀에 문제 1개를 추가 (LPUSH)
     - count(difficulty): 현재 풀 크기 조회
     - needs_refill(difficulty): 보충이 필요한지 확인
+    - get_stats(): 난이도별 풀 크기, 적중률(hit/miss), 생성 검증 통계
+
+    적중/실패 및 생성 통계는 Redis Hash(coding_pool:stats)에 누적되어
+    모든 워커가 같은 값을 봅니다.
 
     Redis 연결 실패 시 모든 메서드는 graceful하게 None/0/True를 반환합니다.
     """
 
     REDIS_KEY_PREFIX = "coding_pool"
+    RETRY_CONNECT_SEC = 30.0
 
     def __init__(self):
         """Redis 클라이언트 초기화 (Lazy — 첫 호출 시 연결)"""
         self._redis = None
         self._redis_url = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+        self._last_failure = 0.0
+        # Redis를 쓸 수 없을 때의 프로세스 내 통계
+        self._local_stats: Dict[str, int] = {}
 
     def _get_redis(self):
-        """Redis 연결을 반환합니다. 연결 실패 시 None."""
-        if self._redis is None:
+        """Redis 연결을 반환합니다. 연결 실패 시 None (30초 동안 재시도하지 않음)."""
+        if self._redis is None and time.time() - self._last_failure > self.RETRY_CONNECT_SEC:
             try:
                 import redis as redis_lib
 
-                self._redis = redis_lib.from_url(self._redis_url, decode_responses=True)
-                self._redis.ping()
+                client = redis_lib.from_url(
+                    self._redis_url, decode_responses=True, socket_connect_timeout=1
+                )
+                client.ping()
+                self._redis = client
             except Exception as e:
                 print(f"[ProblemPool] Redis 연결 실패: {e}")
-                self._redis = None
+                self._last_failure = time.time()
         return self._redis
 
     def _key(self, difficulty: str) -> str:
@@ -414,21 +949,25 @@ class ProblemPool:
             return False
 
     def pop(self, difficulty: str) -> Optional[CodingProblem]:
-        """풀에서 문제 1개를 꺼냅니다. 없으면 None."""
+        """풀에서 문제 1개를 꺼냅니다. 없으면 None (miss로 집계)."""
         r = self._get_redis()
         if not r:
+            self.record(f"{difficulty}:misses")
             return None
         try:
             data = r.rpop(self._key(difficulty))
             if not data:
+                self.record(f"{difficulty}:misses")
                 return None
             parsed = json.loads(data)
             problem = CodingProblem(**parsed)
-            # 꺼낸 문제를 글로벌 캐시에도 등록 (submission/analysis에서 참조)
-            _generated_problems[problem.id] = problem
+            # 꺼낸 문제를 공유 저장소에 등록 (다른 워커의 submission/analysis에서 참조)
+            problem_store.put(problem)
+            self.record(f"{difficulty}:hits")
             return problem
         except Exception as e:
             print(f"[ProblemPool] pop 실패 ({difficulty}): {e}")
+            self.record(f"{difficulty}:misses")
             return None
 
     def count(self, difficulty: str) -> int:
@@ -445,27 +984,200 @@ class ProblemPool:
         """풀 보충이 필요한지 확인합니다."""
         return self.count(difficulty) <= POOL_REFILL_THRESHOLD
 
+    def record(self, field: str, amount: int = 1) -> None:
+        """통계 카운터 증가 (예: "easy:hits", "medium:rejected")"""
+        self._local_stats[field] = self._local_stats.get(field, 0) + amount
+        r = self._get_redis()
+        if not r:
+            return
+        try:
+            r.hincrby(f"{self.REDIS_KEY_PREFIX}:stats", field, amount)
+        except Exception:
+            pass
+
+    def get_stats(self) -> Dict:
+        """난이도별 풀 크기와 적중률, 배치 생성 검증 통계를 반환합니다."""
+        counters = dict(self._local_stats)
+        r = self._get_redis()
+        if r:
+            try:
+                counters = {
+                    k: int(v) for k, v in r.hgetall(f"{self.REDIS_KEY_PREFIX}:stats").items()
+                }
+            except Exception:
+                pass
+
+        pools = {}
+        for difficulty in ("easy", "medium", "hard"):
+            hits = counters.get(f"{difficulty}:hits", 0)
+            misses = counters.get(f"{difficulty}:misses", 0)
+            accepted = counters.get(f"{difficulty}:accepted", 0)
+            rejected = counters.get(f"{difficulty}:rejected", 0)
+            pools[difficulty] = {
+                "size": self.count(difficulty),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+                "accepted": accepted,
+                "rejected": rejected,
+            }
+        hits = sum(p["hits"] for p in pools.values())
+        requests = hits + sum(p["misses"] for p in pools.values())
+        return {
+            "redis_available": self._redis is not None,
+            "target_size": POOL_TARGET_SIZE,
+            "batch_size": POOL_BATCH_SIZE,
+            "hit_rate": round(hits / requests, 3) if requests else None,
+            "pools": pools,
+            "problem_store": problem_store.get_stats(),
+        }
+
 
 # 전역 문제 풀 인스턴스
 problem_pool = ProblemPool()
 
 
+class ProblemStore:
+    """
+    출제된 코딩 문제 저장소 (Redis Hash + 프로세스 내 LRU).
+
+    - coding_problems        Hash (problem_id → 문제 JSON) — 어느 워커에서든 조회 가능
+    - coding_problems:index  ZSET (problem_id → 저장 시각) — 보관 기간이 지난 문제 정리용
+
+    프로세스 내에는 최근 PROBLEM_CACHE_SIZE개만 유지하므로 메모리가 계속 늘지 않습니다.
+    Redis 연결은 problem_pool과 공유하며, Redis가 없으면 LRU만 사용합니다.
+    """
+
+    REDIS_KEY = "coding_problems"
+    PRUNE_INTERVAL_SEC = 600.0
+
+    def __init__(self, pool: ProblemPool, max_size: int = PROBLEM_CACHE_SIZE):
+        self._pool = pool
+        self._max_size = max_size
+        self._lru: "OrderedDict[str, CodingProblem]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _remember(self, problem: CodingProblem) -> None:
+        with self._lock:
+            self._lru[problem.id] = problem
+            self._lru.move_to_end(problem.id)
+            while len(self._lru) > self._max_size:
+                self._lru.popitem(last=False)
+
+    def put(self, problem: CodingProblem) -> None:
+        """문제를 LRU와 Redis에 저장합니다."""
+        self._remember(problem)
+        r = self._pool._get_redis()
+        if not r:
+            return
+        try:
+            now = time.time()
+            pipe = r.pipeline()
+            pipe.hset(self.REDIS_KEY, problem.id, json.dumps(problem.dict(), ensure_ascii=False))
+            pipe.zadd(f"{self.REDIS_KEY}:index", {problem.id: now})
+            pipe.execute()
+            if now - self._last_prune > self.PRUNE_INTERVAL_SEC:
+                self._last_prune = now
+                self._prune(r, now)
+        except Exception as e:
+            print(f"[ProblemStore] 저장 실패 ({problem.id}): {e}")
+
+    def _prune(self, r, now: float) -> None:
+        """보관 기간(PROBLEM_STORE_TTL_SEC)이 지난 문제 삭제"""
+        index_key = f"{self.REDIS_KEY}:index"
+        expired = r.zrangebyscore(index_key, "-inf", now - PROBLEM_STORE_TTL_SEC)
+        if expired:
+            r.hdel(self.REDIS_KEY, *expired)
+            r.zrem(index_key, *expired)
+
+    def get(self, problem_id: str) -> Optional[CodingProblem]:
+        """LRU → Redis 순으로 조회합니다. 없으면 None."""
+        with self._lock:
+            problem = self._lru.get(problem_id)
+            if problem is not None:
+                self._lru.move_to_end(problem_id)
+                self.local_hits += 1
+                return problem
+
+        r = self._pool._get_redis()
+        if r:
+            try:
+                data = r.hget(self.REDIS_KEY, problem_id)
+                if data:
+                    problem = CodingProblem(**json.loads(data))
+                    self._remember(problem)
+                    self.redis_hits += 1
+                    return problem
+            except Exception as e:
+                print(f"[ProblemStore] 조회 실패 ({problem_id}): {e}")
+        self.misses += 1
+        return None
+
+    def get_stats(self) -> Dict:
+        return {
+            "cached": len(self._lru),
+            "max_size": self._max_size,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+
+# 전역 문제 저장소 인스턴스 (problem_id → CodingProblem)
+problem_store = ProblemStore(problem_pool)
+
+
 def trigger_pool_refill(difficulty: str):
     """
     Celery 태스크를 발행하여 풀을 보충합니다.
+    태스크 1개가 LLM 호출 1회로 최대 POOL_BATCH_SIZE개를 생성하므로
+    부족분을 배치 단위로 나누어 발행합니다.
     Celery가 사용 불가능하면 무시합니다 (다음 요청 시 LLM 직접 호출로 대체).
     """
     try:
         from celery_tasks import pre_generate_coding_problem_task
 
-        needed = POOL_TARGET_SIZE - problem_pool.count(difficulty)
-        for _ in range(max(needed, 1)):
-            pre_generate_coding_problem_task.delay(difficulty)
-        print(f"[ProblemPool] 보충 태스크 {needed}개 발행 ({difficulty})")
+        needed = max(POOL_TARGET_SIZE - problem_pool.count(difficulty), 1)
+        batches = 0
+        while needed > 0:
+            count = min(needed, POOL_BATCH_SIZE)
+            pre_generate_coding_problem_task.delay(difficulty, count)
+            needed -= count
+            batches += 1
+        print(f"[ProblemPool] 보충 태스크 {batches}개 발행 ({difficulty})")
     except Exception as e:
         print(f"[ProblemPool] 보충 태스크 발행 실패: {e}")
 
 
+def validate_reference_solution(
+    problem: CodingProblem, solution: str, executor: Optional["CodeExecutor"] = None
+) -> Tuple[bool, str]:
+    """
+    정답 코드(Python)가 문제의 예제/테스트 케이스를 모두 통과하는지 확인합니다.
+    기대 출력이 틀린 문제가 풀에 들어가는 것을 막기 위해 사용합니다.
+    반환: (통과 여부, 실패 사유)
+    """
+    if not solution or not solution.strip():
+        return False, "정답 코드 없음"
+    if not problem.test_cases:
+        return False, "테스트 케이스 없음"
+
+    cases = [(tc.get("input", ""), tc.get("expected", "")) for tc in problem.test_cases]
+    cases += [(ex.get("input", ""), ex.get("output", "")) for ex in problem.examples]
+    executor = executor or CodeExecutor()
+    for i, (stdin, expected) in enumerate(cases):
+        result = executor.execute(solution, "python", str(stdin))
+        if not result.success:
+            return False, f"케이스 {i + 1} 실행 실패: {(result.error or '')[:100]}"
+        if not _smart_compare(result.output.strip(), str(expected).strip()):
+            return False, f"케이스 {i + 1} 출력 불일치"
+    return True, ""
+
+
 class CodingProblemGenerator:
     """LLM 기반 코딩 문제 자동 생성기"""
 
@@ -483,6 +1195,8 @@ class CodingProblemGenerator:
             )
         else:
             self.llm = None
+        # 배치 생성 시 정답 코드 검증용 실행기 (Lazy)
+        self._validator: Optional[CodeExecutor] = None
 
     async def generate(self, difficulty: str = "medium") -> CodingProblem:
         """LLM을 사용하여 코딩 문제 1개를 생성합니다.
@@ -537,8 +1251,8 @@ class CodingProblemGenerator:
                 hints=parsed.get("hints", []),
             )
 
-            # 캐시에 저장
-            _generated_problems[problem_id] = problem
+            # 공유 저장소에 저장
+            problem_store.put(problem)
             print(
                 f"[CodingProblemGenerator] 문제 생성 완료: {problem.title} (ID: {problem_id})"
             )
@@ -557,14 +1271,24 @@ class CodingProblemGenerator:
 
     def generate_sync(self, difficulty: str = "medium") -> Optional[CodingProblem]:
         """
-        동기(Synchronous) 버전 문제 생성 — Celery worker에서 호출합니다.
-
-        asyncio 이벤트 루프가 없는 Celery worker 환경에서 사용하며,
-        고품질 모델(qwen3:4b)로 생성하여 Redis 풀에 저장합니다.
+        동기(Synchronous) 버전 문제 1개 생성 — 정답 코드 검증을 통과한 문제만 반환합니다.
         실패 시 None을 반환합니다.
         """
+        problems = self.generate_batch_sync(difficulty, count=1)
+        return problems[0] if problems else None
+
+    def generate_batch_sync(
+        self, difficulty: str = "medium", count: int = POOL_BATCH_SIZE
+    ) -> List[CodingProblem]:
+        """
+        동기(Synchronous) 배치 문제 생성 — Celery worker에서 호출합니다.
+
+        LLM 호출 1회로 문제 count개와 각 문제의 Python 정답 코드를 받고,
+        정답 코드가 예제/테스트 케이스를 모두 통과한 문제만 반환합니다.
+        (검증 통과/탈락 수는 problem_pool 통계에 누적)
+        """
         if not LLM_AVAILABLE:
-            return None
+            return []
 
         try:
             # Celery 전용 LLM 인스턴스 (백그라운드 사전 생성용, 시간 여유)
@@ -575,7 +1299,9 @@ class CodingProblemGenerator:
                 think=None,  # thinking 모드 비활성화
             )
 
-            prompt = PROBLEM_GENERATION_PROMPT.format(difficulty=difficulty)
+            prompt = BATCH_PROBLEM_GENERATION_PROMPT.format(
+                difficulty=difficulty, count=count
+            )
             # /no_think 지시어로 Qwen3 thinking 모드 명시적 비활성화
             response = celery_llm.invoke(
                 [
@@ -591,34 +1317,50 @@ class CodingProblemGenerator:
             raw = re.sub(r"<think>.*?</think>", "", raw, flags=re.DOTALL).strip()
             raw = re.sub(r"</think>", "", raw).strip()
 
-            # JSON 파싱
-            parsed = parse_code_analysis_json(raw)
-            if not parsed:
-                json_match = re.search(r"\{[\s\S]*\}", raw)
-                if json_match:
-                    parsed = json.loads(json_match.group())
-                else:
-                    print("[CodingProblemGenerator] generate_sync: JSON 파싱 실패")
-                    return None
-
-            problem_id = str(uuid.uuid4())[:8]
-            problem = CodingProblem(
-                id=problem_id,
-                title=parsed.get("title", "코딩 문제"),
-                difficulty=parsed.get("difficulty", difficulty),
-                description=parsed.get("description", ""),
-                examples=parsed.get("examples", []),
-                test_cases=parsed.get("test_cases", []),
-                hints=parsed.get("hints", []),
-            )
-            print(
-                f"[CodingProblemGenerator] 동기 생성 완료: {problem.title} (ID: {problem_id})"
+            parsed = resilient_json_parse(
+                raw, fallback={}, expect_type=dict, context="coding_problem_batch"
             )
-            return problem
-
+            items = parsed.get("problems") or ([parsed] if parsed.get("title") else [])
+            if not items:
+                print("[CodingProblemGenerator] generate_batch_sync: JSON 파싱 실패")
+                return []
         except Exception as e:
-            print(f"[CodingProblemGenerator] generate_sync 실패: {e}")
-            return None
+            print(f"[CodingProblemGenerator] generate_batch_sync 실패: {e}")
+            return []
+
+        if self._validator is None:
+            self._validator = CodeExecutor()
+
+        accepted: List[CodingProblem] = []
+        for item in items[:count]:
+            try:
+                problem = CodingProblem(
+                    id=str(uuid.uuid4())[:8],
+                    title=item.get("title", "코딩 문제"),
+                    difficulty=difficulty,
+                    description=item.get("description", ""),
+                    examples=item.get("examples", []),
+                    test_cases=item.get("test_cases", []),
+                    hints=item.get("hints", []),
+                )
+                ok, reason = validate_reference_solution(
+                    problem, item.get("reference_solution", ""), self._validator
+                )
+            except Exception as e:
+                ok, reason = False, f"형식 오류: {e}"
+            if ok:
+                accepted.append(problem)
+            else:
+                print(
+                    f"[CodingProblemGenerator] 검증 탈락: {item.get('title', '?')} ({reason})"
+                )
+
+        problem_pool.record(f"{difficulty}:accepted", len(accepted))
+        problem_pool.record(f"{difficulty}:rejected", len(items[:count]) - len(accepted))
+        print(
+            f"[CodingProblemGenerator] 배치 생성 완료: {len(accepted)}/{len(items[:count])}개 검증 통과 ({difficulty})"
+        )
+        return accepted
 
     def _fallback_problem(self, difficulty: str = "easy") -> CodingProblem:
         """
@@ -1307,7 +2049,7 @@ nums에서 두 수를 선택하여 더한 값이 target이 되는 두 수의 인
             test_cases=selected["test_cases"],
             hints=selected.get("hints", []),
         )
-        _generated_problems[problem_id] = problem
+        problem_store.put(problem)
         return problem
 
 
@@ -2018,22 +2760,19 @@ class CodeAnalyzer:
 
         # asyncio.to_thread로 LLM 호출을 별도 스레드에서 실행하여 이벤트 루프 블로킹 방지
         # wait_for로 120초 타임아웃을 설정하여 무한 대기 방지
-        response = await asyncio.wait_for(
-            asyncio.to_thread(self.llm.invoke, messages),
+        # 스키마 제약 생성 — <think> 블록/설명문 없이 JSON만 생성되며, 폴백 파서가 태그를 제거
+        analysis = await asyncio.wait_for(
+            asyncio.to_thread(
+                invoke_structured_json,
+                self.llm,
+                messages,
+                CODE_ANALYSIS_SCHEMA,
+                parse_code_analysis_json,
+                kind="code_analysis",
+                context="CodeAnalyzer.analyze_code",
+            ),
             timeout=120,
         )
-        response_text = response.content
-
-        # <think> 태그 제거 (Qwen 모델 — 열림/닫힘 쌍 및 단독 닫힘 태그 모두 제거)
-        response_text = re.sub(
-            r"<think>.*?</think>", "", response_text, flags=re.DOTALL
-        ).strip()
-        response_text = re.sub(r"</think>", "", response_text).strip()
-
-        # JSON Resilience 파싱
-        analysis = parse_code_analysis_json(
-            response_text, context="CodeAnalyzer.analyze_code"
-        )
 
         return CodeAnalysisResult(
             overall_score=analysis.get("overall_score", 0),
@@ -2207,7 +2946,7 @@ class CodeExecutionService:
         """코드 실행 및 분석"""
 
         # 문제 가져오기 (캐시에서 조회)
-        problem = _generated_problems.get(problem_id) if problem_id else None
+        problem = problem_store.get(problem_id) if problem_id else None
 
         # 테스트 케이스 결정
         test_cases = custom_test_cases or (problem.test_cases if problem else [])
@@ -2309,10 +3048,15 @@ def create_coding_router():
         public_problem["test_cases"] = problem.test_cases[:2]
         return public_problem
 
+    @router.get("/pool/stats")
+    async def get_pool_stats():
+        """문제 풀 현황 및 적중률 (풀 hit/miss, 배치 생성 검증 통과/탈락)"""
+        return await asyncio.to_thread(problem_pool.get_stats)
+
     @router.get("/problems/{problem_id}")
     async def get_problem(problem_id: str):
         """캐시된 문제 상세 조회"""
-        problem = _generated_problems.get(problem_id)
+        problem = problem_store.get(problem_id)
         if not problem:
             raise HTTPException(
                 status_code=404,
@@ -0,0 +1,330 @@
+"""
+화이트보드 다이어그램 이미지 전처리 & 분석 결과 캐시
+====================================================
+DiagramAnalyzer가 비전 모델을 호출하기 전에 사용합니다.
+
+기능:
+  - 빈 캔버스 여백 자르기 + 비전 모델 해상도로 축소 (이미지 토큰 수 감소)
+  - 결과 캐시 — 완전 일치(문제별, 세션 공유) / 지각 해시(dHash 256bit) 근접 일치(같은 세션 안에서만,
+    잉크 격자 변화율로 재확인)
+  - 구조 비교(diff) 모드 — 같은 세션의 직전 그림 대비 잉크 격자가 거의 안 바뀌면 재분석 생략
+
+OpenCV가 없으면 전처리 없이 원본을 그대로 쓰고, 원본 바이트 해시로 완전 일치 캐시만 동작합니다.
+"""
+
+import base64
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import cv2
+    import numpy as np
+
+    CV2_AVAILABLE = True
+except ImportError:
+    cv2 = None
+    np = None
+    CV2_AVAILABLE = False
+    print("⚠️ opencv-python 미설치 — 다이어그램 전처리/지각 해시 비활성화")
+
+
+# ========== 설정 ==========
+# 비전 모델 입력 최대 변 길이 (Qwen3-VL은 32px 단위 패치 → 32의 배수로 맞춤)
+DIAGRAM_MAX_IMAGE_SIDE = int(os.getenv("DIAGRAM_MAX_IMAGE_SIDE", "896"))
+DIAGRAM_PATCH_SIZE = 32
+# 여백 자르기 후 남겨둘 테두리 (px)
+DIAGRAM_CROP_PADDING = int(os.getenv("DIAGRAM_CROP_PADDING", "16"))
+# 배경색과 이 값 이상 차이 나는 픽셀을 잉크로 간주 (0-255)
+DIAGRAM_INK_THRESHOLD = int(os.getenv("DIAGRAM_INK_THRESHOLD", "40"))
+# 지각 해시 해밍 거리 이하이면 거의 같은 그림 후보 (256bit 중)
+# 라벨 하나 추가도 거리 2 안팎이므로 낮게 유지하고, 잉크 격자 변화율로 한 번 더 확인
+DIAGRAM_HASH_MAX_DISTANCE = int(os.getenv("DIAGRAM_HASH_MAX_DISTANCE", "2"))
+# diff 모드: 잉크 격자 변화율이 이 값 미만이면 재분석하지 않음
+DIAGRAM_DIFF_THRESHOLD = float(os.getenv("DIAGRAM_DIFF_THRESHOLD", "0.05"))
+# 문제별 캐시 항목 수 / 전체 문제 수 상한
+DIAGRAM_CACHE_PER_PROBLEM = int(os.getenv("DIAGRAM_CACHE_PER_PROBLEM", "64"))
+DIAGRAM_CACHE_MAX_PROBLEMS = int(os.getenv("DIAGRAM_CACHE_MAX_PROBLEMS", "256"))
+
+_HASH_SIZE = 16   # dHash 16x16 = 256bit
+_GRID_SIZE = 64   # diff 모드 잉크 격자 (원본 캔버스 좌표 기준)
+
+
+@dataclass
+class PreparedDiagram:
+    """전처리된 다이어그램 이미지"""
+    image_base64: str           # 비전 모델에 보낼 PNG (base64, data URL 접두어 없음)
+    exact_key: str              # 픽셀 기준 완전 일치 키
+    phash: Optional[int]        # 지각 해시 (OpenCV 없으면 None)
+    ink_grid: Any               # 잉크 격자 (bool ndarray, OpenCV 없으면 None)
+    is_blank: bool              # 아무것도 그려지지 않은 캔버스
+    original_size: Tuple[int, int]
+    prepared_size: Tuple[int, int]
+    original_bytes: int
+    prepared_bytes: int
+
+
+def _strip_data_url(image_base64: str) -> str:
+    # 이미지 데이터 정리 (data:image/png;base64, 제거)
+    if "," in image_base64:
+        return image_base64.split(",", 1)[1]
+    return image_base64
+
+
+def _flatten_on_white(img):
+    """알파 채널은 흰 배경에 합성 (색상은 유지 — 비전 모델 입력용)"""
+    if img.ndim == 2 or img.shape[2] != 4:
+        return img
+    alpha = img[:, :, 3:4].astype(np.float32) / 255.0
+    rgb = img[:, :, :3].astype(np.float32) * alpha + 255.0 * (1.0 - alpha)
+    return rgb.astype(np.uint8)
+
+
+def _to_gray(img):
+    """해시/잉크 마스크 계산용 그레이스케일"""
+    if img.ndim == 2:
+        return img
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+def _ink_mask(gray):
+    # 네 모서리 중앙값을 배경색으로 추정 (흰/검은 캔버스 모두 대응)
+    corners = np.array([gray[0, 0], gray[0, -1], gray[-1, 0], gray[-1, -1]])
+    background = int(np.median(corners))
+    return np.abs(gray.astype(np.int16) - background) >= DIAGRAM_INK_THRESHOLD
+
+
+def _dhash(gray) -> int:
+    small = cv2.resize(gray, (_HASH_SIZE + 1, _HASH_SIZE), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int("".join("1" if b else "0" for b in bits), 2)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def ink_change_ratio(prev_grid, grid) -> float:
+    """잉크 격자 변화율 (바뀐 칸 / 잉크가 있는 칸)"""
+    if prev_grid is None or grid is None:
+        return 1.0
+    union = np.logical_or(prev_grid, grid).sum()
+    if union == 0:
+        return 0.0
+    return float(np.logical_xor(prev_grid, grid).sum()) / float(union)
+
+
+def prepare_diagram(image_base64: str) -> PreparedDiagram:
+    """여백 자르기 + 축소 + 해시 계산. 디코딩 실패 시 원본을 그대로 사용합니다."""
+    raw_b64 = _strip_data_url(image_base64)
+    raw_bytes_len = len(raw_b64) * 3 // 4
+
+    passthrough = PreparedDiagram(
+        image_base64=raw_b64,
+        exact_key=hashlib.sha256(raw_b64.encode("ascii", "ignore")).hexdigest(),
+        phash=None,
+        ink_grid=None,
+        is_blank=False,
+        original_size=(0, 0),
+        prepared_size=(0, 0),
+        original_bytes=raw_bytes_len,
+        prepared_bytes=raw_bytes_len,
+    )
+    if not CV2_AVAILABLE:
+        return passthrough
+
+    try:
+        buf = np.frombuffer(base64.b64decode(raw_b64), dtype=np.uint8)
+        img = cv2.imdecode(buf, cv2.IMREAD_UNCHANGED)
+    except Exception:
+        img = None
+    if img is None:
+        return passthrough
+
+    color = _flatten_on_white(img)
+    gray = _to_gray(color)
+    h, w = gray.shape[:2]
+    mask = _ink_mask(gray)
+
+    # diff 모드용 격자는 원본 캔버스 좌표 기준 (그림이 커져도 위치 비교 가능)
+    ink_grid = cv2.resize(mask.astype(np.uint8) * 255, (_GRID_SIZE, _GRID_SIZE), interpolation=cv2.INTER_AREA) > 0
+
+    ys, xs = np.nonzero(mask)
+    if len(xs) == 0:
+        blank_key = hashlib.sha256(f"blank:{w}x{h}".encode()).hexdigest()
+        return PreparedDiagram(
+            image_base64=raw_b64, exact_key=blank_key, phash=0, ink_grid=ink_grid,
+            is_blank=True, original_size=(w, h), prepared_size=(w, h),
+            original_bytes=raw_bytes_len, prepared_bytes=raw_bytes_len,
+        )
+
+    # 1) 빈 여백 자르기
+    pad = DIAGRAM_CROP_PADDING
+    x0, x1 = max(0, xs.min() - pad), min(w, xs.max() + 1 + pad)
+    y0, y1 = max(0, ys.min() - pad), min(h, ys.max() + 1 + pad)
+    cropped = color[y0:y1, x0:x1]
+
+    # 2) 비전 모델 해상도로 축소 (긴 변 기준, 32의 배수)
+    ch, cw = cropped.shape[:2]
+    scale = min(1.0, DIAGRAM_MAX_IMAGE_SIDE / float(max(ch, cw)))
+    tw = max(DIAGRAM_PATCH_SIZE, int(round(cw * scale / DIAGRAM_PATCH_SIZE)) * DIAGRAM_PATCH_SIZE)
+    th = max(DIAGRAM_PATCH_SIZE, int(round(ch * scale / DIAGRAM_PATCH_SIZE)) * DIAGRAM_PATCH_SIZE)
+    resized = cv2.resize(cropped, (tw, th), interpolation=cv2.INTER_AREA)
+
+    ok, encoded = cv2.imencode(".png", resized, [cv2.IMWRITE_PNG_COMPRESSION, 6])
+    if not ok:
+        return passthrough
+    png = encoded.tobytes()
+
+    return PreparedDiagram(
+        image_base64=base64.b64encode(png).decode("ascii"),
+        exact_key=hashlib.sha256(resized.tobytes() + f"{tw}x{th}".encode()).hexdigest(),
+        phash=_dhash(gray[y0:y1, x0:x1]),
+        ink_grid=ink_grid,
+        is_blank=False,
+        original_size=(w, h),
+        prepared_size=(tw, th),
+        original_bytes=raw_bytes_len,
+        prepared_bytes=len(png),
+    )
+
+
+class DiagramResultCache:
+    """
+    문제별 다이어그램 분석 결과 캐시 (완전 일치 + 지각 해시 근접 일치)
+    + 세션별 마지막 분석 그림 (diff 모드)
+
+    완전 일치는 픽셀이 같으므로 세션 간에 공유하지만, 근접 일치는 수정된 그림이나
+    다른 지원자의 그림에 이전 분석이 돌아가지 않도록 같은 세션이 저장한 항목만 대상으로 하고
+    잉크 격자 변화율이 DIAGRAM_DIFF_THRESHOLD 미만인지 재확인합니다.
+    """
+
+    def __init__(self):
+        # problem_key -> OrderedDict[exact_key, (phash, explanation_key, result, session_id, ink_grid)]
+        self._by_problem: "OrderedDict[str, OrderedDict]" = OrderedDict()
+        # session_id -> (problem_key, explanation_key, ink_grid, result)
+        self._last_by_session: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = {
+            "exact_hits": 0,
+            "near_hits": 0,
+            "unchanged_hits": 0,
+            "misses": 0,
+            "analysis_seconds": 0.0,
+            "original_bytes": 0,
+            "prepared_bytes": 0,
+        }
+
+    @staticmethod
+    def explanation_key(user_explanation: Optional[str]) -> str:
+        text = " ".join((user_explanation or "").split())
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+    def lookup(
+        self,
+        problem_key: str,
+        explanation_key: str,
+        prepared: PreparedDiagram,
+        session_id: Optional[str] = None,
+        diff_mode: bool = False,
+    ) -> Tuple[Optional[Any], Optional[str], Dict]:
+        """캐시 조회 → (결과, 적중 종류, 상세)"""
+        self.stats["original_bytes"] += prepared.original_bytes
+        self.stats["prepared_bytes"] += prepared.prepared_bytes
+
+        # 1) diff 모드: 같은 세션 직전 그림과 구조적으로 거의 같으면 재사용
+        if diff_mode and session_id and session_id in self._last_by_session:
+            last_problem, last_expl, last_grid, last_result = self._last_by_session[session_id]
+            if last_problem == problem_key and last_expl == explanation_key:
+                ratio = ink_change_ratio(last_grid, prepared.ink_grid)
+                if ratio < DIAGRAM_DIFF_THRESHOLD:
+                    self.stats["unchanged_hits"] += 1
+                    return last_result, "unchanged", {"change_ratio": round(ratio, 4)}
+
+        entries = self._by_problem.get(problem_key)
+        if entries:
+            self._by_problem.move_to_end(problem_key)
+
+            # 2) 완전 일치
+            hit = entries.get(prepared.exact_key)
+            if hit and hit[1] == explanation_key:
+                entries.move_to_end(prepared.exact_key)
+                self.stats["exact_hits"] += 1
+                return hit[2], "exact", {}
+
+            # 3) 지각 해시 근접 일치 — 같은 세션 항목만, 잉크 격자 변화율로 재확인
+            if prepared.phash is not None and session_id:
+                best, best_dist, best_ratio = None, DIAGRAM_HASH_MAX_DISTANCE + 1, 1.0
+                for key, (phash, expl, result, owner, grid) in entries.items():
+                    if phash is None or expl != explanation_key or owner != session_id:
+                        continue
+                    dist = hamming(phash, prepared.phash)
+                    if dist >= best_dist:
+                        continue
+                    ratio = ink_change_ratio(grid, prepared.ink_grid)
+                    if ratio < DIAGRAM_DIFF_THRESHOLD:
+                        best, best_dist, best_ratio = key, dist, ratio
+                if best is not None:
+                    entries.move_to_end(best)
+                    self.stats["near_hits"] += 1
+                    return entries[best][2], "near", {
+                        "hash_distance": best_dist,
+                        "change_ratio": round(best_ratio, 4),
+                    }
+
+        self.stats["misses"] += 1
+        return None, None, {}
+
+    def store(
+        self,
+        problem_key: str,
+        explanation_key: str,
+        prepared: PreparedDiagram,
+        result: Any,
+        elapsed: float = 0.0,
+        session_id: Optional[str] = None,
+    ) -> None:
+        self.stats["analysis_seconds"] += elapsed
+        entries = self._by_problem.setdefault(problem_key, OrderedDict())
+        self._by_problem.move_to_end(problem_key)
+        entries[prepared.exact_key] = (
+            prepared.phash, explanation_key, result, session_id, prepared.ink_grid
+        )
+        entries.move_to_end(prepared.exact_key)
+        while len(entries) > DIAGRAM_CACHE_PER_PROBLEM:
+            entries.popitem(last=False)
+        while len(self._by_problem) > DIAGRAM_CACHE_MAX_PROBLEMS:
+            self._by_problem.popitem(last=False)
+
+    def remember_session(
+        self,
+        session_id: Optional[str],
+        problem_key: str,
+        explanation_key: str,
+        prepared: PreparedDiagram,
+        result: Any,
+    ) -> None:
+        if not session_id:
+            return
+        self._last_by_session[session_id] = (problem_key, explanation_key, prepared.ink_grid, result)
+        self._last_by_session.move_to_end(session_id)
+        while len(self._last_by_session) > DIAGRAM_CACHE_MAX_PROBLEMS * 4:
+            self._last_by_session.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        s = self.stats
+        hits = s["exact_hits"] + s["near_hits"] + s["unchanged_hits"]
+        total = hits + s["misses"]
+        return {
+            "preprocess_available": CV2_AVAILABLE,
+            "problems": len(self._by_problem),
+            "entries": sum(len(e) for e in self._by_problem.values()),
+            "exact_hits": s["exact_hits"],
+            "near_hits": s["near_hits"],
+            "unchanged_hits": s["unchanged_hits"],
+            "misses": s["misses"],
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "avg_analysis_seconds": round(s["analysis_seconds"] / s["misses"], 2) if s["misses"] else 0.0,
+            "image_bytes_ratio": round(s["prepared_bytes"] / s["original_bytes"], 3) if s["original_bytes"] else 1.0,
+        }
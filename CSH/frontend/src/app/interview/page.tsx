@@ -7,6 +7,7 @@ import EventToastContainer from "@/components/common/EventToast";
 import InterviewReportCharts, { ReportData } from "@/components/report/InterviewReportCharts";
 import { sessionApi, interviewApi, ttsApi, interventionApi, resumeApi, webrtcApi } from "@/lib/api";
 import { useToast } from "@/contexts/ToastContext";
+import { encodeVadFrame, decodeServerFrame } from "./vadFrames";
 import { Mic, MicOff, Camera, CameraOff, PhoneOff, SkipForward, Volume2, Loader2, FileText, Download, LayoutDashboard, AlertTriangle, Upload } from "lucide-react";
 
 /* Web Speech API 타입 (브라우저 전용) */
@@ -99,6 +100,10 @@ function InterviewPageInner() {
   const analyserRef = useRef<AnalyserNode | null>(null);
   const vadIntervalRef = useRef<ReturnType<typeof setInterval> | null>(null);
   const vadSourceRef = useRef<MediaStreamAudioSourceNode | null>(null);
+  // WebSocket VAD 프레임 순번 (u16, 서버 디버깅용)
+  const vadSeqRef = useRef(0);
+  // 마지막으로 표시한 개입 메시지 (서버 푸시/폴링 공통 — 동일 메시지 중복 표시 방지)
+  const lastInterventionMsgRef = useRef("");
   // STT 오디오 처리 노드:
   //  - 우선: AudioWorkletNode (별도 오디오 스레드에서 처리 → 프레임 드롭 방지)
   //  - 폴백: ScriptProcessorNode (AudioWorklet 미지원 브라우저)
@@ -134,6 +139,13 @@ function InterviewPageInner() {
   useEffect(() => { serverSttAvailableRef.current = serverSttAvailable; }, [serverSttAvailable]);
   useEffect(() => { browserSttEnabledRef.current = browserSttEnabled; }, [browserSttEnabled]);
 
+  // 확정 STT 텍스트를 WebSocket으로 전달 — 서버가 길이/주제 이탈 개입을 판단해 푸시
+  useEffect(() => {
+    const ws = wsRef.current;
+    if (!interviewStarted || !ws || ws.readyState !== WebSocket.OPEN) return;
+    try { ws.send(JSON.stringify({ type: "answer_text", text: sttText })); } catch { /* ignore */ }
+  }, [sttText, interviewStarted]);
+
   // ── Web Speech API 음성 목록 사전 로드 ──
   // Chrome 등 일부 브라우저는 getVoices()가 비동기적으로 로딩되므로,
   // voiceschanged 이벤트를 통해 음성 목록이 준비되었음을 보장합니다.
@@ -245,7 +257,7 @@ function InterviewPageInner() {
    *  1. MediaStream → AudioContext → AnalyserNode 연결
    *  2. 500ms 간격으로 주파수 데이터를 읽어 RMS(Root Mean Square) 계산
    *  3. RMS가 임계값(0.015) 이상이면 음성(is_speech=true)으로 판단
-   *  4. 결과를 interventionApi.vadSignal()로 서버에 전송
+   *  4. 결과를 WebSocket 8바이트 VAD 프레임으로 서버에 전송 (미연결 시 interventionApi.vadSignal() 폴백)
    *  5. 서버의 InterventionManager가 침묵/발화 상태를 추적
    *
    * @param stream - getUserMedia()로 얻은 마이크 포함 MediaStream
@@ -525,9 +537,16 @@ function InterviewPageInner() {
         // 서버에 VAD 신호 전송 (면접 진행 중일 때만)
         const sid = sessionIdRef.current;
         if (sid && interviewStartedRef.current) {
-          interventionApi.vadSignal(sid, isSpeech, rms).catch(() => {
-            // 네트워크 오류 시 무시 — VAD 신호 누락은 치명적이지 않음
-          });
+          const ws = wsRef.current;
+          if (ws && ws.readyState === WebSocket.OPEN) {
+            try {
+              ws.send(encodeVadFrame(isSpeech, rms, vadSeqRef.current++));
+            } catch { /* ignore */ }
+          } else {
+            interventionApi.vadSignal(sid, isSpeech, rms).catch(() => {
+              // 네트워크 오류 시 무시 — VAD 신호 누락은 치명적이지 않음
+            });
+          }
         }
       }, 500);
 
@@ -746,6 +765,8 @@ function InterviewPageInner() {
           wsUrl = `${protocol}//${host}:8000/ws/interview/${targetSid}?token=${encodeURIComponent(wsToken || "")}`;
         }
         const ws = new WebSocket(wsUrl);
+        // 서버가 푸시하는 Turn-taking/개입 바이너리 프레임을 ArrayBuffer로 수신
+        ws.binaryType = "arraybuffer";
 
         // WebSocket 연결 성공 시 재연결 카운터 리셋
         // — 이전 끊김에서 정상 복구된 것이므로 카운터를 초기화
@@ -754,6 +775,13 @@ function InterviewPageInner() {
         };
 
         ws.onmessage = (e) => {
+          if (e.data instanceof ArrayBuffer) {
+            const frame = decodeServerFrame(e.data);
+            if (frame?.kind === "intervention") {
+              showIntervention(frame.message).catch(() => { });
+            }
+            return;
+          }
           try {
             const data = JSON.parse(e.data);
             // ★ STT 정책: Deepgram Nova-3를 메인 STT로 사용, 브라우저 SpeechRecognition은 폴백
@@ -1396,24 +1424,36 @@ function InterviewPageInner() {
   };
 
   // ========== 개입 체크 ==========
+  // WebSocket이 연결되어 있으면 서버가 VAD 프레임마다 개입 여부를 판단해 푸시하므로 폴링하지 않습니다.
+  // 미연결 시에만 3초 간격 HTTP 폴링으로 폴백합니다.
   // 백엔드의 중복 방지 플래그 + 쿨다운이 주된 방어선이며,
   // 프론트엔드에서도 개입 발생 시 10초간 폴링을 일시정지하여 이중 방어합니다.
+
+  /** 개입 메시지 표시 + 음성 출력 (동일 메시지 연속 표시 방지). 표시했으면 true */
+  const showIntervention = async (interventionMessage: string) => {
+    if (!interventionMessage || interventionMessage === lastInterventionMsgRef.current) return false;
+    lastInterventionMsgRef.current = interventionMessage;
+    setMessages(prev => [...prev, { role: "ai", text: `💡 ${interventionMessage}` }]);
+    await speakQuestion(interventionMessage);
+    // 개입 메시지 발화 후에는 다시 사용자 응답 대기 상태로 복귀
+    setStatus("listening");
+    return true;
+  };
+
   const startInterventionCheck = (sid: string) => {
     if (interventionTimerRef.current) clearInterval(interventionTimerRef.current);
+    // 새 턴(또는 폴링 재개)마다 중복 메시지 기준 초기화 — 이전 턴과 같은 문구도 다시 표시
+    lastInterventionMsgRef.current = "";
     interventionApi.startTurn(sid, currentQuestion).catch(() => { });
-    // 마지막으로 표시한 개입 메시지를 추적하여 동일 메시지 중복 표시 방지
-    let lastInterventionMsg = "";
     interventionTimerRef.current = setInterval(async () => {
+      // WebSocket 연결 중 → 서버 푸시 사용
+      if (wsRef.current?.readyState === WebSocket.OPEN) return;
       try {
         const res = await interventionApi.check(sid, sttText);
         const interventionMessage = res.intervention?.message;
         if (res.needs_intervention && interventionMessage) {
           // 동일 메시지 연속 표시 방지 (백엔드 쿨다운 보완)
-          if (interventionMessage === lastInterventionMsg) return;
-          lastInterventionMsg = interventionMessage;
-
-          setMessages(prev => [...prev, { role: "ai", text: `💡 ${interventionMessage}` }]);
-          await speakQuestion(interventionMessage);
+          if (!(await showIntervention(interventionMessage))) return;
 
           // 개입 메시지 발화 후 10초간 폴링 일시정지 (사용자 응답 대기)
           if (interventionTimerRef.current) clearInterval(interventionTimerRef.current);
@@ -1421,9 +1461,6 @@ function InterviewPageInner() {
             // 10초 후 폴링 재개 (타이머가 이미 정리되지 않은 경우에만)
             startInterventionCheck(sid);
           }, 10000);
-
-          // 개입 메시지 발화 후에는 다시 사용자 응답 대기 상태로 복귀
-          setStatus("listening");
           return; // setTimeout으로 재개할 것이므로 여기서 종료
         }
       } catch { /* ignore */ }
@@ -0,0 +1,77 @@
+/**
+ * 실시간 개입 VAD 바이너리 프레임 (백엔드 vad_channel.py와 동일 형식)
+ *
+ * 클라이언트 → 서버: VAD 8바이트 (magic, kind=1, flags, level, seq, reserved)
+ * 서버 → 클라이언트: TURN 8바이트 / INTERVENTION 6바이트 헤더 + UTF-8 메시지
+ * 코드 테이블 순서는 백엔드와 반드시 같아야 합니다.
+ */
+
+const FRAME_MAGIC = 0xa5;
+const KIND_VAD = 0x01;
+const KIND_TURN = 0x02;
+const KIND_INTERVENTION = 0x03;
+const LEVEL_SCALE = 1000;
+
+const TURN_STATES = ["ai_speaking", "user_speaking", "silence"];
+const INTERRUPT_REASONS = ["", "silence_pause", "time_exceeded", "speech_ending"];
+const INTERVENTION_TYPES = ["", "soft_time_warning", "hard_time_limit", "off_topic", "encourage_more", "silence_detected"];
+const INTERVENTION_ACTIONS = ["", "warn", "force_next_question", "redirect", "encourage"];
+const INTERVENTION_PRIORITIES = ["", "low", "medium", "high"];
+
+export interface TurnSignalFrame {
+  kind: "turn";
+  turnState: string;
+  canInterrupt: boolean;
+  isSpeaking: boolean;
+  interruptReason: string;
+  silenceDurationMs: number;
+}
+
+export interface InterventionFrame {
+  kind: "intervention";
+  type: string;
+  action: string;
+  priority: string;
+  message: string;
+}
+
+export function encodeVadFrame(isSpeech: boolean, rms: number, seq: number): ArrayBuffer {
+  const buf = new ArrayBuffer(8);
+  const view = new DataView(buf);
+  view.setUint8(0, FRAME_MAGIC);
+  view.setUint8(1, KIND_VAD);
+  view.setUint8(2, isSpeech ? 1 : 0);
+  view.setUint8(3, Math.max(0, Math.min(255, Math.round(rms * LEVEL_SCALE))));
+  view.setUint16(4, seq & 0xffff, true);
+  view.setUint16(6, 0, true);
+  return buf;
+}
+
+export function decodeServerFrame(data: ArrayBuffer): TurnSignalFrame | InterventionFrame | null {
+  if (data.byteLength < 6) return null;
+  const view = new DataView(data);
+  if (view.getUint8(0) !== FRAME_MAGIC) return null;
+
+  const kind = view.getUint8(1);
+  if (kind === KIND_TURN && data.byteLength === 8) {
+    const flags = view.getUint8(3);
+    return {
+      kind: "turn",
+      turnState: TURN_STATES[view.getUint8(2)] ?? "",
+      canInterrupt: (flags & 0x01) !== 0,
+      isSpeaking: (flags & 0x02) !== 0,
+      interruptReason: INTERRUPT_REASONS[view.getUint8(4)] ?? "",
+      silenceDurationMs: view.getUint16(6, true) * 100,
+    };
+  }
+  if (kind === KIND_INTERVENTION) {
+    return {
+      kind: "intervention",
+      type: INTERVENTION_TYPES[view.getUint8(2)] ?? "",
+      action: INTERVENTION_ACTIONS[view.getUint8(3)] ?? "",
+      priority: INTERVENTION_PRIORITIES[view.getUint8(4)] ?? "",
+      message: new TextDecoder().decode(new Uint8Array(data, 6)),
+    };
+  }
+  return null;
+}
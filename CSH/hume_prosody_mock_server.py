@@ -0,0 +1,84 @@
+"""
+Hume Prosody Streaming API 로컬 Mock 서버
+=========================================
+HUME_API_KEY 없이 Prosody 스트리밍 경로(세션 연결 재사용, 링 버퍼, 세그먼트 전송)를
+로컬에서 확인하기 위한 WebSocket 서버입니다.
+
+실행:
+    python hume_prosody_mock_server.py --port 8765
+
+서버 설정:
+    HUME_API_KEY=mock
+    HUME_PROSODY_STREAM_URL=ws://127.0.0.1:8765/v0/stream/models
+
+동작:
+  - {"data": base64 WAV, "models": {"prosody": {}}} 메시지마다 예측 1개를 응답
+  - 감정 스코어는 오디오 RMS 기반의 결정적 값 (같은 입력 → 같은 결과)
+  - 5초를 넘는 오디오는 실제 API처럼 오류 응답
+  - --delay 로 응답 지연을 흉내낼 수 있음
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import wave
+
+import numpy as np
+import websockets
+
+from hume_prosody_service import ALL_PROSODY_EMOTIONS
+
+MAX_AUDIO_SEC = 5.0
+
+
+def _predict(wav_bytes: bytes) -> dict:
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+        rate = wf.getframerate()
+        frames = wf.readframes(wf.getnframes())
+    pcm = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    duration = len(pcm) / float(rate)
+    if duration > MAX_AUDIO_SEC:
+        return {"error": f"Audio exceeds {MAX_AUDIO_SEC:.0f}s limit", "code": "E0203"}
+
+    rms = float(np.sqrt(np.mean(pcm ** 2))) if len(pcm) else 0.0
+    emotions = [
+        {"name": name, "score": round((rms * (i + 1) * 7.3) % 1.0 * 0.5, 4)}
+        for i, name in enumerate(ALL_PROSODY_EMOTIONS)
+    ]
+    return {
+        "prosody": {
+            "predictions": [{
+                "time": {"begin": 0.0, "end": round(duration, 3)},
+                "emotions": emotions,
+            }]
+        }
+    }
+
+
+async def _handle(ws, delay: float):
+    async for message in ws:
+        try:
+            payload = json.loads(message)
+            result = _predict(base64.b64decode(payload["data"]))
+        except Exception as e:
+            result = {"error": f"invalid payload: {e}", "code": "E0100"}
+        if delay:
+            await asyncio.sleep(delay)
+        await ws.send(json.dumps(result))
+
+
+async def main(host: str, port: int, delay: float):
+    async with websockets.serve(lambda ws, *_: _handle(ws, delay), host, port, max_size=8 * 1024 * 1024):
+        print(f"✅ [HumeProsodyMock] ws://{host}:{port}/v0/stream/models")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hume Prosody Streaming API mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port, args.delay))
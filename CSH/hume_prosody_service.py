@@ -5,6 +5,8 @@ Hume AI Prosody 감정 분석 서비스
 
 기능:
   - Hume Expression Measurement Streaming API (WebSocket) 기반 실시간 분석
+    · 세션별 WebSocket 연결 재사용 (전체 연결 수 상한, LRU로 정리)
+    · 세션별 고정 크기 PCM 링 버퍼 + 최적 길이 세그먼트로 묶어 전송
   - Hume Expression Measurement Batch API (REST) 기반 녹음 후 분석
   - DeepFace 7종 표정 감정과 병합하여 멀티모달 감정 융합
   - 면접 맥락에 최적화된 10종 핵심 지표 추출
@@ -23,25 +25,54 @@ Hume AI Prosody 감정 분석 서비스
 """
 
 import os
+import io
+import wave
 import asyncio
 import base64
 import json
 import time
 import statistics
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, List, Any, Tuple, Callable, Awaitable
 from dataclasses import dataclass, field
 from datetime import datetime
-from collections import Counter
+from collections import Counter, OrderedDict
+from urllib.parse import urlencode
 
 import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
 
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    websockets = None
+    WEBSOCKETS_AVAILABLE = False
+
 # ========== Hume AI API 키 (hume_tts_service.py와 공유) ==========
 HUME_API_KEY = os.getenv("HUME_API_KEY")
 HUME_SECRET_KEY = os.getenv("HUME_SECRET_KEY")
 
+# ========== 엔드포인트 (로컬 mock 서버로 교체 가능) ==========
+HUME_API_BASE = os.getenv("HUME_API_BASE", "https://api.hume.ai")
+HUME_PROSODY_STREAM_URL = os.getenv(
+    "HUME_PROSODY_STREAM_URL", "wss://api.hume.ai/v0/stream/models"
+)
+
+# ========== 스트리밍 설정 ==========
+PROSODY_SAMPLE_RATE = 16000                # PCM16 mono 16kHz
+PROSODY_BYTES_PER_SEC = PROSODY_SAMPLE_RATE * 2
+# Hume 스트리밍은 메시지당 오디오 5초 제한 → 그 안에서 최대한 길게 묶어 전송
+PROSODY_SEGMENT_SEC = float(os.getenv("PROSODY_SEGMENT_SEC", "4.0"))
+# 발화 종료(flush) 시 이보다 짧은 꼬리 오디오는 버림
+PROSODY_MIN_SEGMENT_SEC = float(os.getenv("PROSODY_MIN_SEGMENT_SEC", "0.5"))
+# 세션별 대기 오디오 상한 (초과 시 가장 오래된 오디오부터 버림)
+PROSODY_BUFFER_SEC = float(os.getenv("PROSODY_BUFFER_SEC", "12.0"))
+# 동시에 열어둘 스트리밍 WebSocket 최대 수 (초과 시 가장 오래 안 쓴 연결을 닫음)
+PROSODY_MAX_STREAMS = int(os.getenv("PROSODY_MAX_STREAMS", "32"))
+PROSODY_STREAM_TIMEOUT = float(os.getenv("PROSODY_STREAM_TIMEOUT", "10.0"))
+
 # ========== 면접 핵심 지표 매핑 ==========
 INTERVIEW_EMOTION_MAP: Dict[str, List[str]] = {
     "confidence": ["Determination", "Pride", "Triumph"],
@@ -133,29 +164,54 @@ class ProsodySessionStats:
         }
 
 
+# ========== 공유 HTTP 클라이언트 (TLS 연결 재사용) ==========
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """토큰/Batch 요청이 함께 쓰는 커넥션 풀"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            base_url=HUME_API_BASE,
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _http_client
+
+
 # ========== 토큰 인증 (hume_tts_service와 독립 캐싱) ==========
 _prosody_access_token: Optional[str] = None
 _prosody_token_expires_at: float = 0
+_prosody_token_lock = asyncio.Lock()
+_prosody_token_warned = False
 
 
 async def _get_prosody_access_token() -> Optional[str]:
-    """Hume AI OAuth2 토큰 인증 (Prosody 전용 캐시)"""
-    global _prosody_access_token, _prosody_token_expires_at
+    """Hume AI OAuth2 토큰 인증 (Prosody 전용 캐시, 만료 5분 전까지 재사용)"""
+    global _prosody_access_token, _prosody_token_expires_at, _prosody_token_warned
 
     if _prosody_access_token and time.time() < _prosody_token_expires_at - 300:
         return _prosody_access_token
 
     if not HUME_API_KEY or not HUME_SECRET_KEY:
-        print("⚠️ [HumeProsody] HUME_API_KEY 또는 HUME_SECRET_KEY가 설정되지 않았습니다.")
+        if not _prosody_token_warned:
+            # 세그먼트마다 호출되므로 경고는 한 번만
+            print("⚠️ [HumeProsody] HUME_API_KEY 또는 HUME_SECRET_KEY가 설정되지 않았습니다.")
+            _prosody_token_warned = True
         return None
 
-    try:
-        auth = f"{HUME_API_KEY}:{HUME_SECRET_KEY}"
-        encoded_auth = base64.b64encode(auth.encode()).decode()
+    # 동시에 만료를 감지한 요청들이 토큰을 중복 발급받지 않도록 직렬화
+    async with _prosody_token_lock:
+        if _prosody_access_token and time.time() < _prosody_token_expires_at - 300:
+            return _prosody_access_token
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                url="https://api.hume.ai/oauth2-cc/token",
+        try:
+            auth = f"{HUME_API_KEY}:{HUME_SECRET_KEY}"
+            encoded_auth = base64.b64encode(auth.encode()).decode()
+
+            resp = await _get_http_client().post(
+                "/oauth2-cc/token",
                 headers={"Authorization": f"Basic {encoded_auth}"},
                 data={"grant_type": "client_credentials"},
             )
@@ -169,9 +225,103 @@ async def _get_prosody_access_token() -> Optional[str]:
             else:
                 print(f"❌ [HumeProsody] 토큰 인증 실패: {resp.status_code}")
                 return None
-    except Exception as e:
-        print(f"❌ [HumeProsody] 토큰 인증 오류: {e}")
-        return None
+        except Exception as e:
+            print(f"❌ [HumeProsody] 토큰 인증 오류: {e}")
+            return None
+
+
+# ========== PCM 유틸리티 ==========
+
+def pcm16_to_wav(pcm: bytes, sample_rate: int = PROSODY_SAMPLE_RATE) -> bytes:
+    """PCM16 mono 바이트에 WAV 헤더를 붙입니다."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+    return buf.getvalue()
+
+
+class PcmRingBuffer:
+    """
+    고정 크기 PCM 링 버퍼.
+    가득 차면 가장 오래된 오디오부터 덮어쓰며, 버린 바이트 수를 기록합니다.
+    """
+
+    def __init__(self, capacity_bytes: int):
+        capacity_bytes -= capacity_bytes % 2  # 16bit 샘플 경계 유지
+        self._buf = bytearray(capacity_bytes)
+        self._capacity = capacity_bytes
+        self._start = 0
+        self._size = 0
+        self.dropped_bytes = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def append(self, data: bytes) -> None:
+        n = len(data)
+        if n == 0:
+            return
+        cap = self._capacity
+        if n >= cap:
+            # 버퍼보다 긴 입력은 마지막 부분만 유지
+            self.dropped_bytes += self._size + (n - cap)
+            data = memoryview(data)[n - cap:]
+            n = cap
+            self._start = 0
+            self._size = 0
+
+        overflow = self._size + n - cap
+        if overflow > 0:
+            self._start = (self._start + overflow) % cap
+            self._size -= overflow
+            self.dropped_bytes += overflow
+
+        end = (self._start + self._size) % cap
+        first = min(n, cap - end)
+        self._buf[end:end + first] = data[:first]
+        if n > first:
+            self._buf[:n - first] = data[first:]
+        self._size += n
+
+    def take(self, n: int) -> bytes:
+        """앞에서부터 최대 n 바이트를 꺼냅니다."""
+        n = min(n, self._size)
+        n -= n % 2
+        cap = self._capacity
+        first = min(n, cap - self._start)
+        out = bytes(self._buf[self._start:self._start + first])
+        if n > first:
+            out += bytes(self._buf[:n - first])
+        self._start = (self._start + n) % cap
+        self._size -= n
+        return out
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+
+class _ProsodyStream:
+    """세션별 스트리밍 상태 (대기 오디오 + WebSocket 연결)"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.ring = PcmRingBuffer(int(PROSODY_BUFFER_SEC * PROSODY_BYTES_PER_SEC))
+        self.ws = None
+        self.lock = asyncio.Lock()     # 연결당 요청 1개씩 (응답 순서 보장)
+        self.pump: Optional[asyncio.Task] = None
+        self.flush_requested = False
+        self.transcript = ""
+        self.offset_sec = 0.0          # 세션 오디오 기준 누적 시각
+        self.segments_sent = 0
+        self.latency_total = 0.0
 
 
 # ========== 감정 스코어 → 면접 지표 변환 ==========
@@ -238,6 +388,11 @@ class HumeProsodyService:
         self._session_turn_indices: Dict[str, int] = {}
         self._session_turn_boundaries: Dict[str, List[int]] = {}  # 턴 시작 sample index
 
+        # 세션별 스트리밍 상태 + 열린 WebSocket LRU (session_id 순서)
+        self._streams: Dict[str, _ProsodyStream] = {}
+        self._open_sockets: "OrderedDict[str, None]" = OrderedDict()
+        self._on_sample: Optional[Callable[[str, ProsodyEmotionSample], Awaitable[None]]] = None
+
         if not self._is_available:
             print("⚠️ [HumeProsody] HUME_API_KEY 미설정 — 서비스 비활성화")
         else:
@@ -270,58 +425,54 @@ class HumeProsodyService:
         if not self._is_available:
             return None
 
-        token = await _get_prosody_access_token()
-        if not token:
-            # API Key 인증 폴백
-            headers = {
-                "X-Hume-Api-Key": self.api_key,
-            }
-        else:
-            headers = {
-                "Authorization": f"Bearer {token}",
-            }
+        # 짧은 WAV는 스트리밍 연결로 세그먼트 분석 (Batch Job 제출/폴링 생략)
+        if WEBSOCKETS_AVAILABLE and audio_data[:4] == b"RIFF":
+            samples = await self._analyze_wav_via_stream(audio_data, session_id)
+            if samples is not None:
+                return samples
+
+        headers = await self._auth_headers()
 
         try:
-            # Batch Job 제출
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                # 파일 업로드 + Prosody 모델 설정
-                files = {"file": ("audio.wav", audio_data, content_type)}
-                models_config = json.dumps({
-                    "models": {
-                        "prosody": {
-                            "granularity": "utterance",
-                            "identify_speakers": False,
-                        }
+            client = _get_http_client()
+            # 파일 업로드 + Prosody 모델 설정
+            files = {"file": ("audio.wav", audio_data, content_type)}
+            models_config = json.dumps({
+                "models": {
+                    "prosody": {
+                        "granularity": "utterance",
+                        "identify_speakers": False,
                     }
-                })
+                }
+            })
 
-                resp = await client.post(
-                    "https://api.hume.ai/v0/batch/jobs",
-                    headers=headers,
-                    files=files,
-                    data={"json": models_config},
-                )
+            resp = await client.post(
+                "/v0/batch/jobs",
+                headers=headers,
+                files=files,
+                data={"json": models_config},
+            )
 
-                if resp.status_code != 200:
-                    print(f"❌ [HumeProsody] Batch Job 제출 실패: {resp.status_code} {resp.text[:200]}")
-                    return None
+            if resp.status_code != 200:
+                print(f"❌ [HumeProsody] Batch Job 제출 실패: {resp.status_code} {resp.text[:200]}")
+                return None
 
-                job_data = resp.json()
-                job_id = job_data.get("job_id")
-                if not job_id:
-                    print(f"❌ [HumeProsody] Job ID 없음: {job_data}")
-                    return None
+            job_data = resp.json()
+            job_id = job_data.get("job_id")
+            if not job_id:
+                print(f"❌ [HumeProsody] Job ID 없음: {job_data}")
+                return None
 
-                print(f"🔄 [HumeProsody] Batch Job 제출: {job_id}")
+            print(f"🔄 [HumeProsody] Batch Job 제출: {job_id}")
 
-                # 폴링으로 완료 대기
-                predictions = await self._poll_batch_job(client, headers, job_id)
-                if predictions is None:
-                    return None
+            # 폴링으로 완료 대기
+            predictions = await self._poll_batch_job(client, headers, job_id)
+            if predictions is None:
+                return None
 
-                # 파싱
-                samples = self._parse_prosody_predictions(predictions, session_id)
-                return samples
+            # 파싱
+            samples = self._parse_prosody_predictions(predictions, session_id)
+            return samples
 
         except Exception as e:
             print(f"❌ [HumeProsody] Batch 분석 오류: {e}")
@@ -329,13 +480,13 @@ class HumeProsodyService:
 
     async def _poll_batch_job(
         self, client: httpx.AsyncClient, headers: dict, job_id: str,
-        max_wait: int = 120, interval: float = 2.0,
+        max_wait: int = 120, interval: float = 0.5, max_interval: float = 4.0,
     ) -> Optional[Dict]:
-        """Batch Job 완료 폴링"""
+        """Batch Job 완료 폴링 (짧은 간격에서 시작해 점점 늘림)"""
         elapsed = 0.0
         while elapsed < max_wait:
             resp = await client.get(
-                f"https://api.hume.ai/v0/batch/jobs/{job_id}",
+                f"/v0/batch/jobs/{job_id}",
                 headers=headers,
             )
             if resp.status_code == 200:
@@ -344,7 +495,7 @@ class HumeProsodyService:
                 if status == "COMPLETED":
                     # 예측 결과 가져오기
                     pred_resp = await client.get(
-                        f"https://api.hume.ai/v0/batch/jobs/{job_id}/predictions",
+                        f"/v0/batch/jobs/{job_id}/predictions",
                         headers=headers,
                     )
                     if pred_resp.status_code == 200:
@@ -357,13 +508,82 @@ class HumeProsodyService:
                 # IN_PROGRESS — 계속 대기
             await asyncio.sleep(interval)
             elapsed += interval
+            interval = min(interval * 2, max_interval)
 
         print(f"⚠️ [HumeProsody] Batch Job 타임아웃 ({max_wait}초)")
         return None
 
+    async def _analyze_wav_via_stream(
+        self, audio_data: bytes, session_id: str
+    ) -> Optional[List[ProsodyEmotionSample]]:
+        """WAV를 세그먼트 길이로 잘라 스트리밍 연결로 분석. 지원하지 않는 포맷이면 None."""
+        try:
+            with wave.open(io.BytesIO(audio_data), "rb") as wf:
+                if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+                    return None
+                rate = wf.getframerate()
+                pcm = wf.readframes(wf.getnframes())
+        except (wave.Error, EOFError):
+            return None
+
+        seg_bytes = int(PROSODY_SEGMENT_SEC * rate) * 2
+        stream = self._get_stream(session_id)
+        samples: List[ProsodyEmotionSample] = []
+        for i in range(0, len(pcm), seg_bytes):
+            segment = pcm[i:i + seg_bytes]
+            if len(segment) < int(PROSODY_MIN_SEGMENT_SEC * rate) * 2:
+                break
+            result = await self._send_segment(
+                stream, pcm16_to_wav(segment, rate), len(segment) / (rate * 2), ""
+            )
+            if result is None:
+                return None if not samples else samples
+            samples.extend(result)
+        return samples
+
     # ------------------------------------------------------------------ #
     #  Streaming API — 실시간 오디오 스트림 분석                                #
     # ------------------------------------------------------------------ #
+    def set_sample_callback(
+        self, callback: Optional[Callable[[str, ProsodyEmotionSample], Awaitable[None]]]
+    ):
+        """push_audio/flush_audio로 분석된 샘플을 받을 비동기 콜백 등록"""
+        self._on_sample = callback
+
+    def open_stream(self, session_id: str) -> None:
+        """세션 스트리밍 시작 (WebSocket은 첫 세그먼트 전송 시 연결)"""
+        self._get_stream(session_id)
+
+    def push_audio(self, session_id: str, pcm: bytes) -> None:
+        """
+        PCM16 mono 16kHz 오디오를 세션 링 버퍼에 추가합니다.
+        세그먼트 길이만큼 모이면 백그라운드에서 전송합니다.
+        """
+        stream = self._streams.get(session_id)
+        if stream is None or not self._is_available:
+            return
+        stream.ring.append(pcm)
+        if len(stream.ring) >= int(PROSODY_SEGMENT_SEC * PROSODY_SAMPLE_RATE) * 2:
+            self._ensure_pump(stream)
+
+    def flush_audio(self, session_id: str, transcript: str = "") -> None:
+        """발화 종료 시 호출 — 남은 오디오를 세그먼트 길이를 기다리지 않고 전송"""
+        stream = self._streams.get(session_id)
+        if stream is None or not self._is_available:
+            return
+        stream.flush_requested = True
+        stream.transcript = transcript
+        self._ensure_pump(stream)
+
+    async def close_stream(self, session_id: str) -> None:
+        """세션 스트리밍 종료 (대기 오디오 폐기 + 연결 닫기)"""
+        stream = self._streams.pop(session_id, None)
+        if stream is None:
+            return
+        if stream.pump and not stream.pump.done():
+            stream.pump.cancel()
+        await self._close_socket(stream)
+
     async def analyze_audio_stream(
         self,
         audio_chunk: bytes,
@@ -372,11 +592,11 @@ class HumeProsodyService:
         """
         오디오 청크를 Hume Streaming API (WebSocket)로 분석합니다.
 
-        현재는 REST 기반 간이 구현 — 프레임 누적 후 Batch 분석.
-        본격 WebSocket 스트리밍은 hume SDK 의 connect 를 활용합니다.
+        세션별 WebSocket 연결을 재사용하므로 청크마다 TLS 핸드셰이크가 발생하지 않습니다.
+        연속 오디오는 push_audio/flush_audio를 사용하면 세그먼트 길이로 묶어서 전송됩니다.
 
         Args:
-            audio_chunk: PCM16 오디오 청크
+            audio_chunk: PCM16 오디오 청크 (16kHz mono) 또는 WAV 바이트
             session_id: 세션 ID
 
         Returns:
@@ -385,67 +605,185 @@ class HumeProsodyService:
         if not self._is_available:
             return None
 
-        token = await _get_prosody_access_token()
-        if not token and not self.api_key:
-            return None
-
-        headers = {}
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
+        if audio_chunk[:4] == b"RIFF":
+            wav_bytes = audio_chunk
+            duration = 0.0
+            try:
+                with wave.open(io.BytesIO(audio_chunk), "rb") as wf:
+                    duration = wf.getnframes() / float(wf.getframerate())
+            except (wave.Error, EOFError):
+                pass
         else:
-            headers["X-Hume-Api-Key"] = self.api_key
+            wav_bytes = pcm16_to_wav(audio_chunk)
+            duration = len(audio_chunk) / PROSODY_BYTES_PER_SEC
 
-        try:
-            audio_b64 = base64.b64encode(audio_chunk).decode("utf-8")
-
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.post(
-                    "https://api.hume.ai/v0/stream/models",
-                    headers={**headers, "Content-Type": "application/json"},
-                    json={
-                        "data": audio_b64,
-                        "models": {"prosody": {}},
-                        "raw_text": False,
-                    },
-                )
+        samples = await self._send_segment(self._get_stream(session_id), wav_bytes, duration, "")
+        return samples[-1] if samples else None
 
-                if resp.status_code != 200:
-                    return None
+    def get_stream_stats(self) -> Dict:
+        """스트리밍 연결/버퍼 현황 (모니터링용)"""
+        sent = sum(s.segments_sent for s in self._streams.values())
+        latency = sum(s.latency_total for s in self._streams.values())
+        return {
+            "sessions": len(self._streams),
+            "open_sockets": len(self._open_sockets),
+            "max_sockets": PROSODY_MAX_STREAMS,
+            "buffered_sec": round(
+                sum(len(s.ring) for s in self._streams.values()) / PROSODY_BYTES_PER_SEC, 2
+            ),
+            "dropped_sec": round(
+                sum(s.ring.dropped_bytes for s in self._streams.values()) / PROSODY_BYTES_PER_SEC, 2
+            ),
+            "segments_sent": sent,
+            "avg_latency_ms": round(latency / sent * 1000, 1) if sent else 0.0,
+        }
 
-                result = resp.json()
-                prosody_preds = result.get("prosody", {}).get("predictions", [])
+    def _get_stream(self, session_id: str) -> _ProsodyStream:
+        stream = self._streams.get(session_id)
+        if stream is None:
+            stream = self._streams[session_id] = _ProsodyStream(session_id)
+        return stream
 
-                if not prosody_preds:
-                    return None
+    def _ensure_pump(self, stream: _ProsodyStream) -> None:
+        # 세션당 전송 작업은 하나만 (밀린 오디오는 링 버퍼에 남고 오래된 것부터 버려짐)
+        if stream.pump is None or stream.pump.done():
+            stream.pump = asyncio.create_task(self._pump(stream))
 
-                # 첫 번째 예측 사용
-                pred = prosody_preds[0]
-                raw_emotions = {
-                    e["name"]: e["score"]
-                    for e in pred.get("emotions", [])
-                }
-                indicators = extract_interview_indicators(raw_emotions)
-                dominant = max(raw_emotions, key=raw_emotions.get) if raw_emotions else "neutral"
-
-                sample = ProsodyEmotionSample(
-                    timestamp=time.time(),
-                    text=pred.get("text", ""),
-                    time_begin=pred.get("time", {}).get("begin", 0),
-                    time_end=pred.get("time", {}).get("end", 0),
-                    raw_emotions=raw_emotions,
-                    interview_indicators=indicators,
-                    dominant_emotion=dominant,
-                    dominant_indicator=get_dominant_indicator(indicators),
+    async def _pump(self, stream: _ProsodyStream) -> None:
+        seg_bytes = int(PROSODY_SEGMENT_SEC * PROSODY_SAMPLE_RATE) * 2
+        min_bytes = int(PROSODY_MIN_SEGMENT_SEC * PROSODY_SAMPLE_RATE) * 2
+        try:
+            while True:
+                text = ""
+                if len(stream.ring) >= seg_bytes:
+                    pcm = stream.ring.take(seg_bytes)
+                elif stream.flush_requested:
+                    stream.flush_requested = False
+                    text, stream.transcript = stream.transcript, ""
+                    pcm = stream.ring.take(len(stream.ring))
+                    if len(pcm) < min_bytes:
+                        stream.offset_sec += len(pcm) / PROSODY_BYTES_PER_SEC
+                        continue
+                else:
+                    break
+
+                samples = await self._send_segment(
+                    stream, pcm16_to_wav(pcm), len(pcm) / PROSODY_BYTES_PER_SEC, text
                 )
+                if samples and self._on_sample:
+                    try:
+                        await self._on_sample(stream.session_id, samples[-1])
+                    except Exception as e:
+                        print(f"⚠️ [HumeProsody] 결과 콜백 오류: {e}")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"⚠️ [HumeProsody] 스트리밍 전송 오류: {e}")
 
-                # 세션에 저장
-                self._session_samples.setdefault(session_id, []).append(sample)
-                return sample
+    async def _auth_headers(self) -> Dict[str, str]:
+        token = await _get_prosody_access_token()
+        if token:
+            return {"Authorization": f"Bearer {token}"}
+        # API Key 인증 폴백
+        return {"X-Hume-Api-Key": self.api_key}
 
-        except Exception as e:
-            print(f"⚠️ [HumeProsody] 스트리밍 분석 오류: {e}")
+    async def _connect_socket(self, stream: _ProsodyStream):
+        token = await _get_prosody_access_token()
+        query = {"access_token": token} if token else {"apikey": self.api_key}
+        url = f"{HUME_PROSODY_STREAM_URL}?{urlencode(query)}"
+        stream.ws = await websockets.connect(url, max_size=8 * 1024 * 1024, ping_interval=20)
+        return stream.ws
+
+    async def _trim_sockets(self) -> None:
+        """연결 수 상한: 가장 오래 안 쓴 (사용 중이 아닌) 연결부터 닫음"""
+        for sid in list(self._open_sockets):
+            if len(self._open_sockets) <= PROSODY_MAX_STREAMS:
+                break
+            other = self._streams.get(sid)
+            if other is None or other.ws is None:
+                self._open_sockets.pop(sid, None)
+            elif not other.lock.locked():
+                await self._close_socket(other)
+
+    async def _close_socket(self, stream: _ProsodyStream) -> None:
+        self._open_sockets.pop(stream.session_id, None)
+        ws, stream.ws = stream.ws, None
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+    async def _send_segment(
+        self, stream: _ProsodyStream, wav_bytes: bytes, duration_sec: float, text: str,
+    ) -> Optional[List[ProsodyEmotionSample]]:
+        """세그먼트 1개를 세션 WebSocket으로 전송하고 예측을 샘플로 변환"""
+        if not WEBSOCKETS_AVAILABLE:
+            print("⚠️ [HumeProsody] websockets 미설치 — 스트리밍 분석 불가")
             return None
 
+        payload = json.dumps({
+            "data": base64.b64encode(wav_bytes).decode("utf-8"),
+            "models": {"prosody": {}},
+            "raw_text": False,
+        })
+
+        async with stream.lock:
+            t0 = time.time()
+            result = None
+            for attempt in range(2):
+                try:
+                    ws = stream.ws or await self._connect_socket(stream)
+                    self._open_sockets[stream.session_id] = None
+                    self._open_sockets.move_to_end(stream.session_id)
+                    await ws.send(payload)
+                    result = json.loads(
+                        await asyncio.wait_for(ws.recv(), timeout=PROSODY_STREAM_TIMEOUT)
+                    )
+                    break
+                except Exception as e:
+                    # 서버가 유휴 연결을 닫은 경우 등 — 한 번 재연결
+                    await self._close_socket(stream)
+                    if attempt:
+                        print(f"⚠️ [HumeProsody] 스트리밍 분석 오류: {e}")
+                        return None
+
+            offset = stream.offset_sec
+            stream.offset_sec += duration_sec
+            stream.segments_sent += 1
+            stream.latency_total += time.time() - t0
+
+        if len(self._open_sockets) > PROSODY_MAX_STREAMS:
+            await self._trim_sockets()
+
+        if result.get("error"):
+            print(f"⚠️ [HumeProsody] 스트리밍 응답 오류: {result.get('error')}")
+            return None
+
+        samples: List[ProsodyEmotionSample] = []
+        for pred in result.get("prosody", {}).get("predictions", []):
+            raw_emotions = {
+                e["name"]: e["score"]
+                for e in pred.get("emotions", [])
+            }
+            indicators = extract_interview_indicators(raw_emotions)
+            dominant = max(raw_emotions, key=raw_emotions.get) if raw_emotions else "neutral"
+
+            samples.append(ProsodyEmotionSample(
+                timestamp=time.time(),
+                text=pred.get("text") or text,
+                time_begin=offset + pred.get("time", {}).get("begin", 0),
+                time_end=offset + pred.get("time", {}).get("end", 0),
+                raw_emotions=raw_emotions,
+                interview_indicators=indicators,
+                dominant_emotion=dominant,
+                dominant_indicator=get_dominant_indicator(indicators),
+            ))
+
+        # 세션에 저장
+        self._session_samples.setdefault(stream.session_id, []).extend(samples)
+        return samples
+
     # ------------------------------------------------------------------ #
     #  예측 결과 파싱                                                        #
     # ------------------------------------------------------------------ #
@@ -711,6 +1049,16 @@ class HumeProsodyService:
     # ------------------------------------------------------------------ #
     def cleanup_session(self, session_id: str):
         """세션 데이터 정리"""
+        stream = self._streams.pop(session_id, None)
+        if stream is not None:
+            if stream.pump and not stream.pump.done():
+                stream.pump.cancel()
+            self._open_sockets.pop(session_id, None)
+            if stream.ws is not None:
+                try:
+                    asyncio.get_running_loop().create_task(stream.ws.close())
+                except RuntimeError:
+                    pass
         self._session_samples.pop(session_id, None)
         self._session_turn_indices.pop(session_id, None)
         self._session_turn_boundaries.pop(session_id, None)
@@ -82,8 +82,8 @@ sys.path.append(current_dir)
 
 load_dotenv()
 
-# JSON Resilience 유틸리티
-from json_utils import parse_evaluation_json
+# JSON Resilience 유틸리티 + 스키마 제약 JSON 생성
+from json_utils import EVALUATION_SCHEMA, parse_evaluation_json, parse_stats
 
 # 지연 시간 측정 및 SLA 모니터링 (REQ-N-001: 초저지연 1.5초 이내)
 from latency_monitor import latency_monitor
@@ -97,7 +97,38 @@ from prompt_templates import (
     MAX_QUESTIONS as SHARED_MAX_QUESTIONS,
 )
 from prompt_templates import (
+    CONVERSATION_SUMMARY_PROMPT,
     build_question_prompt,
+    build_summary_prompt,
+)
+
+# 토큰 예산 기반 프롬프트 조립 (섹션별 예산 + prefill 메트릭)
+from prompt_assembler import AssembledPrompt, PromptAssembler
+
+# 단일 스캔 답변 분석 (STAR/기술 키워드/주제/필러, 답변 해시 캐시)
+from answer_analytics import STAR_KEYWORDS as ANALYTICS_STAR_KEYWORDS
+from answer_analytics import TECH_KEYWORDS as ANALYTICS_TECH_KEYWORDS
+from answer_analytics import (
+    analyze_star_structure,
+    answer_analyzer,
+    detect_topic,
+    extract_tech_keywords,
+)
+
+# 투기적 다음 질문 사전 생성 (침묵 감지 시 안정 STT 접두사로 초안 생성)
+from speculative_question import SpeculativeQuestionEngine
+from structured_output import invoke_structured_json
+
+# 임베딩 기반 주제 이탈 감지 (질문 벡터 캐시 + 세션 간 배치 임베딩)
+from topic_relevance import TOPIC_SIMILARITY_THRESHOLD, topic_relevance_scorer
+
+# 실시간 개입 VAD 바이너리 채널 (WebSocket 프레임 + 고정 크기 링 버퍼)
+from vad_channel import (
+    VadRingBuffer,
+    decode_vad_frame,
+    encode_intervention,
+    encode_turn_signal,
+    is_vad_frame,
 )
 
 # 보안 유틸리티 (bcrypt 비밀번호 해싱, JWT 토큰 인증, TLS, AES-256 파일 암호화)
@@ -132,6 +163,31 @@ STT_QUALITY_LOG_ENABLED = os.getenv("STT_QUALITY_LOG_ENABLED", "1") == "1"
 STT_QUALITY_LOG_EVERY_FINAL = int(os.getenv("STT_QUALITY_LOG_EVERY_FINAL", "5"))
 STT_QUALITY_LOG_EVERY_UTTERANCE = int(os.getenv("STT_QUALITY_LOG_EVERY_UTTERANCE", "3"))
 
+# 투기적(Speculative) 질문 사전 생성
+# - 답변 말미 침묵(UtteranceEnd / VAD)이 감지되면 안정된 interim 접두사로
+#   RAG + 질문 초안을 미리 생성하고, 최종 답변과 유사도가 임계값 이상이면 즉시 사용
+# - GTX 1660 환경에서는 미스 시 GPU 시간을 낭비하므로 기본 비활성화
+SPECULATIVE_QUESTION_ENABLED = os.getenv("SPECULATIVE_QUESTION_ENABLED", "0") == "1"
+SPECULATIVE_SIMILARITY_THRESHOLD = float(
+    os.getenv("SPECULATIVE_SIMILARITY_THRESHOLD", "0.85")
+)
+SPECULATIVE_SILENCE_MS = int(os.getenv("SPECULATIVE_SILENCE_MS", "800"))
+# 초안이 아직 생성 중일 때 본 경로가 기다릴 최대 시간 (새로 생성하는 것보다 빠름)
+SPECULATIVE_WAIT_SEC = float(os.getenv("SPECULATIVE_WAIT_SEC", "30"))
+
+# 질문 생성 프롬프트 토큰 예산 (num_ctx 안에서 섹션별 상한)
+# - 출력용 예약분을 제외한 나머지를 시스템 프롬프트/공고/요약/RAG/대화 기록에 배분
+# - 예산 초과 텍스트는 줄/문장 경계에서 잘라 "(이하 생략)" 표시
+PROMPT_OUTPUT_RESERVE = int(os.getenv("PROMPT_OUTPUT_RESERVE", "1024"))
+PROMPT_BUDGET_JOB_POSTING = int(os.getenv("PROMPT_BUDGET_JOB_POSTING", "700"))
+PROMPT_BUDGET_SUMMARY = int(os.getenv("PROMPT_BUDGET_SUMMARY", "400"))
+PROMPT_BUDGET_RESUME_RAG = int(os.getenv("PROMPT_BUDGET_RESUME_RAG", "600"))
+PROMPT_BUDGET_QA_RAG = int(os.getenv("PROMPT_BUDGET_QA_RAG", "500"))
+PROMPT_HISTORY_MAX_MESSAGES = 10  # 5턴 = assistant 5 + user 5
+# 롤링 요약: 대화 창 밖으로 밀려난 메시지가 N개 이상 쌓이면 백그라운드에서 요약 갱신
+PROMPT_SUMMARY_MIN_NEW_MESSAGES = int(os.getenv("PROMPT_SUMMARY_MIN_NEW_MESSAGES", "2"))
+PROMPT_SUMMARY_INPUT_TOKENS = int(os.getenv("PROMPT_SUMMARY_INPUT_TOKENS", "2048"))
+
 # LLM 한국어 출력 강제 정책 (운영 가드)
 LLM_KOREAN_GUARD_ENABLED = os.getenv("LLM_KOREAN_GUARD_ENABLED", "1") == "1"
 LLM_KOREAN_MIN_RATIO = float(os.getenv("LLM_KOREAN_MIN_RATIO", "0.6"))
@@ -1079,6 +1135,41 @@ async def reset_latency_stats():
     return {"message": "지연 시간 통계가 초기화되었습니다."}
 
 
+@app.get("/api/monitoring/speculative")
+async def get_speculative_stats():
+    """투기적 질문 사전 생성 통계 (적중률, 미스로 낭비된 GPU 시간)"""
+    return speculative_engine.get_stats()
+
+
+@app.get("/api/monitoring/answer-analytics")
+async def get_answer_analytics_stats():
+    """답변 분석 엔진 캐시 통계 (로컬 LRU / Redis 적중률, 평균 스캔 시간)"""
+    return answer_analyzer.get_stats()
+
+
+@app.get("/api/monitoring/json-parse")
+async def get_json_parse_stats():
+    """JSON 응답 파싱 실패율 (free_text: 기존 자유 텍스트 / schema: 스키마 제약 생성)
+
+    Celery 워커의 평가 통계는 워커 프로세스에서 별도로 집계됩니다.
+    """
+    return parse_stats.get_stats()
+
+
+@app.get("/api/monitoring/prompt")
+async def get_prompt_metrics():
+    """질문 생성 프롬프트 토큰 예산 메트릭 (섹션별 추정 토큰, prefill 시간, prefix cache 적중)"""
+    return prompt_assembler.get_metrics()
+
+
+@app.get("/api/monitoring/prosody")
+async def get_prosody_stream_stats():
+    """Hume Prosody 스트리밍 현황 (열린 연결 수, 대기/버려진 오디오 초, 세그먼트 평균 지연)"""
+    if not (PROSODY_AVAILABLE and prosody_service):
+        return {"available": False}
+    return {"available": True, **prosody_service.get_stream_stats()}
+
+
 # 정적 파일 마운트
 static_dir = os.path.join(current_dir, "static")
 if os.path.exists(static_dir):
@@ -1650,6 +1741,8 @@ class InterviewInterventionManager:
     - VAD(Voice Activity Detection) 기반 발화 감지
     - Turn-taking 알고리즘으로 적절한 개입 타이밍 결정
     - 답변 길이/시간 초과, 주제 이탈 감지
+
+    경과 시간은 모두 time.monotonic() 기준입니다 (시스템 시각 변경에 영향 없음).
     """
 
     # 개입 임계값 설정
@@ -1658,9 +1751,11 @@ class InterviewInterventionManager:
     SOFT_WARNING_TIME = 90  # 부드러운 경고 시간 (1분 30초)
     SOFT_WARNING_LENGTH = 600  # 부드러운 경고 길이
     SILENCE_THRESHOLD_MS = 5000  # 침묵 감지 임계값 (5초)
-    TOPIC_RELEVANCE_THRESHOLD = 0.3  # 주제 관련성 임계값
+    TOPIC_RELEVANCE_THRESHOLD = 0.3  # 주제 관련성 임계값 (키워드 매칭)
+    EMBEDDING_RELEVANCE_THRESHOLD = TOPIC_SIMILARITY_THRESHOLD  # 임베딩 코사인 유사도 임계값
     INTERVENTION_COOLDOWN_SECONDS = 15  # 개입 간 최소 쿨다운 (15초)
     MAX_INTERVENTIONS_PER_TURN = 3  # 턴당 최대 개입 횟수
+    VAD_BUFFER_SIZE = 128  # VAD 링 버퍼 크기 (500ms 간격 기준 약 1분)
 
     # 개입 메시지 템플릿
     INTERVENTION_MESSAGES = {
@@ -1710,22 +1805,28 @@ class InterviewInterventionManager:
             "hard_limit_intervention_given": False,  # 강제 제한 개입 중복 방지 플래그
             "last_intervention_time": None,  # 마지막 개입 시각 (쿨다운 계산용)
             "current_question_keywords": [],
-            "vad_buffer": [],  # VAD 신호 버퍼
+            "vad_buffer": VadRingBuffer(self.VAD_BUFFER_SIZE),  # VAD 신호 링 버퍼
             "turn_state": "ai_speaking",  # ai_speaking, user_speaking, silence
         }
         self.intervention_history[session_id] = []
         print(f"🎙️ [Intervention] 세션 {session_id[:8]}... 개입 시스템 초기화")
 
-    def start_user_turn(self, session_id: str, question_keywords: List[str] = None):
+    def start_user_turn(
+        self,
+        session_id: str,
+        question_keywords: List[str] = None,
+        question: Optional[str] = None,
+    ):
         """사용자 발화 시작 (질문 후)"""
         if session_id not in self.session_states:
             self.init_session(session_id)
 
         state = self.session_states[session_id]
-        state["answer_start_time"] = datetime.now()
+        now = time.monotonic()
+        state["answer_start_time"] = now
         state["current_answer_text"] = ""
         state["is_speaking"] = True
-        state["last_speech_time"] = datetime.now()
+        state["last_speech_time"] = now
         state["silence_duration_ms"] = 0
         state["soft_warning_given"] = False
         state["silence_intervention_given"] = (
@@ -1739,11 +1840,16 @@ class InterviewInterventionManager:
         )
         state["last_intervention_time"] = None  # 쿨다운 타이머 리셋
         state["intervention_count"] = 0  # 턴 시작 시 개입 카운트 리셋
+        state["vad_buffer"].clear()  # 이전 턴(AI 발화 구간)의 VAD 신호가 발화 비율에 섞이지 않도록
         state["turn_state"] = "user_speaking"
 
         if question_keywords:
             state["current_question_keywords"] = question_keywords
 
+        # 질문 임베딩은 백그라운드 배치 워커에 맡기고 즉시 반환 (캐시 적중 시 재임베딩 없음)
+        if question:
+            topic_relevance_scorer.set_question(session_id, question)
+
         print(f"🎤 [VAD] 세션 {session_id[:8]}... 사용자 발화 시작")
 
     def update_vad_signal(
@@ -1754,20 +1860,10 @@ class InterviewInterventionManager:
             return None
 
         state = self.session_states[session_id]
-        current_time = datetime.now()
-
-        # VAD 버퍼에 신호 추가
-        state["vad_buffer"].append(
-            {
-                "timestamp": current_time,
-                "is_speech": is_speech,
-                "audio_level": audio_level,
-            }
-        )
+        current_time = time.monotonic()
 
-        # 버퍼 크기 제한 (최근 100개)
-        if len(state["vad_buffer"]) > 100:
-            state["vad_buffer"] = state["vad_buffer"][-100:]
+        # VAD 링 버퍼에 신호 추가 (고정 크기 — 오래된 신호는 덮어씀)
+        state["vad_buffer"].append(is_speech, audio_level)
 
         if is_speech:
             state["is_speaking"] = True
@@ -1780,9 +1876,7 @@ class InterviewInterventionManager:
         else:
             # 침묵 시간 계산
             if state["last_speech_time"]:
-                silence_ms = (
-                    current_time - state["last_speech_time"]
-                ).total_seconds() * 1000
+                silence_ms = (current_time - state["last_speech_time"]) * 1000
                 state["silence_duration_ms"] = silence_ms
 
                 if silence_ms > self.SILENCE_THRESHOLD_MS:
@@ -1797,6 +1891,7 @@ class InterviewInterventionManager:
             return
 
         self.session_states[session_id]["current_answer_text"] = text
+        topic_relevance_scorer.update_answer(session_id, text)
 
     def check_intervention_needed(
         self, session_id: str, answer_text: str = None
@@ -1814,14 +1909,13 @@ class InterviewInterventionManager:
 
         if answer_text:
             state["current_answer_text"] = answer_text
+            topic_relevance_scorer.update_answer(session_id, answer_text)
 
         answer_length = len(state["current_answer_text"])
         elapsed_seconds = 0
 
         if state["answer_start_time"]:
-            elapsed_seconds = (
-                datetime.now() - state["answer_start_time"]
-            ).total_seconds()
+            elapsed_seconds = time.monotonic() - state["answer_start_time"]
 
         # ──────────────────────────────────────────────
         # 글로벌 가드: 쿨다운 + 최대 횟수 제한
@@ -1834,7 +1928,7 @@ class InterviewInterventionManager:
         # 마지막 개입 후 쿨다운(INTERVENTION_COOLDOWN_SECONDS) 시간 내이면 개입 스킵
         last_time = state.get("last_intervention_time")
         if last_time:
-            since_last = (datetime.now() - last_time).total_seconds()
+            since_last = time.monotonic() - last_time
             if since_last < self.INTERVENTION_COOLDOWN_SECONDS:
                 return None
 
@@ -1900,13 +1994,22 @@ class InterviewInterventionManager:
             and answer_length > 100
             and not state.get("off_topic_intervention_given", False)
         ):
-            relevance = self._check_topic_relevance(
-                state["current_answer_text"], state["current_question_keywords"]
+            # 임베딩 유사도가 계산돼 있으면 사용 (미리 계산된 값 조회만 — 임베딩 호출 없음),
+            # 아직 없거나 임베딩 모델이 없으면 키워드 매칭으로 대체
+            off_topic = topic_relevance_scorer.is_off_topic(
+                session_id, self.EMBEDDING_RELEVANCE_THRESHOLD
             )
-            if relevance < self.TOPIC_RELEVANCE_THRESHOLD:
+            if off_topic is not None:
+                relevance, method = topic_relevance_scorer.similarity(session_id), "임베딩"
+            else:
+                relevance = self._check_topic_relevance(
+                    state["current_answer_text"], state["current_question_keywords"]
+                )
+                off_topic, method = relevance < self.TOPIC_RELEVANCE_THRESHOLD, "키워드"
+            if off_topic:
                 intervention = {
                     "type": "off_topic",
-                    "reason": f"주제 관련성 낮음 ({relevance:.2f})",
+                    "reason": f"주제 관련성 낮음 ({method} {relevance:.2f})",
                     "message": self._get_random_message("off_topic"),
                     "action": "redirect",
                     "priority": "medium",
@@ -1939,7 +2042,7 @@ class InterviewInterventionManager:
         # ──────────────────────────────────────────────
         if intervention:
             state["intervention_count"] += 1
-            state["last_intervention_time"] = datetime.now()
+            state["last_intervention_time"] = time.monotonic()
             self.intervention_history[session_id].append(
                 {
                     **intervention,
@@ -2074,18 +2177,15 @@ class InterviewInterventionManager:
 
         # 2. 시간/길이 초과 시 개입 가능
         if state["answer_start_time"]:
-            elapsed = (datetime.now() - state["answer_start_time"]).total_seconds()
+            elapsed = time.monotonic() - state["answer_start_time"]
             if elapsed > self.SOFT_WARNING_TIME:
                 can_interrupt = True
                 interrupt_reason = "time_exceeded"
 
         # 3. VAD 버퍼 분석 - 발화 패턴 감지
-        recent_vad = state["vad_buffer"][-20:] if state["vad_buffer"] else []
-        if len(recent_vad) >= 10:
-            # 최근 발화 비율 계산
-            speech_ratio = sum(1 for v in recent_vad if v["is_speech"]) / len(
-                recent_vad
-            )
+        if len(state["vad_buffer"]) >= 10:
+            # 최근 20개 신호의 발화 비율
+            speech_ratio = state["vad_buffer"].speech_ratio(20)
             # 발화가 줄어들고 있으면 (문장 끝) 개입 가능
             if speech_ratio < 0.3 and state["silence_duration_ms"] > 1000:
                 can_interrupt = True
@@ -2109,9 +2209,7 @@ class InterviewInterventionManager:
         # 발화 통계 계산
         elapsed_seconds = 0
         if state["answer_start_time"]:
-            elapsed_seconds = (
-                datetime.now() - state["answer_start_time"]
-            ).total_seconds()
+            elapsed_seconds = time.monotonic() - state["answer_start_time"]
 
         stats = {
             "total_time_seconds": elapsed_seconds,
@@ -2120,9 +2218,10 @@ class InterviewInterventionManager:
             "soft_warning_given": state["soft_warning_given"],
         }
 
-        # 상태 리셋
+        # 상태 리셋 (answer_start_time=None → 다음 턴 시작 전까지 푸시 개입 중단)
         state["turn_state"] = "ai_speaking"
         state["is_speaking"] = False
+        state["answer_start_time"] = None
 
         print(
             f"🎙️ [VAD] 세션 {session_id[:8]}... 사용자 발화 종료 ({elapsed_seconds:.1f}초, {stats['answer_length']}자)"
@@ -2130,6 +2229,16 @@ class InterviewInterventionManager:
 
         return stats
 
+    def poll_intervention(self, session_id: str) -> Optional[Dict]:
+        """
+        WebSocket VAD 프레임마다 호출 — 사용자 답변 턴 중일 때만 개입 여부를 확인합니다.
+        (AI 발화/처리 중 침묵을 개입 대상으로 오인하지 않도록)
+        """
+        state = self.session_states.get(session_id)
+        if not state or state["answer_start_time"] is None:
+            return None
+        return self.check_intervention_needed(session_id)
+
     def get_session_stats(self, session_id: str) -> Dict:
         """세션 개입 통계 반환"""
         return {
@@ -2158,6 +2267,7 @@ class AIInterviewer:
         self.rag = None
         self.retriever = None
         self.tts_service = None
+        self._summary_inflight: set = set()  # 롤링 요약 갱신 중인 세션
 
         self._init_services()
 
@@ -2250,7 +2360,9 @@ class AIInterviewer:
                 messages.append(HumanMessage(content=content))
         return messages
 
-    async def fetch_rag_contexts(self, session_id: str, user_answer: str) -> tuple:
+    async def fetch_rag_contexts(
+        self, session_id: str, user_answer: str, *, reuse_speculative: bool = True
+    ) -> tuple:
         """RAG 컨텍스트 병렬 조회 (이력서 + Q&A) — 워크플로우 노드에서 사전 호출용
 
         evaluate 노드에서 평가/감정 분석과 동시에 asyncio.gather로 병렬 실행됩니다.
@@ -2258,6 +2370,8 @@ class AIInterviewer:
         LLM 프롬프트 조립 시 바로 사용됩니다.
         이를 통해 RAG 검색 시간(~2초)이 평가 시간과 겹쳐 전체 응답 시간이 단축됩니다.
 
+        투기적 초안 생성 중 같은 답변 접두사로 이미 조회한 결과가 있으면 재사용합니다.
+
         Returns:
             tuple: (resume_context: str, qa_reference_context: str)
         """
@@ -2265,6 +2379,12 @@ class AIInterviewer:
         if not session:
             return "", ""
 
+        if reuse_speculative:
+            speculative_rag = speculative_engine.peek_rag(session_id, user_answer)
+            if speculative_rag is not None:
+                print("🔮 [RAG] 투기적 초안의 RAG 컨텍스트 재사용")
+                return speculative_rag
+
         session_retriever = session.get("retriever") or self.retriever
 
         async def _fetch_resume_rag():
@@ -2311,6 +2431,218 @@ class AIInterviewer:
         )
         return resume_context, qa_reference_context
 
+    # 감정 적응 프롬프트 (evaluate 노드에서 결정된 모드별)
+    EMOTION_PROMPTS = {
+        "encouraging": (
+            "⚠️ [감정 적응 시스템] 지원자가 불안하거나 긴장한 상태입니다.\n"
+            "부드럽고 격려하는 톤으로 질문하세요. 압박 질문은 자제하고,\n"
+            "지원자가 편안하게 답변할 수 있도록 도와주세요."
+        ),
+        "challenging": (
+            "💪 [감정 적응 시스템] 지원자가 자신감 있고 활발한 상태입니다.\n"
+            "조금 더 도전적이고 심층적인 질문을 해보세요.\n"
+            "구체적인 기술적 디테일이나 난이도 높은 시나리오를 제시해도 좋습니다."
+        ),
+    }
+
+    def assemble_question_prompt(
+        self,
+        session: Dict,
+        user_answer: str,
+        *,
+        question_count: int,
+        resume_context: str = "",
+        qa_context: str = "",
+        needs_follow_up: bool = False,
+        follow_up_reason: str = "",
+        current_topic: str = "general",
+        topic_count: int = 0,
+        emotion_mode: str = "normal",
+    ) -> AssembledPrompt:
+        """질문 생성 프롬프트를 토큰 예산 안에서 조립합니다.
+
+        build_and_call_llm / generate_llm_question / chat_stream이 공유하는 단일 경로입니다.
+        섹션 순서는 세션 내내 고정(시스템 → 공고 → 요약 → 감정 → RAG → 대화 → 지시)되어
+        앞부분이 턴 사이에 바뀌지 않으므로 Ollama prefix cache가 재사용됩니다.
+        """
+        sections: Dict[str, Any] = {"system": self.INTERVIEWER_PROMPT}
+
+        # 채용 공고 — 상세 내용만 예산으로 자르고 머리말/활용 지시는 유지
+        job_posting = session.get("job_posting")
+        if job_posting:
+            jp_wrapper = (
+                f"\n--- [채용 공고 정보] 이 면접의 대상 공고 ---\n"
+                f"회사명: {job_posting.get('company', 'N/A')}\n"
+                f"공고 제목: {job_posting.get('title', 'N/A')}\n"
+                f"근무지: {job_posting.get('location', 'N/A')}\n"
+                f"직무 분야: {job_posting.get('job_category', 'N/A')}\n"
+                f"경력 수준: {job_posting.get('experience_level', 'N/A')}\n"
+                f"급여: {job_posting.get('salary_info', 'N/A')}\n"
+                "\n[공고 상세 내용]\n{body}\n"
+                "------------------------------------------\n"
+                "☝️ 위 채용 공고의 요구사항, 자격요건, 우대사항, 직무 설명을 활용하여 "
+                "맞춤형 면접 질문을 생성하세요.\n"
+                "예시: 공고에서 요구하는 기술 스택 경험, 해당 직무의 실무 시나리오, "
+                "자격 요건 충족 여부 등을 질문하세요."
+            )
+            description = job_posting.get("description") or ""
+            sections["job_posting"] = (
+                (jp_wrapper, description)
+                if description
+                else jp_wrapper.replace("{body}", "")
+            )
+
+        # 롤링 대화 요약 — 대화 창(최근 5턴) 밖으로 밀려난 초반 맥락
+        summary_text = (session.get("conversation_summary") or {}).get("text", "")
+        if summary_text:
+            sections["conversation_summary"] = (
+                "\n--- [이전 대화 요약] 최근 대화 이전에 다룬 내용 ---\n"
+                "{body}\n"
+                "------------------------------------------",
+                summary_text,
+            )
+
+        sections["emotion"] = self.EMOTION_PROMPTS.get(emotion_mode, "")
+
+        # RAG 컨텍스트 (배경 지식으로 대화 전에 배치)
+        # ★ 핵심: RAG를 대화 기록 앞에 배치하여 자연스러운 대화 흐름을 유지
+        # RAG가 대화 뒤에 끼어들면 LLM이 사용자 답변보다 RAG 내용에 집중하여
+        # 맥락 없는 질문을 생성하는 문제 발생
+        sections["resume_rag"] = (
+            "\n--- [RAG System] 참고용 이력서 관련 내용 ---\n"
+            "{body}\n"
+            "------------------------------------------",
+            resume_context,
+        )
+        sections["qa_rag"] = (
+            "\n--- [RAG System] 면접 참고 자료 (모범 답변 DB) ---\n"
+            "{body}\n"
+            "이 참고 자료를 바탕으로 지원자의 답변 수준을 판단하고, "
+            "더 깊은 꼬리질문을 만들어주세요.\n"
+            "------------------------------------------",
+            qa_context,
+        )
+
+        # 질문 생성 프롬프트 (꼬리질문 정보 + 사용자 답변 포함)
+        follow_up_instruction = ""
+        if needs_follow_up and topic_count < 2:
+            follow_up_instruction = (
+                f"\n⚠️ 지원자의 답변이 부실합니다. ({follow_up_reason})\n"
+                f"꼬리질문을 해주세요. 현재 주제({current_topic})에서 "
+                f"{topic_count}번째 질문입니다.\n"
+                f"더 구체적인 예시, 수치, 결과를 요청하세요."
+            )
+        elif topic_count >= 2:
+            follow_up_instruction = (
+                "\n✅ 이 주제에서 충분히 질문했습니다.\n"
+                '"알겠습니다. 다음은..." 이라며 새로운 주제로 전환하세요.'
+            )
+
+        question_prompt = build_question_prompt(
+            question_count=question_count,
+            max_questions=self.MAX_QUESTIONS,
+            current_topic=current_topic,
+            topic_count=topic_count,
+            follow_up_instruction=follow_up_instruction,
+            user_answer=user_answer,  # ★ 사용자 답변을 프롬프트에 명시적으로 포함
+        )
+
+        # ★ 대화 기록은 RAG 뒤, 지시 프롬프트 앞에 위치하여
+        # LLM이 직전 대화 맥락을 가장 강하게 인식 (남은 예산 안에서 최신 턴 우선)
+        assembled = prompt_assembler.assemble(
+            sections, session.get("chat_history", []), question_prompt
+        )
+        if assembled.trimmed_sections:
+            print(
+                f"✂️ [Prompt] 예산 초과 섹션 축약: {', '.join(assembled.trimmed_sections)} "
+                f"(추정 {assembled.total_tokens}토큰)"
+            )
+        return assembled
+
+    def to_langchain_messages(self, assembled: AssembledPrompt) -> list:
+        """조립된 프롬프트를 LangChain Message 리스트로 변환합니다."""
+        return assembled.to_messages(SystemMessage, HumanMessage, AIMessage)
+
+    def record_prompt_call(
+        self,
+        session_id: str,
+        assembled: AssembledPrompt,
+        response_metadata: Optional[Dict] = None,
+        elapsed_ms: float = 0.0,
+    ) -> None:
+        """질문 생성 1회의 토큰/prefill 메트릭을 기록하고 롤링 요약 갱신을 예약합니다."""
+        prompt_assembler.record_call(
+            assembled,
+            response_metadata,
+            session_id=session_id,
+            elapsed_ms=elapsed_ms,
+        )
+        self.schedule_summary_refresh(session_id)
+
+    def schedule_summary_refresh(self, session_id: str) -> None:
+        """대화 창 밖으로 밀려난 메시지가 쌓였으면 백그라운드 요약 갱신을 시작합니다.
+
+        질문 생성이 끝난 뒤에 실행되므로 사용자 대기 시간에는 포함되지 않고,
+        다음 턴 프롬프트의 [이전 대화 요약] 섹션에 반영됩니다.
+        """
+        if not self.llm or session_id in self._summary_inflight:
+            return
+        session = state.get_session(session_id)
+        if not session:
+            return
+        summarized_upto = (session.get("conversation_summary") or {}).get("upto", 0)
+        boundary = len(session.get("chat_history", [])) - PROMPT_HISTORY_MAX_MESSAGES
+        if boundary - summarized_upto < PROMPT_SUMMARY_MIN_NEW_MESSAGES:
+            return
+        self._summary_inflight.add(session_id)
+        asyncio.ensure_future(self.refresh_conversation_summary(session_id, boundary))
+
+    async def refresh_conversation_summary(self, session_id: str, boundary: int) -> None:
+        """chat_history[upto:boundary] 구간을 기존 요약에 합쳐 롤링 요약을 갱신합니다."""
+        try:
+            session = state.get_session(session_id)
+            if not session:
+                return
+            previous = session.get("conversation_summary") or {}
+            chat_history = session.get("chat_history", [])
+            dialogue = "\n".join(
+                f"{'면접관' if m.get('role') == 'assistant' else '지원자'}: {m.get('content', '')}"
+                for m in chat_history[previous.get("upto", 0) : boundary]
+                if m.get("role") in ("assistant", "user")
+            )
+            if not dialogue:
+                return
+
+            t0 = time.perf_counter()
+            response = await run_llm_async(
+                self.llm,
+                [
+                    SystemMessage(content=CONVERSATION_SUMMARY_PROMPT),
+                    HumanMessage(
+                        content=build_summary_prompt(
+                            previous.get("text", ""),
+                            prompt_assembler.trim(dialogue, PROMPT_SUMMARY_INPUT_TOKENS),
+                        )
+                    ),
+                ],
+            )
+            summary_text = strip_think_tokens(response.content).strip()
+            if not summary_text:
+                return
+            state.update_session(
+                session_id,
+                {"conversation_summary": {"text": summary_text, "upto": boundary}},
+            )
+            print(
+                f"📝 [Summary] 세션 {session_id[:8]}... 대화 요약 갱신 "
+                f"(~{boundary}번째 메시지까지, {(time.perf_counter() - t0) * 1000:.0f}ms)"
+            )
+        except Exception as e:
+            # 요약 실패는 면접 진행에 영향 없음 — 다음 턴에 다시 시도
+            print(f"⚠️ [Summary] 대화 요약 갱신 실패 (무시): {e}")
+        finally:
+            self._summary_inflight.discard(session_id)
+
     async def build_and_call_llm(
         self,
         session_id: str,
@@ -2323,6 +2655,7 @@ class AIInterviewer:
         current_topic: str = "general",
         topic_count: int = 0,
         emotion_mode: str = "normal",
+        allow_speculative: bool = True,
     ) -> str:
         """순수 프롬프트 조립 + LLM 호출만 수행 (워크플로우 노드용)
 
@@ -2345,6 +2678,7 @@ class AIInterviewer:
             current_topic: 현재 질문 주제
             topic_count: 해당 주제 내 질문 수
             emotion_mode: 감정 적응 모드 (normal / encouraging / challenging)
+            allow_speculative: 검증된 투기적 초안이 있으면 LLM 호출 없이 사용
 
         Returns:
             str: 생성된 면접 질문 텍스트
@@ -2355,118 +2689,48 @@ class AIInterviewer:
 
         question_count = session.get("question_count", 1)
 
+        # ========== 0. 투기적 초안 검증 (적중 시 LLM 호출 생략) ==========
+        if allow_speculative and user_answer:
+            speculative_question = await speculative_engine.take_draft(
+                session_id,
+                user_answer,
+                needs_follow_up=needs_follow_up,
+                question_count=question_count,
+                wait_timeout=SPECULATIVE_WAIT_SEC,
+            )
+            if speculative_question:
+                return speculative_question
+
         if not self.question_llm:
             raise RuntimeError(
                 "LLM 서비스가 초기화되지 않았습니다. Ollama 실행 상태를 확인하세요."
             )
 
-        # ========== 1. 시스템 프롬프트 ==========
-        chat_history = session.get("chat_history", [])
-        messages = [SystemMessage(content=self.INTERVIEWER_PROMPT)]
-
-        # ========== 2. 채용 공고 컨텍스트 (있을 때만) ==========
-        job_posting = session.get("job_posting")
-        if job_posting:
-            jp_context = (
-                f"\n--- [채용 공고 정보] 이 면접의 대상 공고 ---\n"
-                f"회사명: {job_posting.get('company', 'N/A')}\n"
-                f"공고 제목: {job_posting.get('title', 'N/A')}\n"
-                f"근무지: {job_posting.get('location', 'N/A')}\n"
-                f"직무 분야: {job_posting.get('job_category', 'N/A')}\n"
-                f"경력 수준: {job_posting.get('experience_level', 'N/A')}\n"
-                f"급여: {job_posting.get('salary_info', 'N/A')}\n"
-                f"\n[공고 상세 내용]\n{job_posting.get('description', '')}\n"
-                f"------------------------------------------\n"
-                f"☝️ 위 채용 공고의 요구사항, 자격요건, 우대사항, 직무 설명을 활용하여 "
-                f"맞춤형 면접 질문을 생성하세요.\n"
-                f"예시: 공고에서 요구하는 기술 스택 경험, 해당 직무의 실무 시나리오, "
-                f"자격 요건 충족 여부 등을 질문하세요."
-            )
-            messages.append(SystemMessage(content=jp_context))
-
-        # ========== 3. 감정 적응 프롬프트 (evaluate 노드에서 결정된 모드) ==========
-        # 사용자의 감정 상태에 따라 LLM의 질문 톤과 난이도를 동적으로 조절
-        if emotion_mode == "encouraging":
-            messages.append(
-                SystemMessage(
-                    content=(
-                        "⚠️ [감정 적응 시스템] 지원자가 불안하거나 긴장한 상태입니다.\n"
-                        "부드럽고 격려하는 톤으로 질문하세요. 압박 질문은 자제하고,\n"
-                        "지원자가 편안하게 답변할 수 있도록 도와주세요."
-                    )
-                )
-            )
-        elif emotion_mode == "challenging":
-            messages.append(
-                SystemMessage(
-                    content=(
-                        "💪 [감정 적응 시스템] 지원자가 자신감 있고 활발한 상태입니다.\n"
-                        "조금 더 도전적이고 심층적인 질문을 해보세요.\n"
-                        "구체적인 기술적 디테일이나 난이도 높은 시나리오를 제시해도 좋습니다."
-                    )
-                )
-            )
-
-        # ========== 4. RAG 컨텍스트 (배경 지식으로 대화 전에 배치) ==========
-        # ★ 핵심: RAG를 대화 기록 앞에 배치하여 자연스러운 대화 흐름을 유지
-        # RAG가 대화 뒤에 끼어들면 LLM이 사용자 답변보다 RAG 내용에 집중하여
-        # 맥락 없는 질문을 생성하는 문제 밌생
-        if resume_context:
-            context_msg = (
-                f"\n--- [RAG System] 참고용 이력서 관련 내용 ---\n"
-                f"{resume_context}\n"
-                f"------------------------------------------"
-            )
-            messages.append(SystemMessage(content=context_msg))
-
-        if qa_context:
-            qa_msg = (
-                f"\n--- [RAG System] 면접 참고 자료 (모범 답변 DB) ---\n"
-                f"{qa_context}\n"
-                f"이 참고 자료를 바탕으로 지원자의 답변 수준을 판단하고, "
-                f"더 깊은 꼬리질문을 만들어주세요.\n"
-                f"------------------------------------------"
-            )
-            messages.append(SystemMessage(content=qa_msg))
-
-        # ========== 5. chat_history → LangChain Message 변환 (최근 5턴) ==========
-        # ★ 핵심: 대화 기록이 메시지 목록의 마지막 위치에 오도록 하여
-        # LLM이 직전 대화 맥락을 가장 강하게 인식하고,
-        # 바로 다음에 오는 question_prompt와 자연스럽게 연결됨.
-        # 6→10으로 증가: 면접 후반부에도 초반 대화 맥락 유지
-        MAX_HISTORY_MESSAGES = 10  # 5턴 = assistant 5 + user 5
-        history_messages = self.chat_history_to_messages(
-            chat_history, max_messages=MAX_HISTORY_MESSAGES
-        )
-        messages.extend(history_messages)
-
-        # ========== 6. 질문 생성 프롬프트 (꼬리질문 정보 + 사용자 답변 포함) ==========
-        follow_up_instruction = ""
-        if needs_follow_up and topic_count < 2:
-            follow_up_instruction = (
-                f"\n⚠️ 지원자의 답변이 부실합니다. ({follow_up_reason})\n"
-                f"꼬리질문을 해주세요. 현재 주제({current_topic})에서 "
-                f"{topic_count}번째 질문입니다.\n"
-                f"더 구체적인 예시, 수치, 결과를 요청하세요."
-            )
-        elif topic_count >= 2:
-            follow_up_instruction = (
-                "\n✅ 이 주제에서 충분히 질문했습니다.\n"
-                '"알겠습니다. 다음은..." 이라며 새로운 주제로 전환하세요.'
-            )
-
-        question_prompt = build_question_prompt(
+        # ========== 1. 프롬프트 조립 (토큰 예산 적용) ==========
+        # 시스템 프롬프트 + 채용 공고 + 대화 요약 + 감정 적응 + RAG + 대화 기록 + 질문 지시
+        assembled = self.assemble_question_prompt(
+            session,
+            user_answer,
             question_count=question_count,
-            max_questions=self.MAX_QUESTIONS,
+            resume_context=resume_context,
+            qa_context=qa_context,
+            needs_follow_up=needs_follow_up,
+            follow_up_reason=follow_up_reason,
             current_topic=current_topic,
             topic_count=topic_count,
-            follow_up_instruction=follow_up_instruction,
-            user_answer=user_answer,  # ★ 사용자 답변을 프롬프트에 명시적으로 포함
+            emotion_mode=emotion_mode,
         )
-        messages.append(HumanMessage(content=question_prompt))
+        messages = self.to_langchain_messages(assembled)
 
-        # ========== 7. LLM 호출 + 언어 정책 강제 가드(한국어 비율 검사) ==========
+        # ========== 2. LLM 호출 + 언어 정책 강제 가드(한국어 비율 검사) ==========
+        t0 = time.perf_counter()
         response = await run_llm_async(self.question_llm, messages)
+        self.record_prompt_call(
+            session_id,
+            assembled,
+            getattr(response, "response_metadata", None),
+            (time.perf_counter() - t0) * 1000,
+        )
         next_question = _postprocess_question_output(response.content)
 
         guard_retry_count = 0
@@ -2515,38 +2779,60 @@ class AIInterviewer:
 
         return next_question
 
-    def detect_topic_from_answer(self, answer: str) -> str:
-        """답변에서 주제를 추출 (간단한 키워드 기반)"""
-        topic_keywords = {
-            "project": ["프로젝트", "개발", "구현", "만들", "제작"],
-            "technical": [
-                "기술",
-                "스택",
-                "언어",
-                "프레임워크",
-                "도구",
-                "python",
-                "java",
-                "react",
-            ],
-            "experience": ["경험", "경력", "회사", "팀", "업무"],
-            "problem_solving": ["문제", "해결", "버그", "오류", "이슈", "장애"],
-            "teamwork": ["팀", "협업", "동료", "커뮤니케이션", "갈등"],
-            "motivation": ["지원", "이유", "동기", "관심", "목표"],
-            "growth": ["성장", "발전", "학습", "공부", "목표", "계획"],
-        }
+    async def draft_speculative_question(
+        self, session_id: str, stable_prefix: str
+    ) -> Dict[str, Any]:
+        """투기적 질문 초안 생성기 (SpeculativeQuestionEngine에서 호출)
 
-        answer_lower = answer.lower()
-        topic_scores = {}
+        답변이 끝나기 전의 안정 접두사로 route_next/generate_question 노드와
+        동일한 판단(꼬리질문 여부, 감정 적응 모드)을 미리 수행하고 질문을 생성합니다.
+        세션 상태(chat_history, question_count, 주제 추적)는 변경하지 않으며,
+        최종 답변 검증을 통과한 경우에만 본 경로에서 사용됩니다.
+        """
+        session = state.get_session(session_id)
+        if not session or not self.question_llm:
+            return {}
+
+        answer = sanitize_user_input(stable_prefix)
+        resume_context, qa_context = await self.fetch_rag_contexts(
+            session_id, answer, reuse_speculative=False
+        )
+        speculative_engine.store_rag(
+            session_id, stable_prefix, (resume_context, qa_context)
+        )
+
+        needs_follow_up, follow_up_reason = self.should_follow_up(session_id, answer)
+        emotion_mode = session.get("emotion_adaptive_mode", "normal")
+        if emotion_mode == "encouraging" and needs_follow_up:
+            needs_follow_up = False
+            follow_up_reason = "감정 적응: 격려 모드 (꼬리질문 완화)"
 
-        for topic, keywords in topic_keywords.items():
-            score = sum(1 for kw in keywords if kw in answer_lower)
-            if score > 0:
-                topic_scores[topic] = score
+        t0 = time.perf_counter()
+        question = await self.build_and_call_llm(
+            session_id,
+            answer,
+            resume_context=resume_context,
+            qa_context=qa_context,
+            needs_follow_up=needs_follow_up,
+            follow_up_reason=follow_up_reason,
+            current_topic=session.get("current_topic") or "general",
+            topic_count=session.get("topic_question_count", 0),
+            emotion_mode=emotion_mode,
+            allow_speculative=False,
+        )
+        return {
+            "question": question,
+            "needs_follow_up": needs_follow_up,
+            "llm_ms": (time.perf_counter() - t0) * 1000,
+        }
 
-        if topic_scores:
-            return max(topic_scores, key=topic_scores.get)
-        return "general"
+    def detect_topic_from_answer(self, answer: str) -> str:
+        """답변에서 주제를 추출 (키워드 기반, 답변 해시 캐시 공유)
+
+        같은 답변의 STAR/기술 키워드 분석도 이때 함께 계산·캐싱되어
+        이후 Celery 평가/리포트 생성에서 재사용됩니다.
+        """
+        return detect_topic(answer)
 
     def should_follow_up(self, session_id: str, answer: str) -> tuple[bool, str]:
         """꼬리질문이 필요한지 판단 (답변 품질 + 주제 추적)"""
@@ -2736,6 +3022,22 @@ class AIInterviewer:
                 f"📊 [Session {session_id[:8]}] 주제: {current_topic}, 주제내 질문수: {topic_count}, 꼬리질문 필요: {needs_follow_up} ({follow_up_reason})"
             )
 
+            # ========== 2. 투기적 초안 검증 (적중 시 RAG/LLM 생략) ==========
+            if user_answer:
+                speculative_question = await speculative_engine.take_draft(
+                    session_id,
+                    user_answer,
+                    needs_follow_up=needs_follow_up,
+                    question_count=question_count,
+                    wait_timeout=SPECULATIVE_WAIT_SEC,
+                )
+                if speculative_question:
+                    self.update_topic_tracking(session_id, user_answer, needs_follow_up)
+                    state.update_session(
+                        session_id, {"question_count": question_count + 1}
+                    )
+                    return speculative_question
+
             # ========== 3. RAG 컨텍스트 병렬 조회 (이력서 + Q&A) ==========
             # ⚡ GPU 경합 방지: RAG 임베딩(Ollama)을 LLM 호출(step 7) 전에 먼저 완료
             #    두 RAG 간 병렬 실행은 유지 (동일 임베딩 모델 사용), 각 RAG에 20초 타임아웃
@@ -2792,89 +3094,34 @@ class AIInterviewer:
                 _fetch_resume_rag(), _fetch_qa_rag()
             )
 
-            # ========== 4. 대화 기록을 LangChain 메시지로 변환 ==========
-            chat_history = session.get("chat_history", [])
-            messages = [SystemMessage(content=self.INTERVIEWER_PROMPT)]
-
-            # ========== 4-1. 채용 공고 컨텍스트 주입 (공고 기반 면접 시) ==========
+            # ========== 4. 프롬프트 조립 (토큰 예산 적용) ==========
             job_posting = session.get("job_posting")
             if job_posting:
-                jp_context = (
-                    f"\n--- [채용 공고 정보] 이 면접의 대상 공고 ---\n"
-                    f"회사명: {job_posting.get('company', 'N/A')}\n"
-                    f"공고 제목: {job_posting.get('title', 'N/A')}\n"
-                    f"근무지: {job_posting.get('location', 'N/A')}\n"
-                    f"직무 분야: {job_posting.get('job_category', 'N/A')}\n"
-                    f"경력 수준: {job_posting.get('experience_level', 'N/A')}\n"
-                    f"급여: {job_posting.get('salary_info', 'N/A')}\n"
-                    f"\n[공고 상세 내용]\n{job_posting.get('description', '')}\n"
-                    f"------------------------------------------\n"
-                    f"☝️ 위 채용 공고의 요구사항, 자격요건, 우대사항, 직무 설명을 활용하여 "
-                    f"맞춤형 면접 질문을 생성하세요.\n"
-                    f"예시: 공고에서 요구하는 기술 스택 경험, 해당 직무의 실무 시나리오, "
-                    f"자격 요건 충족 여부 등을 질문하세요."
-                )
-                messages.append(SystemMessage(content=jp_context))
                 print(
                     f"📋 LLM에 공고 컨텍스트 주입: [{job_posting.get('company')}] {job_posting.get('title')}"
                 )
-
-            # ========== 4-2. RAG 컨텍스트 (배경 지식으로 대화 전에 배치) ==========
-            # ★ 핵심: RAG를 대화 기록 앞에 배치하여 자연스러운 대화 흐름을 유지
-            # RAG가 대화 뒤에 끼어들면 LLM이 사용자 답변보다 RAG 내용에 집중하여
-            # 맥락 없는 질문을 생성하는 문제 발생
-            if resume_context:
-                context_msg = (
-                    f"\n--- [RAG System] 참고용 이력서 관련 내용 ---\n"
-                    f"{resume_context}\n"
-                    f"------------------------------------------"
-                )
-                messages.append(SystemMessage(content=context_msg))
-
-            if qa_reference_context:
-                qa_msg = (
-                    f"\n--- [RAG System] 면접 참고 자료 (모범 답변 DB) ---\n"
-                    f"{qa_reference_context}\n"
-                    f"이 참고 자료를 바탕으로 지원자의 답변 수준을 판단하고, "
-                    f"더 깊은 꼬리질문을 만들어주세요.\n"
-                    f"------------------------------------------"
-                )
-                messages.append(SystemMessage(content=qa_msg))
-
-            # ========== 4-3. chat_history → LangChain Message 변환 (최근 5턴) ==========
-            # ★ 핵심: 대화 기록이 메시지 목록의 마지막 위치에 오도록 하여
-            # LLM이 직전 대화 맥락을 가장 강하게 인식함
-            MAX_HISTORY_MESSAGES = 10  # 5턴 = assistant 5 + user 5
-            history_messages = self.chat_history_to_messages(
-                chat_history, max_messages=MAX_HISTORY_MESSAGES
-            )
-            messages.extend(history_messages)
-
-            # ========== 6. 질문 생성 프롬프트 (꼬리질문 정보 포함) ==========
-            follow_up_instruction = ""
-            if needs_follow_up and topic_count < 2:
-                follow_up_instruction = f"""
-⚠️ 지원자의 답변이 부실합니다. ({follow_up_reason})
-꼬리질문을 해주세요. 현재 주제({current_topic})에서 {topic_count}번째 질문입니다.
-더 구체적인 예시, 수치, 결과를 요청하세요."""
-            elif topic_count >= 2:
-                follow_up_instruction = """
-✅ 이 주제에서 충분히 질문했습니다. 
-"알겠습니다. 다음은..." 이라며 새로운 주제로 전환하세요."""
-
-            question_prompt = build_question_prompt(
+            assembled = self.assemble_question_prompt(
+                session,
+                user_answer,
                 question_count=question_count,
-                max_questions=self.MAX_QUESTIONS,
+                resume_context=resume_context,
+                qa_context=qa_reference_context,
+                needs_follow_up=needs_follow_up,
+                follow_up_reason=follow_up_reason,
                 current_topic=current_topic,
                 topic_count=topic_count,
-                follow_up_instruction=follow_up_instruction,
-                user_answer=user_answer,  # ★ 사용자 답변을 프롬프트에 명시적으로 포함
             )
+            messages = self.to_langchain_messages(assembled)
 
-            messages.append(HumanMessage(content=question_prompt))
-
-            # ========== 7. LLM 호출 + 언어 정책 강제 가드(한국어 비율 검사) ==========
+            # ========== 5. LLM 호출 + 언어 정책 강제 가드(한국어 비율 검사) ==========
+            t0 = time.perf_counter()
             response = await run_llm_async(self.question_llm, messages)
+            self.record_prompt_call(
+                session_id,
+                assembled,
+                getattr(response, "response_metadata", None),
+                (time.perf_counter() - t0) * 1000,
+            )
             next_question = _postprocess_question_output(response.content)
 
             guard_retry_count = 0
@@ -2929,7 +3176,7 @@ class AIInterviewer:
                     )
                     next_question = "지금 말씀하신 내용을 바탕으로, 가장 핵심적인 성과를 한국어로 구체적으로 설명해 주시겠어요?"
 
-            # ========== 8. 주제 추적 업데이트 ==========
+            # ========== 6. 주제 추적 업데이트 ==========
             self.update_topic_tracking(session_id, user_answer, needs_follow_up)
 
             # 질문 카운트 증가 (꼬리질문 포함, 총 질문 수 제한을 위해)
@@ -2998,13 +3245,19 @@ class AIInterviewer:
                 ),
             ]
 
-            # ThreadPoolExecutor로 블로킹 LLM 호출을 비동기로 실행
-            response = await run_llm_async(self.llm, messages)
-            response_text = response.content
-
-            # JSON Resilience 파싱
-            evaluation = parse_evaluation_json(
-                response_text, context="AIInterviewer.evaluate_answer"
+            # 스키마 제약 생성 (Ollama format) — 파싱 실패 시 재호출 없이 resilient 파서로 폴백
+            evaluation = await asyncio.wait_for(
+                run_in_executor(
+                    LLM_EXECUTOR,
+                    invoke_structured_json,
+                    self.llm,
+                    messages,
+                    EVALUATION_SCHEMA,
+                    parse_evaluation_json,
+                    kind="evaluation",
+                    context="AIInterviewer.evaluate_answer",
+                ),
+                timeout=LLM_TIMEOUT_SEC,
             )
             return evaluation
 
@@ -3246,6 +3499,26 @@ class AIInterviewer:
 # AI 면접관 인스턴스
 interviewer = AIInterviewer()
 
+# 질문 생성 프롬프트 조립기 (섹션별 토큰 예산)
+prompt_assembler = PromptAssembler(
+    DEFAULT_LLM_NUM_CTX,
+    output_reserve=PROMPT_OUTPUT_RESERVE,
+    section_budgets={
+        "job_posting": PROMPT_BUDGET_JOB_POSTING,
+        "conversation_summary": PROMPT_BUDGET_SUMMARY,
+        "resume_rag": PROMPT_BUDGET_RESUME_RAG,
+        "qa_rag": PROMPT_BUDGET_QA_RAG,
+    },
+    max_history_messages=PROMPT_HISTORY_MAX_MESSAGES,
+)
+
+# 투기적 질문 사전 생성 엔진 (초안 생성은 AIInterviewer에 위임)
+speculative_engine = SpeculativeQuestionEngine(
+    interviewer.draft_speculative_question,
+    enabled=SPECULATIVE_QUESTION_ENABLED and LLM_AVAILABLE,
+    similarity_threshold=SPECULATIVE_SIMILARITY_THRESHOLD,
+)
+
 # ========== LangGraph 워크플로우 초기화 ==========
 interview_workflow = None
 if LANGGRAPH_AVAILABLE:
@@ -3262,118 +3535,22 @@ if LANGGRAPH_AVAILABLE:
 class InterviewReportGenerator:
     """STAR 기법 기반 면접 리포트 생성"""
 
-    STAR_KEYWORDS = {
-        "situation": [
-            "상황",
-            "배경",
-            "당시",
-            "그때",
-            "환경",
-            "상태",
-            "문제",
-            "이슈",
-            "과제",
-        ],
-        "task": [
-            "목표",
-            "과제",
-            "임무",
-            "역할",
-            "담당",
-            "책임",
-            "해야 할",
-            "목적",
-            "미션",
-        ],
-        "action": [
-            "행동",
-            "수행",
-            "실행",
-            "처리",
-            "해결",
-            "개발",
-            "구현",
-            "적용",
-            "진행",
-            "시도",
-            "노력",
-        ],
-        "result": [
-            "결과",
-            "성과",
-            "달성",
-            "완료",
-            "개선",
-            "향상",
-            "증가",
-            "감소",
-            "효과",
-            "성공",
-        ],
-    }
-
-    TECH_KEYWORDS = [
-        "python",
-        "java",
-        "javascript",
-        "react",
-        "vue",
-        "django",
-        "flask",
-        "spring",
-        "aws",
-        "azure",
-        "docker",
-        "kubernetes",
-        "sql",
-        "mongodb",
-        "postgresql",
-        "git",
-        "ci/cd",
-        "api",
-        "rest",
-        "machine learning",
-        "deep learning",
-        "tensorflow",
-        "pytorch",
-        "pandas",
-        "LLM",
-        "RAG",
-        "LangChain",
-        "FastAPI",
-    ]
+    # 키워드 사전은 answer_analytics 모듈이 단일 소스 (Celery 리포트와 공유)
+    STAR_KEYWORDS = ANALYTICS_STAR_KEYWORDS
+    TECH_KEYWORDS = ANALYTICS_TECH_KEYWORDS
 
     def __init__(self, llm=None):
         self.llm = llm or interviewer.llm
 
     def analyze_star_structure(self, answers: List[str]) -> Dict:
-        """STAR 기법 분석"""
-        star_analysis = {
-            key: {"count": 0, "examples": []} for key in self.STAR_KEYWORDS
-        }
-
-        for answer in answers:
-            answer_lower = answer.lower()
-            for element, keywords in self.STAR_KEYWORDS.items():
-                for keyword in keywords:
-                    if keyword in answer_lower:
-                        star_analysis[element]["count"] += 1
-                        break
-
-        return star_analysis
+        """STAR 기법 분석 (답변 해시 캐시 공유)"""
+        return analyze_star_structure(answers)
 
     def extract_keywords(self, answers: List[str]) -> Dict:
         """키워드 추출"""
+        found_tech = extract_tech_keywords(answers)
         all_text = " ".join(answers).lower()
 
-        found_tech = []
-        for kw in self.TECH_KEYWORDS:
-            if kw.lower() in all_text:
-                count = all_text.count(kw.lower())
-                found_tech.append((kw, count))
-
-        found_tech.sort(key=lambda x: x[1], reverse=True)
-
         korean_words = re.findall(r"[가-힣]{2,}", all_text)
         word_freq = Counter(korean_words)
 
@@ -5687,8 +5864,11 @@ async def start_user_turn(
     # 질문에서 키워드 추출
     keywords = intervention_manager.extract_question_keywords(request.question)
 
-    # 사용자 턴 시작
-    intervention_manager.start_user_turn(request.session_id, keywords)
+    # 사용자 턴 시작 (이전 턴의 투기적 초안 폐기)
+    intervention_manager.start_user_turn(
+        request.session_id, keywords, question=request.question
+    )
+    speculative_engine.reset(request.session_id)
 
     return {
         "success": True,
@@ -5703,7 +5883,7 @@ async def start_user_turn(
 async def update_vad_signal(
     request: VADSignalRequest, current_user: Dict = Depends(get_current_user)
 ):
-    """VAD 신호 업데이트 (실시간 스트리밍)"""
+    """VAD 신호 업데이트 — WebSocket 미연결 시 폴백 (기본 경로는 /ws/interview 바이너리 VAD 프레임)"""
     session = state.get_session(request.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
@@ -5716,6 +5896,15 @@ async def update_vad_signal(
     # Turn-taking 신호 확인
     turn_signal = intervention_manager.get_turn_taking_signal(request.session_id)
 
+    # 답변 말미 침묵 → 투기적 질문 초안 생성 시작
+    if (
+        not request.is_speech
+        and turn_signal.get("silence_duration_ms", 0) >= SPECULATIVE_SILENCE_MS
+    ):
+        await speculative_engine.on_silence(
+            request.session_id, session.get("question_count", 1)
+        )
+
     return {
         "turn_state": turn_state,
         "can_interrupt": turn_signal["can_interrupt"],
@@ -5728,7 +5917,7 @@ async def update_vad_signal(
 async def check_intervention(
     request: InterventionCheckRequest, current_user: Dict = Depends(get_current_user)
 ):
-    """개입 필요 여부 확인"""
+    """개입 필요 여부 확인 — WebSocket 미연결 시 폴백 (연결 중에는 서버가 개입을 푸시)"""
     session = state.get_session(request.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
@@ -5836,6 +6025,8 @@ async def get_intervention_settings(current_user: Dict = Depends(get_current_use
         "soft_warning_length": intervention_manager.SOFT_WARNING_LENGTH,
         "silence_threshold_ms": intervention_manager.SILENCE_THRESHOLD_MS,
         "topic_relevance_threshold": intervention_manager.TOPIC_RELEVANCE_THRESHOLD,
+        "embedding_relevance_threshold": intervention_manager.EMBEDDING_RELEVANCE_THRESHOLD,
+        "embedding_relevance": topic_relevance_scorer.get_stats(),
     }
 
 
@@ -5904,7 +6095,9 @@ async def chat(
     # 다음 질문을 위한 사용자 턴 시작 (개입 시스템)
     if not response.startswith("면접이 종료"):
         keywords = intervention_manager.extract_question_keywords(response)
-        intervention_manager.start_user_turn(request.session_id, keywords)
+        intervention_manager.start_user_turn(
+            request.session_id, keywords, question=response
+        )
 
         # 발화 분석 턴 시작
         if SPEECH_ANALYSIS_AVAILABLE and speech_service:
@@ -6048,7 +6241,9 @@ async def chat_with_intervention(
     question_keywords = []
     if not response.startswith("면접이 종료"):
         question_keywords = intervention_manager.extract_question_keywords(response)
-        intervention_manager.start_user_turn(request.session_id, question_keywords)
+        intervention_manager.start_user_turn(
+            request.session_id, question_keywords, question=response
+        )
 
         # 발화 분석 / 시선 추적 턴 시작
         if SPEECH_ANALYSIS_AVAILABLE and speech_service:
@@ -6254,59 +6449,6 @@ async def chat_stream(
                 except Exception as e:
                     print(f"⚠️ Celery 태스크 제출 실패: {e}")
 
-            # ── RAG 컨텍스트 병렬 조회 (이력서 + Q&A) ──
-            yield f"event: status\ndata: {_json.dumps({'phase': 'rag_search'}, ensure_ascii=False)}\n\n"
-
-            resume_context = ""
-            qa_context = ""
-            session_retriever = session_data.get("retriever") or interviewer.retriever
-
-            # ⚡ GPU 경합 방지: RAG 임베딩(Ollama)을 LLM 호출 전에 먼저 실행
-            async def _fetch_resume():
-                if not (session_retriever and sanitized_message):
-                    return ""
-                try:
-                    docs = await asyncio.wait_for(
-                        run_rag_async(session_retriever, sanitized_message),
-                        timeout=20,
-                    )
-                    if docs:
-                        return "\n".join([d.page_content for d in docs[:3]])
-                except asyncio.TimeoutError:
-                    print("⏰ [RAG Stream] 이력서 검색 타임아웃 (20초)")
-                except Exception as e:
-                    print(f"⚠️ [RAG Stream] 이력서 검색 오류: {e}")
-                return ""
-
-            async def _fetch_qa():
-                if not (
-                    RAG_AVAILABLE
-                    and sanitized_message
-                    and getattr(interviewer, "qa_rag", None)
-                ):
-                    return ""
-                try:
-                    qa_docs = await asyncio.wait_for(
-                        run_in_executor(
-                            RAG_EXECUTOR,
-                            interviewer.qa_rag.similarity_search,
-                            sanitized_message,
-                            2,
-                        ),
-                        timeout=20,
-                    )
-                    if qa_docs:
-                        return "\n".join([d.page_content for d in qa_docs[:2]])
-                except asyncio.TimeoutError:
-                    print("⏰ [RAG Stream] Q&A 검색 타임아웃 (20초)")
-                except Exception as e:
-                    print(f"⚠️ [RAG Stream] Q&A 검색 오류: {e}")
-                return ""
-
-            resume_context, qa_context = await asyncio.gather(
-                _fetch_resume(), _fetch_qa()
-            )
-
             # ── 꼬리질문 판단 ──
             needs_follow_up, follow_up_reason = interviewer.should_follow_up(
                 session_id, sanitized_message
@@ -6314,177 +6456,186 @@ async def chat_stream(
             current_topic = session_data.get("current_topic", "general")
             topic_count = session_data.get("topic_question_count", 0)
 
-            # ── LLM 프롬프트 조립 (generate_llm_question과 동일한 로직) ──
-            messages = [SystemMessage(content=interviewer.INTERVIEWER_PROMPT)]
+            # ── 투기적 초안 검증 (적중 시 RAG + LLM 스트리밍 생략) ──
+            final_question = await speculative_engine.take_draft(
+                session_id,
+                sanitized_message,
+                needs_follow_up=needs_follow_up,
+                question_count=question_count,
+                wait_timeout=SPECULATIVE_WAIT_SEC,
+            )
+            if final_question:
+                yield f"event: token\ndata: {_json.dumps({'token': final_question}, ensure_ascii=False)}\n\n"
+            else:
+                # ── RAG 컨텍스트 병렬 조회 (이력서 + Q&A) ──
+                yield f"event: status\ndata: {_json.dumps({'phase': 'rag_search'}, ensure_ascii=False)}\n\n"
 
-            # 채용 공고 컨텍스트
-            job_posting = session_data.get("job_posting")
-            if job_posting:
-                jp_ctx = (
-                    f"\n--- [채용 공고 정보] 이 면접의 대상 공고 ---\n"
-                    f"회사명: {job_posting.get('company', 'N/A')}\n"
-                    f"공고 제목: {job_posting.get('title', 'N/A')}\n"
-                    f"근무지: {job_posting.get('location', 'N/A')}\n"
-                    f"직무 분야: {job_posting.get('job_category', 'N/A')}\n"
-                    f"경력 수준: {job_posting.get('experience_level', 'N/A')}\n"
-                    f"급여: {job_posting.get('salary_info', 'N/A')}\n"
-                    f"\n[공고 상세 내용]\n{job_posting.get('description', '')}\n"
-                    f"------------------------------------------\n"
-                    f"☝️ 위 채용 공고의 요구사항, 자격요건, 우대사항, 직무 설명을 활용하여 "
-                    f"맞춤형 면접 질문을 생성하세요."
-                )
-                messages.append(SystemMessage(content=jp_ctx))
+                resume_context = ""
+                qa_context = ""
+                session_retriever = session_data.get("retriever") or interviewer.retriever
 
-            # RAG 컨텍스트 (배경 지식으로 대화 전에 배치)
-            # ★ 핵심: RAG를 대화 기록 앞에 배치하여 자연스러운 대화 흐름을 유지
-            if resume_context:
-                messages.append(
-                    SystemMessage(
-                        content=(
-                            f"\n--- [RAG System] 참고용 이력서 관련 내용 ---\n"
-                            f"{resume_context}\n"
-                            f"------------------------------------------"
+                # ⚡ GPU 경합 방지: RAG 임베딩(Ollama)을 LLM 호출 전에 먼저 실행
+                async def _fetch_resume():
+                    if not (session_retriever and sanitized_message):
+                        return ""
+                    try:
+                        docs = await asyncio.wait_for(
+                            run_rag_async(session_retriever, sanitized_message),
+                            timeout=20,
                         )
-                    )
-                )
-            if qa_context:
-                messages.append(
-                    SystemMessage(
-                        content=(
-                            f"\n--- [RAG System] 면접 참고 자료 (모범 답변 DB) ---\n{qa_context}\n"
-                            f"이 참고 자료를 바탕으로 지원자의 답변 수준을 판단하고, "
-                            f"더 깊은 꼬리질문을 만들어주세요.\n"
-                            f"------------------------------------------"
+                        if docs:
+                            return "\n".join([d.page_content for d in docs[:3]])
+                    except asyncio.TimeoutError:
+                        print("⏰ [RAG Stream] 이력서 검색 타임아웃 (20초)")
+                    except Exception as e:
+                        print(f"⚠️ [RAG Stream] 이력서 검색 오류: {e}")
+                    return ""
+
+                async def _fetch_qa():
+                    if not (
+                        RAG_AVAILABLE
+                        and sanitized_message
+                        and getattr(interviewer, "qa_rag", None)
+                    ):
+                        return ""
+                    try:
+                        qa_docs = await asyncio.wait_for(
+                            run_in_executor(
+                                RAG_EXECUTOR,
+                                interviewer.qa_rag.similarity_search,
+                                sanitized_message,
+                                2,
+                            ),
+                            timeout=20,
                         )
-                    )
-                )
+                        if qa_docs:
+                            return "\n".join([d.page_content for d in qa_docs[:2]])
+                    except asyncio.TimeoutError:
+                        print("⏰ [RAG Stream] Q&A 검색 타임아웃 (20초)")
+                    except Exception as e:
+                        print(f"⚠️ [RAG Stream] Q&A 검색 오류: {e}")
+                    return ""
 
-            # chat_history → LangChain Message 변환 (최근 5턴)
-            # ★ 핵심: 대화 기록이 RAG 뒤, 지시 프롬프트 앞에 위치하여
-            # LLM이 직전 대화 맥락을 가장 강하게 인식
-            MAX_HIST = 10  # 5턴 = assistant 5 + user 5
-            history_msgs = interviewer.chat_history_to_messages(
-                chat_history, max_messages=MAX_HIST
-            )
-            messages.extend(history_msgs)
-
-            # 질문 생성 프롬프트 (꼬리질문 정보 포함)
-            follow_up_instruction = ""
-            if needs_follow_up and topic_count < 2:
-                follow_up_instruction = (
-                    f"\n⚠️ 지원자의 답변이 부실합니다. ({follow_up_reason})\n"
-                    f"꼬리질문을 해주세요. 현재 주제({current_topic})에서 "
-                    f"{topic_count}번째 질문입니다.\n"
-                    f"더 구체적인 예시, 수치, 결과를 요청하세요."
+                resume_context, qa_context = await asyncio.gather(
+                    _fetch_resume(), _fetch_qa()
                 )
-            elif topic_count >= 2:
-                follow_up_instruction = (
-                    "\n✅ 이 주제에서 충분히 질문했습니다.\n"
-                    '"알겠습니다. 다음은..." 이라며 새로운 주제로 전환하세요.'
+
+                # ── LLM 프롬프트 조립 (build_and_call_llm과 동일한 조립 경로) ──
+                assembled = interviewer.assemble_question_prompt(
+                    session_data,
+                    sanitized_message,
+                    question_count=question_count,
+                    resume_context=resume_context,
+                    qa_context=qa_context,
+                    needs_follow_up=needs_follow_up,
+                    follow_up_reason=follow_up_reason,
+                    current_topic=current_topic,
+                    topic_count=topic_count,
                 )
+                messages = interviewer.to_langchain_messages(assembled)
 
-            q_prompt = build_question_prompt(
-                question_count=question_count,
-                max_questions=interviewer.MAX_QUESTIONS,
-                current_topic=current_topic,
-                topic_count=topic_count,
-                follow_up_instruction=follow_up_instruction,
-                user_answer=sanitized_message,  # ★ 사용자 답변을 프롬프트에 명시적으로 포함
-            )
-            messages.append(HumanMessage(content=q_prompt))
+                # ── 2단계: LLM 스트리밍 (ChatOllama.astream 사용) ──
+                yield f"event: status\ndata: {_json.dumps({'phase': 'llm_generating'}, ensure_ascii=False)}\n\n"
 
-            # ── 2단계: LLM 스트리밍 (ChatOllama.astream 사용) ──
-            yield f"event: status\ndata: {_json.dumps({'phase': 'llm_generating'}, ensure_ascii=False)}\n\n"
+                if rid:
+                    latency_monitor.start_phase(rid, "llm_inference")
 
-            if rid:
-                latency_monitor.start_phase(rid, "llm_inference")
+                # ChatOllama.astream()은 토큰 단위로 AIMessageChunk를 생성합니다.
+                # 각 chunk의 .content 속성에 토큰 텍스트가 담겨있습니다.
+                # ★ 안전장치: LLM_TIMEOUT_SEC 초 초과 시 스트리밍 강제 중단
+                # 마지막 chunk(done)의 response_metadata에 prompt_eval_count 등이 담김
+                stream_metadata: Dict[str, Any] = {}
+                try:
+                    _stream_start = asyncio.get_event_loop().time()
+                    async for chunk in interviewer.question_llm.astream(messages):
+                        if getattr(chunk, "response_metadata", None):
+                            stream_metadata = chunk.response_metadata
+                        # 타임아웃 체크 — 모델이 stop 토큰을 놓쳐 무한 생성되는 것을 방지
+                        if (
+                            asyncio.get_event_loop().time() - _stream_start
+                            > LLM_TIMEOUT_SEC
+                        ):
+                            print(
+                                f"⏰ [LLM Stream] 스트리밍 타임아웃 ({LLM_TIMEOUT_SEC}초 초과, {len(full_response)}자 생성됨)"
+                            )
+                            break
+                        token_text = chunk.content
+                        if token_text:
+                            full_response += token_text
+                            # 각 토큰을 SSE 이벤트로 즉시 전송 → 프론트엔드에 실시간 표시
+                            yield f"event: token\ndata: {_json.dumps({'token': token_text}, ensure_ascii=False)}\n\n"
+                except Exception as llm_err:
+                    print(f"❌ [LLM Stream] 스트리밍 오류: {llm_err}")
+                    if rid:
+                        latency_monitor.end_phase(rid, "llm_inference")
+                    yield f"event: error\ndata: {_json.dumps({'error': f'LLM 스트리밍 오류: {llm_err}'}, ensure_ascii=False)}\n\n"
+                    return
 
-            # ChatOllama.astream()은 토큰 단위로 AIMessageChunk를 생성합니다.
-            # 각 chunk의 .content 속성에 토큰 텍스트가 담겨있습니다.
-            # ★ 안전장치: LLM_TIMEOUT_SEC 초 초과 시 스트리밍 강제 중단
-            try:
-                _stream_start = asyncio.get_event_loop().time()
-                async for chunk in interviewer.question_llm.astream(messages):
-                    # 타임아웃 체크 — 모델이 stop 토큰을 놓쳐 무한 생성되는 것을 방지
-                    if (
-                        asyncio.get_event_loop().time() - _stream_start
-                        > LLM_TIMEOUT_SEC
-                    ):
-                        print(
-                            f"⏰ [LLM Stream] 스트리밍 타임아웃 ({LLM_TIMEOUT_SEC}초 초과, {len(full_response)}자 생성됨)"
-                        )
-                        break
-                    token_text = chunk.content
-                    if token_text:
-                        full_response += token_text
-                        # 각 토큰을 SSE 이벤트로 즉시 전송 → 프론트엔드에 실시간 표시
-                        yield f"event: token\ndata: {_json.dumps({'token': token_text}, ensure_ascii=False)}\n\n"
-            except Exception as llm_err:
-                print(f"❌ [LLM Stream] 스트리밍 오류: {llm_err}")
                 if rid:
                     latency_monitor.end_phase(rid, "llm_inference")
-                yield f"event: error\ndata: {_json.dumps({'error': f'LLM 스트리밍 오류: {llm_err}'}, ensure_ascii=False)}\n\n"
-                return
+                interviewer.record_prompt_call(
+                    session_id,
+                    assembled,
+                    stream_metadata,
+                    (asyncio.get_event_loop().time() - _stream_start) * 1000,
+                )
 
-            if rid:
-                latency_monitor.end_phase(rid, "llm_inference")
+                # ── 3단계: 후처리 + 언어 정책 강제 가드 (한국어 비율 검사) ──
+                final_question = _postprocess_question_output(full_response)
+
+                guard_retry_count = 0
+                while guard_retry_count < max(0, LLM_KOREAN_MAX_RETRIES):
+                    needs_retry = not final_question
+                    reason = "empty"
+                    ratio_stats = {
+                        "ratio": 1.0,
+                        "korean_count": 0.0,
+                        "english_count": 0.0,
+                    }
 
-            # ── 3단계: 후처리 + 언어 정책 강제 가드 (한국어 비율 검사) ──
-            final_question = _postprocess_question_output(full_response)
+                    if final_question and LLM_KOREAN_GUARD_ENABLED:
+                        acceptable, ratio_stats = _is_korean_output_acceptable(
+                            final_question
+                        )
+                        if not acceptable:
+                            needs_retry = True
+                            reason = "language_policy"
 
-            guard_retry_count = 0
-            while guard_retry_count < max(0, LLM_KOREAN_MAX_RETRIES):
-                needs_retry = not final_question
-                reason = "empty"
-                ratio_stats = {
-                    "ratio": 1.0,
-                    "korean_count": 0.0,
-                    "english_count": 0.0,
-                }
+                    if not needs_retry:
+                        break
 
-                if final_question and LLM_KOREAN_GUARD_ENABLED:
-                    acceptable, ratio_stats = _is_korean_output_acceptable(
-                        final_question
+                    print(
+                        f"⚠️ [LLM Stream Guard] 재생성 시도 {guard_retry_count + 1}/{LLM_KOREAN_MAX_RETRIES} "
+                        f"(reason={reason}, ratio={ratio_stats.get('ratio', 1.0):.3f})"
                     )
-                    if not acceptable:
-                        needs_retry = True
-                        reason = "language_policy"
-
-                if not needs_retry:
-                    break
-
-                print(
-                    f"⚠️ [LLM Stream Guard] 재생성 시도 {guard_retry_count + 1}/{LLM_KOREAN_MAX_RETRIES} "
-                    f"(reason={reason}, ratio={ratio_stats.get('ratio', 1.0):.3f})"
-                )
-                try:
-                    retry_messages = messages + [
-                        HumanMessage(
-                            content=(
-                                "⚠️ 출력 규칙 재강조: 반드시 한국어로 질문 1개만 작성하세요. "
-                                "영어 문장으로 답변하지 마세요. 기술 용어만 영어 병기 가능합니다."
+                    try:
+                        retry_messages = messages + [
+                            HumanMessage(
+                                content=(
+                                    "⚠️ 출력 규칙 재강조: 반드시 한국어로 질문 1개만 작성하세요. "
+                                    "영어 문장으로 답변하지 마세요. 기술 용어만 영어 병기 가능합니다."
+                                )
                             )
+                        ]
+                        retry_resp = await run_llm_async(
+                            interviewer.question_llm, retry_messages
                         )
-                    ]
-                    retry_resp = await run_llm_async(
-                        interviewer.question_llm, retry_messages
-                    )
-                    final_question = _postprocess_question_output(retry_resp.content)
-                except Exception:
-                    final_question = ""
-                guard_retry_count += 1
+                        final_question = _postprocess_question_output(retry_resp.content)
+                    except Exception:
+                        final_question = ""
+                    guard_retry_count += 1
 
-            if not final_question:
-                final_question = "지금까지의 경험 중 가장 도전적이었던 프로젝트에 대해 한국어로 말씀해 주시겠어요?"
+                if not final_question:
+                    final_question = "지금까지의 경험 중 가장 도전적이었던 프로젝트에 대해 한국어로 말씀해 주시겠어요?"
 
-            if LLM_KOREAN_GUARD_ENABLED:
-                acceptable, ratio_stats = _is_korean_output_acceptable(final_question)
-                if not acceptable:
-                    print(
-                        f"⚠️ [LLM Stream Guard] 한국어 정책 미충족 지속 (ratio={ratio_stats['ratio']:.3f}) "
-                        "→ 한국어 폴백 질문 사용"
-                    )
-                    final_question = "지금 말씀하신 내용을 바탕으로, 가장 핵심적인 성과를 한국어로 구체적으로 설명해 주시겠어요?"
+                if LLM_KOREAN_GUARD_ENABLED:
+                    acceptable, ratio_stats = _is_korean_output_acceptable(final_question)
+                    if not acceptable:
+                        print(
+                            f"⚠️ [LLM Stream Guard] 한국어 정책 미충족 지속 (ratio={ratio_stats['ratio']:.3f}) "
+                            "→ 한국어 폴백 질문 사용"
+                        )
+                        final_question = "지금 말씀하신 내용을 바탕으로, 가장 핵심적인 성과를 한국어로 구체적으로 설명해 주시겠어요?"
 
             # ── 대화 기록 및 주제 추적 업데이트 ──
             chat_history.append({"role": "assistant", "content": final_question})
@@ -6504,7 +6655,9 @@ async def chat_stream(
                 keywords = intervention_manager.extract_question_keywords(
                     final_question
                 )
-                intervention_manager.start_user_turn(session_id, keywords)
+                intervention_manager.start_user_turn(
+                    session_id, keywords, question=final_question
+                )
 
                 # 발화 분석 턴 시작
                 if SPEECH_ANALYSIS_AVAILABLE and speech_service:
@@ -7120,69 +7273,50 @@ async def _video_pipeline(track, session_id: str):
         pass
 
 
-# ========== Hume Prosody 오디오 버퍼 & 분석 함수 ==========
-_prosody_audio_buffers: Dict[str, bytearray] = {}
-
-
-async def _analyze_prosody_from_audio(session_id: str, raw_pcm: bytes, transcript: str):
+# ========== Hume Prosody 스트리밍 결과 처리 ==========
+async def _on_prosody_sample(session_id: str, sample) -> None:
     """
-    축적된 PCM 오디오를 WAV로 변환 → Hume Prosody Streaming API로 분석.
-    결과를 prosody_service 세션에 저장하고, WebSocket으로 클라이언트에 전송.
+    prosody_service가 세션 WebSocket으로 분석한 세그먼트 결과를 받아
+    최신 prosody를 저장하고 WebSocket으로 클라이언트에 전송.
+    (오디오는 push_audio로 링 버퍼에 쌓이고 최적 길이 세그먼트로 묶여 전송됨)
     """
-    import io
-    import struct
-
     try:
-        # --- PCM (16kHz, 16bit, mono) → WAV 변환 ---
-        wav_buf = io.BytesIO()
-        num_samples = len(raw_pcm) // 2
-        sample_rate = 16000
-        # WAV header
-        wav_buf.write(b"RIFF")
-        data_size = num_samples * 2
-        wav_buf.write(struct.pack("<I", 36 + data_size))
-        wav_buf.write(b"WAVE")
-        wav_buf.write(b"fmt ")
-        wav_buf.write(
-            struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
-        )
-        wav_buf.write(b"data")
-        wav_buf.write(struct.pack("<I", data_size))
-        wav_buf.write(raw_pcm)
-        wav_bytes = wav_buf.getvalue()
-
-        # --- Prosody 분석 (Streaming REST API) ---
-        result = await asyncio.get_event_loop().run_in_executor(
-            LLM_EXECUTOR,
-            lambda: prosody_service.analyze_audio_stream(
-                session_id, wav_bytes, transcript
-            ),
-        )
+        indicators = sample.interview_indicators
+        if not indicators:
+            return
+        adaptive_mode = determine_emotion_adaptive_mode(indicators)
 
-        if result and result.get("interview_indicators"):
-            # InterviewState에 최신 prosody 저장
-            state.last_prosody = result
+        # InterviewState에 최신 prosody 저장
+        state.last_prosody = {
+            "interview_indicators": indicators,
+            "dominant_indicator": sample.dominant_indicator,
+            "adaptive_mode": adaptive_mode,
+        }
 
-            # WebSocket으로 클라이언트에 전송
-            await broadcast_stt_result(
-                session_id,
-                {
-                    "type": "prosody_result",
-                    "indicators": result["interview_indicators"],
-                    "dominant_indicator": result.get("dominant_indicator", ""),
-                    "adaptive_mode": result.get("adaptive_mode", "normal"),
-                    "timestamp": time.time(),
-                },
-            )
+        # WebSocket으로 클라이언트에 전송
+        await broadcast_stt_result(
+            session_id,
+            {
+                "type": "prosody_result",
+                "indicators": indicators,
+                "dominant_indicator": sample.dominant_indicator,
+                "adaptive_mode": adaptive_mode,
+                "timestamp": time.time(),
+            },
+        )
 
-            print(
-                f"[Prosody] 세션 {session_id[:8]}... "
-                f"주요감정: {result.get('dominant_indicator', '?')} "
-                f"모드: {result.get('adaptive_mode', '?')}"
-            )
+        print(
+            f"[Prosody] 세션 {session_id[:8]}... "
+            f"주요감정: {sample.dominant_indicator} "
+            f"모드: {adaptive_mode}"
+        )
 
     except Exception as e:
-        print(f"[Prosody] 분석 오류 (세션 {session_id[:8]}): {e}")
+        print(f"[Prosody] 결과 처리 오류 (세션 {session_id[:8]}): {e}")
+
+
+if PROSODY_AVAILABLE and prosody_service:
+    prosody_service.set_sample_callback(_on_prosody_sample)
 
 
 # ── Anti-aliasing FIR LPF 커널 캐시 (모듈 레벨) ──
@@ -7441,6 +7575,10 @@ async def _process_audio_with_stt_and_recording(
                     )
 
                     if transcript:
+                        speculative_engine.on_transcript(
+                            session_id, transcript, is_final
+                        )
+
                         if SPEECH_ANALYSIS_AVAILABLE and speech_service:
                             try:
                                 speech_service.add_stt_result(
@@ -7483,16 +7621,7 @@ async def _process_audio_with_stt_and_recording(
 
                         # ── Hume Prosody 음성 감정 분석 (최종 발화 시) ──
                         if is_final and PROSODY_AVAILABLE and prosody_service:
-                            buffered = bytes(
-                                _prosody_audio_buffers.get(session_id, b"")
-                            )
-                            _prosody_audio_buffers[session_id] = bytearray()
-                            if len(buffered) > 3200:  # 최소 0.1초 (16kHz, 16bit)
-                                asyncio.create_task(
-                                    _analyze_prosody_from_audio(
-                                        session_id, buffered, output_transcript
-                                    )
-                                )
+                            prosody_service.flush_audio(session_id, output_transcript)
 
                 except Exception as e:
                     print(f"[STT] 메시지 처리 오류: {e}")
@@ -7517,6 +7646,12 @@ async def _process_audio_with_stt_and_recording(
                 """발화 종료 감지 — utterance_end_ms 침묵 후 Deepgram이 전송"""
                 try:
                     _update_stt_quality_on_utterance_end(session_id)
+                    _stt_session = state.get_session(session_id) or {}
+                    asyncio.create_task(
+                        speculative_engine.on_silence(
+                            session_id, _stt_session.get("question_count", 1)
+                        )
+                    )
                     asyncio.create_task(
                         broadcast_stt_result(
                             session_id,
@@ -7549,9 +7684,9 @@ async def _process_audio_with_stt_and_recording(
             state.stt_connections[session_id] = dg_connection
             print(f"[STT] 세션 {session_id} 오디오 처리 시작")
 
-            # Prosody용 오디오 버퍼 초기화
+            # Prosody 스트리밍 시작 (세션 링 버퍼 + WebSocket 연결 재사용)
             if PROSODY_AVAILABLE and prosody_service:
-                _prosody_audio_buffers[session_id] = bytearray()
+                prosody_service.open_stream(session_id)
 
             try:
                 while True:
@@ -7568,13 +7703,9 @@ async def _process_audio_with_stt_and_recording(
 
                         dg_connection.send_media(ListenV1MediaMessage(audio_bytes))
 
-                        # → Prosody 오디오 버퍼 축적
-                        if (
-                            PROSODY_AVAILABLE
-                            and prosody_service
-                            and session_id in _prosody_audio_buffers
-                        ):
-                            _prosody_audio_buffers[session_id].extend(audio_bytes)
+                        # → Prosody 링 버퍼 축적 (세그먼트 길이가 차면 자동 전송)
+                        if PROSODY_AVAILABLE and prosody_service:
+                            prosody_service.push_audio(session_id, audio_bytes)
 
                         # → 녹화 파이프 전송
                         if recording_active:
@@ -7590,7 +7721,8 @@ async def _process_audio_with_stt_and_recording(
                 print(f"[STT] 오디오 처리 종료: {e}")
             finally:
                 state.stt_connections.pop(session_id, None)
-                _prosody_audio_buffers.pop(session_id, None)
+                if PROSODY_AVAILABLE and prosody_service:
+                    await prosody_service.close_stream(session_id)
 
     except Exception as e:
         print(f"[STT] Deepgram 연결 실패: {e}")
@@ -7696,6 +7828,10 @@ async def _process_audio_with_stt(track, session_id: str):
                     )
 
                     if transcript:
+                        speculative_engine.on_transcript(
+                            session_id, transcript, is_final
+                        )
+
                         # 발화 분석 서비스에 STT 결과 전달
                         if SPEECH_ANALYSIS_AVAILABLE and speech_service:
                             try:
@@ -7760,6 +7896,12 @@ async def _process_audio_with_stt(track, session_id: str):
                 """발화 종료 감지 — utterance_end_ms 침묵 후 Deepgram이 전송"""
                 try:
                     _update_stt_quality_on_utterance_end(session_id)
+                    _stt_session = state.get_session(session_id) or {}
+                    asyncio.create_task(
+                        speculative_engine.on_silence(
+                            session_id, _stt_session.get("question_count", 1)
+                        )
+                    )
                     asyncio.create_task(
                         broadcast_stt_result(
                             session_id,
@@ -8086,6 +8228,35 @@ async def websocket_interview(
         except Exception:
             pass
 
+    # ── 실시간 개입 (VAD 바이너리 프레임 → Turn-taking 상태/개입 푸시) ──
+    # POST /api/intervention/vad-signal + /check 폴링을 대체합니다.
+    last_turn_frame = b""
+
+    async def _on_vad(is_speech: bool, audio_level: float):
+        nonlocal last_turn_frame
+        intervention_manager.update_vad_signal(session_id, is_speech, audio_level)
+        turn_signal = intervention_manager.get_turn_taking_signal(session_id)
+
+        # Turn-taking 상태가 바뀐 경우에만 전송 (침묵 시간 필드는 비교에서 제외)
+        turn_frame = encode_turn_signal(turn_signal)
+        if turn_frame[:6] != last_turn_frame[:6]:
+            last_turn_frame = turn_frame
+            await websocket.send_bytes(turn_frame)
+
+        # 답변 말미 침묵 → 투기적 질문 초안 생성 시작
+        if (
+            not is_speech
+            and turn_signal.get("silence_duration_ms", 0) >= SPECULATIVE_SILENCE_MS
+        ):
+            _ws_session = state.get_session(session_id) or {}
+            await speculative_engine.on_silence(
+                session_id, _ws_session.get("question_count", 1)
+            )
+
+        intervention = intervention_manager.poll_intervention(session_id)
+        if intervention:
+            await websocket.send_bytes(encode_intervention(intervention))
+
     async def _send_stt_status(available: bool, reason: str = ""):
         try:
             await websocket.send_json(
@@ -8224,6 +8395,10 @@ async def websocket_interview(
                     )
 
                     if transcript:
+                        speculative_engine.on_transcript(
+                            session_id, transcript, is_final
+                        )
+
                         if SPEECH_ANALYSIS_AVAILABLE and speech_service:
                             try:
                                 speech_service.add_stt_result(
@@ -8284,6 +8459,12 @@ async def websocket_interview(
             def on_utterance_end(_utterance_end_msg) -> None:
                 try:
                     _update_stt_quality_on_utterance_end(session_id)
+                    _ws_session = state.get_session(session_id) or {}
+                    _schedule(
+                        speculative_engine.on_silence(
+                            session_id, _ws_session.get("question_count", 1)
+                        )
+                    )
                     _schedule(
                         broadcast_stt_result(
                             session_id,
@@ -8321,6 +8502,11 @@ async def websocket_interview(
             if message_type == "websocket.disconnect":
                 break
 
+            if incoming.get("bytes") is not None and is_vad_frame(incoming["bytes"]):
+                is_speech, audio_level, _seq = decode_vad_frame(incoming["bytes"])
+                await _on_vad(is_speech, audio_level)
+                continue
+
             if incoming.get("bytes") is not None:
                 # 클라이언트 PCM16(16kHz, mono) 바이너리 입력을 Deepgram으로 전달
                 if ws_dg_connection and server_stt_available:
@@ -8352,7 +8538,14 @@ async def websocket_interview(
             if data.get("type") == "ping":
                 await websocket.send_json({"type": "pong"})
             elif data.get("type") == "vad_signal":
-                pass
+                await _on_vad(
+                    bool(data.get("is_speech")), float(data.get("audio_level", 0.0))
+                )
+            elif data.get("type") == "answer_text":
+                # 브라우저 STT 확정 텍스트 — 길이/주제 이탈 개입 판단에 사용
+                intervention_manager.update_answer_text(
+                    session_id, str(data.get("text", ""))
+                )
 
     except WebSocketDisconnect:
         print(f"[WS] 세션 {session_id} WebSocket 연결 해제")
@@ -8372,6 +8565,8 @@ async def websocket_interview(
             if not state.websocket_connections[session_id]:
                 _stt_last_final_by_session.pop(session_id, None)
                 _stt_quality_by_session.pop(session_id, None)
+                speculative_engine.remove_session(session_id)
+                topic_relevance_scorer.remove_session(session_id)
         # EventBus에서 WebSocket 해제
         if EVENT_BUS_AVAILABLE and event_bus:
             event_bus.unregister_ws(session_id, websocket)
@@ -9189,6 +9384,20 @@ async def on_startup():
         except Exception as e:
             print(f"⚠️ [Startup] 코딩 문제 풀 초기화 실패 (Celery 미실행?): {e}")
 
+    # ── 화이트보드 아키텍처 문제 풀(Pool) 사전 생성 ──
+    # (카테고리, 난이도)별로 부족한 풀만 보충 태스크를 발행합니다.
+    if WHITEBOARD_AVAILABLE:
+        try:
+            from whiteboard_service import refill_all_architecture_pools
+
+            issued = await asyncio.to_thread(refill_all_architecture_pools)
+            print(
+                f"✅ [Startup] 아키텍처 문제 풀 보충 태스크 발행 완료 "
+                f"({sum(issued.values())}개, {len(issued)}개 풀)"
+            )
+        except Exception as e:
+            print(f"⚠️ [Startup] 아키텍처 문제 풀 초기화 실패 (Celery 미실행?): {e}")
+
 
 @app.on_event("shutdown")
 async def on_shutdown():
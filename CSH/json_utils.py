@@ -10,12 +10,15 @@ LLM 응답에서 JSON을 안정적으로 추출하고 파싱하는 방어 로직
 4. trailing comma, 제어문자 등 흔한 구문 오류 자동 수정
 5. 중첩된 JSON에서 가장 바깥쪽 객체/배열 추출
 6. 다단계 파싱 시도 (원본 → 정제 → 정규식 추출 → fallback)
+7. 스키마 제약 생성용 JSON Schema + 스트리밍 증분 파서 (structured_output.py에서 사용)
+8. 생성 방식별 파싱 실패율 집계 (parse_stats)
 """
 
 import re
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -239,10 +242,10 @@ def _regex_extract(text: str) -> Optional[Any]:
 
 # ==================== 편의 함수 ====================
 
-def parse_evaluation_json(text: str, context: str = "evaluation") -> Dict:
+def parse_evaluation_json(text: str, context: str = "evaluation", mode: str = "free_text") -> Dict:
     """
     답변 평가용 JSON 파싱 (scores, total_score 등 포함)
-    파싱 실패 시 안전한 기본 평가를 반환
+    파싱 실패 시 안전한 기본 평가를 반환 (mode: 파싱 통계 집계용 생성 방식)
     """
     default_eval = {
         "scores": {
@@ -262,6 +265,7 @@ def parse_evaluation_json(text: str, context: str = "evaluation") -> Dict:
     }
     
     result = resilient_json_parse(text, fallback=default_eval, expect_type=dict, context=context)
+    parse_stats.record("evaluation", mode, ok=result is not default_eval)
     
     # 필수 키 검증 및 보정
     if "scores" not in result:
@@ -279,10 +283,10 @@ def parse_evaluation_json(text: str, context: str = "evaluation") -> Dict:
     return result
 
 
-def parse_code_analysis_json(text: str, context: str = "code_analysis") -> Dict:
+def parse_code_analysis_json(text: str, context: str = "code_analysis", mode: str = "free_text") -> Dict:
     """
     코드 분석용 JSON 파싱 (overall_score, correctness 등 포함)
-    파싱 실패 시 안전한 기본 분석 결과를 반환
+    파싱 실패 시 안전한 기본 분석 결과를 반환 (mode: 파싱 통계 집계용 생성 방식)
     """
     default_analysis = {
         "overall_score": 0,
@@ -298,6 +302,7 @@ def parse_code_analysis_json(text: str, context: str = "code_analysis") -> Dict:
     }
     
     result = resilient_json_parse(text, fallback=default_analysis, expect_type=dict, context=context)
+    parse_stats.record("code_analysis", mode, ok=result is not default_analysis)
     
     # 필수 키 보정
     if "overall_score" not in result:
@@ -308,10 +313,10 @@ def parse_code_analysis_json(text: str, context: str = "code_analysis") -> Dict:
     return result
 
 
-def parse_architecture_json(text: str, context: str = "architecture") -> Dict:
+def parse_architecture_json(text: str, context: str = "architecture", mode: str = "free_text") -> Dict:
     """
     아키텍처 문제/평가용 JSON 파싱
-    파싱 실패 시 안전한 기본값 반환
+    파싱 실패 시 안전한 기본값 반환 (mode: 파싱 통계 집계용 생성 방식)
     """
     default_arch = {
         "diagram_recognition": {"components": [], "connections": [], "data_flows": []},
@@ -329,4 +334,317 @@ def parse_architecture_json(text: str, context: str = "architecture") -> Dict:
         "fallback": True
     }
     
-    return resilient_json_parse(text, fallback=default_arch, expect_type=dict, context=context)
+    result = resilient_json_parse(text, fallback=default_arch, expect_type=dict, context=context)
+    parse_stats.record("architecture", mode, ok=result is not default_arch)
+    return result
+
+
+# ==================== 파싱 성공률 통계 ====================
+
+class JSONParseStats:
+    """스키마 종류(evaluation 등) × 생성 방식(free_text / schema)별 파싱 결과 집계
+
+    free_text: 자유 텍스트로 JSON을 요청한 뒤 resilient_json_parse로 추출 (기존 방식)
+    schema:    Ollama format(JSON Schema) 제약 생성 + 스트리밍 증분 파서
+    fallback(기본값 반환)으로 끝난 호출을 파싱 실패로 집계합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, kind: str, mode: str, *, ok: bool,
+               early_stop: bool = False, field_errors: int = 0) -> None:
+        with self._lock:
+            c = self._counts.setdefault(f"{kind}:{mode}", {
+                "calls": 0, "failures": 0, "early_stops": 0, "field_errors": 0,
+            })
+            c["calls"] += 1
+            c["failures"] += 0 if ok else 1
+            c["early_stops"] += 1 if early_stop else 0
+            c["field_errors"] += field_errors
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            snapshot = {k: dict(v) for k, v in self._counts.items()}
+        for c in snapshot.values():
+            c["failure_rate"] = round(c["failures"] / c["calls"], 4) if c["calls"] else 0.0
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+parse_stats = JSONParseStats()
+
+
+# ==================== 스키마 제약 생성용 JSON Schema ====================
+# Ollama /api/chat 의 format 필드에 그대로 전달됩니다 (llama.cpp 문법 제약 생성).
+# properties 선언 순서가 곧 생성 순서이므로 프롬프트의 출력 예시와 같은 순서를 유지합니다.
+
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+
+def _score(minimum: int, maximum: int) -> Dict[str, Any]:
+    return {"type": "integer", "minimum": minimum, "maximum": maximum}
+
+
+_EVALUATION_SCORE_KEYS = ["problem_solving", "logic", "technical", "star", "communication"]
+
+EVALUATION_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "scores": {
+            "type": "object",
+            "properties": {k: _score(1, 5) for k in _EVALUATION_SCORE_KEYS},
+            "required": _EVALUATION_SCORE_KEYS,
+        },
+        "total_score": _score(5, 25),
+        "recommendation": {"type": "string", "enum": ["합격", "불합격"]},
+        "recommendation_reason": _STRING,
+        "strengths": _STRING_LIST,
+        "improvements": _STRING_LIST,
+        "brief_feedback": _STRING,
+    },
+    "required": [
+        "scores", "total_score", "recommendation", "recommendation_reason",
+        "strengths", "improvements", "brief_feedback",
+    ],
+}
+
+
+def _scored_section(maximum: int, **extra: Dict[str, Any]) -> Dict[str, Any]:
+    properties = {"score": _score(0, maximum), **extra, "feedback": _STRING}
+    return {"type": "object", "properties": properties, "required": ["score", "feedback"]}
+
+
+CODE_ANALYSIS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "overall_score": _score(0, 100),
+        "correctness": _scored_section(
+            25, passed_tests={"type": "integer"}, total_tests={"type": "integer"}),
+        "time_complexity": _scored_section(20, estimated=_STRING, optimal=_STRING),
+        "space_complexity": _scored_section(15, estimated=_STRING),
+        "code_style": _scored_section(20, issues=_STRING_LIST),
+        "comments": _scored_section(
+            10, has_comments={"type": "boolean"},
+            quality={"type": "string", "enum": ["good", "fair", "poor"]}),
+        "best_practices": _scored_section(10, followed=_STRING_LIST, missing=_STRING_LIST),
+        "feedback": _STRING_LIST,
+        "detailed_analysis": _STRING,
+    },
+    "required": [
+        "overall_score", "correctness", "time_complexity", "space_complexity",
+        "code_style", "comments", "best_practices", "feedback", "detailed_analysis",
+    ],
+}
+
+_ARCH_SCORE_KEYS = ["structure", "scalability", "security", "performance"]
+
+ARCHITECTURE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "diagram_recognition": {
+            "type": "object",
+            "properties": {
+                "components": _STRING_LIST,
+                "connections": _STRING_LIST,
+                "data_flows": _STRING_LIST,
+            },
+            "required": ["components", "connections", "data_flows"],
+        },
+        "architecture_evaluation": {
+            "type": "object",
+            "properties": {
+                field: spec
+                for key in _ARCH_SCORE_KEYS
+                for field, spec in ((f"{key}_score", _score(0, 25)), (f"{key}_comment", _STRING))
+            },
+            "required": [f"{key}_score" for key in _ARCH_SCORE_KEYS],
+        },
+        "component_analysis": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"name": _STRING, "role": _STRING, "evaluation": _STRING},
+                "required": ["name", "role", "evaluation"],
+            },
+        },
+        "strengths": _STRING_LIST,
+        "weaknesses": _STRING_LIST,
+        "feedback": _STRING_LIST,
+        "detailed_analysis": _STRING,
+    },
+    "required": [
+        "diagram_recognition", "architecture_evaluation", "component_analysis",
+        "strengths", "weaknesses", "feedback", "detailed_analysis",
+    ],
+}
+
+
+def validate_schema(value: Any, schema: Dict[str, Any], path: str = "$") -> Tuple[Any, List[str]]:
+    """JSON Schema 부분집합(type/properties/required/items/enum/minimum/maximum) 검증
+
+    숫자 범위 초과는 경계값으로 보정(clamp)하고, 타입 불일치·필수 키 누락·enum 위반만
+    오류로 반환합니다.
+
+    Returns:
+        (보정된 값, 오류 메시지 리스트)
+    """
+    errors: List[str] = []
+    expected = schema.get("type")
+
+    if expected == "object":
+        if not isinstance(value, dict):
+            return value, [f"{path}: object 기대"]
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key}: 필수 키 누락")
+        for key, sub in schema.get("properties", {}).items():
+            if key in value:
+                value[key], sub_errors = validate_schema(value[key], sub, f"{path}.{key}")
+                errors.extend(sub_errors)
+        return value, errors
+
+    if expected == "array":
+        if not isinstance(value, list):
+            return value, [f"{path}: array 기대"]
+        items = schema.get("items")
+        if items:
+            for i, item in enumerate(value):
+                value[i], sub_errors = validate_schema(item, items, f"{path}[{i}]")
+                errors.extend(sub_errors)
+        return value, errors
+
+    if expected in ("integer", "number"):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return value, [f"{path}: {expected} 기대"]
+        if expected == "integer" and isinstance(value, float):
+            value = int(round(value))
+        if "minimum" in schema:
+            value = max(schema["minimum"], value)
+        if "maximum" in schema:
+            value = min(schema["maximum"], value)
+        return value, errors
+
+    if expected == "string" and not isinstance(value, str):
+        return value, [f"{path}: string 기대"]
+    if expected == "boolean" and not isinstance(value, bool):
+        return value, [f"{path}: boolean 기대"]
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: 허용되지 않은 값 {value!r}")
+    return value, errors
+
+
+# ==================== 스트리밍 증분 파서 ====================
+
+class IncrementalJSONParser:
+    """LLM 스트리밍 청크를 받아 최상위 JSON 객체를 증분 파싱합니다.
+
+    - 최상위 필드 값이 완성될 때마다 fields에 추가하고 pop_fields()로 꺼낼 수 있어
+      생성 도중에 필드 단위 검증이 가능합니다.
+    - 최상위 객체의 닫는 괄호가 도착하면 complete=True — 호출 측은 즉시 스트림을
+      닫아 뒤따르는 공백/설명문 생성을 중단할 수 있습니다.
+    - 이미 처리한 위치(_pos)부터만 스캔하므로 전체 비용은 O(응답 길이)입니다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.complete = False
+        self.result: Optional[Any] = None
+        self.fields: Dict[str, Any] = {}
+        self.field_errors: List[str] = []
+        self._pending: List[Tuple[str, Any]] = []
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "key"  # 최상위 객체 내부: key → colon → value
+        self._key: Optional[str] = None
+        self._token_start = -1
+
+    def feed(self, chunk: str) -> bool:
+        """청크를 추가하고 최상위 객체 완성 여부를 반환합니다."""
+        if self.complete or not chunk:
+            return self.complete
+        self.text += chunk
+        text = self.text
+        i = self._pos
+        while i < len(text) and not self.complete:
+            ch = text[i]
+            if self._start < 0:
+                # 객체 시작 전 텍스트(설명문 등)는 무시
+                if ch == "{":
+                    self._start, self._depth, self._state = i, 1, "key"
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == "key":
+                        try:
+                            self._key = json.loads(text[self._token_start:i + 1])
+                        except json.JSONDecodeError:
+                            self._key = text[self._token_start + 1:i]
+                        self._state = "colon"
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state == "key":
+                    self._token_start = i
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 1:
+                    self._close_field(i)
+                    self._finish(i)
+                else:
+                    self._depth -= 1
+            elif self._depth == 1 and ch == ":" and self._state == "colon":
+                self._state, self._token_start = "value", i + 1
+            elif self._depth == 1 and ch == ",":
+                self._close_field(i)
+                self._state = "key"
+            i += 1
+        self._pos = i
+        return self.complete
+
+    def pop_fields(self) -> List[Tuple[str, Any]]:
+        """마지막 호출 이후 완성된 최상위 (키, 값) 목록을 반환합니다."""
+        pending, self._pending = self._pending, []
+        return pending
+
+    def _close_field(self, end: int) -> None:
+        if self._state != "value" or self._key is None:
+            return
+        raw = self.text[self._token_start:end].strip()
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            try:
+                value = json.loads(_apply_json_fixes(raw))
+            except json.JSONDecodeError:
+                self.field_errors.append(f"{self._key}: 값 파싱 실패")
+                self._key = None
+                return
+        self.fields[self._key] = value
+        self._pending.append((self._key, value))
+        self._key = None
+
+    def _finish(self, end: int) -> None:
+        self._depth = 0
+        self.complete = True
+        raw = self.text[self._start:end + 1]
+        try:
+            self.result = json.loads(raw)
+        except json.JSONDecodeError:
+            try:
+                self.result = json.loads(_apply_json_fixes(raw))
+            except json.JSONDecodeError:
+                # 필드 단위로는 모두 읽었으면 그것으로 객체 구성
+                self.result = dict(self.fields) if self.fields else None
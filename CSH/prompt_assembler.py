@@ -0,0 +1,280 @@
+"""
+토큰 예산 기반 프롬프트 조립기 (Prompt Assembler)
+================================================
+질문 생성 프롬프트의 각 섹션(시스템 프롬프트, 채용 공고, 대화 요약, 감정 적응,
+이력서 RAG, Q&A RAG, 대화 기록, 질문 지시)을 토큰 단위로 계량하고,
+섹션별 예산을 넘는 텍스트는 잘라서 num_ctx 안에 항상 들어가도록 조립합니다.
+
+설계 원칙:
+1. 섹션 순서 고정 — 세션 내내 변하지 않는 섹션(시스템 프롬프트, 채용 공고)을
+   앞에 두어 Ollama KV 캐시(prefix cache)가 턴 사이에 재사용되도록 함
+2. 섹션별 예산 — 긴 채용 공고/RAG 문서가 프롬프트를 잠식하지 않도록 상한 적용
+3. 대화 기록은 남은 예산 안에서 최신 메시지부터 채움 (오래된 턴은 롤링 요약으로 대체)
+4. 호출별 메트릭 — 섹션별 추정 토큰, Ollama 실측 prompt_eval_count/prefill 시간 기록
+
+토큰 수 추정:
+  EXAONE/Qwen 토크나이저를 로컬에서 로드하지 않고 문자 종류별 휴리스틱으로 추정한 뒤,
+  Ollama 응답의 prompt_eval_count(실측)로 보정 계수를 지수이동평균(EMA) 갱신합니다.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# 최근 N개 호출 메트릭만 메모리에 보관
+MAX_CALL_HISTORY = 200
+
+_HANGUL_RE = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+_ASCII_WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+_TRIM_SUFFIX = "\n…(이하 생략)"
+
+
+def estimate_tokens(text: str) -> int:
+    """문자 종류별 휴리스틱 토큰 수 추정 (보정 전 원시값)
+
+    - 한글: 음절 약 1.5자당 1토큰 (EXAONE/Qwen 한국어 어휘 기준)
+    - 영문/숫자 단어: 단어당 약 1.3토큰
+    - 그 외 기호/공백: 4자당 1토큰
+    """
+    if not text:
+        return 0
+    hangul = len(_HANGUL_RE.findall(text))
+    words = _ASCII_WORD_RE.findall(text)
+    word_chars = sum(len(w) for w in words)
+    other = max(0, len(text) - hangul - word_chars)
+    return int(hangul / 1.5 + len(words) * 1.3 + other / 4) + 1
+
+
+@dataclass
+class AssembledPrompt:
+    """조립 결과 — (종류, 내용) 메시지 목록과 섹션별 토큰 계량값"""
+
+    messages: List[Tuple[str, str]]  # kind: "system" | "ai" | "human"
+    section_tokens: Dict[str, int] = field(default_factory=dict)
+    total_tokens: int = 0
+    trimmed_sections: List[str] = field(default_factory=list)
+    history_kept: int = 0
+    history_dropped: int = 0
+
+    def to_messages(self, system_cls, human_cls, ai_cls) -> list:
+        """LangChain Message 객체 목록으로 변환합니다."""
+        factory = {"system": system_cls, "human": human_cls, "ai": ai_cls}
+        return [factory[kind](content=content) for kind, content in self.messages]
+
+
+class PromptAssembler:
+    """섹션별 토큰 예산을 적용하는 프롬프트 조립기 (Thread-Safe 메트릭)"""
+
+    # 섹션 고정 순서 (prefix cache 재사용을 위해 변하지 않는 섹션이 앞쪽)
+    SECTION_ORDER = (
+        "system",
+        "job_posting",
+        "conversation_summary",
+        "emotion",
+        "resume_rag",
+        "qa_rag",
+    )
+
+    def __init__(
+        self,
+        num_ctx: int,
+        *,
+        output_reserve: int = 1024,
+        section_budgets: Optional[Dict[str, int]] = None,
+        max_history_messages: int = 10,
+    ):
+        self.num_ctx = num_ctx
+        self.output_reserve = output_reserve
+        self.section_budgets = dict(section_budgets or {})
+        self.max_history_messages = max_history_messages
+
+        self._lock = threading.Lock()
+        # 실측(prompt_eval_count) / 추정 토큰 비율 EMA
+        self._calibration = 1.0
+        self._calls: deque = deque(maxlen=MAX_CALL_HISTORY)
+        self._totals: Dict[str, float] = {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "cached_prefix_calls": 0,
+            "prefill_ms": 0.0,
+            "prefill_samples": 0,
+            "trimmed_calls": 0,
+        }
+
+    # ───────── 토큰 계량 / 자르기 ─────────
+
+    def count_tokens(self, text: str) -> int:
+        """보정 계수를 적용한 토큰 수 추정"""
+        return int(estimate_tokens(text) * self._calibration)
+
+    def trim(self, text: str, max_tokens: Optional[int]) -> str:
+        """텍스트를 max_tokens 이하로 자릅니다 (줄/문장 경계 우선, 앞부분 유지)."""
+        if not text or max_tokens is None or self.count_tokens(text) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+
+        # 이분 탐색으로 예산 안에 들어가는 최대 문자 길이 탐색
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.count_tokens(text[:mid] + _TRIM_SUFFIX) <= max_tokens:
+                lo = mid
+            else:
+                hi = mid - 1
+        cut = text[:lo]
+
+        # 절반 이상 남는 범위에서 줄바꿈/문장 끝 경계로 정리
+        boundary = max(cut.rfind("\n"), cut.rfind(". "), cut.rfind("다."))
+        if boundary >= len(cut) // 2:
+            cut = cut[: boundary + 1]
+        return cut.rstrip() + _TRIM_SUFFIX
+
+    # ───────── 조립 ─────────
+
+    def assemble(
+        self,
+        sections: Dict[str, Union[str, Tuple[str, str]]],
+        history: List[Dict[str, Any]],
+        question_prompt: str,
+    ) -> AssembledPrompt:
+        """섹션 + 대화 기록 + 질문 지시를 토큰 예산 안에서 조립합니다.
+
+        Args:
+            sections: {섹션명: 본문 또는 (래퍼, 본문)} — SECTION_ORDER 순서로 배치.
+                      (래퍼, 본문) 형태면 본문만 섹션 예산으로 자른 뒤 래퍼의
+                      "{body}" 자리에 넣어 머리말/지시문이 잘리지 않도록 합니다.
+                      본문이 비어 있으면 섹션 자체를 생략합니다.
+            history: session["chat_history"] 형식의 dict 리스트
+            question_prompt: 마지막 HumanMessage로 들어갈 질문 생성 지시
+        """
+        result = AssembledPrompt(messages=[])
+        budget = self.num_ctx - self.output_reserve
+
+        for name in self.SECTION_ORDER:
+            spec = sections.get(name)
+            wrapper, body = spec if isinstance(spec, tuple) else ("{body}", spec)
+            if not body:
+                continue
+            trimmed = self.trim(body, self.section_budgets.get(name))
+            if trimmed != body:
+                result.trimmed_sections.append(name)
+            content = wrapper.replace("{body}", trimmed)
+            tokens = self.count_tokens(content)
+            result.messages.append(("system", content))
+            result.section_tokens[name] = tokens
+            budget -= tokens
+
+        prompt_tokens = self.count_tokens(question_prompt)
+        result.section_tokens["question_prompt"] = prompt_tokens
+        budget -= prompt_tokens
+
+        # 대화 기록: 최신 메시지부터 남은 예산 안에서 채움
+        recent = history[-self.max_history_messages :] if history else []
+        kept: List[Tuple[str, str]] = []
+        history_tokens = 0
+        for msg in reversed(recent):
+            role = msg.get("role", "")
+            if role not in ("assistant", "user"):
+                continue
+            content = msg.get("content", "")
+            tokens = self.count_tokens(content)
+            if history_tokens + tokens > budget:
+                break
+            kept.append(("ai" if role == "assistant" else "human", content))
+            history_tokens += tokens
+        kept.reverse()
+
+        result.messages.extend(kept)
+        result.messages.append(("human", question_prompt))
+        result.section_tokens["history"] = history_tokens
+        result.history_kept = len(kept)
+        result.history_dropped = len(history or []) - len(kept)
+        result.total_tokens = sum(result.section_tokens.values())
+        return result
+
+    # ───────── 메트릭 ─────────
+
+    def record_call(
+        self,
+        assembled: AssembledPrompt,
+        response_metadata: Optional[Dict[str, Any]] = None,
+        *,
+        session_id: str = "",
+        elapsed_ms: float = 0.0,
+    ) -> Dict[str, Any]:
+        """LLM 호출 1회의 토큰/prefill 메트릭을 기록하고 보정 계수를 갱신합니다.
+
+        Ollama 응답 메타데이터:
+          prompt_eval_count    — 실제 prefill 토큰 수 (prefix cache 적중분은 제외됨)
+          prompt_eval_duration — prefill 소요 시간 (ns)
+          eval_count           — 생성 토큰 수
+        """
+        meta = response_metadata or {}
+        actual_prompt = meta.get("prompt_eval_count")
+        prefill_ns = meta.get("prompt_eval_duration")
+        prefill_ms = round(prefill_ns / 1e6, 1) if prefill_ns else None
+
+        record = {
+            "session_id": session_id[:8],
+            "timestamp": time.time(),
+            "estimated_tokens": assembled.total_tokens,
+            "section_tokens": dict(assembled.section_tokens),
+            "trimmed_sections": list(assembled.trimmed_sections),
+            "history_kept": assembled.history_kept,
+            "history_dropped": assembled.history_dropped,
+            "prompt_eval_count": actual_prompt,
+            "prefill_ms": prefill_ms,
+            "eval_count": meta.get("eval_count"),
+            "elapsed_ms": round(elapsed_ms, 1),
+        }
+
+        with self._lock:
+            self._calls.append(record)
+            self._totals["calls"] += 1
+            self._totals["prompt_tokens"] += assembled.total_tokens
+            if assembled.trimmed_sections:
+                self._totals["trimmed_calls"] += 1
+            if prefill_ms is not None:
+                self._totals["prefill_ms"] += prefill_ms
+                self._totals["prefill_samples"] += 1
+            if actual_prompt and assembled.total_tokens:
+                # prefix cache 적중 시 prompt_eval_count가 추정치보다 크게 작아짐
+                # → 보정 계수 학습에서 제외하고 캐시 적중 횟수로 집계
+                ratio = actual_prompt / assembled.total_tokens
+                if ratio < 0.5:
+                    self._totals["cached_prefix_calls"] += 1
+                else:
+                    raw = ratio * self._calibration
+                    self._calibration = 0.8 * self._calibration + 0.2 * raw
+        return record
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """/api/monitoring/prompt 대시보드용 메트릭"""
+        with self._lock:
+            totals = dict(self._totals)
+            recent = list(self._calls)[-20:]
+            calibration = self._calibration
+        calls = int(totals["calls"])
+        samples = int(totals["prefill_samples"])
+        return {
+            "num_ctx": self.num_ctx,
+            "output_reserve": self.output_reserve,
+            "section_budgets": dict(self.section_budgets),
+            "calibration": round(calibration, 3),
+            "summary": {
+                "calls": calls,
+                "avg_estimated_tokens": (
+                    round(totals["prompt_tokens"] / calls, 1) if calls else 0
+                ),
+                "avg_prefill_ms": (
+                    round(totals["prefill_ms"] / samples, 1) if samples else None
+                ),
+                "trimmed_calls": int(totals["trimmed_calls"]),
+                "cached_prefix_calls": int(totals["cached_prefix_calls"]),
+            },
+            "recent_calls": recent,
+        }
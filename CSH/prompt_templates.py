@@ -104,3 +104,29 @@ def build_question_prompt(
 {"마지막 질문이니 마무리 질문을 해주세요." if question_count == max_questions - 1 else ""}
 질문만 작성하세요. 부가 설명은 필요 없습니다. 여러 질문을 나열하지 마세요.
 반드시 한국어로 질문하세요."""
+
+
+CONVERSATION_SUMMARY_PROMPT = """당신은 면접 기록을 정리하는 보조자입니다.
+아래 [기존 요약]과 [새 대화]를 합쳐, 면접관이 다음 질문을 만들 때 참고할 수 있도록
+지원자가 언급한 기술·경험·프로젝트·수치와 이미 다룬 주제를 한국어로 간결하게 요약하세요.
+
+[작성 규칙]
+- 5줄 이내의 글머리표(-)로만 작성하세요.
+- 면접관의 질문 문장은 옮기지 말고, 지원자의 답변 핵심과 다룬 주제만 남기세요.
+- 대화에 없는 내용을 추측하여 추가하지 마세요."""
+
+
+def build_summary_prompt(previous_summary: str, dialogue: str) -> str:
+    """롤링 대화 요약 갱신용 사용자 프롬프트를 반환합니다.
+
+    Args:
+        previous_summary: 지금까지 누적된 요약 (없으면 빈 문자열)
+        dialogue: 새로 요약에 편입할 대화 구간 ("면접관: ...\\n지원자: ..." 형식)
+    """
+    return f"""[기존 요약]
+{previous_summary or "(없음)"}
+
+[새 대화]
+{dialogue}
+
+위 내용을 합친 갱신된 요약만 출력하세요."""
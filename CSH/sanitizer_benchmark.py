@@ -0,0 +1,196 @@
+"""
+CodeSanitizer 허용/차단 코퍼스 검증 + 성능 벤치마크
+==================================================
+실행:
+    python sanitizer_benchmark.py
+    python sanitizer_benchmark.py --repeat 200 --size-kb 60
+
+1) 코퍼스: 언어별로 허용(ALLOWED)/차단(BLOCKED)되어야 하는 코드 샘플을 검사합니다.
+   - 기존 정규식 방식에서 오탐이던 코드(문자열 속 "socket", re.compile 등)는 허용 목록에 포함
+   - 하나라도 기대와 다르면 종료 코드 1
+2) 벤치마크: 큰 제출 코드를 기준으로 비교합니다.
+   - legacy : 규칙별 re.search 반복 (변경 전 방식)
+   - cold   : 식별자 1회 스캔 + 관련 규칙만 검사 (캐시 비움)
+   - python+os : "import os"가 있어 AST 검사까지 수행하는 경우
+   - warm   : 같은 코드 재검사 (소스 해시 메모이제이션, 테스트 케이스별 execute 호출에 해당)
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+
+from code_execution_service import CodeSanitizer
+
+ALLOWED = {
+    "python": [
+        "n = int(input())\nprint(sum(map(int, input().split())))",
+        "import re\npattern = re.compile(r'\\d+')\nprint(pattern.findall(input()))",
+        "import os\nprint(os.path.join('a', 'b'))",
+        "print('socket programming is fun')  # subprocess 언급은 문자열/주석일 뿐",
+        "def compile(tokens):\n    return ' '.join(tokens)\nprint(compile(['a', 'b']))",
+        "from collections import deque\nimport heapq, sys\ninput = sys.stdin.readline\nq = deque([1])\nprint(q.popleft())",
+        "def apply(fn, compile):\n    return fn(compile)\nprint(apply(len, 'abc'))",
+        "def exec(cmd):\n    return cmd\nprint(exec('ok'))",
+        "with open('input.txt') as f:\n    pass",
+    ],
+    "javascript": [
+        "const lines = require('readline');\nconsole.log(1);",
+        "// require('child_process') 는 주석이므로 허용\nconsole.log('eval(' + 1 + ')');",
+        "const obj = { eval(x) { return x; } };\nconsole.log(obj.eval(3));",
+        "const processed = [1, 2].map(x => x * 2);\nconsole.log(processed);",
+        "const s = \"process.exit\";\nconsole.log(s.length);",
+        "const r = /'/g;\nconsole.log(\"it's\".replace(r, ''));",
+    ],
+    "java": [
+        "import java.util.*;\npublic class Solution { public static void main(String[] a) { Scanner sc = new Scanner(System.in); System.out.println(sc.nextInt()); } }",
+    ],
+    "c": [
+        "#include <stdio.h>\nint main(){int n; scanf(\"%d\", &n); printf(\"%d\\n\", n*2); return 0;}",
+    ],
+    "cpp": [
+        "#include <bits/stdc++.h>\nusing namespace std;\nint main(){vector<int> v{3,1,2}; sort(v.begin(), v.end()); cout << v[0];}",
+    ],
+}
+
+BLOCKED = {
+    "python": [
+        "import subprocess\nsubprocess.run(['ls'])",
+        "import os as o\no.system('ls')",
+        "from os import system\nsystem('ls')",
+        "import os\nf = os.popen",
+        "import http.client",
+        "from urllib.request import urlopen",
+        "eval(input())",
+        "x = __import__('os')",
+        "import importlib\nimportlib.import_module('subprocess')",
+        "run = exec\nrun('print(1)')",
+        "open('/etc/passwd').read()",
+        "import ctypes",
+        "import builtins\nbuiltins.exec('print(1)')",
+        "import builtins\nbuiltins.__import__('subprocess')",
+        "import sys\nsys.modules['builtins'].exec('1')",
+        "from importlib import __import__ as imp\nimp('os')",
+        "getattr(__builtins__, 'exec')('1')",
+        "class Evaluator:\n    def eval(self, x):\n        return x\nEvaluator().eval(3)",
+        # 다른 스코프의 가려짐은 모듈 수준 내장 함수 사용에 영향 없음
+        "def f(exec):\n    pass\nexec('print(1)')",
+        "def f():\n    compile = len\nprint(compile('1', '', 'exec'))",
+        "def g():\n    return eval('1')\ndef eval(x):\n    return x",
+        "if False:\n    def exec(x):\n        pass\nexec('print(1)')",
+        "import re\nre = __import__('builtins')\nre.compile('1', '', 'exec')",
+        "open(f'/etc/passwd')",
+        "p = 'passwd'\nopen(f'/etc/{p}')",
+        # 문법 오류 코드는 정규식 검사로 대체
+        "import socket\nprint(",
+    ],
+    "javascript": [
+        "const cp = require('child_process');",
+        "const fs = require(\"node:fs\");",
+        "import fs from 'fs';",
+        "import { readFileSync } from 'fs/promises';",
+        "const m = await import('os');",
+        "eval('1+1');",
+        "globalThis.eval('1');",
+        "new Function('return 1')();",
+        "process.exit(1);",
+        "console.log(`${eval('1')}`);",
+        "const r = /'/; const cp = require('child_process');",
+        "const r = /[\"/]/; require(\"fs\");",
+        "let x = a\n/'/.test(s); require('fs');",
+    ],
+    "java": [
+        "Runtime.getRuntime().exec(\"ls\");",
+        "new java.net.Socket(\"a\", 80);",
+        "System.exit(0);",
+        "new FileReader(\"x\");",
+    ],
+    "c": [
+        "#include <unistd.h>\nint main(){fork();}",
+        "int main(){system(\"ls\");}",
+    ],
+    "cpp": [
+        "#include <filesystem>\nint main(){std::filesystem::remove(\"a\");}",
+        "int main(){popen(\"ls\", \"r\");}",
+    ],
+}
+
+
+def legacy_sanitize(code: str, language: str):
+    """변경 전 방식: 규칙마다 정규식 전체 스캔"""
+    for pattern, message in CodeSanitizer.DANGEROUS_PATTERNS.get(language, []):
+        match = re.search(pattern, code, re.IGNORECASE)
+        if match:
+            return False, message
+    return True, None
+
+
+def check_corpus() -> int:
+    failures = 0
+    for expected_safe, corpus in ((True, ALLOWED), (False, BLOCKED)):
+        for language, samples in corpus.items():
+            for code in samples:
+                safe, message = CodeSanitizer.sanitize(code, language)
+                if safe != expected_safe:
+                    failures += 1
+                    label = "허용" if expected_safe else "차단"
+                    print(f"❌ [{language}] {label} 기대: {code[:60]!r} → {message}")
+    total = sum(len(v) for v in ALLOWED.values()) + sum(len(v) for v in BLOCKED.values())
+    print(f"✅ 코퍼스 {total - failures}/{total} 통과" if not failures else f"❌ 코퍼스 {failures}개 실패")
+    return failures
+
+
+def large_submission(language: str, size_kb: int) -> str:
+    unit = {
+        "python": "def f{i}(xs):\n    seen = {{}}\n    for i, x in enumerate(xs):\n        seen[x] = i\n    return sorted(seen)\n\n",
+        "javascript": "function f{i}(xs) {{\n  const seen = new Map();\n  xs.forEach((x, i) => seen.set(x, i));\n  return [...seen.keys()].sort();\n}}\n",
+        "java": "    static int f{i}(int[] xs) {{ int s = 0; for (int x : xs) s += x; return s; }}\n",
+    }[language]
+    parts, size, i = [], 0, 0
+    while size < size_kb * 1024:
+        chunk = unit.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    return "".join(parts)
+
+
+def bench(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def run_benchmark(repeat: int, size_kb: int) -> dict:
+    results = {}
+    for name in ("python", "python+os", "javascript", "java"):
+        language = name.split("+")[0]
+        code = large_submission(language, size_kb)
+        if name == "python+os":
+            code = "import os\n" + code
+
+        def cold():
+            CodeSanitizer._cache.clear()
+            CodeSanitizer.sanitize(code, language)
+
+        CodeSanitizer.sanitize(code, language)
+        results[name] = {
+            "size_kb": round(len(code) / 1024, 1),
+            "legacy_ms": round(bench(lambda: legacy_sanitize(code, language), repeat), 3),
+            "cold_ms": round(bench(cold, repeat), 3),
+            "warm_ms": round(bench(lambda: CodeSanitizer.sanitize(code, language), repeat), 4),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CodeSanitizer 코퍼스 검증 + 벤치마크")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--size-kb", type=int, default=60)
+    args = parser.parse_args()
+
+    failed = check_corpus()
+    print(json.dumps(run_benchmark(args.repeat, args.size_kb), ensure_ascii=False, indent=2))
+    sys.exit(1 if failed else 0)
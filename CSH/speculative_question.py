@@ -0,0 +1,331 @@
+"""
+투기적(Speculative) 다음 질문 사전 생성 엔진
+==========================================
+지원자의 답변이 끝나갈 무렵(침묵 감지) 안정된 STT 전사 접두사(stable prefix)로
+RAG 검색과 다음 질문 초안(draft)을 미리 생성해 두고, 최종 답변이 도착하면
+초안을 검증하여 즉시 제공(hit)하거나 폐기(miss)합니다.
+
+동작 흐름:
+1. on_transcript()  — Deepgram interim/final 결과로 세션별 안정 접두사 갱신
+2. on_silence()     — UtteranceEnd / VAD 침묵 감지 시 초안 생성 태스크 시작
+3. take_draft()     — 최종 답변과 접두사 유사도(SequenceMatcher)가 임계값 이상이면
+                      초안 반환, 아니면 폐기 후 낭비된 GPU 시간 기록
+4. get_stats()      — 적중률(hit rate), 미스로 낭비된 LLM 생성 시간 통계
+
+안정 접두사 규칙:
+- final 결과는 모두 확정 구간으로 누적
+- interim 결과는 직전 interim과 공통 어절 접두사만 "안정"으로 간주
+  (Deepgram은 마지막 1~2어절을 자주 고쳐 쓰기 때문)
+
+모든 공개 메서드는 Deepgram 콜백 스레드에서도 호출될 수 있으므로
+세션 상태는 threading.Lock으로 보호합니다.
+"""
+
+import asyncio
+import difflib
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# 초안 생성기 시그니처: (session_id, stable_prefix) -> {"question", "needs_follow_up", "llm_ms"}
+DraftGenerator = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+
+def _normalize(text: str) -> str:
+    """유사도 비교용 정규화 (공백/문장부호 제거, 소문자)"""
+    return re.sub(r"[\s.,!?。！？]+", "", (text or "").lower())
+
+
+def _common_word_prefix(a: str, b: str) -> str:
+    """두 전사 결과의 공통 어절 접두사를 반환합니다."""
+    a_words = a.split()
+    b_words = b.split()
+    common: List[str] = []
+    for left, right in zip(a_words, b_words):
+        if left != right:
+            break
+        common.append(left)
+    return " ".join(common)
+
+
+@dataclass
+class _SpeculationState:
+    """세션별 투기적 생성 상태"""
+
+    final_segments: List[str] = field(default_factory=list)
+    last_interim: str = ""
+    stable_interim: str = ""
+    prefix: str = ""  # 초안 생성에 사용한 접두사
+    question_count: Optional[int] = None  # 초안 생성 시점의 질문 번호
+    rag: Optional[tuple] = None  # (resume_context, qa_context)
+    task: Optional[asyncio.Task] = None
+    started_at: float = 0.0
+
+    def stable_prefix(self) -> str:
+        parts = list(self.final_segments)
+        if self.stable_interim:
+            parts.append(self.stable_interim)
+        return " ".join(p for p in parts if p).strip()
+
+
+class SpeculativeQuestionEngine:
+    """침묵 감지 기반 다음 질문 투기적 생성기 (Thread-Safe)"""
+
+    def __init__(
+        self,
+        generator: DraftGenerator,
+        *,
+        enabled: bool = True,
+        similarity_threshold: float = 0.85,
+        min_prefix_chars: int = 20,
+    ):
+        self._generator = generator
+        self.enabled = enabled
+        self.similarity_threshold = similarity_threshold
+        self.min_prefix_chars = min_prefix_chars
+
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, _SpeculationState] = {}
+
+        # 통계 (hit rate / 낭비된 GPU 시간)
+        self._stats: Dict[str, float] = {
+            "started": 0,
+            "hits": 0,
+            "misses": 0,
+            "rag_reused": 0,
+            "generation_errors": 0,
+            "saved_ms": 0.0,
+            "wasted_gpu_ms": 0.0,
+        }
+
+    # ───────── STT 입력 ─────────
+
+    def on_transcript(self, session_id: str, transcript: str, is_final: bool) -> None:
+        """Deepgram 메시지로 안정 접두사를 갱신합니다 (콜백 스레드에서 호출 가능)."""
+        if not self.enabled or not transcript:
+            return
+        text = transcript.strip()
+        if not text:
+            return
+        with self._lock:
+            spec = self._sessions.setdefault(session_id, _SpeculationState())
+            if is_final:
+                spec.final_segments.append(text)
+                spec.last_interim = ""
+                spec.stable_interim = ""
+            else:
+                spec.stable_interim = _common_word_prefix(spec.last_interim, text)
+                spec.last_interim = text
+
+    def reset(self, session_id: str) -> None:
+        """새 질문이 출제되면 이전 턴의 접두사와 초안을 폐기합니다."""
+        with self._lock:
+            spec = self._sessions.pop(session_id, None)
+        if spec:
+            self._discard(spec, reason="turn_reset")
+
+    def remove_session(self, session_id: str) -> None:
+        """세션 종료 시 상태를 정리합니다."""
+        self.reset(session_id)
+
+    # ───────── 초안 생성 ─────────
+
+    async def on_silence(
+        self, session_id: str, question_count: Optional[int] = None
+    ) -> None:
+        """침묵 감지 시 안정 접두사로 초안 생성을 시작합니다.
+
+        이미 동일 접두사로 생성 중/완료된 초안이 있으면 재시작하지 않으며,
+        접두사가 늘어난 경우 이전 초안을 폐기하고 새로 생성합니다.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            spec = self._sessions.get(session_id)
+            if spec is None:
+                return
+            prefix = spec.stable_prefix()
+            if len(_normalize(prefix)) < self.min_prefix_chars:
+                return
+            if spec.task is not None and spec.prefix == prefix:
+                return
+            previous_task = spec.task
+            previous_started = spec.started_at
+            spec.prefix = prefix
+            spec.rag = None
+            spec.question_count = question_count
+            spec.started_at = time.perf_counter()
+            spec.task = asyncio.ensure_future(self._generator(session_id, prefix))
+            self._stats["started"] += 1
+
+        if previous_task is not None:
+            self._record_waste(previous_task, previous_started)
+        print(
+            f"🔮 [Speculative] 세션 {session_id[:8]}... 초안 생성 시작 "
+            f"(접두사 {len(prefix)}자)"
+        )
+
+    def _similar(self, prefix: str, final_answer: str) -> float:
+        return difflib.SequenceMatcher(
+            None, _normalize(prefix), _normalize(final_answer)
+        ).ratio()
+
+    def _match(
+        self, session_id: str, final_answer: str, question_count: Optional[int]
+    ) -> Optional[_SpeculationState]:
+        with self._lock:
+            spec = self._sessions.get(session_id)
+            if spec is None or spec.task is None:
+                return None
+            if (
+                question_count is not None
+                and spec.question_count is not None
+                and spec.question_count != question_count
+            ):
+                return None
+            if self._similar(spec.prefix, final_answer) < self.similarity_threshold:
+                return None
+            return spec
+
+    def store_rag(self, session_id: str, prefix: str, contexts: tuple) -> None:
+        """초안 생성기가 RAG 검색을 마치면 결과를 보관합니다 (LLM 완료 전 재사용 가능)."""
+        with self._lock:
+            spec = self._sessions.get(session_id)
+            if spec is not None and spec.prefix == prefix:
+                spec.rag = contexts
+
+    def peek_rag(self, session_id: str, final_answer: str) -> Optional[tuple]:
+        """초안 생성에 사용된 RAG 컨텍스트를 재사용합니다 (초안은 소비하지 않음).
+
+        Returns:
+            (resume_context, qa_context) 또는 None
+        """
+        if not self.enabled:
+            return None
+        spec = self._match(session_id, final_answer, None)
+        if spec is None or spec.rag is None:
+            return None
+        with self._lock:
+            self._stats["rag_reused"] += 1
+        return spec.rag
+
+    async def take_draft(
+        self,
+        session_id: str,
+        final_answer: str,
+        *,
+        needs_follow_up: Optional[bool] = None,
+        question_count: Optional[int] = None,
+        wait_timeout: float = 0.0,
+    ) -> Optional[str]:
+        """최종 답변으로 초안을 검증하여 적중 시 질문을, 아니면 None을 반환합니다.
+
+        Args:
+            final_answer: 최종 전사(또는 사용자가 제출한) 답변
+            needs_follow_up: 본 경로에서 판단한 꼬리질문 여부 — 초안과 다르면 폐기
+            question_count: 현재 질문 번호 — 초안 생성 시점과 다르면 폐기
+            wait_timeout: 초안이 아직 생성 중일 때 기다릴 최대 시간(초)
+        """
+        if not self.enabled:
+            return None
+
+        spec = self._match(session_id, final_answer, question_count)
+        if spec is None:
+            with self._lock:
+                stale = self._sessions.pop(session_id, None)
+                if stale and stale.task is not None:
+                    self._stats["misses"] += 1
+            if stale:
+                self._discard(stale, reason="mismatch")
+            return None
+
+        draft: Optional[Dict[str, Any]] = None
+        try:
+            draft = await asyncio.wait_for(asyncio.shield(spec.task), wait_timeout)
+        except asyncio.TimeoutError:
+            draft = None
+        except Exception as e:
+            print(f"⚠️ [Speculative] 초안 생성 실패: {e}")
+            with self._lock:
+                self._stats["generation_errors"] += 1
+
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+        question = (draft or {}).get("question", "")
+        if (
+            not question
+            or needs_follow_up is not None
+            and bool(draft.get("needs_follow_up")) != bool(needs_follow_up)
+        ):
+            with self._lock:
+                self._stats["misses"] += 1
+            self._discard(spec, reason="not_ready" if not draft else "route_mismatch")
+            return None
+
+        with self._lock:
+            self._stats["hits"] += 1
+            self._stats["saved_ms"] += float(draft.get("llm_ms", 0.0))
+        print(
+            f"⚡ [Speculative] 세션 {session_id[:8]}... 초안 적중 "
+            f"(LLM {draft.get('llm_ms', 0.0):.0f}ms 절약)"
+        )
+        return question
+
+    # ───────── 폐기 / 통계 ─────────
+
+    def _discard(self, spec: _SpeculationState, reason: str) -> None:
+        if spec.task is None:
+            return
+        self._record_waste(spec.task, spec.started_at)
+        print(f"🗑️ [Speculative] 초안 폐기 (reason={reason})")
+
+    def _record_waste(self, task: asyncio.Task, started_at: float) -> None:
+        """미스된 초안의 LLM 생성 시간을 낭비 시간으로 기록합니다.
+
+        실행 중인 초안은 Executor 스레드에서 계속 GPU를 점유하므로
+        취소하지 않고 완료 시점에 소요 시간을 합산합니다.
+        """
+
+        def _accumulate(done: asyncio.Future) -> None:
+            spent_ms = (time.perf_counter() - started_at) * 1000
+            try:
+                result = done.result() if not done.cancelled() else None
+                if result and result.get("llm_ms") is not None:
+                    spent_ms = float(result["llm_ms"])
+            except Exception:
+                pass
+            with self._lock:
+                self._stats["wasted_gpu_ms"] += spent_ms
+
+        if task.done():
+            _accumulate(task)
+        else:
+            task.add_done_callback(_accumulate)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중률 및 낭비된 GPU 시간 통계를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            active = sum(1 for s in self._sessions.values() if s.task is not None)
+        decided = stats["hits"] + stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "similarity_threshold": self.similarity_threshold,
+            "started": int(stats["started"]),
+            "hits": int(stats["hits"]),
+            "misses": int(stats["misses"]),
+            "hit_rate": round(stats["hits"] / decided, 3) if decided else None,
+            "rag_reused": int(stats["rag_reused"]),
+            "generation_errors": int(stats["generation_errors"]),
+            "saved_llm_ms": round(stats["saved_ms"], 1),
+            "wasted_gpu_ms": round(stats["wasted_gpu_ms"], 1),
+            "active_drafts": active,
+        }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
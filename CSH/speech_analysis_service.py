@@ -12,15 +12,26 @@ REQ-F-006 구현: 발화 속도 및 발음 명확성 측정
 데이터 소스:
   - Deepgram STT의 words 배열 (단어별 start/end/confidence)
   - InterventionManager의 턴 시작/종료 시간
+
+저장 방식:
+  - interim 결과는 저장하지 않고 is_final 단어만 start 시각 기준으로 한 번씩 저장
+  - 단어 start/end/confidence는 array('d') 버퍼에 보관 (턴당 단어 수에 비례하는 고정 크기)
+  - 침묵/confidence/발화 속도는 final 단어가 들어올 때 누적 계산
+  - 세션 통계는 턴 종료 시 누적 집계에 더해 두므로 get_session_stats는 턴 수와 무관
 """
 
 from __future__ import annotations
 
 import re
+import math
 import time
-import statistics
+from array import array
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from answer_analytics import analyze_answer
 
 
 # ========== 한국어 음절 수 계산 ==========
@@ -62,7 +73,7 @@ class SpeechTurnMetrics:
     speech_rate_spm: float = 0.0   # 분당 음절 수 (Syllables Per Minute)
     speech_rate_wpm: float = 0.0   # 분당 어절 수 (Words Per Minute)
     avg_confidence: float = 0.0    # 평균 STT confidence
-    word_confidences: List[float] = field(default_factory=list)
+    word_confidences: Sequence[float] = field(default_factory=lambda: array('d'))
     filler_count: int = 0          # 필러(음... 어...) 횟수
     pause_count: int = 0           # 1초 이상 침묵 횟수
     pause_durations: List[float] = field(default_factory=list)  # 침묵 지속시간 목록
@@ -112,20 +123,13 @@ class SessionSpeechStats:
 
 # ========== 필러 감지 ==========
 
-# 한국어 필러 (간투사) 패턴
-FILLER_PATTERNS = [
-    r'\b(음+|어+|아+|으+|에+|그+)\b',
-    r'(음\.\.\.|어\.\.\.|아\.\.\.|으\.\.\.)',
-    r'\b(저기|그러니까|뭐랄까|있잖아|그니까|솔직히|약간)\b',
-]
-
-
 def count_fillers(text: str) -> int:
-    """필러/간투사 횟수 계산"""
-    count = 0
-    for pattern in FILLER_PATTERNS:
-        count += len(re.findall(pattern, text, re.IGNORECASE))
-    return count
+    """필러/간투사 횟수 계산
+
+    answer_analytics의 필러 규칙(FILLER_*)을 단일 스캔 오토마톤으로 계산하며,
+    결과는 답변 해시로 캐싱되어 리포트/평가 경로와 공유됩니다.
+    """
+    return analyze_answer(text).filler_count
 
 
 # ========== 등급 계산 ==========
@@ -174,6 +178,196 @@ def grade_pronunciation(confidence: float) -> tuple[str, str]:
         return "D", f"발음 명확도 {confidence:.1%} — 상당 부분 인식이 어렵습니다. 발음과 발성 훈련을 권장합니다."
 
 
+# ========== 턴/세션 누적 버퍼 ==========
+
+PAUSE_THRESHOLD_SEC = 1.0  # 이 이상 단어 사이가 비면 침묵으로 집계
+
+
+class _TurnWordBuffer:
+    """한 턴의 final 단어 버퍼. 단어가 들어올 때마다 침묵/confidence/음절 수를 누적합니다."""
+
+    __slots__ = (
+        "starts", "ends", "confs", "_by_start", "conf_sum", "conf_count",
+        "pauses", "in_order", "last_start", "last_end", "first_start",
+        "syllables", "words",
+    )
+
+    def __init__(self):
+        self.starts = array('d')
+        self.ends = array('d')
+        self.confs = array('d')          # confidence > 0인 값만 (타임스탬프 없는 단어 포함)
+        self._by_start: Dict[int, int] = {}   # start(ms) -> confs 인덱스
+        self.conf_sum = 0.0
+        self.conf_count = 0
+        self.pauses = array('d')
+        self.in_order = True             # 단어가 시간 순으로 들어왔는지 (아니면 종료 시 재계산)
+        self.last_start = 0.0
+        self.last_end = 0.0
+        self.first_start = 0.0
+        self.syllables = 0
+        self.words = 0
+
+    def add_confidence(self, conf: float) -> None:
+        if conf > 0:
+            self.confs.append(conf)
+            self.conf_sum += conf
+            self.conf_count += 1
+
+    def add_word(self, text: str, start: float, end: float, conf: float) -> None:
+        if not (start > 0 and end > 0):
+            # 타임스탬프가 없으면 confidence만 반영
+            self.add_confidence(conf)
+            return
+
+        key = int(round(start * 1000))
+        idx = self._by_start.get(key)
+        if idx is not None:
+            # 같은 단어가 다시 확정된 경우: confidence만 교체하고 중복 저장하지 않음
+            if conf > 0 and idx >= 0:
+                self.conf_sum += conf - self.confs[idx]
+                self.confs[idx] = conf
+            return
+
+        if conf > 0:
+            self._by_start[key] = len(self.confs)
+            self.add_confidence(conf)
+        else:
+            self._by_start[key] = -1
+
+        if not self.starts:
+            self.first_start = start
+        elif start < self.last_start:
+            self.in_order = False
+        elif self.in_order:
+            gap = start - self.last_end
+            if gap >= PAUSE_THRESHOLD_SEC:
+                self.pauses.append(round(gap, 2))
+
+        self.starts.append(start)
+        self.ends.append(end)
+        self.last_start = max(self.last_start, start)
+        self.last_end = max(self.last_end, end)
+        self.first_start = min(self.first_start, start)
+        self.syllables += count_syllables_ko(text)
+        self.words += 1
+
+    def pause_durations(self) -> List[float]:
+        if self.in_order:
+            return list(self.pauses)
+        # 순서가 뒤섞여 들어온 드문 경우만 한 번 정렬해서 재계산
+        starts = np.frombuffer(self.starts, dtype=np.float64)
+        ends = np.frombuffer(self.ends, dtype=np.float64)
+        order = np.argsort(starts, kind="stable")
+        gaps = starts[order][1:] - ends[order][:-1]
+        return [round(float(g), 2) for g in gaps[gaps >= PAUSE_THRESHOLD_SEC]]
+
+    def live_metrics(self) -> Dict:
+        span = self.last_end - self.first_start if self.starts else 0.0
+        minutes = span / 60.0
+        return {
+            "words": self.words,
+            "syllables": self.syllables,
+            "voiced_seconds": round(span, 1),
+            "spm": round(self.syllables / minutes, 1) if span > 1 else 0.0,
+            "wpm": round(self.words / minutes, 1) if span > 1 else 0.0,
+            "avg_confidence": round(self.conf_sum / self.conf_count, 3) if self.conf_count else 0.0,
+            "pauses": len(self.pauses),
+        }
+
+
+class _SessionAggregate:
+    """세션 누적 집계 (턴 종료 시 한 번씩 갱신)"""
+
+    __slots__ = (
+        "turns", "duration", "syllables", "words", "fillers", "pauses",
+        "pause_sum", "spm_n", "spm_mean", "spm_m2", "wpm_sum", "wpm_n",
+        "conf_sum", "conf_n", "turn_details",
+    )
+
+    def __init__(self):
+        self.turns = 0
+        self.duration = 0.0
+        self.syllables = 0
+        self.words = 0
+        self.fillers = 0
+        self.pauses = 0
+        self.pause_sum = 0.0
+        # 발화 속도 평균/표준편차 (Welford)
+        self.spm_n = 0
+        self.spm_mean = 0.0
+        self.spm_m2 = 0.0
+        self.wpm_sum = 0.0
+        self.wpm_n = 0
+        self.conf_sum = 0.0
+        self.conf_n = 0
+        self.turn_details: List[Dict] = []
+
+    def add_turn(self, turn: SpeechTurnMetrics, conf_sum: float, conf_n: int) -> None:
+        self.turns += 1
+        self.duration += turn.duration_seconds
+        self.syllables += turn.syllable_count
+        self.words += turn.word_count
+        self.fillers += turn.filler_count
+        self.pauses += turn.pause_count
+        self.pause_sum += sum(turn.pause_durations)
+        if turn.speech_rate_spm > 0:
+            self.spm_n += 1
+            delta = turn.speech_rate_spm - self.spm_mean
+            self.spm_mean += delta / self.spm_n
+            self.spm_m2 += delta * (turn.speech_rate_spm - self.spm_mean)
+        if turn.speech_rate_wpm > 0:
+            self.wpm_sum += turn.speech_rate_wpm
+            self.wpm_n += 1
+        self.conf_sum += conf_sum
+        self.conf_n += conf_n
+        self.turn_details.append({
+            "turn": turn.turn_index + 1,
+            "duration_sec": round(turn.duration_seconds, 1),
+            "syllables": turn.syllable_count,
+            "words": turn.word_count,
+            "spm": round(turn.speech_rate_spm, 1),
+            "wpm": round(turn.speech_rate_wpm, 1),
+            "confidence": round(turn.avg_confidence, 3),
+            "fillers": turn.filler_count,
+            "pauses": turn.pause_count,
+        })
+
+    def to_stats(self, session_id: str) -> SessionSpeechStats:
+        stats = SessionSpeechStats(session_id=session_id)
+        if not self.turns:
+            stats.speech_rate_assessment = "발화 데이터가 없습니다."
+            stats.pronunciation_assessment = "발음 데이터가 없습니다."
+            return stats
+
+        stats.total_turns = self.turns
+        stats.total_duration_seconds = self.duration
+        stats.total_syllables = self.syllables
+        stats.total_words = self.words
+        stats.total_fillers = self.fillers
+        stats.total_pauses = self.pauses
+
+        # 평균 발화 속도
+        if self.spm_n:
+            stats.avg_speech_rate_spm = self.spm_mean
+            stats.avg_speech_rate_wpm = self.wpm_sum / self.wpm_n if self.wpm_n else 0.0
+            if self.spm_n > 1:
+                stats.speech_rate_consistency = math.sqrt(self.spm_m2 / (self.spm_n - 1))
+
+        # 평균 confidence / 평균 침묵 시간
+        stats.avg_confidence = self.conf_sum / self.conf_n if self.conf_n else 0.0
+        stats.avg_pause_duration = self.pause_sum / self.pauses if self.pauses else 0.0
+
+        # 등급 및 평가
+        stats.speech_rate_grade, stats.speech_rate_assessment = grade_speech_rate(
+            stats.avg_speech_rate_spm
+        )
+        stats.pronunciation_grade, stats.pronunciation_assessment = grade_pronunciation(
+            stats.avg_confidence
+        )
+        stats.turn_details = list(self.turn_details)
+        return stats
+
+
 # ========== 메인 서비스 클래스 ==========
 
 class SpeechAnalysisService:
@@ -190,10 +384,11 @@ class SpeechAnalysisService:
     def __init__(self):
         self._sessions: Dict[str, List[SpeechTurnMetrics]] = {}
         self._active_turns: Dict[str, SpeechTurnMetrics] = {}
-        # 턴별 word-level confidence 누적
-        self._turn_confidences: Dict[str, List[float]] = {}
-        # 턴별 word timestamps (pause 감지용)
-        self._turn_word_times: Dict[str, List[tuple]] = {}  # [(start, end), ...]
+        # 턴별 final 단어 버퍼 (confidence / timestamps / 누적 지표)
+        self._turn_buffers: Dict[str, _TurnWordBuffer] = {}
+        # 세션 누적 집계 + 마지막으로 만든 통계 (턴 종료 시 무효화)
+        self._aggregates: Dict[str, _SessionAggregate] = {}
+        self._stats_cache: Dict[str, SessionSpeechStats] = {}
     
     def start_turn(self, session_id: str, turn_index: int = -1) -> None:
         """발화 턴 시작"""
@@ -208,8 +403,7 @@ class SpeechAnalysisService:
             start_time=time.time(),
         )
         self._active_turns[session_id] = turn
-        self._turn_confidences[session_id] = []
-        self._turn_word_times[session_id] = []
+        self._turn_buffers[session_id] = _TurnWordBuffer()
     
     def add_stt_result(
         self,
@@ -222,37 +416,46 @@ class SpeechAnalysisService:
         """STT 결과 수신 시 호출. Deepgram words 배열이 있으면 상세 분석.
         
         words 형식: [{"word": "안녕하세요", "start": 0.5, "end": 1.1, "confidence": 0.97}, ...]
+        interim 결과는 같은 단어가 반복되므로 무시하고 final 결과만 누적합니다.
         """
-        if session_id not in self._active_turns:
+        if not is_final:
+            return
+        buf = self._turn_buffers.get(session_id)
+        if buf is None or session_id not in self._active_turns:
             return
         
-        # word-level confidence 수집
         if words:
             for w in words:
-                conf = w.get("confidence", 0.0)
-                if conf > 0:
-                    self._turn_confidences.setdefault(session_id, []).append(conf)
-                
-                start = w.get("start", 0)
-                end = w.get("end", 0)
-                if start > 0 and end > 0:
-                    self._turn_word_times.setdefault(session_id, []).append((start, end))
-        elif confidence > 0 and is_final:
+                buf.add_word(
+                    w.get("punctuated_word") or w.get("word", ""),
+                    w.get("start", 0) or 0,
+                    w.get("end", 0) or 0,
+                    w.get("confidence", 0.0) or 0.0,
+                )
+        elif confidence and confidence > 0:
             # words 배열이 없으면 문장 단위 confidence 사용
-            self._turn_confidences.setdefault(session_id, []).append(confidence)
+            buf.add_confidence(confidence)
+    
+    def get_live_turn_metrics(self, session_id: str) -> Optional[Dict]:
+        """진행 중인 턴의 누적 지표 (final 단어 기준 발화 속도/confidence/침묵)"""
+        buf = self._turn_buffers.get(session_id)
+        return buf.live_metrics() if buf is not None else None
     
     def end_turn(self, session_id: str, final_text: str = "") -> Optional[SpeechTurnMetrics]:
         """발화 턴 종료. 최종 텍스트로 메트릭 계산."""
         turn = self._active_turns.pop(session_id, None)
         if not turn:
             return None
+        buf = self._turn_buffers.pop(session_id, None) or _TurnWordBuffer()
         
         turn.end_time = time.time()
         turn.text = final_text
         turn.duration_seconds = turn.end_time - turn.start_time
-        turn.word_count = count_words_ko(final_text)
-        turn.syllable_count = count_syllables_ko(final_text)
-        turn.filler_count = count_fillers(final_text)
+        # 어절/음절/필러 수를 한 번의 스캔(답변 해시 캐시 공유)으로 계산
+        analysis = analyze_answer(final_text)
+        turn.word_count = analysis.word_count
+        turn.syllable_count = analysis.syllable_count
+        turn.filler_count = analysis.filler_count
         
         # 발화 속도 계산 (0으로 나누기 방지)
         if turn.duration_seconds > 1:
@@ -260,93 +463,36 @@ class SpeechAnalysisService:
             turn.speech_rate_spm = turn.syllable_count / minutes
             turn.speech_rate_wpm = turn.word_count / minutes
         
-        # confidence 통계
-        confidences = self._turn_confidences.pop(session_id, [])
-        turn.word_confidences = confidences
-        turn.avg_confidence = statistics.mean(confidences) if confidences else 0.0
+        # confidence 통계 (누적 합계 사용)
+        turn.word_confidences = buf.confs
+        turn.avg_confidence = buf.conf_sum / buf.conf_count if buf.conf_count else 0.0
         
-        # pause 분석 (word timestamps 기반)
-        word_times = self._turn_word_times.pop(session_id, [])
-        if len(word_times) > 1:
-            word_times.sort(key=lambda x: x[0])
-            for i in range(1, len(word_times)):
-                gap = word_times[i][0] - word_times[i - 1][1]
-                if gap >= 1.0:  # 1초 이상 침묵
-                    turn.pause_count += 1
-                    turn.pause_durations.append(round(gap, 2))
+        # pause 분석 (단어 수신 시 누적된 값)
+        turn.pause_durations = buf.pause_durations()
+        turn.pause_count = len(turn.pause_durations)
         
         self._sessions.setdefault(session_id, []).append(turn)
+        self._aggregates.setdefault(session_id, _SessionAggregate()).add_turn(
+            turn, buf.conf_sum, buf.conf_count
+        )
+        self._stats_cache.pop(session_id, None)
         return turn
     
     def get_session_stats(self, session_id: str) -> SessionSpeechStats:
-        """세션 전체 발화 통계 집계"""
-        turns = self._sessions.get(session_id, [])
-        stats = SessionSpeechStats(session_id=session_id)
-        
-        if not turns:
-            stats.speech_rate_assessment = "발화 데이터가 없습니다."
-            stats.pronunciation_assessment = "발음 데이터가 없습니다."
-            return stats
-        
-        stats.total_turns = len(turns)
-        stats.total_duration_seconds = sum(t.duration_seconds for t in turns)
-        stats.total_syllables = sum(t.syllable_count for t in turns)
-        stats.total_words = sum(t.word_count for t in turns)
-        stats.total_fillers = sum(t.filler_count for t in turns)
-        stats.total_pauses = sum(t.pause_count for t in turns)
-        
-        # 평균 발화 속도
-        spm_values = [t.speech_rate_spm for t in turns if t.speech_rate_spm > 0]
-        if spm_values:
-            stats.avg_speech_rate_spm = statistics.mean(spm_values)
-            stats.avg_speech_rate_wpm = statistics.mean(
-                [t.speech_rate_wpm for t in turns if t.speech_rate_wpm > 0]
-            )
-            if len(spm_values) > 1:
-                stats.speech_rate_consistency = statistics.stdev(spm_values)
-        
-        # 평균 confidence
-        all_confs = [c for t in turns for c in t.word_confidences]
-        if all_confs:
-            stats.avg_confidence = statistics.mean(all_confs)
-        else:
-            # word-level이 없으면 turn-level 평균 사용
-            turn_confs = [t.avg_confidence for t in turns if t.avg_confidence > 0]
-            stats.avg_confidence = statistics.mean(turn_confs) if turn_confs else 0.0
-        
-        # 평균 침묵 시간
-        all_pauses = [p for t in turns for p in t.pause_durations]
-        stats.avg_pause_duration = statistics.mean(all_pauses) if all_pauses else 0.0
-        
-        # 등급 및 평가
-        stats.speech_rate_grade, stats.speech_rate_assessment = grade_speech_rate(
-            stats.avg_speech_rate_spm
-        )
-        stats.pronunciation_grade, stats.pronunciation_assessment = grade_pronunciation(
-            stats.avg_confidence
-        )
-        
-        # 턴별 상세
-        stats.turn_details = [
-            {
-                "turn": t.turn_index + 1,
-                "duration_sec": round(t.duration_seconds, 1),
-                "syllables": t.syllable_count,
-                "words": t.word_count,
-                "spm": round(t.speech_rate_spm, 1),
-                "wpm": round(t.speech_rate_wpm, 1),
-                "confidence": round(t.avg_confidence, 3),
-                "fillers": t.filler_count,
-                "pauses": t.pause_count,
-            }
-            for t in turns
-        ]
-        
+        """세션 전체 발화 통계 집계 (누적 집계 기반, 다음 턴 종료 전까지 캐시)"""
+        cached = self._stats_cache.get(session_id)
+        if cached is not None:
+            return cached
+        agg = self._aggregates.get(session_id)
+        stats = agg.to_stats(session_id) if agg else _SessionAggregate().to_stats(session_id)
+        if agg:
+            self._stats_cache[session_id] = stats
         return stats
     
     def clear_session(self, session_id: str) -> None:
         """세션 데이터 정리"""
         self._sessions.pop(session_id, None)
         self._active_turns.pop(session_id, None)
-        self._turn_confidences.pop(session_id, None)
-        self._turn_word_times.pop(session_id, None)
+        self._turn_buffers.pop(session_id, None)
+        self._aggregates.pop(session_id, None)
+        self._stats_cache.pop(session_id, None)
@@ -0,0 +1,107 @@
+"""
+스키마 제약 JSON 생성 (Structured Output)
+========================================
+평가/코드 분석/아키텍처 분석처럼 JSON 응답이 필요한 LLM 호출을
+Ollama의 format(JSON Schema) 제약 생성으로 수행합니다.
+
+기존 방식(자유 텍스트로 JSON 요청 → resilient_json_parse 다단계 추출)은
+파싱에 실패하면 기본 평가로 대체되어 LLM 호출 1회가 통째로 낭비되었습니다.
+문법 제약 생성은 토큰 단계에서 스키마를 벗어난 출력을 막으므로 파싱 실패 경로가 사라집니다.
+
+동작:
+1. llm.bind(format=schema).stream(messages) 로 스트리밍 생성
+2. IncrementalJSONParser 로 최상위 필드가 완성될 때마다 스키마 검증
+3. 최상위 객체가 닫히면 즉시 스트림을 닫아 생성 중단 (뒤따르는 공백 토큰 생략)
+4. 검증 실패/스트림 오류 시 기존 resilient 파서로 폴백 — 결과는 parse_stats에 집계
+
+STRUCTURED_JSON_ENABLED=0 이면 기존 자유 텍스트 경로만 사용합니다 (before/after 비교용).
+"""
+
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+from json_utils import (
+    IncrementalJSONParser,
+    parse_stats,
+    validate_schema,
+)
+
+logger = logging.getLogger(__name__)
+
+STRUCTURED_JSON_ENABLED = os.getenv("STRUCTURED_JSON_ENABLED", "1") == "1"
+
+# parse_*_json(text, context=..., mode=...) 형태의 기존 resilient 파서
+FallbackParser = Callable[..., Dict[str, Any]]
+
+
+def invoke_structured_json(
+    llm,
+    messages: List[Any],
+    schema: Dict[str, Any],
+    fallback_parser: FallbackParser,
+    *,
+    kind: str,
+    context: str = "",
+) -> Dict[str, Any]:
+    """JSON Schema 제약으로 LLM을 호출하고 검증된 dict를 반환합니다 (동기, 스레드에서 호출).
+
+    Args:
+        llm: ChatOllama 인스턴스
+        messages: LangChain 메시지 리스트
+        schema: Ollama format 필드에 전달할 JSON Schema (json_utils.*_SCHEMA)
+        fallback_parser: 기존 parse_*_json 함수 — 폴백 및 자유 텍스트 모드에서 사용
+        kind: 통계 집계 키 (evaluation / code_analysis / architecture)
+        context: 로깅용 호출 위치
+    """
+    if not STRUCTURED_JSON_ENABLED:
+        response = llm.invoke(messages)
+        return fallback_parser(response.content, context=context, mode="free_text")
+
+    parser = IncrementalJSONParser()
+    properties = schema.get("properties", {})
+    field_errors = 0
+    early_stop = False
+    t0 = time.perf_counter()
+
+    try:
+        stream = llm.bind(format=schema).stream(messages)
+        try:
+            for chunk in stream:
+                content = chunk.content if isinstance(chunk.content, str) else ""
+                complete = parser.feed(content)
+                # 필드가 완성되는 즉시 검증 (스키마 밖 필드는 무시)
+                for key, value in parser.pop_fields():
+                    if key in properties:
+                        _, errors = validate_schema(value, properties[key], f"$.{key}")
+                        field_errors += len(errors)
+                if complete:
+                    early_stop = True
+                    break
+        finally:
+            # 객체가 닫히면 스트림을 닫아 Ollama 생성 요청을 중단
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+    except Exception as e:
+        # format 스키마 미지원(구버전 Ollama) 등 — 기존 자유 텍스트 경로로 폴백
+        logger.warning(f"[Structured JSON] ({context}) 스키마 제약 생성 실패, 자유 텍스트로 폴백: {e}")
+        response = llm.invoke(messages)
+        return fallback_parser(response.content, context=context, mode="free_text")
+
+    field_errors += len(parser.field_errors)
+    if isinstance(parser.result, dict):
+        result, errors = validate_schema(parser.result, schema)
+        if not errors:
+            parse_stats.record(kind, "schema", ok=True,
+                               early_stop=early_stop, field_errors=field_errors)
+            logger.debug(
+                f"[Structured JSON] ({context}) 검증 통과 "
+                f"({len(parser.text)}자, {(time.perf_counter() - t0) * 1000:.0f}ms, early_stop={early_stop})"
+            )
+            return result
+        logger.warning(f"[Structured JSON] ({context}) 스키마 검증 실패: {errors[:3]}")
+
+    # 불완전/검증 실패 출력 → 기존 다단계 파서 (fallback 여부가 schema 모드 실패로 집계됨)
+    return fallback_parser(parser.text, context=context, mode="schema")
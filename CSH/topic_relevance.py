@@ -0,0 +1,308 @@
+"""
+임베딩 기반 주제 이탈(off-topic) 감지
+=====================================
+InterviewInterventionManager의 키워드 매칭을 보완하는 경량 관련성 점수기입니다.
+
+- 질문: 출제 시 1회 임베딩 (질문 텍스트 해시 → 정규화 벡터 LRU 캐시)
+- 답변: 확정 STT 텍스트의 최근 TOPIC_WINDOW_CHARS 글자 구간을, 새 텍스트가
+  TOPIC_WINDOW_STRIDE 글자 이상 쌓일 때마다 임베딩 (슬라이딩 윈도우)
+- 점수: 질문 벡터와 최근 윈도우 벡터들의 코사인 유사도 중 최댓값
+- 배치: 여러 세션의 임베딩 요청을 백그라운드 스레드가 모아 한 번에 호출
+- 세션별 레이트 리밋: TOPIC_EMBED_MIN_INTERVAL_SEC 간격보다 자주 답변을 임베딩하지 않음
+
+similarity()는 미리 계산된 값을 읽기만 하므로 개입 체크 경로에서 수 µs 수준이며,
+임베딩 호출은 질문 생성/개입 체크 경로를 막지 않습니다.
+임베딩 백엔드(Ollama)가 없으면 similarity()가 None을 반환하고 키워드 방식으로 동작합니다.
+"""
+
+import hashlib
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+try:
+    from langchain_ollama import OllamaEmbeddings
+
+    OLLAMA_EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    OLLAMA_EMBEDDINGS_AVAILABLE = False
+
+# 로컬 소형 임베딩 모델 (기본값: RAG와 같은 모델 → 추가 모델 pull 불필요)
+TOPIC_EMBEDDING_MODEL = os.getenv(
+    "TOPIC_EMBEDDING_MODEL", os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
+)
+# 코사인 유사도가 이 값 미만이면 주제 이탈로 판단 (모델에 따라 조정)
+TOPIC_SIMILARITY_THRESHOLD = float(os.getenv("TOPIC_SIMILARITY_THRESHOLD", "0.45"))
+TOPIC_WINDOW_CHARS = int(os.getenv("TOPIC_WINDOW_CHARS", "240"))
+TOPIC_WINDOW_STRIDE = int(os.getenv("TOPIC_WINDOW_STRIDE", "80"))
+TOPIC_EMBED_MIN_INTERVAL_SEC = float(os.getenv("TOPIC_EMBED_MIN_INTERVAL_SEC", "2.0"))
+TOPIC_BATCH_MAX = int(os.getenv("TOPIC_BATCH_MAX", "32"))
+TOPIC_BATCH_WAIT_MS = int(os.getenv("TOPIC_BATCH_WAIT_MS", "20"))
+TOPIC_QUESTION_CACHE_SIZE = 512
+TOPIC_MAX_SESSIONS = 2000
+# 점수 계산에 사용하는 최근 윈도우 수 (모두 낮아야 이탈로 판단)
+TOPIC_RECENT_WINDOWS = 3
+
+
+class _SessionTopic:
+    __slots__ = ("question_key", "embedded_upto", "last_embed_at", "window_scores")
+
+    def __init__(self):
+        self.question_key: Optional[str] = None
+        self.embedded_upto = 0  # 임베딩을 요청한 답변 텍스트 길이
+        self.last_embed_at = 0.0  # time.monotonic()
+        self.window_scores: deque = deque(maxlen=TOPIC_RECENT_WINDOWS)
+
+
+class TopicRelevanceScorer:
+    """질문/답변 임베딩 코사인 유사도 기반 주제 관련성 점수기"""
+
+    def __init__(self, embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None):
+        self._embed_fn = embed_fn
+        self._backend_checked = embed_fn is not None
+        self._lock = threading.Lock()
+        self._questions: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # 임베딩 대기 중인 질문 key → 질문 벡터를 기다리는 세션 ID 목록
+        self._pending_questions: Dict[str, List[str]] = {}
+        self._pending_windows: Dict[str, np.ndarray] = {}  # 세션 ID → 점수 계산 대기 답변 벡터
+        self._sessions: "OrderedDict[str, _SessionTopic]" = OrderedDict()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self.stats = {
+            "batches": 0,
+            "texts": 0,
+            "embed_ms_total": 0.0,
+            "rate_limited": 0,
+            "question_cache_hits": 0,
+            "errors": 0,
+        }
+
+    # ───── 백엔드 / 워커 ─────
+
+    def _ensure_backend(self) -> bool:
+        if not self._backend_checked:
+            self._backend_checked = True
+            if OLLAMA_EMBEDDINGS_AVAILABLE:
+                try:
+                    self._embed_fn = OllamaEmbeddings(model=TOPIC_EMBEDDING_MODEL).embed_documents
+                    print(f"✅ [TopicRelevance] 임베딩 모델: {TOPIC_EMBEDDING_MODEL}")
+                except Exception as e:
+                    print(f"⚠️ [TopicRelevance] 임베딩 초기화 실패 (키워드 방식 사용): {e}")
+        if self._embed_fn is None:
+            return False
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="topic-embedding", daemon=True
+            )
+            self._worker.start()
+        return True
+
+    def _run(self):
+        """요청을 TOPIC_BATCH_WAIT_MS 동안 모아 한 번의 임베딩 호출로 처리"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + TOPIC_BATCH_WAIT_MS / 1000
+            while len(batch) < TOPIC_BATCH_MAX:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            t0 = time.perf_counter()
+            try:
+                vectors = self._embed_fn([text for text, _ in batch])
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"⚠️ [TopicRelevance] 임베딩 실패 ({len(batch)}건): {e}")
+                vectors = [None] * len(batch)
+            self.stats["batches"] += 1
+            self.stats["texts"] += len(batch)
+            self.stats["embed_ms_total"] += (time.perf_counter() - t0) * 1000
+
+            for (_, on_done), vector in zip(batch, vectors):
+                if vector is not None:
+                    vector = np.asarray(vector, dtype=np.float32)
+                    norm = float(np.linalg.norm(vector))
+                    if norm:
+                        vector /= norm
+                try:
+                    on_done(vector)
+                except Exception as e:
+                    print(f"⚠️ [TopicRelevance] 결과 처리 오류: {e}")
+
+    # ───── 질문 ─────
+
+    @staticmethod
+    def _question_key(question: str) -> str:
+        return hashlib.sha1(" ".join(question.split()).encode("utf-8")).hexdigest()
+
+    def set_question(self, session_id: str, question: str) -> None:
+        """새 질문 출제 시 호출 — 캐시에 없으면 백그라운드로 임베딩만 요청 (즉시 반환)"""
+        if not question or not self._ensure_backend():
+            return
+        key = self._question_key(question)
+        with self._lock:
+            session = self._session(session_id)
+            session.question_key = key
+            session.embedded_upto = 0
+            session.last_embed_at = 0.0
+            session.window_scores.clear()
+            if key in self._questions:
+                self._questions.move_to_end(key)
+                self.stats["question_cache_hits"] += 1
+                return
+            if key in self._pending_questions:
+                return
+            self._pending_questions[key] = []
+
+        def on_done(vector: Optional[np.ndarray]):
+            with self._lock:
+                waiting = self._pending_questions.pop(key, [])
+                if vector is None:
+                    # 실패 시 대기 상태만 해제 → 다음 set_question에서 재시도
+                    for window_session in waiting:
+                        self._pending_windows.pop(window_session, None)
+                    return
+                self._questions[key] = vector
+                while len(self._questions) > TOPIC_QUESTION_CACHE_SIZE:
+                    self._questions.popitem(last=False)
+                # 질문 임베딩 전에 도착한 답변 윈도우 점수 계산
+                for window_session in waiting:
+                    window_vec = self._pending_windows.pop(window_session, None)
+                    session = self._sessions.get(window_session)
+                    if window_vec is not None and session is not None and session.question_key == key:
+                        session.window_scores.append(float(np.dot(vector, window_vec)))
+
+        self._queue.put((question, on_done))
+
+    # ───── 답변 ─────
+
+    def update_answer(self, session_id: str, answer_text: str) -> None:
+        """
+        확정 STT 답변 텍스트 갱신 — 새 텍스트가 충분히 쌓였고 레이트 리밋 이내면
+        최근 윈도우를 임베딩 큐에 넣습니다 (즉시 반환).
+        """
+        if self._embed_fn is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.question_key is None:
+                return
+            if len(answer_text) - session.embedded_upto < TOPIC_WINDOW_STRIDE:
+                return
+            if now - session.last_embed_at < TOPIC_EMBED_MIN_INTERVAL_SEC:
+                self.stats["rate_limited"] += 1
+                return
+            session.embedded_upto = len(answer_text)
+            session.last_embed_at = now
+            question_key = session.question_key
+
+        window = answer_text[-TOPIC_WINDOW_CHARS:]
+
+        def on_done(vector: Optional[np.ndarray]):
+            if vector is None:
+                return
+            with self._lock:
+                current = self._sessions.get(session_id)
+                if current is None or current.question_key != question_key:
+                    return  # 그 사이 다음 질문으로 넘어감
+                question_vec = self._questions.get(question_key)
+                if question_vec is not None:
+                    current.window_scores.append(float(np.dot(question_vec, vector)))
+                elif question_key in self._pending_questions:
+                    # 질문 임베딩이 아직 진행 중이면 완료 시점에 계산
+                    self._pending_windows[session_id] = vector
+                    self._pending_questions[question_key].append(session_id)
+
+        self._queue.put((window, on_done))
+
+    # ───── 조회 ─────
+
+    def similarity(self, session_id: str) -> Optional[float]:
+        """최근 답변 윈도우와 질문의 코사인 유사도 (최근 윈도우 중 최댓값). 없으면 None."""
+        session = self._sessions.get(session_id)
+        if session is None or not session.window_scores:
+            return None
+        return max(session.window_scores)
+
+    def is_off_topic(self, session_id: str, threshold: float = TOPIC_SIMILARITY_THRESHOLD) -> Optional[bool]:
+        """유사도가 threshold 미만이면 True. 아직 계산된 유사도가 없으면 None."""
+        score = self.similarity(session_id)
+        return None if score is None else score < threshold
+
+    def remove_session(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._pending_windows.pop(session_id, None)
+
+    def _session(self, session_id: str) -> _SessionTopic:
+        """세션 상태 조회/생성 (self._lock 보유 상태에서 호출, 최대 TOPIC_MAX_SESSIONS개 유지)"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _SessionTopic()
+            while len(self._sessions) > TOPIC_MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def get_stats(self) -> Dict:
+        batches = self.stats["batches"]
+        return {
+            "available": self._embed_fn is not None,
+            "model": TOPIC_EMBEDDING_MODEL,
+            "sessions": len(self._sessions),
+            "cached_questions": len(self._questions),
+            "queue_size": self._queue.qsize(),
+            "avg_batch_size": round(self.stats["texts"] / batches, 2) if batches else 0.0,
+            "avg_embed_ms": round(self.stats["embed_ms_total"] / batches, 2) if batches else 0.0,
+            **{k: v for k, v in self.stats.items() if k != "embed_ms_total"},
+        }
+
+
+# 전역 인스턴스
+topic_relevance_scorer = TopicRelevanceScorer()
+
+
+if __name__ == "__main__":
+    # 개입 체크 경로 지연 측정 (가짜 임베딩 백엔드: 배치당 5ms)
+    def _fake_embed(texts: List[str]) -> List[List[float]]:
+        time.sleep(0.005)
+        rng = np.random.default_rng(0)
+        return [rng.standard_normal(768).tolist() for _ in texts]
+
+    scorer = TopicRelevanceScorer(embed_fn=_fake_embed)
+    sessions = [f"s{i}" for i in range(50)]
+    t0 = time.perf_counter()
+    for sid in sessions:
+        scorer.set_question(sid, "Redis 캐시 무효화 전략을 설명해 주세요.")
+    set_ms = (time.perf_counter() - t0) / len(sessions) * 1000
+    time.sleep(0.1)
+
+    answer = "캐시 무효화는 TTL과 write-through 방식을 조합해서 " * 10
+    t0 = time.perf_counter()
+    for sid in sessions:
+        scorer.update_answer(sid, answer)
+    update_ms = (time.perf_counter() - t0) / len(sessions) * 1000
+    time.sleep(0.2)
+
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        for sid in sessions:
+            scorer.similarity(sid)
+    check_us = (time.perf_counter() - t0) / (1000 * len(sessions)) * 1e6
+
+    print(f"set_question: {set_ms:.3f}ms  update_answer: {update_ms:.3f}ms  similarity: {check_us:.2f}µs")
+    print(scorer.get_stats())
@@ -0,0 +1,146 @@
+"""
+실시간 개입용 VAD 바이너리 채널
+================================
+/ws/interview/{session_id} WebSocket 위에서 VAD 신호와 개입 결정을 주고받는
+고정 길이 바이너리 프레임과, 세션별 VAD 상태를 담는 고정 크기 링 버퍼입니다.
+
+기존에는 프론트엔드가 500ms마다 POST /api/intervention/vad-signal,
+3초마다 POST /api/intervention/check를 호출했습니다 (요청마다 JWT 검증 + JSON 파싱).
+이제 VAD 프레임은 이미 인증된 WebSocket으로 8바이트씩 전송되고,
+서버는 Turn-taking 상태가 바뀌거나 개입이 필요할 때만 프레임을 푸시합니다.
+
+프레임 형식 (little-endian, 첫 바이트는 항상 FRAME_MAGIC):
+  클라이언트 → 서버
+    VAD (8B)          magic, kind=1, flags(bit0=발화), level(RMS×1000, 0~255), seq(u16), reserved(u16)
+  서버 → 클라이언트
+    TURN (8B)         magic, kind=2, turn_state, flags(bit0=can_interrupt, bit1=is_speaking),
+                      reason, reserved, silence(u16, 0.1초 단위)
+    INTERVENTION      magic, kind=3, type, action, priority, reserved + UTF-8 메시지
+
+같은 소켓으로 들어오는 PCM16 오디오(수천 바이트)와는 길이 + magic 으로 구분합니다.
+"""
+
+import struct
+from array import array
+from typing import Dict, Optional, Tuple
+
+FRAME_MAGIC = 0xA5
+KIND_VAD = 0x01
+KIND_TURN = 0x02
+KIND_INTERVENTION = 0x03
+
+VAD_FRAME = struct.Struct("<BBBBHH")
+TURN_FRAME = struct.Struct("<BBBBBBH")
+INTERVENTION_HEADER = struct.Struct("<BBBBBB")
+
+# RMS(0.0~1.0)를 0.001 단위 정수로 전송 (발화 RMS는 보통 0.2 미만)
+LEVEL_SCALE = 1000
+
+# 코드 테이블 — 인덱스가 곧 전송 코드 (프론트엔드 vadFrames.ts와 동일 순서 유지)
+TURN_STATES = ("ai_speaking", "user_speaking", "silence")
+INTERRUPT_REASONS = ("", "silence_pause", "time_exceeded", "speech_ending")
+INTERVENTION_TYPES = (
+    "",
+    "soft_time_warning",
+    "hard_time_limit",
+    "off_topic",
+    "encourage_more",
+    "silence_detected",
+)
+INTERVENTION_ACTIONS = ("", "warn", "force_next_question", "redirect", "encourage")
+INTERVENTION_PRIORITIES = ("", "low", "medium", "high")
+
+
+def _code(table: Tuple[str, ...], value: str) -> int:
+    try:
+        return table.index(value)
+    except ValueError:
+        return 0
+
+
+def is_vad_frame(data: bytes) -> bool:
+    """바이너리 메시지가 VAD 프레임인지 (PCM 오디오 청크와 구분)"""
+    return (
+        len(data) == VAD_FRAME.size
+        and data[0] == FRAME_MAGIC
+        and data[1] == KIND_VAD
+    )
+
+
+def decode_vad_frame(data: bytes) -> Tuple[bool, float, int]:
+    """(is_speech, audio_level, seq) 반환"""
+    _, _, flags, level, seq, _ = VAD_FRAME.unpack(data)
+    return bool(flags & 0x01), level / LEVEL_SCALE, seq
+
+
+def encode_turn_signal(signal: Dict) -> bytes:
+    """get_turn_taking_signal() 결과를 8바이트 프레임으로 변환"""
+    flags = int(bool(signal.get("can_interrupt"))) | (int(bool(signal.get("is_speaking"))) << 1)
+    silence_ds = min(int(signal.get("silence_duration_ms", 0) / 100), 0xFFFF)
+    return TURN_FRAME.pack(
+        FRAME_MAGIC,
+        KIND_TURN,
+        _code(TURN_STATES, signal.get("turn_state", "")),
+        flags,
+        _code(INTERRUPT_REASONS, signal.get("interrupt_reason", "")),
+        0,
+        silence_ds,
+    )
+
+
+def encode_intervention(intervention: Dict) -> bytes:
+    """check_intervention_needed() 결과를 헤더 6바이트 + UTF-8 메시지로 변환"""
+    header = INTERVENTION_HEADER.pack(
+        FRAME_MAGIC,
+        KIND_INTERVENTION,
+        _code(INTERVENTION_TYPES, intervention.get("type", "")),
+        _code(INTERVENTION_ACTIONS, intervention.get("action", "")),
+        _code(INTERVENTION_PRIORITIES, intervention.get("priority", "")),
+        0,
+    )
+    return header + intervention.get("message", "").encode("utf-8")
+
+
+class VadRingBuffer:
+    """
+    고정 크기 VAD 신호 링 버퍼.
+
+    리스트 append + 슬라이싱 대신 미리 할당한 배열에 덮어쓰므로
+    신호가 계속 들어와도 메모리와 처리 시간이 일정합니다.
+    """
+
+    __slots__ = ("capacity", "_speech", "_levels", "_next", "_size")
+
+    def __init__(self, capacity: int = 128):
+        self.capacity = capacity
+        self._speech = bytearray(capacity)
+        self._levels = array("f", bytes(4 * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, is_speech: bool, audio_level: float) -> None:
+        i = self._next
+        self._speech[i] = 1 if is_speech else 0
+        self._levels[i] = audio_level
+        self._next = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def speech_ratio(self, last_n: int = 20) -> Optional[float]:
+        """최근 last_n개 신호 중 발화 비율 (신호가 없으면 None)"""
+        n = min(last_n, self._size)
+        if n == 0:
+            return None
+        start = (self._next - n) % self.capacity
+        if start + n <= self.capacity:
+            speech = sum(self._speech[start : start + n])
+        else:
+            speech = sum(self._speech[start:]) + sum(self._speech[: (start + n) % self.capacity])
+        return speech / n
+
+    def clear(self) -> None:
+        self._next = 0
+        self._size = 0
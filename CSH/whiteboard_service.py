@@ -8,11 +8,16 @@
 2. Qwen3-VL:4B 비전 모델을 통한 다이어그램 인식 (폴백)
 3. 시스템 아키텍처 평가 (구조, 확장성, 보안 등)
 4. 피드백 및 개선 제안
+5. 이미지 전처리(여백 자르기/축소) + 지각 해시 결과 캐시 + 구조 비교(diff) 모드
 """
 
+import asyncio
 import json
 import os
-from typing import Dict, List, Optional
+import random
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
 
 # .env 파일에서 환경변수 로드
 from dotenv import load_dotenv
@@ -22,7 +27,13 @@ load_dotenv()
 # JSON Resilience 유틸리티
 # FastAPI
 from fastapi import APIRouter, HTTPException
-from json_utils import parse_architecture_json, resilient_json_parse
+from json_utils import (
+    ARCHITECTURE_SCHEMA,
+    parse_architecture_json,
+    resilient_json_parse,
+)
+from structured_output import invoke_structured_json
+from diagram_image_cache import DiagramResultCache, prepare_diagram
 from pydantic import BaseModel
 
 # Anthropic Claude API
@@ -59,6 +70,7 @@ class DiagramAnalysisRequest(BaseModel):
     session_id: str
     problem_context: Optional[str] = None  # 문제 설명
     user_explanation: Optional[str] = None  # 사용자 설명
+    diff_mode: bool = False  # 직전 제출과 구조적으로 거의 같으면 재분석하지 않음
 
 
 class DiagramAnalysisResult(BaseModel):
@@ -165,6 +177,266 @@ DIFFICULTY_SCALES = {
 }
 
 
+# ========== Redis 기반 아키텍처 문제 풀 (Problem Pool) ==========
+# 코딩 테스트의 ProblemPool과 같은 방식으로, (카테고리, 난이도)별 문제를 Celery로 미리 생성해
+# Redis에 저장합니다. 화이트보드 페이지를 열 때 LLM을 기다리지 않고 풀에서 즉시 꺼냅니다.
+# - 풀이 WHITEBOARD_POOL_REFILL_THRESHOLD 이하로 줄면 보충 태스크 발행
+# - 같은 카테고리의 풀/최근 출제 문제와 유사하면 저장하지 않음 (중복 제거)
+# - WHITEBOARD_POOL_TTL_SEC 이 지난 문제는 버리고 새 문제로 교체 (로테이션)
+
+# (카테고리, 난이도)별 풀에 유지할 문제 개수
+WHITEBOARD_POOL_SIZE = int(os.getenv("WHITEBOARD_POOL_SIZE", "2"))
+# 풀이 이 수치 이하로 떨어지면 보충 태스크를 발행
+WHITEBOARD_POOL_REFILL_THRESHOLD = int(os.getenv("WHITEBOARD_POOL_REFILL_THRESHOLD", "0"))
+# 풀에 보관하는 최대 시간 (초) — 지나면 새 문제로 교체
+WHITEBOARD_POOL_TTL_SEC = int(os.getenv("WHITEBOARD_POOL_TTL_SEC", str(24 * 3600)))
+# 출제된 문제를 ID로 조회할 수 있는 시간 (초) — 분석 요청의 problem_context 조회용
+WHITEBOARD_PROBLEM_TTL_SEC = int(os.getenv("WHITEBOARD_PROBLEM_TTL_SEC", str(24 * 3600)))
+# 제목/컴포넌트 유사도가 이 값 이상이면 중복으로 간주 (Jaccard, 0-1)
+WHITEBOARD_DEDUPE_THRESHOLD = float(os.getenv("WHITEBOARD_DEDUPE_THRESHOLD", "0.6"))
+# 중복 비교용 최근 출제 제목 수 (카테고리별)
+WHITEBOARD_RECENT_TITLES = 30
+
+
+def _shingles(text: str) -> set:
+    compact = "".join(text.lower().split())
+    return {compact[i : i + 2] for i in range(max(len(compact) - 1, 1))}
+
+
+def problem_similarity(a: Dict, b: Dict) -> float:
+    """두 문제의 제목 + 예상 컴포넌트 2-gram Jaccard 유사도"""
+
+    def signature(p: Dict) -> set:
+        return _shingles(p.get("title", "")) | _shingles(
+            " ".join(sorted(p.get("expected_components", [])))
+        )
+
+    sa, sb = signature(a), signature(b)
+    if not sa or not sb:
+        return 0.0
+    return len(sa & sb) / len(sa | sb)
+
+
+class ArchitectureProblemPool:
+    """
+    Redis Sorted Set 기반 아키텍처 문제 풀.
+
+    - whiteboard_pool:{category}:{difficulty}  ZSET (member=문제 JSON, score=생성 시각)
+    - whiteboard_problem:{problem_id}          출제된 문제 (TTL, 분석 시 problem_context 조회)
+    - whiteboard_recent:{category}             최근 저장/출제 제목 (중복 제거용)
+
+    Redis 연결 실패 시 모든 메서드는 graceful하게 None/0/"error"를 반환합니다.
+    """
+
+    REDIS_KEY_PREFIX = "whiteboard_pool"
+    RETRY_CONNECT_SEC = 30.0
+
+    def __init__(self):
+        """Redis 클라이언트 초기화 (Lazy — 첫 호출 시 연결)"""
+        self._redis = None
+        self._redis_url = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+        self._last_failure = 0.0
+
+    def _get_redis(self):
+        """Redis 연결을 반환합니다. 연결 실패 시 None (30초 동안 재시도하지 않음)."""
+        if self._redis is None and time.time() - self._last_failure > self.RETRY_CONNECT_SEC:
+            try:
+                import redis as redis_lib
+
+                client = redis_lib.from_url(
+                    self._redis_url, decode_responses=True, socket_connect_timeout=1
+                )
+                client.ping()
+                self._redis = client
+            except Exception as e:
+                print(f"[WhiteboardPool] Redis 연결 실패: {e}")
+                self._last_failure = time.time()
+        return self._redis
+
+    def available(self) -> bool:
+        return self._get_redis() is not None
+
+    def _key(self, category: str, difficulty: str) -> str:
+        return f"{self.REDIS_KEY_PREFIX}:{category}:{difficulty}"
+
+    def _prune(self, r, key: str) -> None:
+        """TTL이 지난 문제 제거 (로테이션)"""
+        r.zremrangebyscore(key, "-inf", time.time() - WHITEBOARD_POOL_TTL_SEC)
+
+    def recent_titles(self, category: str) -> List[str]:
+        r = self._get_redis()
+        if not r:
+            return []
+        try:
+            return r.lrange(f"whiteboard_recent:{category}", 0, WHITEBOARD_RECENT_TITLES - 1)
+        except Exception:
+            return []
+
+    def find_duplicate(self, problem: ArchitectureProblem) -> Optional[str]:
+        """같은 카테고리의 풀(전 난이도) + 최근 출제 문제 중 유사한 문제 제목 반환"""
+        r = self._get_redis()
+        if not r:
+            return None
+        candidate = problem.dict()
+        for difficulty in DIFFICULTY_SCALES:
+            for raw in r.zrange(self._key(problem.category, difficulty), 0, -1):
+                other = json.loads(raw)
+                if problem_similarity(candidate, other) >= WHITEBOARD_DEDUPE_THRESHOLD:
+                    return other.get("title", "")
+        for title in self.recent_titles(problem.category):
+            if problem_similarity({"title": candidate["title"]}, {"title": title}) >= WHITEBOARD_DEDUPE_THRESHOLD:
+                return title
+        return None
+
+    def push(self, problem: ArchitectureProblem) -> str:
+        """문제를 풀에 추가합니다. "ok" / "duplicate" / "error" 반환."""
+        r = self._get_redis()
+        if not r:
+            return "error"
+        try:
+            duplicate = self.find_duplicate(problem)
+            if duplicate is not None:
+                print(f"[WhiteboardPool] 중복 문제 제외: '{problem.title}' ≈ '{duplicate}'")
+                return "duplicate"
+            key = self._key(problem.category, problem.difficulty)
+            data = json.dumps(problem.dict(), ensure_ascii=False)
+            pipe = r.pipeline()
+            pipe.zadd(key, {data: time.time()})
+            pipe.lpush(f"whiteboard_recent:{problem.category}", problem.title)
+            pipe.ltrim(f"whiteboard_recent:{problem.category}", 0, WHITEBOARD_RECENT_TITLES - 1)
+            pipe.execute()
+            return "ok"
+        except Exception as e:
+            print(f"[WhiteboardPool] push 실패 ({problem.category}/{problem.difficulty}): {e}")
+            return "error"
+
+    def pop(self, category: str, difficulty: str) -> Optional[ArchitectureProblem]:
+        """풀에서 가장 오래된 문제 1개를 꺼냅니다. 없으면 None."""
+        r = self._get_redis()
+        if not r:
+            return None
+        try:
+            key = self._key(category, difficulty)
+            self._prune(r, key)
+            popped = r.zpopmin(key, 1)
+            if not popped:
+                return None
+            problem = ArchitectureProblem(**json.loads(popped[0][0]))
+            self.remember(problem)
+            return problem
+        except Exception as e:
+            print(f"[WhiteboardPool] pop 실패 ({category}/{difficulty}): {e}")
+            return None
+
+    def remember(self, problem: ArchitectureProblem) -> None:
+        """출제된 문제를 ID로 조회할 수 있도록 저장 (다른 워커/프로세스에서도 조회)"""
+        r = self._get_redis()
+        if not r:
+            return
+        try:
+            r.setex(
+                f"whiteboard_problem:{problem.id}",
+                WHITEBOARD_PROBLEM_TTL_SEC,
+                json.dumps(problem.dict(), ensure_ascii=False),
+            )
+        except Exception as e:
+            print(f"[WhiteboardPool] 문제 저장 실패 ({problem.id}): {e}")
+
+    def get_by_id(self, problem_id: str) -> Optional[ArchitectureProblem]:
+        r = self._get_redis()
+        if not r:
+            return None
+        try:
+            data = r.get(f"whiteboard_problem:{problem_id}")
+            return ArchitectureProblem(**json.loads(data)) if data else None
+        except Exception:
+            return None
+
+    def count(self, category: str, difficulty: str) -> int:
+        """현재 풀에 남은 (만료되지 않은) 문제 수를 반환합니다."""
+        r = self._get_redis()
+        if not r:
+            return 0
+        try:
+            key = self._key(category, difficulty)
+            self._prune(r, key)
+            return r.zcard(key)
+        except Exception:
+            return 0
+
+    def needs_refill(self, category: str, difficulty: str) -> bool:
+        """풀 보충이 필요한지 확인합니다."""
+        return self.count(category, difficulty) <= WHITEBOARD_POOL_REFILL_THRESHOLD
+
+    def claim_refill(self, category: str, difficulty: str, ttl: int = 180) -> bool:
+        """같은 풀에 보충 태스크가 중복 발행되지 않도록 짧은 잠금 획득"""
+        r = self._get_redis()
+        if not r:
+            return False
+        try:
+            return bool(r.set(f"whiteboard_pool_refilling:{category}:{difficulty}", "1", nx=True, ex=ttl))
+        except Exception:
+            return False
+
+    def get_stats(self) -> Dict:
+        pools = {
+            f"{category}:{difficulty}": self.count(category, difficulty)
+            for category in PROBLEM_CATEGORIES
+            for difficulty in DIFFICULTY_SCALES
+        }
+        return {
+            "redis_available": self._redis is not None,
+            "target_size": WHITEBOARD_POOL_SIZE,
+            "ttl_sec": WHITEBOARD_POOL_TTL_SEC,
+            "total": sum(pools.values()),
+            "empty_pools": sum(1 for v in pools.values() if v == 0),
+            "pools": pools,
+        }
+
+
+# 전역 문제 풀 인스턴스
+architecture_pool = ArchitectureProblemPool()
+
+
+def trigger_architecture_pool_refill(category: str, difficulty: str) -> int:
+    """
+    Celery 태스크를 발행하여 풀을 보충합니다. 발행한 태스크 수를 반환합니다.
+    Redis/Celery가 사용 불가능하면 무시합니다 (템플릿 문제 또는 LLM 직접 호출로 대체).
+    """
+    if not architecture_pool.available():
+        return 0
+    needed = WHITEBOARD_POOL_SIZE - architecture_pool.count(category, difficulty)
+    if needed <= 0 or not architecture_pool.claim_refill(category, difficulty):
+        return 0
+    try:
+        from celery_tasks import pre_generate_architecture_problem_task
+
+        for _ in range(needed):
+            pre_generate_architecture_problem_task.delay(category, difficulty)
+        print(f"[WhiteboardPool] 보충 태스크 {needed}개 발행 ({category}/{difficulty})")
+        return needed
+    except Exception as e:
+        print(f"[WhiteboardPool] 보충 태스크 발행 실패: {e}")
+        return 0
+
+
+def _refill_if_needed(category: str, difficulty: str) -> None:
+    if architecture_pool.needs_refill(category, difficulty):
+        trigger_architecture_pool_refill(category, difficulty)
+
+
+def refill_all_architecture_pools() -> Dict[str, int]:
+    """모든 (카테고리, 난이도) 풀의 만료 문제를 정리하고 부족분 보충 태스크 발행"""
+    issued = {}
+    for category in PROBLEM_CATEGORIES:
+        for difficulty in DIFFICULTY_SCALES:
+            if architecture_pool.count(category, difficulty) < WHITEBOARD_POOL_SIZE:
+                n = trigger_architecture_pool_refill(category, difficulty)
+                if n:
+                    issued[f"{category}:{difficulty}"] = n
+    return issued
+
+
 class ArchitectureProblemGenerator:
     """AI 기반 동적 아키텍처 문제 생성기"""
 
@@ -208,21 +480,49 @@ class ArchitectureProblemGenerator:
     async def generate_problem(
         self, category: Optional[str] = None, difficulty: Optional[str] = None
     ) -> ArchitectureProblem:
-        """AI를 사용해 새로운 아키텍처 문제 생성"""
-        import random
-
+        """AI를 사용해 새로운 아키텍처 문제 생성 (LLM 호출은 스레드에서 실행)"""
         # 카테고리/난이도 선택
         if not category:
             category = self._get_random_category()
         if not difficulty:
             difficulty = self._get_random_difficulty()
 
+        problem = await asyncio.to_thread(self.generate_sync, category, difficulty)
+        if problem is None:
+            problem = self._create_fallback_problem(
+                category,
+                difficulty,
+                self._new_problem_id(category, difficulty),
+                PROBLEM_CATEGORIES.get(category, PROBLEM_CATEGORIES["messaging"]),
+                DIFFICULTY_SCALES.get(difficulty, DIFFICULTY_SCALES["medium"]),
+            )
+        self.generated_problems_cache[problem.id] = problem
+        return problem
+
+    def _new_problem_id(self, category: str, difficulty: str) -> str:
+        # API 서버와 Celery 워커가 함께 만들므로 프로세스 간에 겹치지 않는 ID 사용
+        self.problem_counter += 1
+        return f"gen_{uuid.uuid4().hex[:8]}_{category}_{difficulty}"
+
+    def generate_sync(
+        self,
+        category: str,
+        difficulty: str,
+        avoid_titles: Optional[List[str]] = None,
+    ) -> Optional[ArchitectureProblem]:
+        """
+        동기(Synchronous) 버전 문제 생성 — Celery worker에서도 호출합니다.
+        LLM이 없거나 실패하면 None을 반환합니다 (폴백 문제는 호출 측에서 결정).
+        """
         cat_info = PROBLEM_CATEGORIES.get(category, PROBLEM_CATEGORIES["messaging"])
         diff_info = DIFFICULTY_SCALES.get(difficulty, DIFFICULTY_SCALES["medium"])
 
         # 문제 ID 생성
-        self.problem_counter += 1
-        problem_id = f"gen_{self.problem_counter}_{category}_{difficulty}"
+        problem_id = self._new_problem_id(category, difficulty)
+
+        avoid_text = ""
+        if avoid_titles:
+            avoid_text = "\n- 다음 문제들과 겹치지 않는 주제로 내세요: " + ", ".join(avoid_titles[:10])
 
         # 프롬프트 생성
         prompt = f"""당신은 시스템 설계 면접관입니다. 아래 조건에 맞는 새로운 아키텍처 설계 문제를 생성하세요.
@@ -248,7 +548,7 @@ class ArchitectureProblemGenerator:
 - 기존의 흔한 문제(채팅, URL 단축기 등)와 다른 **창의적인** 문제를 내세요
 - 실제 기업에서 사용하는 시스템을 참고하되, 독특한 제약조건을 추가하세요
 - 요구사항은 측정 가능하고 구체적이어야 합니다
-- 한국어로 작성하세요
+- 한국어로 작성하세요{avoid_text}
 
 새로운 아키텍처 문제를 JSON 형식으로 생성하세요:"""
 
@@ -266,10 +566,8 @@ class ArchitectureProblemGenerator:
                 response = self.llm.invoke([HumanMessage(content=prompt)])
                 response_text = response.content
             else:
-                # LLM 없으면 기본 문제 반환
-                return self._create_fallback_problem(
-                    category, difficulty, problem_id, cat_info, diff_info
-                )
+                # LLM 없으면 호출 측에서 기본 문제 사용
+                return None
 
             # JSON Resilience 파싱
             data = resilient_json_parse(
@@ -281,7 +579,7 @@ class ArchitectureProblemGenerator:
             if data is None:
                 raise ValueError("문제 생성 JSON 파싱 실패")
 
-            problem = ArchitectureProblem(
+            return ArchitectureProblem(
                 id=problem_id,
                 title=data.get("title", "시스템 설계 문제"),
                 description=data.get("description", "시스템을 설계하세요."),
@@ -294,16 +592,9 @@ class ArchitectureProblemGenerator:
                 category=category,
             )
 
-            # 캐시에 저장
-            self.generated_problems_cache[problem_id] = problem
-
-            return problem
-
         except Exception as e:
             print(f"문제 생성 오류: {e}")
-            return self._create_fallback_problem(
-                category, difficulty, problem_id, cat_info, diff_info
-            )
+            return None
 
     def _create_fallback_problem(
         self,
@@ -345,32 +636,86 @@ class ArchitectureProblemGenerator:
             category=category,
         )
 
+    async def get_problem(
+        self, category: Optional[str] = None, difficulty: Optional[str] = None
+    ) -> ArchitectureProblem:
+        """
+        문제 1개 반환 — 사전 생성 풀에서 즉시 꺼내고, 비어 있으면 LLM으로 생성.
+        꺼낸 뒤 풀이 부족하면 Celery 보충 태스크를 발행합니다.
+        """
+        if not category:
+            category = self._get_random_category()
+        if not difficulty:
+            difficulty = self._get_random_difficulty()
+
+        pooled = await asyncio.to_thread(architecture_pool.pop, category, difficulty)
+        if pooled:
+            self.generated_problems_cache[pooled.id] = pooled
+            await asyncio.to_thread(_refill_if_needed, category, difficulty)
+            return pooled
+
+        await asyncio.to_thread(trigger_architecture_pool_refill, category, difficulty)
+        return await self.generate_problem(category=category, difficulty=difficulty)
+
     async def get_problem_set(self, count: int = 5) -> List[ArchitectureProblem]:
-        """여러 개의 랜덤 문제 세트 생성"""
+        """
+        여러 개의 랜덤 문제 세트 반환.
+        LLM을 기다리지 않도록 풀에서 꺼내고, 풀이 빈 조합은 템플릿 문제로 채웁니다.
+        """
+        return await asyncio.to_thread(self._get_problem_set_sync, count)
+
+    def _get_problem_set_sync(self, count: int) -> List[ArchitectureProblem]:
         problems = []
         used_categories = set()
+        refill: set = set()
 
         for _ in range(count):
-            # 다양한 카테고리에서 문제 생성
+            # 다양한 카테고리에서 문제 선택
             available_categories = [
                 c for c in PROBLEM_CATEGORIES.keys() if c not in used_categories
             ]
             if not available_categories:
                 available_categories = list(PROBLEM_CATEGORIES.keys())
 
-            import random
-
             category = random.choice(available_categories)
             used_categories.add(category)
+            difficulty = self._get_random_difficulty()
+
+            # 원하는 난이도가 비어 있으면 같은 카테고리의 다른 난이도로
+            problem = None
+            for diff in [difficulty] + [d for d in DIFFICULTY_SCALES if d != difficulty]:
+                problem = architecture_pool.pop(category, diff)
+                if problem:
+                    refill.add((category, diff))
+                    break
+                refill.add((category, diff))
+
+            if problem is None:
+                problem = self._create_fallback_problem(
+                    category,
+                    difficulty,
+                    self._new_problem_id(category, difficulty),
+                    PROBLEM_CATEGORIES[category],
+                    DIFFICULTY_SCALES[difficulty],
+                )
+                architecture_pool.remember(problem)
 
-            problem = await self.generate_problem(category=category)
+            self.generated_problems_cache[problem.id] = problem
             problems.append(problem)
 
+        for category, diff in refill:
+            _refill_if_needed(category, diff)
+
         return problems
 
     def get_cached_problem(self, problem_id: str) -> Optional[ArchitectureProblem]:
-        """캐시된 문제 조회"""
-        return self.generated_problems_cache.get(problem_id)
+        """문제 ID로 조회 (프로세스 캐시 → Redis)"""
+        problem = self.generated_problems_cache.get(problem_id)
+        if problem is None:
+            problem = architecture_pool.get_by_id(problem_id)
+            if problem is not None:
+                self.generated_problems_cache[problem_id] = problem
+        return problem
 
 
 # 문제 생성기 인스턴스
@@ -409,6 +754,10 @@ class DiagramAnalyzer:
                 "⚠️ 다이어그램 분석 서비스 사용 불가: Claude API 또는 Qwen3-VL 모델을 설정해주세요"
             )
 
+        # 문제별 결과 캐시 + 동일 그림 동시 요청 합치기
+        self.result_cache = DiagramResultCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
     async def analyze_diagram(
         self,
         image_base64: str,
@@ -416,6 +765,107 @@ class DiagramAnalyzer:
         user_explanation: Optional[str] = None,
     ) -> DiagramAnalysisResult:
         """다이어그램 분석 수행 (우선순위: Claude > Qwen3-VL > 텍스트 폴백)"""
+        result, _ = await self.analyze_diagram_cached(
+            image_base64, problem, user_explanation
+        )
+        return result
+
+    async def analyze_diagram_cached(
+        self,
+        image_base64: str,
+        problem: Optional[ArchitectureProblem] = None,
+        user_explanation: Optional[str] = None,
+        session_id: Optional[str] = None,
+        diff_mode: bool = False,
+    ) -> Tuple[DiagramAnalysisResult, Dict]:
+        """
+        전처리 + 캐시를 거쳐 다이어그램 분석 → (결과, 캐시 정보)
+
+        1. 빈 여백 자르기 + 비전 모델 해상도로 축소 (이미지 토큰 감소)
+        2. diff 모드: 같은 세션 직전 그림과 구조적으로 거의 같으면 직전 결과 재사용
+        3. 같은 문제 + 같은 설명에 대해 완전 일치 / 지각 해시 근접 일치 결과 재사용
+        4. 같은 그림이 동시에 들어오면 한 번만 분석
+        """
+        prepared = await asyncio.to_thread(prepare_diagram, image_base64)
+        problem_key = problem.id if problem else "free"
+        explanation_key = DiagramResultCache.explanation_key(user_explanation)
+        info = {
+            "original_size": list(prepared.original_size),
+            "prepared_size": list(prepared.prepared_size),
+            "bytes_ratio": round(prepared.prepared_bytes / prepared.original_bytes, 3)
+            if prepared.original_bytes
+            else 1.0,
+        }
+
+        if prepared.is_blank:
+            return self._create_error_result(
+                "빈 캔버스입니다. 다이어그램을 그린 뒤 제출해주세요."
+            ), {**info, "cache": "blank"}
+
+        cached, kind, detail = self.result_cache.lookup(
+            problem_key, explanation_key, prepared, session_id, diff_mode
+        )
+        if cached is not None:
+            if kind != "unchanged":
+                # unchanged는 기준 그림을 유지해야 작은 변화가 누적되어도 감지됨
+                self.result_cache.remember_session(
+                    session_id, problem_key, explanation_key, prepared, cached
+                )
+            print(f"♻️ [Whiteboard] 다이어그램 분석 캐시 적중 ({kind}) {detail}")
+            return cached, {**info, "cache": kind, **detail}
+
+        inflight_key = f"{problem_key}:{explanation_key}:{prepared.exact_key}"
+        pending = self._inflight.get(inflight_key)
+        if pending is not None:
+            try:
+                result = await asyncio.shield(pending)
+                return result, {**info, "cache": "inflight"}
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # 이 요청 자체가 취소됨
+                # 선행 요청이 취소됨 → 이 요청에서 직접 분석
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = future
+        t0 = time.time()
+        result = None
+        try:
+            result = await self._analyze_prepared(
+                prepared.image_base64, problem, user_explanation
+            )
+        except Exception as e:
+            print(f"다이어그램 분석 오류: {e}")
+            result = self._create_error_result(str(e))
+        finally:
+            self._inflight.pop(inflight_key, None)
+            # 선행 요청이 취소되어도 대기 중인 요청이 멈추지 않도록 항상 future를 완료
+            if result is not None:
+                future.set_result(result)
+            else:
+                future.cancel()
+        elapsed = time.time() - t0
+
+        # 오류 결과는 캐시하지 않음 (다음 요청에서 다시 시도)
+        if "error" not in result.diagram_recognition:
+            self.result_cache.store(
+                problem_key, explanation_key, prepared, result, elapsed, session_id
+            )
+            self.result_cache.remember_session(
+                session_id, problem_key, explanation_key, prepared, result
+            )
+        print(
+            f"🖼️ [Whiteboard] 다이어그램 분석 {elapsed:.1f}초 "
+            f"({prepared.original_size} → {prepared.prepared_size})"
+        )
+        return result, {**info, "cache": None, "analysis_seconds": round(elapsed, 2)}
+
+    async def _analyze_prepared(
+        self,
+        image_base64: str,
+        problem: Optional[ArchitectureProblem],
+        user_explanation: Optional[str],
+    ) -> DiagramAnalysisResult:
+        """우선순위: Claude > Qwen3-VL > 텍스트 폴백"""
 
         if self.claude_client:
             return await self._analyze_with_claude(
@@ -507,12 +957,14 @@ class DiagramAnalyzer:
                 ]
             )
 
-            response = self.vision_llm.invoke([message])
-
-            # JSON Resilience 파싱
-            response_text = response.content
-            result_data = parse_architecture_json(
-                response_text, context="Qwen3-VL vision"
+            # 스키마 제약 생성 (Ollama format) + 스트리밍 증분 파싱
+            result_data = invoke_structured_json(
+                self.vision_llm,
+                [message],
+                ARCHITECTURE_SCHEMA,
+                parse_architecture_json,
+                kind="architecture",
+                context="Qwen3-VL vision",
             )
 
             # 점수 계산
@@ -687,12 +1139,14 @@ JSON 형식으로 응답하세요:
     "detailed_analysis": "폴백 모드로 분석되었습니다."
 }}"""
 
-            response = llm.invoke([HumanMessage(content=prompt)])
-
             try:
-                result_text = response.content
-                result_data = parse_architecture_json(
-                    result_text, context="text-only fallback"
+                result_data = invoke_structured_json(
+                    llm,
+                    [HumanMessage(content=prompt)],
+                    ARCHITECTURE_SCHEMA,
+                    parse_architecture_json,
+                    kind="architecture",
+                    context="text-only fallback",
                 )
 
                 eval_data = result_data.get("architecture_evaluation", {})
@@ -803,7 +1257,7 @@ async def generate_new_problem(
     category: Optional[str] = None, difficulty: Optional[str] = None
 ):
     """새로운 아키텍처 문제 생성"""
-    problem = await problem_generator.generate_problem(
+    problem = await problem_generator.get_problem(
         category=category, difficulty=difficulty
     )
     return {
@@ -839,11 +1293,13 @@ async def analyze_diagram(request: DiagramAnalysisRequest):
     if request.problem_context:
         problem = problem_generator.get_cached_problem(request.problem_context)
 
-    # 분석 수행
-    result = await diagram_analyzer.analyze_diagram(
+    # 분석 수행 (전처리 + 결과 캐시)
+    result, cache_info = await diagram_analyzer.analyze_diagram_cached(
         image_base64=request.image_data,
         problem=problem,
         user_explanation=request.user_explanation,
+        session_id=request.session_id,
+        diff_mode=request.diff_mode,
     )
 
     # 결과 저장
@@ -863,6 +1319,7 @@ async def analyze_diagram(request: DiagramAnalysisRequest):
             "weaknesses": result.weaknesses,
             "detailed_analysis": result.detailed_analysis,
         },
+        "cache": cache_info,
     }
 
 
@@ -891,6 +1348,12 @@ async def get_whiteboard_results(session_id: str):
     }
 
 
+@router.get("/pool")
+async def get_problem_pool_status():
+    """사전 생성 문제 풀 현황 ((카테고리, 난이도)별 남은 문제 수)"""
+    return await asyncio.to_thread(architecture_pool.get_stats)
+
+
 @router.get("/status")
 async def get_whiteboard_status():
     """화이트보드 서비스 상태 확인"""
@@ -910,4 +1373,5 @@ async def get_whiteboard_status():
         "vision_fallback": vision_fallback,
         "ollama_available": OLLAMA_AVAILABLE,
         "model": model,
+        "cache": diagram_analyzer.result_cache.get_stats(),
     }
@@ -87,6 +87,12 @@ WAV2LIP_OUTPUT_FOLDER = os.path.join(UPLOADS_DIR, "Wav2Lip_mp4")
 # 데이터 폴더 (모델 입력 데이터 등)
 DATA_FOLDER = DATA_DIR
 
+# 이력서 OCR/요약 캐시 폴더 (개인정보이므로 정적 서빙 경로(uploads, data) 밖에 둠)
+RESUME_CACHE_FOLDER = os.path.join(BASE_DIR, "cache", "resume")
+
+# 질문 임베딩 인덱스 저장 폴더
+EMBEDDING_CACHE_FOLDER = os.path.join(BASE_DIR, "cache", "embeddings")
+
 # ---------------------------------------------------------
 # API 키 설정
 # ---------------------------------------------------------
@@ -116,5 +122,7 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(AUDIO_FOLDER, exist_ok=True)
 os.makedirs(TTS_FOLDER, exist_ok=True)
 os.makedirs(WAV2LIP_OUTPUT_FOLDER, exist_ok=True)
+os.makedirs(RESUME_CACHE_FOLDER, exist_ok=True)
+os.makedirs(EMBEDDING_CACHE_FOLDER, exist_ok=True)
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(STATIC_DIR, exist_ok=True)
\ No newline at end of file
@@ -1,18 +1,270 @@
+import os
+import time
+import threading
+import collections
+from contextlib import contextmanager
 import psycopg2
+import psycopg2.extensions
 from fastapi import HTTPException
 from .config import DB_HOST, DB_NAME, DB_USER, DB_PASS, DB_PORT, logger
 
+# ---------------------------------------------------------
+# 커넥션 풀 설정
+# ---------------------------------------------------------
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "20"))
+# 풀이 가득 찼을 때 빈 연결을 기다리는 최대 시간 (초)
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# 이 시간 이상 놀고 있던 연결은 대여 전에 SELECT 1로 상태를 확인 (초)
+DB_POOL_HEALTHCHECK_IDLE = float(os.getenv("DB_POOL_HEALTHCHECK_IDLE", "30"))
+# 오래된 연결은 교체 (서버/방화벽의 유휴 연결 정리 대비, 초)
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe psycopg2 커넥션 풀.
+    - 최대 maxconn개까지 생성하고, 모두 사용 중이면 timeout까지 대기합니다.
+    - 대여 시 끊긴/오래된 연결은 폐기하고 새로 연결합니다 (health check).
+    - 반납 시 열린 트랜잭션은 롤백하여 다음 사용자에게 깨끗한 상태로 넘깁니다.
+    """
+
+    def __init__(self, minconn, maxconn, timeout, **connect_kwargs):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self._connect_kwargs = connect_kwargs
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._idle = collections.deque()  # (conn, created_at, last_used)
+        self._created_at = {}
+        self._in_use = 0
+        self._stats = collections.Counter()
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+
+    def _connect(self):
+        conn = psycopg2.connect(**self._connect_kwargs)
+        with self._lock:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats["created"] += 1
+        return conn
+
+    def _discard(self, conn, reason):
+        with self._lock:
+            self._created_at.pop(id(conn), None)
+            self._stats[f"discarded_{reason}"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _healthy(self, conn, created_at, last_used):
+        now = time.monotonic()
+        if conn.closed:
+            return "closed"
+        if now - created_at > DB_POOL_MAX_LIFETIME:
+            return "expired"
+        if now - last_used > DB_POOL_HEALTHCHECK_IDLE:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+                with self._lock:
+                    self._stats["health_checks"] += 1
+            except Exception:
+                return "unhealthy"
+        return None
+
+    def acquire(self):
+        t0 = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise PoolTimeout(f"DB 커넥션 풀 대기 시간 초과 ({self.timeout}s, 최대 {self.maxconn}개 사용 중)")
+        wait_ms = (time.perf_counter() - t0) * 1000
+
+        try:
+            while True:
+                with self._lock:
+                    item = self._idle.pop() if self._idle else None
+                if item is None:
+                    conn = self._connect()
+                    break
+                conn, created_at, last_used = item
+                problem = self._healthy(conn, created_at, last_used)
+                if problem is None:
+                    with self._lock:
+                        self._stats["reused"] += 1
+                    break
+                self._discard(conn, problem)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._wait_ms_total += wait_ms
+            self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+        return conn
+
+    def release(self, conn):
+        try:
+            if conn.closed:
+                self._discard(conn, "closed")
+                return
+            status = conn.get_transaction_status()
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                self._discard(conn, "broken")
+                return
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                # commit하지 않은 작업은 버림 (기존 conn.close() 동작과 동일)
+                conn.rollback()
+            with self._lock:
+                created_at = self._created_at.get(id(conn), time.monotonic())
+                self._idle.append((conn, created_at, time.monotonic()))
+                # 최소 유지 개수를 넘는 오래된 유휴 연결은 정리
+                while len(self._idle) > max(self.minconn, self.maxconn // 2):
+                    old_conn, _, _ = self._idle.popleft()
+                    self._created_at.pop(id(old_conn), None)
+                    self._stats["discarded_surplus"] += 1
+                    old_conn.close()
+        except Exception:
+            self._discard(conn, "broken")
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def get_metrics(self):
+        with self._lock:
+            checkouts = self._stats["checkouts"]
+            return {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "open": len(self._created_at),
+                "checkouts": checkouts,
+                "reused": self._stats["reused"],
+                "created": self._stats["created"],
+                "reuse_ratio": round(self._stats["reused"] / checkouts, 3) if checkouts else 0.0,
+                "timeouts": self._stats["timeouts"],
+                "health_checks": self._stats["health_checks"],
+                "discarded": {
+                    k[len("discarded_"):]: v for k, v in self._stats.items() if k.startswith("discarded_")
+                },
+                "avg_wait_ms": round(self._wait_ms_total / checkouts, 2) if checkouts else 0.0,
+                "max_wait_ms": round(self._wait_ms_max, 2),
+            }
+
+
+class PooledConnection:
+    """
+    풀에서 빌린 psycopg2 연결 프록시.
+    기존 코드의 conn.cursor()/commit()/close() 사용법을 그대로 유지하되,
+    close()는 실제로 연결을 끊지 않고 풀에 반납합니다 (여러 번 호출해도 안전).
+    """
+
+    __slots__ = ("_pool", "_conn")
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        conn = self._conn
+        if conn is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return getattr(conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+
+    def __del__(self):
+        # close()를 빠뜨린 경로에서도 풀 슬롯이 새지 않도록 반납
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    DB_POOL_MIN,
+                    DB_POOL_MAX,
+                    DB_POOL_TIMEOUT,
+                    host=DB_HOST,
+                    database=DB_NAME,
+                    user=DB_USER,
+                    password=DB_PASS,
+                    port=DB_PORT,
+                    connect_timeout=3
+                )
+                logger.info(f"DB 커넥션 풀 생성 (min={DB_POOL_MIN}, max={DB_POOL_MAX})")
+    return _pool
+
+
 def get_db_connection():
     try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            database=DB_NAME,
-            user=DB_USER,
-            password=DB_PASS,
-            port=DB_PORT,
-            connect_timeout=3
-        )
-        return conn
+        pool = get_pool()
+        return PooledConnection(pool, pool.acquire())
+    except PoolTimeout as e:
+        logger.error(f"데이터베이스 연결 대기 초과: {e}")
+        raise HTTPException(status_code=503, detail="데이터베이스 연결이 혼잡합니다. 잠시 후 다시 시도해주세요.")
     except psycopg2.OperationalError as e:
         logger.error(f"데이터베이스 연결 실패: {e}")
         raise HTTPException(status_code=500, detail="데이터베이스 연결에 실패했습니다.")
+
+
+@contextmanager
+def unit_of_work(cursor_factory=None):
+    """
+    트랜잭션 단위 작업 헬퍼.
+    블록이 정상 종료되면 commit, 예외가 발생하면 rollback 후 연결을 풀에 반납합니다.
+
+    사용 예:
+        with unit_of_work() as c:
+            c.execute(...)
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor(cursor_factory=cursor_factory) if cursor_factory else conn.cursor()
+        yield cursor
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            pass
+        raise
+    finally:
+        conn.close()
+
+
+def get_pool_metrics():
+    """커넥션 풀 현황 (/api/monitoring/db-pool)"""
+    if _pool is None:
+        return {"initialized": False}
+    return {"initialized": True, **_pool.get_metrics()}
@@ -4,6 +4,10 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import logger, BASE_DIR, UPLOADS_DIR, DATA_DIR, STATIC_DIR
+from .database import get_pool_metrics
+from .services.stt_service import get_stt_stats
+from .services.tts_service import get_tts_cache_stats
+from .services.video_gen_service import get_video_gen_stats
 from .routers import auth, user, job, interview, admin, video_router
 
 app = FastAPI()
@@ -25,6 +29,26 @@ app.include_router(interview.router)
 app.include_router(admin.router)
 app.include_router(video_router.router)
 
+# DB 커넥션 풀 현황 (정적 파일 "/" 마운트보다 먼저 등록해야 함)
+@app.get("/api/monitoring/db-pool")
+def db_pool_metrics():
+    return get_pool_metrics()
+
+# STT 엔진별 지연/승률 및 현재 hedge delay
+@app.get("/api/monitoring/stt")
+def stt_metrics():
+    return get_stt_stats()
+
+# TTS 디스크 캐시 파일 수/용량
+@app.get("/api/monitoring/tts-cache")
+def tts_cache_metrics():
+    return get_tts_cache_stats()
+
+# Wav2Lip 상주 워커 상태 및 처리 현황
+@app.get("/api/monitoring/video-gen")
+def video_gen_metrics():
+    return get_video_gen_stats()
+
 # ---------------------------------------------------------
 # Static Files (절대경로로 마운트)
 #   - 저장되는 uploads 경로와
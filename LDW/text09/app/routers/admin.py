@@ -3,7 +3,7 @@ from typing import Optional
 from psycopg2.extras import RealDictCursor
 import os
 from ..database import get_db_connection, logger
-from ..services.pdf_service import extract_text_from_pdf
+from ..services.resume_cache_service import get_resume_text
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -72,7 +72,7 @@ def get_applicant_details(interview_number: str):
             if info_row:
                 resume_path = info_row['resume']
                 if os.path.exists(resume_path):
-                    resume_text = extract_text_from_pdf(resume_path)
+                    resume_text = get_resume_text(resume_path)
             
         # PDF 추출에 실패하거나 파일이 누락된 경우 Interview_Progress의 잘린 텍스트로 대체합니다.
         if not resume_text:
@@ -6,13 +6,14 @@ import json
 from datetime import datetime
 from psycopg2.extras import RealDictCursor
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks
-from ..database import get_db_connection, logger
+from fastapi.concurrency import run_in_threadpool
+from ..database import get_db_connection, unit_of_work, logger
 from ..config import UPLOAD_FOLDER, AUDIO_FOLDER
 from ..models import StartInterviewRequest
-from ..services.pdf_service import extract_text_from_pdf
-from ..services.llm_service import summarize_resume, generate_next_question, evaluate_answer_bg, get_job_questions
+from ..services.resume_cache_service import get_resume_summary, precompute_resume
+from ..services.llm_service import generate_next_question, evaluate_answer_bg, get_job_questions
 from ..services.stt_service import transcribe_audio
-from ..services.tts_service import generate_tts_audio
+from ..services.tts_service import generate_tts_audio, prefetch_tts_audio
 from ..services.analysis_service import analyze_interview_result
 
 router = APIRouter(prefix="/api", tags=["interview"])
@@ -42,7 +43,6 @@ async def start_interview(background_tasks: BackgroundTasks, data: StartIntervie
                  return {"success": False, "message": "이력서를 찾을 수 없습니다. 먼저 이력서를 등록해주세요."}
         
         resume_path = row[0]
-        resume_text = extract_text_from_pdf(resume_path)
         
         # 지원자 이름 확인
         c.execute("SELECT name FROM users WHERE id_name = %s", (data.id_name,))
@@ -51,6 +51,8 @@ async def start_interview(background_tasks: BackgroundTasks, data: StartIntervie
 
         # 1. 첫 번째 질문: 자기소개 (고정)
         first_question = f"안녕하세요, {applicant_name}님. 면접을 시작하겠습니다. 먼저 간단하게 자기소개를 부탁드립니다."
+        # 이력서 요약/DB 저장과 겹쳐 음성 합성 시작 (고정 문장은 캐시 적중)
+        prefetch_tts_audio(first_question)
         
         # 세션 이름 결정 (예: 면접-1)
         c.execute("SELECT COUNT(DISTINCT interview_number) FROM Interview_Progress WHERE id_name = %s", (data.id_name,))
@@ -67,8 +69,9 @@ async def start_interview(background_tasks: BackgroundTasks, data: StartIntervie
             session_name = f"{base_session_name}({suffix})"
             suffix += 1
 
-        # 이력서 요약 (새 기능)
-        resume_summary = summarize_resume(resume_text)
+        # 이력서 요약 (내용 해시 캐시 → 업로드 시 미리 계산된 결과를 재사용)
+        # (미스 시 PDF 파싱 + LLM 호출이므로 이벤트 루프를 막지 않도록 스레드풀에서 실행)
+        resume_summary = await run_in_threadpool(get_resume_summary, resume_path)
 
         # 백그라운드에서 질문 풀 준비
         background_tasks.add_task(get_job_questions, data.job_title)
@@ -129,34 +132,30 @@ async def submit_answer(
     5. 저장 및 반환.
     """
     
-    conn = None
     try:
-        # 1. 파일명을 결정하기 위해 DB를 연결하고 세션 정보를 먼저 가져옵니다.
-        conn = get_db_connection()
-        c = conn.cursor()
+        # 1. 한 번의 조회로 현재 질문 행, 세션 정보, 질문 수, 대화 기록을 모두 가져옵니다.
+        #    (STT/LLM 처리 동안 DB 연결을 붙잡지 않도록 조회 직후 반납)
+        with unit_of_work() as c:
+            c.execute("""
+                SELECT id, Create_Question, Question_answer, Resume, id_name, announcement_id, session_name
+                FROM Interview_Progress 
+                WHERE Interview_Number = %s 
+                ORDER BY id ASC
+            """, (interview_number,))
+            progress_rows = c.fetchall()
         
-        # 이 면접의 가장 마지막 행을 찾습니다.
-        c.execute("""
-            SELECT id, Create_Question, Resume, id_name, announcement_id FROM Interview_Progress 
-            WHERE Interview_Number = %s 
-            ORDER BY id DESC LIMIT 1
-        """, (interview_number,))
-        row = c.fetchone()
-        
-        if not row:
+        if not progress_rows:
              logger.error("진행 중인 질문을 찾을 수 없습니다.")
-             if conn: conn.close()
              return {"success": False, "message": "진행 중인 면접을 찾을 수 없습니다."}
              
+        # 이 면접의 가장 마지막 행이 현재 답변 중인 질문입니다.
+        row = progress_rows[-1]
         current_row_id = row[0]
         prev_question = row[1]
-        resume_summary = row[2] if row[2] else ""
-        id_name = row[3]
-        announcement_id = row[4]
-        
-        # 세션 이름 가져오기
-        c.execute("SELECT session_name FROM Interview_Progress WHERE id = %s", (current_row_id,))
-        session_name = c.fetchone()[0]
+        resume_summary = row[3] if row[3] else ""
+        id_name = row[4]
+        announcement_id = row[5]
+        session_name = row[6]
 
         # 2. 새로운 형식으로 오디오 파일 저장
         # 형식: YYYY-MM-DD-HH-MM-SS-{session_name}.webm
@@ -181,8 +180,7 @@ async def submit_answer(
             audio_analysis = None
         
         # 4. 질문 단계 결정
-        c.execute("SELECT COUNT(*) FROM Interview_Progress WHERE Interview_Number = %s", (interview_number,))
-        current_q_count = c.fetchone()[0]
+        current_q_count = len(progress_rows)
         logger.info(f"Answer Submission. Interview={interview_number}, Count={current_q_count}")
         
         next_phase = ""
@@ -200,21 +198,9 @@ async def submit_answer(
 
         # 6. 평가 및 다음 질문 생성
         # 6. 다음 질문 우선 생성 (빠른 응답을 위해)
-        # LangChain 대화 기록(Memory) 구성을 위해 이전의 모든 질문과 답변을 가져옵니다.
-        c.execute("""
-            SELECT id, Create_Question, Question_answer 
-            FROM Interview_Progress 
-            WHERE Interview_Number = %s 
-            ORDER BY id ASC
-        """, (interview_number,))
-        history_rows = c.fetchall()
-        
-        history_questions = []
-        for r in history_rows:
-            # 현재 처리 중인 질문 단계는 히스토리에서 제외 (바로 직전 질문은 개별 파라미터로 처리)
-            if r[0] == current_row_id:
-                continue
-            history_questions.append((r[1], r[2] if r[2] else ""))
+        # LangChain 대화 기록(Memory) 구성을 위해 이전의 모든 질문과 답변을 사용합니다.
+        # 현재 처리 중인 질문 단계는 히스토리에서 제외 (바로 직전 질문은 개별 파라미터로 처리)
+        history_questions = [(r[1], r[2] if r[2] else "") for r in progress_rows[:-1]]
 
         next_question = generate_next_question(
             job_title, 
@@ -231,24 +217,24 @@ async def submit_answer(
 
         # 7. 현재 답변, 시간 등을 DB에 업데이트 (평가는 나중에 채워넣도록 함)
         # Answer_Evaluation 칼럼은 일단 NULL 또는 '평가 중...' 으로 설정
-        c.execute("""
-            UPDATE Interview_Progress 
-            SET Question_answer = %s, answer_time = %s, Answer_Evaluation = %s
-            WHERE id = %s
-        """, (applicant_answer, answer_time, "평가 진행 중...", current_row_id))
-        
-        interview_finished = False
-        if next_phase == "END":
-             interview_finished = True
-        else:
-            # 8. 다음 질문 레코드 삽입 (END가 아닐 경우)
-            c.execute('''
-                INSERT INTO Interview_Progress (
-                    Interview_Number, Applicant_Name, Job_Title, Resume, Create_Question, id_name, session_name, announcement_id
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (interview_number, applicant_name, job_title, resume_summary, next_question, id_name, session_name, announcement_id))
-        
-        conn.commit()
+        interview_finished = next_phase == "END"
+        if not interview_finished:
+            # DB 커밋과 겹쳐 다음 질문 음성 합성 시작 (아래 generate_tts_audio가 이어받음)
+            prefetch_tts_audio(next_question)
+        with unit_of_work() as c:
+            c.execute("""
+                UPDATE Interview_Progress 
+                SET Question_answer = %s, answer_time = %s, Answer_Evaluation = %s
+                WHERE id = %s
+            """, (applicant_answer, answer_time, "평가 진행 중...", current_row_id))
+            
+            if not interview_finished:
+                # 8. 다음 질문 레코드 삽입 (END가 아닐 경우)
+                c.execute('''
+                    INSERT INTO Interview_Progress (
+                        Interview_Number, Applicant_Name, Job_Title, Resume, Create_Question, id_name, session_name, announcement_id
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                ''', (interview_number, applicant_name, job_title, resume_summary, next_question, id_name, session_name, announcement_id))
         
         # --- NEW: 비디오 분석 요약 추가 및 백그라운드 평가 태스크 추가 ---
         from ..services.analysis_service import get_recent_video_log_summary
@@ -272,11 +258,9 @@ async def submit_answer(
 
         if interview_finished:
              background_tasks.add_task(analyze_interview_result, interview_number, job_title, applicant_name, id_name, announcement_id)
-
-        
-        conn.commit()
-        conn.close()
-        conn = None # 연결이 닫힌 경우 finally 블록에서 이슈가 발생하지 않도록 방지
+             # 면접 종료 → 프레임 분석 대기 슬롯과 마지막 결과 정리
+             from .video_router import frame_scheduler
+             frame_scheduler.forget(interview_number)
 
         # 면접이 계속되면 다음 질문 TTS 생성
         audio_url = None
@@ -301,7 +285,6 @@ async def submit_answer(
 
     except Exception as e:
         logger.error(f"Answer Submission Error: {e}")
-        if conn: conn.close()
         # 프론트엔드 로딩이 멈추도록 오류 발생 시에도 유효한 JSON 반환
         return {
             "success": False, 
@@ -314,7 +297,7 @@ async def submit_answer(
         }
 
 @router.post("/upload/resume")
-async def upload_resume(resume: UploadFile = File(...), id_name: str = Form(...), job_title: str = Form(...)):
+async def upload_resume(background_tasks: BackgroundTasks, resume: UploadFile = File(...), id_name: str = Form(...), job_title: str = Form(...)):
     if not resume.filename.lower().endswith('.pdf'):
          raise HTTPException(status_code=400, detail="PDF 파일만 업로드 가능합니다.")
     
@@ -334,6 +317,9 @@ async def upload_resume(resume: UploadFile = File(...), id_name: str = Form(...)
         ''', (id_name, job_title, filepath))
         conn.commit()
         conn.close()
+
+        # 면접 시작 전에 OCR/요약을 미리 계산하여 캐시에 저장
+        background_tasks.add_task(precompute_resume, filepath)
         
         return {"success": True, "message": "이력서가 업로드되었습니다.", "filepath": filepath}
     except Exception as e:
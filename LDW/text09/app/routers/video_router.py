@@ -1,67 +1,51 @@
-import os
-import json
 import logging
 import time
-from fastapi import APIRouter, File, UploadFile, Form, BackgroundTasks
-from ..services.video_analysis_service import video_analysis_service
-from ..config import UPLOAD_FOLDER
+from fastapi import APIRouter, File, UploadFile, Form
+from ..services.video_analysis_service import get_video_analysis_service
+from ..services.video_log_store import video_log_store
+from ..services.frame_analysis_scheduler import FrameAnalysisScheduler
 
 router = APIRouter(prefix="/api/video", tags=["video"])
 logger = logging.getLogger(__name__)
 
-# 비디오 로그 디렉토리가 존재하는지 확인
-VIDEO_LOGS_DIR = os.path.join(UPLOAD_FOLDER, "video_logs")
-os.makedirs(VIDEO_LOGS_DIR, exist_ok=True)
-
 def append_video_log(interview_number: str, analysis_result: dict):
     """
-    특정 면접의 JSON 파일에 분석 결과를 추가합니다.
+    특정 면접의 로그(JSONL)에 분석 결과 1건을 추가합니다.
+    기존 배열 전체를 다시 쓰지 않으므로 프레임 수와 무관하게 일정한 비용입니다.
     """
     try:
-        file_path = os.path.join(VIDEO_LOGS_DIR, f"{interview_number}.json")
-        
         # 타임스탬프 추가
         analysis_result["timestamp"] = time.time()
-        
-        # 기존 파일 읽기 또는 새로 만들기
-        if os.path.exists(file_path):
-            with open(file_path, "r+", encoding="utf-8") as f:
-                try:
-                    data = json.load(f)
-                except json.JSONDecodeError:
-                    data = []
-                
-                data.append(analysis_result)
-                f.seek(0)
-                json.dump(data, f, ensure_ascii=False, indent=2)
-                f.truncate()
-        else:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump([analysis_result], f, ensure_ascii=False, indent=2)
-                
+        video_log_store.append(interview_number, analysis_result)
     except Exception as e:
         logger.error(f"비디오 로그 추가 실패: {e}")
 
+# 면접별 "최신 프레임 우선" 슬롯 + 면접 간 배치 추론 (이벤트 루프에서 추론하지 않음)
+frame_scheduler = FrameAnalysisScheduler(get_video_analysis_service(), on_result=append_video_log)
+
 @router.post("/analyze")
 async def analyze_frame(
-    background_tasks: BackgroundTasks,
     interview_number: str = Form(...),
     frame: UploadFile = File(...)
 ):
     """
-    비디오 프레임을 수신하여 분석하고 결과를 로깅합니다.
+    비디오 프레임을 수신하여 분석 대기열에 넣고 즉시 반환합니다.
+    분석이 끝나면 워커가 로그에 기록하며, 응답에는 해당 면접의 마지막 완료 결과가 담깁니다.
     """
     try:
         contents = await frame.read()
         
-        # 분석 수행
-        result = video_analysis_service.process_frame(contents)
+        # 분석 예약 (처리 중이면 대기 프레임을 교체)
+        result, age_ms = frame_scheduler.submit(interview_number, contents)
         
-        # 백그라운드에서 파일에 로깅
-        background_tasks.add_task(append_video_log, interview_number, result)
-        
-        return {"success": True, "analysis": result}
+        return {"success": True, "analysis": result, "analysis_age_ms": age_ms}
         
     except Exception as e:
         logger.error(f"비디오 분석 엔드포인트 오류: {e}")
         return {"success": False, "error": str(e)}
+
+
+@router.get("/metrics")
+def frame_analysis_metrics():
+    """프레임 분석 드롭/지연 통계"""
+    return frame_scheduler.get_metrics()
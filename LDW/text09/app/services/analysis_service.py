@@ -5,55 +5,28 @@ import collections
 from ..database import get_db_connection, logger
 from ..services.llm_service import get_model
 from ..services.pdf_service import convert_pdf_to_images
-from ..config import UPLOAD_FOLDER
+from ..services.video_log_store import video_log_store
 
 def get_video_analysis_summary(interview_number):
     """
-    면접의 비디오 로그 JSON 파일을 읽고 요약 문자열을 반환합니다.
+    면접의 비디오 로그 누적 집계를 읽고 요약 문자열을 반환합니다.
     """
-    log_path = os.path.join(UPLOAD_FOLDER, "video_logs", f"{interview_number}.json")
-    if not os.path.exists(log_path):
-        return "비디오 분석 데이터가 없습니다."
-        
     try:
-        with open(log_path, "r", encoding="utf-8") as f:
-            logs = json.load(f)
-            
-        if not logs:
+        agg = video_log_store.get_aggregate(interview_number)
+        if agg is None:
+            return "비디오 분석 데이터가 없습니다."
+        if not agg["total_frames"]:
             return "비디오 분석 데이터가 비어 있습니다."
-            
-        total_frames = len(logs)
-        emotions = []
-        gaze_avoidance_count = 0
-        bad_posture_count = 0
-        hand_fidgeting_count = 0
-        
-        for log in logs:
-            # 감정 분석
-            if "emotion" in log and log["emotion"]:
-                emotions.append(log["emotion"])
-            
-            # 시선 분석 (임시 로직: 얼굴 인식 여부 등 확인)
-            if log.get("face_mesh") != "detected": 
-                 pass 
-            
-            # 자세 분석 (임시)
-            if log.get("pose") == "bad_posture": 
-                bad_posture_count += 1
-                
-            # 손 동작 분석
-            if log.get("hands", 0) > 0:
-                hand_fidgeting_count += 1
 
-        emotion_counts = collections.Counter(emotions)
+        emotion_counts = collections.Counter(agg["emotion_counts"])
         top_emotions = emotion_counts.most_common(3)
         emotion_summary = ", ".join([f"{e}: {c}회" for e, c in top_emotions])
         
         summary = f"""
         [비디오 분석 요약]
-        - 총 분석 프레임: {total_frames}
+        - 총 분석 프레임: {agg["total_frames"]}
         - 주요 감정: {emotion_summary}
-        - 손 움직임 감지 프레임: {hand_fidgeting_count} (손을 자주 움직이는지 참고)
+        - 손 움직임 감지 프레임: {agg["hand_frames"]} (손을 자주 움직이는지 참고)
         - (참고: 자세 및 시선 분석은 현재 감지된 프레임 수만 집계됨)
         """
         return summary
@@ -65,30 +38,11 @@ def get_video_analysis_summary(interview_number):
 def get_recent_video_log_summary(interview_number: str, duration_seconds: int = 60) -> str:
     """
     지정된 interview_number에 대해 최근 'duration_seconds' 동안의 비디오 로그를 검색합니다.
-    감정과 자세에 대한 텍스트 요약을 반환합니다.
+    시간 인덱스로 로그 꼬리만 읽어 감정에 대한 텍스트 요약을 반환합니다.
     """
-    log_path = os.path.join(UPLOAD_FOLDER, "video_logs", f"{interview_number}.json")
-    if not os.path.exists(log_path):
-        return ""
-
     try:
-        import time
-        current_time = time.time()
-        start_time = current_time - duration_seconds
+        recent_logs = video_log_store.read_recent(interview_number, duration_seconds)
 
-        with open(log_path, "r", encoding="utf-8") as f:
-            logs = json.load(f)
-
-        if not logs:
-            return ""
-
-        # 타임스탬프가 있는 경우 필터링, 없는 경우 최근 N개 사용
-        recent_logs = []
-        for log in logs:
-            if "timestamp" in log:
-                 if log["timestamp"] >= start_time:
-                     recent_logs.append(log)
-        
         # 최근 로그가 없는 경우 빈 문자열 반환
         if not recent_logs:
              return ""
@@ -156,8 +110,8 @@ def analyze_interview_result(interview_number, job_title, applicant_name, id_nam
         # 비디오 분석 요약 가져오기 (실제 처리)
         video_upload_dir = os.path.join(os.getcwd(), "uploads", "audio")
         
-        from .video_analysis_service import video_analysis_service
-        video_results = video_analysis_service.process_session_videos(session_name, video_upload_dir)
+        from .video_analysis_service import get_video_analysis_service
+        video_results = get_video_analysis_service().process_session_videos(session_name, video_upload_dir)
         
         # LLM을 위한 비디오 결과 요약
         emotion_counts = collections.Counter(video_results["total_emotions"])
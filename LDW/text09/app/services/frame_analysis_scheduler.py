@@ -0,0 +1,189 @@
+import os
+import time
+import threading
+import collections
+import numpy as np
+import cv2
+from ..config import logger
+
+# ---------------------------------------------------------
+# 설정
+# ---------------------------------------------------------
+# 프레임 분석 워커 스레드 수 (TF/DeepFace 추론은 GIL을 놓으므로 스레드로 충분)
+VIDEO_FRAME_WORKERS = int(os.getenv("VIDEO_FRAME_WORKERS", "2"))
+# 한 번의 추론에서 여러 면접의 프레임을 묶는 최대 개수 (1이면 배치 비활성화)
+VIDEO_FRAME_BATCH_SIZE = int(os.getenv("VIDEO_FRAME_BATCH_SIZE", "8"))
+# 지연 통계에 사용할 최근 표본 수
+LATENCY_WINDOW = 500
+# 이 시간 동안 새 결과가 없는 면접의 마지막 결과는 정리 (초)
+LATEST_RESULT_TTL = 600
+
+
+class FrameAnalysisScheduler:
+    """
+    /api/video/analyze 용 프레임 분석 스케줄러.
+
+    - 면접별로 대기 슬롯을 하나만 둡니다 ("최신 프레임 우선").
+      처리 중에 새 프레임이 오면 대기 중인 프레임을 교체하고 이전 것은 버립니다.
+    - 워커 스레드가 대기 슬롯을 여러 면접에서 모아 한 번에 배치 추론합니다.
+    - 같은 면접의 프레임은 동시에 하나만 처리하므로 결과 순서가 뒤바뀌지 않습니다.
+    - submit()은 즉시 반환하며, 해당 면접의 마지막 완료 결과를 돌려줍니다.
+    """
+
+    def __init__(self, analyzer, on_result=None, workers=VIDEO_FRAME_WORKERS, batch_size=VIDEO_FRAME_BATCH_SIZE):
+        self.analyzer = analyzer
+        self.on_result = on_result
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self._cond = threading.Condition()
+        self._pending = collections.OrderedDict()  # interview_number -> (bytes, received_at)
+        self._in_flight = set()
+        self._latest = {}  # interview_number -> (result, completed_at)
+        self._threads = []
+        self._stats = collections.Counter()
+        self._queue_ms = collections.deque(maxlen=LATENCY_WINDOW)
+        self._inference_ms = collections.deque(maxlen=LATENCY_WINDOW)
+        self._batch_sizes = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"frame-analysis-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info(f"프레임 분석 워커 시작 (workers={self.workers}, batch={self.batch_size})")
+
+    # ───────── 제출 ─────────
+
+    def submit(self, interview_number, image_bytes):
+        """
+        프레임을 대기 슬롯에 넣고 즉시 반환합니다.
+        반환값: (마지막 완료 결과 또는 None, 결과 경과 시간(ms) 또는 None)
+        """
+        with self._cond:
+            self._ensure_started()
+            self._stats["submitted"] += 1
+            if interview_number in self._pending:
+                # 아직 처리되지 않은 이전 프레임은 교체 (최신 프레임 우선)
+                self._stats["dropped"] += 1
+            self._pending[interview_number] = (image_bytes, time.monotonic())
+            self._cond.notify()
+            latest = self._latest.get(interview_number)
+
+        if latest is None:
+            return None, None
+        result, completed_at = latest
+        return result, round((time.monotonic() - completed_at) * 1000, 1)
+
+    def forget(self, interview_number):
+        """면접 종료 시 슬롯과 마지막 결과를 정리합니다."""
+        with self._cond:
+            if self._pending.pop(interview_number, None) is not None:
+                self._stats["dropped"] += 1
+            self._latest.pop(interview_number, None)
+
+    # ───────── 워커 ─────────
+
+    def _take_batch(self):
+        """처리 중이 아닌 면접의 대기 프레임을 도착 순서대로 최대 batch_size개 꺼냅니다."""
+        batch = []
+        for interview_number in list(self._pending):
+            if interview_number in self._in_flight:
+                continue
+            image_bytes, received_at = self._pending.pop(interview_number)
+            self._in_flight.add(interview_number)
+            batch.append((interview_number, image_bytes, received_at))
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                batch = self._take_batch()
+                while not batch:
+                    self._cond.wait()
+                    batch = self._take_batch()
+            try:
+                self._process(batch)
+            except Exception as e:
+                logger.error(f"프레임 배치 분석 오류: {e}")
+            finally:
+                with self._cond:
+                    for interview_number, _, _ in batch:
+                        self._in_flight.discard(interview_number)
+                    # 처리 중이라 건너뛰었던 면접의 새 프레임을 다른 워커가 가져가도록 깨움
+                    self._cond.notify_all()
+
+    def _process(self, batch):
+        started = time.monotonic()
+        frames, items, results = [], [], {}
+        for interview_number, image_bytes, received_at in batch:
+            frame = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                results[interview_number] = {"error": "이미지 디코딩 실패"}
+            else:
+                frames.append(frame)
+                items.append(interview_number)
+
+        if frames:
+            try:
+                for interview_number, result in zip(items, self.analyzer.analyze_frames(frames)):
+                    results[interview_number] = result
+            except Exception as e:
+                logger.error(f"프레임 처리 중 오류 발생: {e}")
+                for interview_number in items:
+                    results[interview_number] = {"error": str(e)}
+
+        completed = time.monotonic()
+        with self._cond:
+            self._stats["processed"] += len(batch)
+            self._stats["batches"] += 1
+            self._batch_sizes.append(len(batch))
+            self._inference_ms.append((completed - started) * 1000)
+            for interview_number, _, received_at in batch:
+                self._queue_ms.append((started - received_at) * 1000)
+                self._latest.pop(interview_number, None)
+                self._latest[interview_number] = (results[interview_number], completed)
+            # 종료된 면접의 결과 정리 (_latest는 완료 시각 순으로 유지됨)
+            while self._latest:
+                oldest = next(iter(self._latest))
+                if completed - self._latest[oldest][1] < LATEST_RESULT_TTL:
+                    break
+                del self._latest[oldest]
+
+        if self.on_result:
+            for interview_number, _, _ in batch:
+                self.on_result(interview_number, dict(results[interview_number]))
+
+    # ───────── 지표 ─────────
+
+    def get_metrics(self):
+        def summary(samples):
+            if not samples:
+                return {"avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+            arr = np.asarray(samples)
+            return {
+                "avg": round(float(arr.mean()), 1),
+                "p50": round(float(np.percentile(arr, 50)), 1),
+                "p95": round(float(np.percentile(arr, 95)), 1),
+                "max": round(float(arr.max()), 1),
+            }
+
+        with self._cond:
+            submitted = self._stats["submitted"]
+            return {
+                "workers": self.workers,
+                "batch_size": self.batch_size,
+                "submitted": submitted,
+                "processed": self._stats["processed"],
+                "dropped": self._stats["dropped"],
+                "drop_ratio": round(self._stats["dropped"] / submitted, 3) if submitted else 0.0,
+                "pending": len(self._pending),
+                "in_flight": len(self._in_flight),
+                "batches": self._stats["batches"],
+                "avg_batch_size": round(float(np.mean(self._batch_sizes)), 2) if self._batch_sizes else 0.0,
+                "queue_wait_ms": summary(self._queue_ms),
+                "inference_ms": summary(self._inference_ms),
+            }
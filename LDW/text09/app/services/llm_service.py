@@ -2,9 +2,12 @@ import json
 import os
 import time
 import warnings
+import threading
 import google.generativeai as genai
+from psycopg2.extras import execute_values
 from ..config import GOOGLE_API_KEY, logger
 from ..database import get_db_connection
+from .question_index_service import get_question_index
 from google.api_core.exceptions import ResourceExhausted
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
@@ -73,93 +76,87 @@ def clean_json_string(json_str):
         json_str = json_str.split("```")[1].split("```")[0]
     return json_str.strip()
 
+# 직무별 참고 질문 풀 메모리 캐시 (풀은 한 번 만들어지면 바뀌지 않음)
+_JOB_QUESTION_CACHE = {}
+_JOB_QUESTION_LOCKS = {}
+_JOB_QUESTION_LOCKS_GUARD = threading.Lock()
+# 직무별로 선택할 참고 질문 수 (5~10)
+JOB_QUESTION_POOL_SIZE = 8
+
+def _job_question_lock(job_title):
+    with _JOB_QUESTION_LOCKS_GUARD:
+        lock = _JOB_QUESTION_LOCKS.get(job_title)
+        if lock is None:
+            lock = _JOB_QUESTION_LOCKS[job_title] = threading.Lock()
+        return lock
+
 def get_job_questions(job_title):
     """
     직무에 맞는 질문을 가져옵니다.
-    풀에 없는 경우 LLM을 사용하여 interview_answer에서 선택하고 풀에 저장합니다.
+    메모리 캐시 → DB 풀 순으로 확인하고, 풀이 없으면 질문 임베딩 인덱스에서
+    직무와 관련도가 높고 서로 겹치지 않는 질문(top-k + MMR)을 골라 풀에 저장합니다.
     """
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    # 1. 풀 확인
-    c.execute("SELECT question_id FROM job_question_pool WHERE job_title = %s", (job_title,))
-    rows = c.fetchall()
-    
-    if rows:
-        # 실제 질문 텍스트 가져오기
-        question_ids = [row[0] for row in rows]
-        # IN 절을 위한 동적 쿼리 생성
-        placeholders = ','.join(['%s'] * len(question_ids))
-        c.execute(f"SELECT question FROM interview_answer WHERE id IN ({placeholders})", tuple(question_ids))
-        questions = [r[0] for r in c.fetchall()]
-        conn.close()
-        return questions
-
-    # 2. 풀이 없는 경우 LLM을 사용하여 생성
-    logger.info(f"{job_title}에 대한 풀을 찾을 수 없습니다. LLM을 사용하여 생성합니다...")
-    c.execute("SELECT id, question FROM interview_answer") # 모든 질문 가져오기
-    all_questions = c.fetchall() # (id, question) 리스트
-    
-    if not all_questions:
-        conn.close()
-        return ["자기소개를 해주세요."]
+    cached = _JOB_QUESTION_CACHE.get(job_title)
+    if cached is not None:
+        return list(cached)
 
-    # LLM을 위한 JSON 변환
-    questions_json = [{"id": q[0], "question": q[1]} for q in all_questions]
-    
-    prompt = f"""
-    당신은 채용 담당자입니다.
-    지원 직무: {job_title}
-    
-    아래 전체 면접 질문 리스트에서 해당 직무에 가장 적합한 핵심 질문 5~10개를 선별해주세요.
-    반드시 JSON 형식으로 ID 리스트만 반환해주세요. 
-    
-    질문 리스트:
-    {json.dumps(questions_json[:500], ensure_ascii=False)} 
-    (데이터가 많으면 일부만 전송됨)
-
-    Response Schema:
-    {{
-        "ids": [1, 5, 10]
-    }}
-    """
-    
-    try:
-        model = get_model()
-        response = generate_content_with_retry(
-            model,
-            prompt,
-            generation_config={"response_mime_type": "application/json"}
-        )
-        
-        text_response = clean_json_string(response.text)
-        result = json.loads(text_response)
-        selected_ids = result.get("ids", [])
-        
-        if not selected_ids:
-             # LLM 실패 시 랜덤하게 5개 선택
-             selected_ids = [q[0] for q in all_questions[:5]]
+    # start_interview 백그라운드 태스크와 submit_answer가 같은 직무 풀을 중복 생성하지 않도록 직무별 잠금
+    with _job_question_lock(job_title):
+        cached = _JOB_QUESTION_CACHE.get(job_title)
+        if cached is not None:
+            return list(cached)
 
-        # 풀에 저장
-        for q_id in selected_ids:
-            c.execute("INSERT INTO job_question_pool (job_title, question_id) VALUES (%s, %s)", (job_title, q_id))
-        
-        conn.commit()
-        
-        # 텍스트 반환
-        if not selected_ids:
-             questions = ["자기소개를 부탁드립니다."]
-        else:
-             c.execute(f"SELECT question FROM interview_answer WHERE id = ANY(%s)", (selected_ids,))
-             questions = [r[0] for r in c.fetchall()]
-             
-        conn.close()
-        return questions
+        conn = get_db_connection()
+        try:
+            c = conn.cursor()
 
-    except Exception as e:
-        logger.error(f"LLM 풀 생성 오류: {e}")
-        conn.close()
-        return ["자기소개를 부탁드립니다.", "성격의 장단점은 무엇인가요?"]
+            # 1. 풀 확인 (질문 텍스트까지 한 번에 조회)
+            c.execute("""
+                SELECT a.question
+                FROM job_question_pool p
+                JOIN interview_answer a ON a.id = p.question_id
+                WHERE p.job_title = %s
+            """, (job_title,))
+            questions = [r[0] for r in c.fetchall()]
+            if questions:
+                _JOB_QUESTION_CACHE[job_title] = questions
+                return list(questions)
+
+            # 2. 풀이 없는 경우 임베딩 인덱스에서 선택
+            logger.info(f"{job_title}에 대한 풀을 찾을 수 없습니다. 질문 임베딩 인덱스로 생성합니다...")
+            try:
+                selected_ids = get_question_index().select(f"{job_title} 직무 면접 질문", k=JOB_QUESTION_POOL_SIZE)
+            except Exception as e:
+                logger.error(f"질문 인덱스 선택 오류: {e}")
+                selected_ids = []
+
+            if not selected_ids:
+                # 인덱스 사용 불가 시 앞쪽 5개 선택
+                c.execute("SELECT id FROM interview_answer ORDER BY id LIMIT 5")
+                selected_ids = [r[0] for r in c.fetchall()]
+            if not selected_ids:
+                return ["자기소개를 해주세요."]
+
+            # 풀에 저장 (한 번의 bulk insert)
+            execute_values(
+                c,
+                "INSERT INTO job_question_pool (job_title, question_id) VALUES %s",
+                [(job_title, q_id) for q_id in selected_ids],
+            )
+            conn.commit()
+
+            # 텍스트 반환 (선택 순서 유지)
+            c.execute("SELECT id, question FROM interview_answer WHERE id = ANY(%s)", (selected_ids,))
+            by_id = dict(c.fetchall())
+            questions = [by_id[q_id] for q_id in selected_ids if q_id in by_id]
+            _JOB_QUESTION_CACHE[job_title] = questions
+            return list(questions)
+
+        except Exception as e:
+            logger.error(f"질문 풀 생성 오류: {e}")
+            return ["자기소개를 부탁드립니다.", "성격의 장단점은 무엇인가요?"]
+        finally:
+            conn.close()
 
 def summarize_resume(text):
     """
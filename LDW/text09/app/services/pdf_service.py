@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 import fitz  # PyMuPDF
 import easyocr
 import torch
@@ -20,17 +21,27 @@ logger.info("EasyOCR 초기화 중... (잠시 시간이 걸릴 수 있습니다)
 ocr_reader = easyocr.Reader(['ko', 'en'], gpu=USE_CUDA)
 logger.info("EasyOCR 초기화 완료.")
 
+# 페이지 병렬 OCR 동시 실행 수 (CPU 코어/메모리에 맞게 조정, 1이면 순차 처리)
+OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", "2" if USE_CUDA else str(min(4, os.cpu_count() or 1))))
+_ocr_executor = ThreadPoolExecutor(max_workers=max(1, OCR_MAX_WORKERS), thread_name_prefix="ocr")
+
+def _ocr_page(img_array):
+    # detail=0 -> 텍스트 문자열 리스트 반환
+    return " ".join(ocr_reader.readtext(img_array, detail=0))
+
 def extract_text_from_pdf(filepath):
     """
     내부 페이지를 이미지로 변환하고 EasyOCR을 사용하여 PDF에서 텍스트를 추출합니다.
+    페이지 렌더링은 순차로, OCR은 최대 OCR_MAX_WORKERS개 페이지를 병렬로 처리합니다.
+    (캐시가 필요한 호출부는 resume_cache_service.get_resume_text를 사용하세요)
     """
     logger.info(f"PDF에서 텍스트 추출 중: {filepath}")
-    extracted_text = ""
     try:
         # PyMuPDF로 PDF 열기
         doc = fitz.open(filepath)
         
-        for i, page in enumerate(doc):
+        futures = []
+        for page in doc:
             # 페이지를 이미지(pixmap)로 렌더링
             # matrix=fitz.Matrix(2, 2)를 사용하여 고해상도로 설정 (OCR에 유리)
             pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
@@ -43,12 +54,15 @@ def extract_text_from_pdf(filepath):
             if pix.n == 4:
                 img_array = img_array[..., :3]
                 
-            # OCR 수행
-            result = ocr_reader.readtext(img_array, detail=0) # detail=0 -> 텍스트 문자열 리스트 반환
-            page_text = " ".join(result)
-            extracted_text += f"\n[Page {i+1}]\n{page_text}"
+            # OCR 수행 (렌더링하는 동안 앞 페이지 OCR이 병렬로 진행됨, pixmap 해제에 대비해 복사)
+            futures.append(_ocr_executor.submit(_ocr_page, img_array.copy()))
+
+        # 페이지 순서대로 결과 조립
+        extracted_text = "".join(
+            f"\n[Page {i+1}]\n{future.result()}" for i, future in enumerate(futures)
+        )
 
-        logger.info(f"OCR 추출 완료. 길이: {len(extracted_text)}")
+        logger.info(f"OCR 추출 완료. 페이지: {len(futures)}, 길이: {len(extracted_text)}")
         return extracted_text
 
     except Exception as e:
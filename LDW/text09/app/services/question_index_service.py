@@ -0,0 +1,220 @@
+import os
+import time
+import hashlib
+import threading
+import numpy as np
+import google.generativeai as genai
+from ..config import GOOGLE_API_KEY, EMBEDDING_CACHE_FOLDER, logger
+from ..database import get_db_connection
+
+# ---------------------------------------------------------
+# 설정
+# ---------------------------------------------------------
+# Gemini 임베딩 모델 (API 키가 없거나 호출 실패 시 로컬 해시 임베딩으로 대체)
+EMBEDDING_MODEL = os.getenv("QUESTION_EMBEDDING_MODEL", "models/text-embedding-004")
+EMBEDDING_BATCH_SIZE = 100
+# 로컬 대체 임베딩 (문자 2~3-gram 해싱) 차원
+HASH_EMBEDDING_DIM = 1024
+# DB 변경 여부 확인 주기 (초) — 답변 제출 경로에서 매번 전체 목록을 조회하지 않도록 제한
+INDEX_REFRESH_INTERVAL = float(os.getenv("QUESTION_INDEX_REFRESH_INTERVAL", "300"))
+# MMR: 관련도(1.0)와 다양성(0.0) 사이 가중치
+MMR_LAMBDA = float(os.getenv("QUESTION_MMR_LAMBDA", "0.7"))
+
+INDEX_PATH = os.path.join(EMBEDDING_CACHE_FOLDER, "interview_answer_questions.npz")
+
+
+def _text_digest(text):
+    return hashlib.md5((text or "").encode("utf-8")).hexdigest()
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _hash_embed(texts):
+    """문자 2~3-gram을 고정 차원으로 해싱한 로컬 임베딩 (프로세스 간 동일한 결과)"""
+    matrix = np.zeros((len(texts), HASH_EMBEDDING_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        compact = "".join((text or "").split())
+        for n in (2, 3):
+            for i in range(len(compact) - n + 1):
+                digest = hashlib.blake2b(compact[i:i + n].encode("utf-8"), digest_size=8).digest()
+                matrix[row, int.from_bytes(digest, "little") % HASH_EMBEDDING_DIM] += 1.0
+    return _normalize(np.log1p(matrix))
+
+
+class QuestionEmbeddingIndex:
+    """
+    interview_answer 질문 임베딩 인덱스.
+
+    - 임베딩 행렬(NumPy)을 디스크(.npz)에 저장하고, 재시작 시 그대로 불러옵니다.
+    - DB 행이 바뀌면 (id, 질문 md5) 비교로 추가/변경된 질문만 다시 임베딩합니다.
+    - 직무명과의 유사도 top-k 후보에서 MMR로 중복 없는 질문 세트를 고릅니다.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.backend = "gemini" if GOOGLE_API_KEY else "hash"
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.digests = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self._last_refresh = 0.0
+        self._load()
+
+    # ───────── 임베딩 ─────────
+
+    def _embed(self, texts, task_type):
+        if self.backend == "gemini":
+            try:
+                vectors = []
+                for i in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+                    result = genai.embed_content(
+                        model=EMBEDDING_MODEL,
+                        content=texts[i:i + EMBEDDING_BATCH_SIZE],
+                        task_type=task_type,
+                    )
+                    vectors.extend(result["embedding"])
+                return _normalize(np.asarray(vectors, dtype=np.float32))
+            except Exception as e:
+                # 백엔드가 바뀌면 기존 벡터와 섞일 수 없으므로 인덱스 전체를 해시 임베딩으로 재구성
+                logger.warning(f"Gemini 임베딩 실패, 로컬 해시 임베딩으로 전환합니다: {e}")
+                self.backend = "hash"
+                self.ids = np.zeros(0, dtype=np.int64)
+                self.digests = []
+                self.matrix = np.zeros((0, 0), dtype=np.float32)
+                raise _BackendChanged()
+        return _hash_embed(texts)
+
+    # ───────── 저장/로드 ─────────
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            data = np.load(self.path, allow_pickle=False)
+            if str(data["backend"]) != self.backend:
+                logger.info("질문 인덱스 임베딩 백엔드가 달라 새로 생성합니다.")
+                return
+            self.ids = data["ids"]
+            self.digests = list(data["digests"])
+            self.matrix = data["matrix"]
+            logger.info(f"질문 임베딩 인덱스 로드: {len(self.ids)}개 ({self.backend})")
+        except Exception as e:
+            logger.warning(f"질문 임베딩 인덱스 로드 실패 (재생성): {e}")
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            backend=np.array(self.backend),
+            ids=self.ids,
+            digests=np.array(self.digests, dtype="U32"),
+            matrix=self.matrix,
+        )
+        os.replace(tmp_path, self.path)
+
+    # ───────── 증분 갱신 ─────────
+
+    def refresh(self, force=False):
+        """DB와 비교하여 추가/변경/삭제된 질문만 반영합니다."""
+        with self._lock:
+            if not force and time.monotonic() - self._last_refresh < INDEX_REFRESH_INTERVAL and len(self.ids):
+                return
+            conn = get_db_connection()
+            try:
+                c = conn.cursor()
+                c.execute("SELECT id, md5(COALESCE(question, '')) FROM interview_answer ORDER BY id")
+                current = c.fetchall()
+
+                known = {int(i): (row, d) for row, (i, d) in enumerate(zip(self.ids, self.digests))}
+                changed_ids = [i for i, d in current if i not in known or known[i][1] != d]
+                if len(current) == len(self.ids) and not changed_ids:
+                    self._last_refresh = time.monotonic()
+                    return
+
+                new_vectors = {}
+                if changed_ids:
+                    c.execute("SELECT id, question FROM interview_answer WHERE id = ANY(%s)", (changed_ids,))
+                    rows = c.fetchall()
+                    try:
+                        embedded = self._embed([q for _, q in rows], "RETRIEVAL_DOCUMENT")
+                    except _BackendChanged:
+                        # 백엔드 전환 → 전체 질문을 새 백엔드로 임베딩
+                        c.execute("SELECT id, question FROM interview_answer")
+                        rows = c.fetchall()
+                        embedded = self._embed([q for _, q in rows], "RETRIEVAL_DOCUMENT")
+                        known = {}
+                    new_vectors = {i: (vec, _text_digest(q)) for (i, q), vec in zip(rows, embedded)}
+            finally:
+                conn.close()
+
+            ids, digests, vectors = [], [], []
+            for i, digest in current:
+                if i in new_vectors:
+                    vec, digest = new_vectors[i]
+                elif i in known:
+                    vec = self.matrix[known[i][0]]
+                else:
+                    continue
+                ids.append(i)
+                digests.append(digest)
+                vectors.append(vec)
+
+            self.ids = np.asarray(ids, dtype=np.int64)
+            self.digests = digests
+            self.matrix = np.vstack(vectors).astype(np.float32) if vectors else np.zeros((0, 0), dtype=np.float32)
+            self._last_refresh = time.monotonic()
+            self._save()
+            logger.info(
+                f"질문 임베딩 인덱스 갱신: 전체 {len(ids)}개, 신규/변경 {len(new_vectors)}개 ({self.backend})"
+            )
+
+    # ───────── 선택 (top-k + MMR) ─────────
+
+    def select(self, query, k=8, candidates=40, mmr_lambda=MMR_LAMBDA):
+        """
+        질의(직무명)와 관련도가 높으면서 서로 겹치지 않는 질문 ID k개를 반환합니다.
+        """
+        self.refresh()
+        with self._lock:
+            if not len(self.ids):
+                return []
+            try:
+                q = self._embed([query], "RETRIEVAL_QUERY")[0]
+            except _BackendChanged:
+                return []
+            ids, matrix = self.ids, self.matrix
+
+        scores = matrix @ q
+        top = np.argsort(-scores)[:candidates]
+        selected = []
+        while top.size and len(selected) < k:
+            if selected:
+                redundancy = (matrix[top] @ matrix[selected].T).max(axis=1)
+            else:
+                redundancy = np.zeros(len(top), dtype=np.float32)
+            mmr = mmr_lambda * scores[top] - (1 - mmr_lambda) * redundancy
+            best = int(np.argmax(mmr))
+            selected.append(int(top[best]))
+            top = np.delete(top, best)
+        return [int(ids[i]) for i in selected]
+
+
+class _BackendChanged(Exception):
+    pass
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_question_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = QuestionEmbeddingIndex()
+    return _index
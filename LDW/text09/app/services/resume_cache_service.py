@@ -0,0 +1,195 @@
+import os
+import json
+import hashlib
+import threading
+from ..config import RESUME_CACHE_FOLDER, logger
+from ..database import get_db_connection
+from .pdf_service import extract_text_from_pdf
+from .llm_service import summarize_resume
+
+# 같은 이력서(내용 해시)에 대한 동시 OCR/요약을 1회로 합치기 위한 잠금
+_hash_locks = {}
+_hash_locks_guard = threading.Lock()
+_table_ready = False
+
+
+def file_content_hash(filepath):
+    """이력서 파일 내용의 SHA-256 해시 (파일명/업로드 경로와 무관)"""
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _lock_for(content_hash):
+    with _hash_locks_guard:
+        lock = _hash_locks.get(content_hash)
+        if lock is None:
+            lock = _hash_locks[content_hash] = threading.Lock()
+        return lock
+
+
+# ---------------------------------------------------------
+# 로컬 디스크 캐시 ({RESUME_CACHE_FOLDER}/{hash}.json)
+# ---------------------------------------------------------
+def _disk_path(content_hash):
+    return os.path.join(RESUME_CACHE_FOLDER, f"{content_hash}.json")
+
+
+def _read_disk(content_hash):
+    try:
+        with open(_disk_path(content_hash), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _write_disk(content_hash, entry):
+    path = _disk_path(content_hash)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"이력서 캐시 디스크 저장 실패: {e}")
+
+
+# ---------------------------------------------------------
+# DB 캐시 (resume_cache 테이블) — DB 장애 시 디스크 캐시만 사용
+# ---------------------------------------------------------
+def _ensure_table(c):
+    global _table_ready
+    if _table_ready:
+        return
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS resume_cache (
+            content_hash TEXT PRIMARY KEY,
+            ocr_text TEXT,
+            summary TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    _table_ready = True
+
+
+def _read_db(content_hash):
+    try:
+        conn = get_db_connection()
+        try:
+            c = conn.cursor()
+            _ensure_table(c)
+            c.execute("SELECT ocr_text, summary FROM resume_cache WHERE content_hash = %s", (content_hash,))
+            row = c.fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f"이력서 캐시 DB 조회 실패 (디스크 캐시만 사용): {e}")
+        return {}
+    if not row:
+        return {}
+    return {k: v for k, v in (("ocr_text", row[0]), ("summary", row[1])) if v}
+
+
+def _write_db(content_hash, entry):
+    try:
+        conn = get_db_connection()
+        try:
+            c = conn.cursor()
+            _ensure_table(c)
+            c.execute('''
+                INSERT INTO resume_cache (content_hash, ocr_text, summary)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (content_hash) DO UPDATE SET
+                    ocr_text = COALESCE(EXCLUDED.ocr_text, resume_cache.ocr_text),
+                    summary = COALESCE(EXCLUDED.summary, resume_cache.summary),
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (content_hash, entry.get("ocr_text"), entry.get("summary")))
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f"이력서 캐시 DB 저장 실패: {e}")
+
+
+def _load_entry(content_hash):
+    """디스크 → DB 순으로 조회. DB에서만 찾은 경우 디스크에도 채워 둡니다."""
+    entry = _read_disk(content_hash)
+    if entry.get("ocr_text") and entry.get("summary"):
+        return entry
+    db_entry = _read_db(content_hash)
+    if db_entry:
+        entry = {**db_entry, **entry}
+        _write_disk(content_hash, entry)
+    return entry
+
+
+def _store(content_hash, entry):
+    _write_disk(content_hash, entry)
+    _write_db(content_hash, entry)
+
+
+# ---------------------------------------------------------
+# 공개 API
+# ---------------------------------------------------------
+def get_resume_text(filepath):
+    """
+    이력서 OCR 텍스트를 반환합니다 (내용 해시 캐시 → 없으면 OCR 후 저장).
+    """
+    if not os.path.exists(filepath):
+        logger.error(f"이력서 파일이 없습니다: {filepath}")
+        return ""
+    content_hash = file_content_hash(filepath)
+    with _lock_for(content_hash):
+        entry = _load_entry(content_hash)
+        if entry.get("ocr_text"):
+            logger.info(f"이력서 OCR 캐시 적중: {content_hash[:12]}")
+            return entry["ocr_text"]
+
+        text = extract_text_from_pdf(filepath)
+        if text:
+            entry["ocr_text"] = text
+            _store(content_hash, entry)
+        return text
+
+
+def get_resume_summary(filepath):
+    """
+    이력서 요약을 반환합니다 (내용 해시 캐시 → 없으면 OCR/요약 후 저장).
+    같은 지원자가 같은 이력서로 면접을 다시 시작하면 OCR과 LLM 호출이 모두 생략됩니다.
+    """
+    if not os.path.exists(filepath):
+        logger.error(f"이력서 파일이 없습니다: {filepath}")
+        return summarize_resume("")
+    content_hash = file_content_hash(filepath)
+    with _lock_for(content_hash):
+        entry = _load_entry(content_hash)
+        if entry.get("summary"):
+            logger.info(f"이력서 요약 캐시 적중: {content_hash[:12]}")
+            return entry["summary"]
+
+        if not entry.get("ocr_text"):
+            entry["ocr_text"] = extract_text_from_pdf(filepath)
+
+        summary = summarize_resume(entry["ocr_text"])
+        # OCR 실패("")나 요약 실패(원문 잘라내기 대체) 결과는 캐시하지 않음
+        if entry["ocr_text"]:
+            if summary and summary != entry["ocr_text"][:1000]:
+                entry["summary"] = summary
+            _store(content_hash, entry)
+        return summary
+
+
+def precompute_resume(filepath):
+    """
+    /upload/resume 직후 백그라운드에서 OCR과 요약을 미리 계산합니다.
+    면접 시작 시점에는 캐시만 읽으면 되도록 합니다.
+    """
+    try:
+        get_resume_summary(filepath)
+        logger.info(f"이력서 사전 처리 완료: {os.path.basename(filepath)}")
+    except Exception as e:
+        logger.error(f"이력서 사전 처리 실패: {e}")
@@ -2,6 +2,9 @@ import os
 import time
 import json
 import logging
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import numpy as np
 import librosa
 import soundfile as sf
@@ -13,37 +16,54 @@ from ..config import logger, OPENAI_API_KEY, BASE_DIR
 # ---------------------------------------------------------
 # 1. 오디오 전처리 (노이즈 제거 및 정규화)
 # ---------------------------------------------------------
+# 파이프라인 공용 샘플 레이트: WebRTC VAD/Whisper 입력 규격과 동일하게 맞춰
+# 한 번 디코딩한 버퍼를 모든 단계에서 재사용합니다.
+PIPELINE_SAMPLE_RATE = 16000
+
+def decode_audio(input_path, target_sr=PIPELINE_SAMPLE_RATE):
+    """
+    오디오 파일을 한 번만 디코딩하여 target_sr 모노 float32 버퍼로 반환합니다.
+    target_sr=None 이면 원본 샘플 레이트를 유지합니다.
+    """
+    try:
+        y, sr = librosa.load(input_path, sr=target_sr, mono=True)
+    except Exception as load_err:
+        logger.warning(f"Librosa 로드 실패: {load_err}. soundfile 직접 읽기 시도 중...")
+        try:
+            data, sr = sf.read(input_path, dtype="float32")
+        except Exception as sf_err:
+            logger.error(f"Soundfile 읽기도 실패: {sf_err}")
+            raise load_err
+        y = data.mean(axis=1) if data.ndim > 1 else data
+        if target_sr and sr != target_sr:
+            y = librosa.resample(y, orig_sr=sr, target_sr=target_sr)
+            sr = target_sr
+    return np.ascontiguousarray(y, dtype=np.float32), sr
+
+def normalize_audio(y):
+    """
+    RMS 기반 정규화 (메모리 버퍼 → 버퍼).
+    - 오디오 품질(RMS)이 이미 충분히 높다면 전처리를 최소화합니다.
+    """
+    rms = float(np.sqrt(np.mean(y**2))) if len(y) else 0.0
+    logger.info(f"원본 오디오 RMS: {rms:.5f}")
+
+    if rms > 0.05:
+        logger.info("오디오 품질이 양호하므로 전처리를 최소화합니다.")
+        return librosa.util.normalize(y) * 0.9
+    # 품질이 낮을 경우 적절한 수준으로 증폭 및 정규화
+    return librosa.util.normalize(y) * 0.707
+
 def preprocess_audio(input_path):
     """
     오디오 파일의 전처리를 수행합니다.
-    - 오디오 품질(RMS)이 이미 충분히 높다면 전처리를 최소화합니다.
     - 정규화를 통해 일관된 음량을 유지합니다.
+    - 처리 결과를 _processed.wav로 저장합니다 (파일 경로가 필요한 외부 도구용).
+      메인 파이프라인(transcribe_audio)은 디스크를 거치지 않고 버퍼를 직접 사용합니다.
     """
     try:
-        # 오디오 로드 (샘플링 레이트 보존)
-        try:
-            y, sr = librosa.load(input_path, sr=None)
-        except Exception as load_err:
-            logger.warning(f"Librosa 로드 실패: {load_err}. soundfile 직접 읽기 시도 중...")
-            try:
-                data, samplerate = sf.read(input_path)
-                y = data.T if data.ndim > 1 else data
-                sr = samplerate
-            except Exception as sf_err:
-                logger.error(f"Soundfile 읽기도 실패: {sf_err}")
-                raise load_err
-
-        # RMS 계산하여 품질 확인
-        rms = np.sqrt(np.mean(y**2))
-        logger.info(f"원본 오디오 RMS: {rms:.5f}")
-
-        # 정규화 및 최소 전처리 로직
-        if rms > 0.05:
-            logger.info("오디오 품질이 양호하므로 전처리를 최소화합니다.")
-            y_norm = librosa.util.normalize(y) * 0.9
-        else:
-            # 품질이 낮을 경우 적절한 수준으로 증폭 및 정규화
-            y_norm = librosa.util.normalize(y) * 0.707
+        y, sr = decode_audio(input_path, target_sr=None)
+        y_norm = normalize_audio(y)
 
         # 처리된 파일 저장 (WAV 형식)
         base, _ = os.path.splitext(input_path)
@@ -114,17 +134,24 @@ def analyze_audio_features(audio_path, y, sr):
 # ---------------------------------------------------------
 # 3. STT 함수 (Google Web Speech & Whisper)
 # ---------------------------------------------------------
-def transcribe_with_google_web_speech(audio_path):
+def transcribe_with_google_web_speech(audio, sample_rate=PIPELINE_SAMPLE_RATE):
     """
     Google Web Speech API를 사용하여 음성 전사를 수행합니다.
     (SpeechRecognition 라이브러리 사용)
+    audio: WAV 파일 경로 또는 float 버퍼 (버퍼는 16-bit PCM으로 변환하여 메모리에서 전달)
     """
     try:
         recognizer = sr_lib.Recognizer()
-        with sr_lib.AudioFile(audio_path) as source:
-            audio_data = recognizer.record(source)
+        if isinstance(audio, np.ndarray):
+            pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+            audio_data = sr_lib.AudioData(pcm, sample_rate, 2)
+            source_desc = f"<메모리 버퍼 {len(audio) / sample_rate:.1f}s>"
+        else:
+            with sr_lib.AudioFile(audio) as source:
+                audio_data = recognizer.record(source)
+            source_desc = audio
         
-        logger.info(f"Google Web Speech 전사 시도: {audio_path}")
+        logger.info(f"Google Web Speech 전사 시도: {source_desc}")
         text = recognizer.recognize_google(audio_data, language="ko-KR")
         return text.strip()
     except sr_lib.UnknownValueError:
@@ -141,10 +168,16 @@ def transcribe_with_google_web_speech(audio_path):
 
 # OpenAI Whisper 모델 캐시
 _WHISPER_MODEL_CACHE = None
+# 헤지 실행으로 여러 스레드가 동시에 처음 호출해도 모델은 한 번만 로드
+_WHISPER_MODEL_LOCK = threading.Lock()
 
 def get_whisper_model():
     global _WHISPER_MODEL_CACHE
-    if _WHISPER_MODEL_CACHE is None:
+    if _WHISPER_MODEL_CACHE is not None:
+        return _WHISPER_MODEL_CACHE
+    with _WHISPER_MODEL_LOCK:
+        if _WHISPER_MODEL_CACHE is not None:
+            return _WHISPER_MODEL_CACHE
         model_name = "turbo"
         logger.info(f"Whisper 로컬 모델({model_name}) 로딩 중...")
         device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -152,16 +185,21 @@ def get_whisper_model():
         logger.info(f"Whisper 로컬 모델({model_name}) 로드 완료.")
     return _WHISPER_MODEL_CACHE
 
-def transcribe_with_whisper(audio_path):
+def transcribe_with_whisper(audio):
     """
     로컬 OpenAI Whisper 모델을 사용하여 음성 전사를 수행합니다. (보조 엔진)
+    audio: 파일 경로 또는 16kHz float32 버퍼 (버퍼는 ffmpeg 재디코딩 없이 바로 사용)
     """
     try:
         model = get_whisper_model()
-        logger.info(f"Whisper 로컬 모델 전사 시작 (보조): {audio_path}")
+        if isinstance(audio, np.ndarray):
+            audio = audio.astype(np.float32, copy=False)
+            logger.info(f"Whisper 로컬 모델 전사 시작 (보조): <메모리 버퍼 {len(audio) / PIPELINE_SAMPLE_RATE:.1f}s>")
+        else:
+            logger.info(f"Whisper 로컬 모델 전사 시작 (보조): {audio}")
         device = "cuda" if torch.cuda.is_available() else "cpu"
         result = model.transcribe(
-            audio_path, 
+            audio, 
             language="ko", 
             temperature=0.0,
             initial_prompt="이것은 한국어 면접 답변입니다.",
@@ -179,66 +217,317 @@ def transcribe_with_whisper(audio_path):
         logger.error(f"Whisper 로컬 STT 오류: {e}")
         return None
 
+# ---------------------------------------------------------
+# 3-1. 헤지(Hedged) STT: 주력 엔진 지연 시 보조 엔진을 겹쳐 실행
+# ---------------------------------------------------------
+# hedged: 주력 엔진이 hedge delay 안에 끝나지 않으면 Whisper를 동시에 시작해 먼저 끝난 결과 사용
+# sequential: 기존 방식 (Google 오류 시에만 Whisper)
+STT_MODE = os.getenv("STT_MODE", "hedged")
+# 통계가 충분하지 않을 때 사용할 기본 hedge delay (초)
+STT_HEDGE_DELAY_SEC = float(os.getenv("STT_HEDGE_DELAY_SEC", "2.0"))
+STT_HEDGE_MIN_DELAY_SEC = float(os.getenv("STT_HEDGE_MIN_DELAY_SEC", "0.5"))
+STT_HEDGE_MAX_DELAY_SEC = float(os.getenv("STT_HEDGE_MAX_DELAY_SEC", "5.0"))
+# 주력 엔진 최근 지연의 이 백분위수를 hedge delay로 사용 (느린 꼬리만 헤지)
+STT_HEDGE_PERCENTILE = float(os.getenv("STT_HEDGE_PERCENTILE", "90"))
+# 주력 엔진 최근 p95가 이 값 이상이거나 실패율이 높으면 보조 엔진을 즉시 함께 시작 (초)
+STT_HEDGE_BAD_P95_SEC = float(os.getenv("STT_HEDGE_BAD_P95_SEC", "6.0"))
+STT_HEDGE_BAD_FAILURE_RATE = 0.3
+# 전체 대기 상한 (초)
+STT_HEDGE_TIMEOUT_SEC = float(os.getenv("STT_HEDGE_TIMEOUT_SEC", "60"))
+STT_STATS_WINDOW = 50
+STT_STATS_MIN_SAMPLES = 5
+
+NO_ANSWER_TEXT = "답변 없음"
+
+
+class _EngineStats:
+    """엔진별 최근 지연/성공 여부와 누적 승리 횟수"""
+
+    def __init__(self):
+        self.latencies = collections.deque(maxlen=STT_STATS_WINDOW)
+        self.outcomes = collections.deque(maxlen=STT_STATS_WINDOW)
+        self.counts = collections.Counter()
+
+    def percentile(self, q):
+        return float(np.percentile(self.latencies, q)) if len(self.latencies) >= STT_STATS_MIN_SAMPLES else None
+
+    def failure_rate(self):
+        if len(self.outcomes) < STT_STATS_MIN_SAMPLES:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+
+class HedgedSTT:
+    """
+    주력 엔진(Google Web Speech)을 먼저 실행하고, hedge delay 안에 결과가 없으면
+    보조 엔진(로컬 Whisper)을 겹쳐 실행하여 먼저 나온 유효한 결과를 사용합니다.
+
+    - hedge delay는 주력 엔진의 최근 지연 분포(STT_HEDGE_PERCENTILE)에 맞춰 자동 조정됩니다.
+    - 주력 엔진이 최근 느리거나 자주 실패하면 보조 엔진을 즉시 함께 시작합니다.
+    - 주력 엔진이 delay 전에 끝나면 보조 엔진은 아예 시작하지 않습니다.
+      이미 실행 중인 패자는 중단할 수 없으므로 결과만 버리고, 대기 중인 작업은 취소합니다.
+    - 엔진은 (audio, sr) -> text|None 함수이므로 테스트에서 대체할 수 있습니다.
+    """
+
+    def __init__(self, primary, secondary, primary_name="google", secondary_name="whisper"):
+        self.engines = {primary_name: primary, secondary_name: secondary}
+        self.primary_name = primary_name
+        self.secondary_name = secondary_name
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stt")
+        self._lock = threading.Lock()
+        self._stats = {primary_name: _EngineStats(), secondary_name: _EngineStats()}
+        self._races = 0
+
+    # ───────── 통계 ─────────
+
+    def _record(self, name, latency, ok):
+        with self._lock:
+            stats = self._stats[name]
+            stats.counts["runs"] += 1
+            stats.outcomes.append(ok)
+            if ok:
+                stats.latencies.append(latency)
+            else:
+                stats.counts["failures"] += 1
+
+    def hedge_delay(self):
+        """주력 엔진의 최근 지연 분포로 보조 엔진 시작 시점을 정합니다."""
+        with self._lock:
+            stats = self._stats[self.primary_name]
+            p95 = stats.percentile(95)
+            if stats.failure_rate() >= STT_HEDGE_BAD_FAILURE_RATE or (p95 is not None and p95 >= STT_HEDGE_BAD_P95_SEC):
+                return 0.0
+            delay = stats.percentile(STT_HEDGE_PERCENTILE)
+        if delay is None:
+            return STT_HEDGE_DELAY_SEC
+        return min(max(delay, STT_HEDGE_MIN_DELAY_SEC), STT_HEDGE_MAX_DELAY_SEC)
+
+    def get_stats(self):
+        with self._lock:
+            engines = {}
+            for name, stats in self._stats.items():
+                wins = stats.counts["wins"]
+                engines[name] = {
+                    "runs": stats.counts["runs"],
+                    "wins": wins,
+                    "win_rate": round(wins / self._races, 3) if self._races else 0.0,
+                    "failures": stats.counts["failures"],
+                    "discarded": stats.counts["discarded"],
+                    "p50_ms": round(stats.percentile(50) * 1000, 1) if stats.percentile(50) is not None else None,
+                    "p95_ms": round(stats.percentile(95) * 1000, 1) if stats.percentile(95) is not None else None,
+                }
+            races = self._races
+        return {"races": races, "hedge_delay_ms": round(self.hedge_delay() * 1000, 1), "engines": engines}
+
+    # ───────── 실행 ─────────
+
+    def _run_engine(self, name, audio, sr):
+        t0 = time.perf_counter()
+        try:
+            text = self.engines[name](audio, sr)
+        except Exception as e:
+            logger.error(f"{name} STT 오류: {e}")
+            text = None
+        latency = time.perf_counter() - t0
+        self._record(name, latency, text is not None)
+        return name, text, latency
+
+    def transcribe(self, audio, sr):
+        """
+        반환값: (text 또는 None, 승리 엔진 이름, 디버그 정보)
+        text가 NO_ANSWER_TEXT이면 엔진이 음성을 인식하지 못한 경우입니다.
+        """
+        delay = self.hedge_delay()
+        t0 = time.perf_counter()
+        futures = {self._executor.submit(self._run_engine, self.primary_name, audio, sr)}
+        hedged = False
+        weak_result = None  # "답변 없음" (다른 엔진 결과가 없을 때만 사용)
+        winner = None
+
+        def launch_secondary():
+            futures.add(self._executor.submit(self._run_engine, self.secondary_name, audio, sr))
+
+        if delay <= 0:
+            hedged = True
+            launch_secondary()
+
+        deadline = t0 + STT_HEDGE_TIMEOUT_SEC
+        while futures and winner is None:
+            timeout = deadline - time.perf_counter()
+            if not hedged:
+                timeout = min(timeout, max(0.0, t0 + delay - time.perf_counter()))
+            done, _ = wait(futures, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+
+            if not done:
+                if not hedged:
+                    # 주력 엔진이 느림 → 보조 엔진을 겹쳐 실행
+                    hedged = True
+                    logger.info(f"주력 STT가 {delay:.2f}s 내 응답 없음. Whisper 헤지 시작.")
+                    launch_secondary()
+                    continue
+                logger.error("STT 헤지 대기 시간 초과")
+                break
+
+            for future in done:
+                futures.discard(future)
+                name, text, latency = future.result()
+                if text and text != NO_ANSWER_TEXT:
+                    winner = (name, text, latency)
+                    break
+                if text == NO_ANSWER_TEXT:
+                    weak_result = weak_result or (name, text, latency)
+                # 주력 엔진 오류(None)이고 아직 헤지 전이면 기존처럼 Whisper로 전환
+                if text is None and not hedged:
+                    hedged = True
+                    launch_secondary()
+                # "답변 없음"은 이미 실행 중인 다른 엔진이 있을 때만 더 기다림
+                if text == NO_ANSWER_TEXT and not hedged:
+                    break
+            if weak_result and not hedged:
+                break
+
+        for future in futures:
+            # 시작 전이면 취소, 이미 실행 중이면 완료 후 결과만 버림
+            future.cancel()
+            future.add_done_callback(self._count_discarded)
+
+        chosen = winner or weak_result
+        with self._lock:
+            self._races += 1
+            if chosen:
+                self._stats[chosen[0]].counts["wins"] += 1
+
+        debug = {
+            "hedged": hedged,
+            "hedge_delay_ms": round(delay * 1000, 1),
+            "latency_ms": round((time.perf_counter() - t0) * 1000, 1),
+        }
+        if not chosen:
+            return None, None, debug
+        return chosen[1], chosen[0], debug
+
+    def _count_discarded(self, future):
+        if future.cancelled():
+            return
+        name = future.result()[0]
+        with self._lock:
+            self._stats[name].counts["discarded"] += 1
+
+
+hedged_stt = HedgedSTT(
+    primary=transcribe_with_google_web_speech,
+    secondary=lambda audio, sr: transcribe_with_whisper(audio),
+)
+
+
+def get_stt_stats():
+    """엔진별 지연/승률 및 현재 hedge delay"""
+    return hedged_stt.get_stats()
+
 # ---------------------------------------------------------
 # 4. 메인 파이프라인
 # ---------------------------------------------------------
+class _StageTimer:
+    """파이프라인 단계별 소요 시간(ms) 기록"""
+
+    def __init__(self):
+        self.timings = {}
+        self._last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.timings[stage] = round((now - self._last) * 1000, 1)
+        self._last = now
+
+    def summary(self):
+        total = round(sum(self.timings.values()), 1)
+        stages = ", ".join(f"{k}={v}ms" for k, v in self.timings.items())
+        return f"STT 파이프라인 {total}ms ({stages})"
+
 def transcribe_audio(original_audio_path):
     """
     메인 STT 파이프라인
+    0. 오디오를 16kHz 모노 float32 버퍼로 한 번만 디코딩
+       (RMS 게이트 / VAD / 정규화 / 특징 분석 / 속도 계산이 같은 버퍼를 공유)
     1. Google Web Speech (주력) 실행
-    2. 실패 시 Whisper (보조) 실행
+    2. hedge delay 초과 또는 실패 시 Whisper (보조) 동시 실행 (STT_MODE=hedged)
+    STT 엔진에는 임시 파일 대신 메모리 버퍼를 전달합니다.
     """
     if not os.path.exists(original_audio_path):
         return {"text": "파일 없음", "analysis": {}}
 
+    from .vad_service import vad_speech_ratio
+    timer = _StageTimer()
+
     try:
-        y_orig, sr_orig = librosa.load(original_audio_path, sr=None)
-        rms_total = np.sqrt(np.mean(y_orig**2))
-        if rms_total < 0.001:
-            return {"text": "답변 없음", "analysis": {"rms_mean": rms_total}}
+        y_raw, sr = decode_audio(original_audio_path)
     except Exception as e:
-        logger.error(f"신호 확인 오류: {e}")
+        logger.error(f"오디오 디코딩 오류: {e}")
+        return {"text": "답변 없음", "analysis": {}}
+    timer.mark("decode")
+
+    # RMS 게이트
+    rms_total = float(np.sqrt(np.mean(y_raw**2))) if len(y_raw) else 0.0
+    timer.mark("rms_gate")
+    if rms_total < 0.001:
+        return {"text": "답변 없음", "analysis": {"rms_mean": rms_total}}
 
     # VAD 체크
-    from .vad_service import check_vad_activity
-    vad_ratio = check_vad_activity(original_audio_path)
+    vad_ratio = vad_speech_ratio(y_raw, sr)
+    timer.mark("vad")
     if vad_ratio < 0.01:
         return {"text": "답변 없음", "analysis": {"vad_ratio": vad_ratio}}
 
-    # 1. 전처리
-    processed_path, y, sr = preprocess_audio(original_audio_path)
+    # 1. 전처리 (정규화)
+    y = normalize_audio(y_raw)
+    timer.mark("normalize")
     
     # 2. 특징 분석
-    analysis = analyze_audio_features(processed_path, y, sr)
+    analysis = analyze_audio_features(None, y, sr)
+    timer.mark("features")
     
-    # 3. STT 실행 (Google 우선 → 오류 시 Whisper 보조)
-    stt_method = "google"
-    final_text = transcribe_with_google_web_speech(processed_path)
-    
-    # Google Web Speech에서 접속 오류(None)가 발생한 경우에만 Whisper로 전환
-    if final_text is None:
-        logger.warning("Google STT 서비스 오류. 보조 엔진(Whisper)으로 전환합니다.")
-        stt_method = "whisper"
-        final_text = transcribe_with_whisper(processed_path)
+    # 3. STT 실행
+    hedge_info = None
+    if STT_MODE == "hedged":
+        # Google 우선 → 지연/오류 시 Whisper를 겹쳐 실행, 먼저 나온 유효한 결과 사용
+        final_text, stt_method, hedge_info = hedged_stt.transcribe(y, sr)
+        timer.mark("stt")
+    else:
+        # Google 우선 → 오류 시 Whisper 보조
+        stt_method = "google"
+        final_text = transcribe_with_google_web_speech(y, sr)
+        timer.mark("stt_google")
+        
+        # Google Web Speech에서 접속 오류(None)가 발생한 경우에만 Whisper로 전환
+        if final_text is None:
+            logger.warning("Google STT 서비스 오류. 보조 엔진(Whisper)으로 전환합니다.")
+            stt_method = "whisper"
+            final_text = transcribe_with_whisper(y)
+            timer.mark("stt_whisper")
     
     if not final_text:
         final_text = "답변 없음"
     
     # 4. 속도 계산
     syllable_count = len(final_text.replace(" ", ""))
-    duration = librosa.get_duration(y=y, sr=sr) if y is not None else 0
+    duration = len(y) / sr
     speech_rate = round(syllable_count / duration, 2) if duration > 0 else 0
     analysis["speech_rate"] = speech_rate
     
     if speech_rate < 2.5: analysis["speed_feedback"] = "느림"
     elif speech_rate > 5.5: analysis["speed_feedback"] = "빠름"
     else: analysis["speed_feedback"] = "적절"
+    timer.mark("speech_rate")
+
+    logger.info(timer.summary())
 
     return {
         "text": final_text,
         "analysis": analysis,
         "debug_info": {
             "stt_engine_used": stt_method,
-            "processed_path": processed_path
+            "stt_hedge": hedge_info,
+            "vad_ratio": round(vad_ratio, 3),
+            "stage_timings_ms": timer.timings
         }
     }
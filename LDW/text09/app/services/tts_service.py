@@ -1,7 +1,195 @@
 import os
+import re
 import uuid
+import asyncio
+import hashlib
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor
 from ..config import TTS_FOLDER, logger
 
+# ---------------------------------------------------------
+# TTS 캐시 설정
+# ---------------------------------------------------------
+# 캐시된 음성 파일 총 용량 상한 (초과 시 가장 오래 사용하지 않은 파일부터 삭제)
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", "200")) * 1024 * 1024
+# gTTS 요청(블로킹 HTTP)을 처리할 스레드 수
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "4"))
+TTS_LANG = "ko"
+
+_tts_executor = ThreadPoolExecutor(max_workers=TTS_MAX_WORKERS, thread_name_prefix="tts")
+
+# 같은 문장에 대한 동시 합성을 1회로 합치기 위한 진행 중 작업
+_inflight = {}
+_lock = threading.RLock()
+# 캐시 파일 경로 -> 크기 (사용 순서 유지, 앞쪽이 가장 오래 사용하지 않은 파일)
+_cache_index = None
+_cache_bytes = 0
+
+# 문장 끝(. ? !) 뒤 공백 기준으로 분리
+_SENTENCE_SPLIT = re.compile(r"(?<=[.?!])\s+")
+
+
+def split_sentences(text):
+    """
+    문장 단위로 나눕니다.
+    '안녕하세요, 홍길동님. 면접을 시작하겠습니다. ...' 처럼 이름만 바뀌는 안내 문구는
+    고정 문장이 그대로 캐시에 적중하고, 이름이 들어간 문장만 새로 합성됩니다.
+    (gTTS도 내부적으로 문장 부호 기준으로 나눠 요청하고 MP3를 이어 붙이므로 음질 차이가 없습니다.)
+    """
+    return [s for s in _SENTENCE_SPLIT.split(" ".join((text or "").split())) if s]
+
+
+def _cache_path(text, lang=TTS_LANG):
+    key = hashlib.sha256(f"{lang}\n{' '.join(text.split())}".encode("utf-8")).hexdigest()[:32]
+    return os.path.join(TTS_FOLDER, f"tts_{key}.mp3")
+
+
+# ---------------------------------------------------------
+# 용량 제한 캐시
+# ---------------------------------------------------------
+def _load_index():
+    global _cache_index, _cache_bytes
+    if _cache_index is not None:
+        return
+    entries = []
+    for name in os.listdir(TTS_FOLDER):
+        if name.startswith("tts_") and name.endswith(".mp3"):
+            path = os.path.join(TTS_FOLDER, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, path, st.st_size))
+    entries.sort()
+    _cache_index = collections.OrderedDict((path, size) for _, path, size in entries)
+    _cache_bytes = sum(_cache_index.values())
+
+
+def _touch(path):
+    """캐시 적중 시 사용 순서 갱신 (재시작 후에도 유지되도록 mtime도 갱신)"""
+    with _lock:
+        _load_index()
+        if path in _cache_index:
+            _cache_index.move_to_end(path)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _register(path):
+    global _cache_bytes
+    size = os.path.getsize(path)
+    with _lock:
+        _load_index()
+        _cache_bytes += size - _cache_index.pop(path, 0)
+        _cache_index[path] = size
+        # 방금 만든 파일은 남기고 오래된 것부터 삭제
+        while _cache_bytes > TTS_CACHE_MAX_BYTES and len(_cache_index) > 1:
+            old_path, old_size = _cache_index.popitem(last=False)
+            _cache_bytes -= old_size
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+
+def _cached(path):
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        _touch(path)
+        return True
+    return False
+
+
+def get_tts_cache_stats():
+    with _lock:
+        _load_index()
+        return {"files": len(_cache_index), "bytes": _cache_bytes, "max_bytes": TTS_CACHE_MAX_BYTES}
+
+
+# ---------------------------------------------------------
+# 합성 (스레드 풀)
+# ---------------------------------------------------------
+def _synthesize_segment(text, path, lang):
+    """gTTS 블로킹 요청 — 워커 스레드에서 실행"""
+    if _cached(path):
+        return path
+    # 임시 파일에 저장 후 교체 (동시 요청/중단 시 깨진 캐시 파일 방지)
+    from gtts import gTTS
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        gTTS(text=text, lang=lang).save(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _register(path)
+    return path
+
+
+def _concat_segments(segment_paths, path):
+    """MP3 프레임은 이어 붙여도 재생 가능 (gTTS도 긴 텍스트를 같은 방식으로 저장)"""
+    if _cached(path):
+        return path
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "wb") as out:
+        for segment_path in segment_paths:
+            with open(segment_path, "rb") as f:
+                out.write(f.read())
+    os.replace(tmp_path, path)
+    _register(path)
+    return path
+
+
+def _submit(path, fn, *args):
+    """같은 캐시 파일을 만드는 작업이 진행 중이면 그 Future를 공유합니다."""
+    with _lock:
+        future = _inflight.get(path)
+        if future is None:
+            future = _tts_executor.submit(fn, *args)
+            _inflight[path] = future
+            future.add_done_callback(lambda _f, p=path: _release(p))
+        return future
+
+
+def _release(path):
+    with _lock:
+        _inflight.pop(path, None)
+
+
+def _start_segments(text, lang):
+    return [
+        _submit(_cache_path(sentence, lang), _synthesize_segment, sentence, _cache_path(sentence, lang), lang)
+        for sentence in split_sentences(text)
+    ]
+
+
+def prefetch_tts_audio(text, lang=TTS_LANG):
+    """
+    문장별 합성을 즉시 스레드 풀에 넣고 바로 반환합니다.
+    (DB 커밋 등 다른 작업과 겹쳐 실행되며, 이후 generate_tts_audio가 같은 작업을 이어받습니다.)
+    """
+    if not text or _cached(_cache_path(text, lang)):
+        return
+    _start_segments(text, lang)
+
+
+async def synthesize_tts_file(text, lang=TTS_LANG):
+    """
+    텍스트 음성 파일 경로를 반환합니다 (전체 문장 캐시 → 문장별 캐시 → gTTS 합성).
+    """
+    path = _cache_path(text, lang)
+    if _cached(path):
+        logger.info(f"[TTS] 캐시 적중: {os.path.basename(path)}")
+        return path
+
+    segment_paths = await asyncio.gather(*(asyncio.wrap_future(f) for f in _start_segments(text, lang)))
+    if len(segment_paths) == 1:
+        return segment_paths[0]
+    return await asyncio.wrap_future(_submit(path, _concat_segments, list(segment_paths), path))
+
+
 async def generate_tts_audio(text, voice="fr-FR-RemyMultilingualNeural"):
     """
     Microsoft Edge TTS를 사용하여 음성을 합성하고 파일로 저장합니다.
@@ -15,26 +203,22 @@ async def generate_tts_audio(text, voice="fr-FR-RemyMultilingualNeural"):
     logger.info(f"[TTS] 요청: '{text[:20]}...' / 음성: {voice}")
 
     try:
-        # TTS 오디오를 저장할 고유한 파일명을 생성합니다.
-        filename = f"{uuid.uuid4()}.mp3"
-        filepath = os.path.join(TTS_FOLDER, filename)
-
         # gTTS 라이브러리를 사용하여 음성 합성을 수행합니다.
         # edge-tts의 403 오류를 회피하기 위해 기본 구글 TTS를 사용합니다.
-        from gtts import gTTS
-        tts = gTTS(text=text, lang='ko')
-        # 비동기가 아니므로 동기 저장
-        tts.save(filepath)
+        # 텍스트 해시로 캐시하며, 블로킹 요청은 스레드 풀에서 실행합니다.
+        filepath = await synthesize_tts_file(text)
+        filename = os.path.basename(filepath)
 
         # 생성된 파일의 크기를 확인하여 정상 생성 여부를 체크합니다.
         if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
             logger.error(f"[TTS] 파일 생성 실패 또는 크기가 0입니다: {filepath}")
             return None
-            
+
         filesize = os.path.getsize(filepath)
         logger.info(f"[TTS] 생성 완료: {filepath} (크기: {filesize} bytes)")
 
         # TTS 완료 후 Wav2Lip을 이용해 면접관 얼굴 영상(립싱크) 생성을 시도합니다.
+        # (같은 텍스트는 같은 오디오 파일이므로 Wav2Lip 결과 캐시도 그대로 적중)
         from .video_gen_service import generate_wav2lip_video
         video_url = await generate_wav2lip_video(filepath)
 
@@ -49,4 +233,4 @@ async def generate_tts_audio(text, voice="fr-FR-RemyMultilingualNeural"):
     except Exception as e:
         # TTS 과정 중 발생하는 모든 예외를 로그에 남기고 에러를 방지합니다.
         logger.error(f"[TTS] 음성 합성 중 시스템 오류 발생: {e}")
-        return None
\ No newline at end of file
+        return None
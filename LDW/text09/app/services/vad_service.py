@@ -36,16 +36,30 @@ def check_vad_activity(audio_path, aggressiveness=3):
         
         # 오디오 로드 및 리샘플링
         y, sr = librosa.load(audio_path, sr=target_sr, mono=True)
+        return vad_speech_ratio(y, target_sr, aggressiveness)
         
+    except Exception as e:
+        logger.error(f"{audio_path}에 대한 WebRTC VAD 실행 중 오류 발생: {e}")
+        # 오류 발생 시(예: 오디오가 너무 짧음), RMS 체크를 통과했다면 기본적으로 통과하도록 0.0 반환 로직 유지
+        return 0.0
+
+def vad_speech_ratio(y, sr=16000, aggressiveness=3):
+    """
+    이미 디코딩된 모노 float 버퍼(y, sr)에 WebRTC VAD를 적용합니다.
+    sr은 8000/16000/32000/48000 중 하나여야 합니다 (파일 재로드 없음).
+    반환값:
+        float: 전체 프레임 대비 음성 프레임의 비율 (0.0 ~ 1.0).
+    """
+    try:
         # 16-bit PCM으로 변환
         # librosa는 [-1, 1] 사이의 float32로 로드하므로, int16으로 변환합니다.
-        pcm_data = (y * 32767).astype(np.int16)
+        pcm_data = (np.clip(y, -1.0, 1.0) * 32767).astype(np.int16)
         
         vad = webrtcvad.Vad(aggressiveness)
         
         # WebRTC VAD는 10, 20, 30ms의 프레임 길이를 지원합니다.
         frame_duration_ms = 30
-        frame_len = int(target_sr * frame_duration_ms / 1000)
+        frame_len = int(sr * frame_duration_ms / 1000)
         
         num_speech_frames = 0
         total_frames = 0
@@ -56,7 +70,7 @@ def check_vad_activity(audio_path, aggressiveness=3):
             # numpy 배열을 bytes로 변환
             frame_bytes = frame.tobytes()
             
-            if vad.is_speech(frame_bytes, target_sr):
+            if vad.is_speech(frame_bytes, sr):
                 num_speech_frames += 1
             total_frames += 1
             
@@ -68,6 +82,5 @@ def check_vad_activity(audio_path, aggressiveness=3):
         return speech_ratio
         
     except Exception as e:
-        logger.error(f"{audio_path}에 대한 WebRTC VAD 실행 중 오류 발생: {e}")
-        # 오류 발생 시(예: 오디오가 너무 짧음), RMS 체크를 통과했다면 기본적으로 통과하도록 0.0 반환 로직 유지
+        logger.error(f"WebRTC VAD 실행 중 오류 발생: {e}")
         return 0.0
@@ -1,5 +1,8 @@
 import logging
 import os
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import cv2
 
@@ -15,10 +18,24 @@ try:
 except ImportError as e:
     logger.warning(f"비디오 분석 의존성 누락: {e}. 비디오 분석 기능이 비활성화됩니다.")
 
+# 한 번에 추론할 프레임 수 (샘플 프레임을 파일 경계를 넘어 모아서 추론)
+VIDEO_ANALYSIS_BATCH_SIZE = int(os.getenv("VIDEO_ANALYSIS_BATCH_SIZE", "16"))
+# 면접 종료 후 세션 비디오 분석 프로세스 수 (기본: 코어 수 - 1)
+VIDEO_ANALYSIS_PROCESSES = int(os.getenv("VIDEO_ANALYSIS_PROCESSES", str(max(1, (os.cpu_count() or 2) - 1))))
+# 샘플링 방식: grab(건너뛸 프레임은 grab만, 샘플만 retrieve) / seek(1초 간격으로 위치 이동)
+VIDEO_SAMPLE_MODE = os.getenv("VIDEO_SAMPLE_MODE", "grab")
+
+# DeepFace Emotion 모델 출력 순서
+EMOTION_LABELS = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+
 class VideoAnalysisService:
     def __init__(self):
         self.movenet_model = None
         self.DeepFace = None
+        # MoveNet signature가 배치 입력을 받는지 여부 (singlepose 모델은 batch=1 고정인 경우가 많음)
+        self._movenet_batch_ok = True
+        # 배치 추론용 DeepFace Emotion Keras 모델 (사용 불가 시 프레임별 DeepFace.analyze)
+        self._emotion_model = None
         
         if VIDEO_ANALYSIS_AVAILABLE:
             try:
@@ -30,6 +47,7 @@ class VideoAnalysisService:
                 
                 # DeepFace 로드
                 self.DeepFace = DeepFace
+                self._emotion_model = self._load_emotion_model()
             except Exception as e:
                 logger.error(f"비디오 분석 모델 로드 실패: {e}")
                 self.movenet_model = None
@@ -38,6 +56,20 @@ class VideoAnalysisService:
         self.detector = None
         self.predictor = None
 
+    def _load_emotion_model(self):
+        """DeepFace 내부 Emotion Keras 모델 (버전별 build_model 시그니처 차이 대응)"""
+        for kwargs in ({"model_name": "Emotion", "task": "facial_attribute"}, {"model_name": "Emotion"}):
+            try:
+                client = self.DeepFace.build_model(**kwargs)
+                model = getattr(client, "model", client)
+                if hasattr(model, "predict"):
+                    return model
+            except Exception:
+                continue
+        logger.warning("Emotion 모델 배치 추론을 사용할 수 없어 프레임별 DeepFace 분석을 사용합니다.")
+        return None
+
+    # ───────── 프레임 분석 ─────────
 
     def process_frame(self, image_bytes: bytes):
         """
@@ -51,122 +83,222 @@ class VideoAnalysisService:
             if frame is None:
                 return {"error": "이미지 디코딩 실패"}
 
-            results = {
-                "face_mesh": None, # 호환성을 위해 키 유지
+            return self.analyze_frames([frame])[0]
+
+        except Exception as e:
+            logger.error(f"프레임 처리 중 오류 발생: {e}")
+            return {"error": str(e)}
+
+    def analyze_frames(self, frames):
+        """
+        디코딩된 BGR 프레임(ndarray) 목록을 한 번에 분석합니다.
+        MoveNet/Emotion 추론을 배치로 수행하며, 결과 형식은 process_frame과 같습니다.
+        """
+        results = [
+            {
+                "face_mesh": None, # 호환성을 위해 키 유지 (Dlib 기능 제거됨)
                 "hands": None,     # MoveNet은 손목/팔꿈치 키포인트는 있지만 전용 손 분석은 아님
                 "pose": None,
                 "emotion": None,
                 "gaze": None
             }
+            for _ in frames
+        ]
+        if not frames:
+            return results
 
-            # --- 1. Dlib 얼굴 및 시선 분석 ---
-            # Dlib 기능은 제거되었습니다. 호환성을 위해 키만 유지합니다.
-            results["face_mesh"] = None 
-            results["gaze"] = None
+        # --- 1. MoveNet 자세 분석 ---
+        if self.movenet_model:
+            try:
+                for result, keypoints in zip(results, self._movenet_keypoints(frames)):
+                    # 신뢰도가 높은 키포인트 확인 (예: > 0.3)
+                    if np.max(keypoints[:, 2]) > 0.3:
+                        result["pose"] = "detected"
+                        result["pose_data"] = keypoints.tolist()
+            except Exception as e:
+                logger.error(f"MoveNet 추론 오류: {e}")
 
-            
-            # --- 2. MoveNet 자세 분석 ---
-            # MoveNet은 [1, height, width, 3] 형태의 int32 텐서를 기대합니다.
-            if self.movenet_model:
-                input_image = tf.expand_dims(frame, axis=0)
-                input_image = tf.cast(tf.image.resize_with_pad(input_image, 256, 256), dtype=tf.int32)
-                
-                # 추론 실행
-                outputs = self.movenet_model(input_image)
-                keypoints = outputs['output_0'].numpy()[0][0] # [17, 3] (y, x, score)
-                
-                # 신뢰도가 높은 키포인트 확인 (예: > 0.3)
-                if np.max(keypoints[:, 2]) > 0.3:
-                    results["pose"] = "detected"
-                    results["pose_data"] = keypoints.tolist()
-
-            # --- 3. DeepFace 감정 분석 ---
-            if self.DeepFace:
-                try:
-                    emotions = self.DeepFace.analyze(
-                        img_path=frame, 
-                        actions=['emotion'], 
-                        enforce_detection=False,
-                        detector_backend='opencv',
-                        silent=True
-                    )
-                    if emotions and isinstance(emotions, list):
-                        results["emotion"] = emotions[0]['dominant_emotion']
-                    elif emotions and isinstance(emotions, dict):
-                        results["emotion"] = emotions['dominant_emotion']
-                except Exception as e:
-                    pass
+        # --- 2. DeepFace 감정 분석 ---
+        if self.DeepFace:
+            for result, emotion in zip(results, self._emotions(frames)):
+                result["emotion"] = emotion
 
-            return results
+        return results
 
-        except Exception as e:
-            logger.error(f"프레임 처리 중 오류 발생: {e}")
-            return {"error": str(e)}
+    def _movenet_keypoints(self, frames):
+        """[N, 17, 3] (y, x, score) 키포인트 — 가능하면 한 번의 호출로 배치 추론"""
+        # MoveNet은 [N, 256, 256, 3] 형태의 int32 텐서를 기대합니다.
+        batch = tf.cast(
+            tf.stack([tf.image.resize_with_pad(frame, 256, 256) for frame in frames]),
+            dtype=tf.int32,
+        )
+        if self._movenet_batch_ok and len(frames) > 1:
+            try:
+                return self.movenet_model(batch)['output_0'].numpy()[:, 0]
+            except Exception:
+                # batch=1 고정 signature → 이후로는 프레임별 호출 (전처리는 배치로 유지)
+                self._movenet_batch_ok = False
+                logger.info("MoveNet signature가 배치 입력을 지원하지 않아 프레임별로 추론합니다.")
+        return np.stack([
+            self.movenet_model(batch[i:i + 1])['output_0'].numpy()[0][0] for i in range(len(frames))
+        ])
 
-    def analyze_video_file(self, file_path: str):
+    def _emotions(self, frames):
+        """프레임별 주 감정 — 얼굴 검출은 프레임별, 감정 분류는 배치로 수행"""
+        if self._emotion_model is not None:
+            try:
+                return self._emotions_batched(frames)
+            except Exception as e:
+                logger.warning(f"Emotion 배치 추론 실패, 프레임별 분석으로 전환합니다: {e}")
+                self._emotion_model = None
+
+        emotions = []
+        for frame in frames:
+            try:
+                analyzed = self.DeepFace.analyze(
+                    img_path=frame, 
+                    actions=['emotion'], 
+                    enforce_detection=False,
+                    detector_backend='opencv',
+                    silent=True
+                )
+                if analyzed and isinstance(analyzed, list):
+                    emotions.append(analyzed[0]['dominant_emotion'])
+                elif analyzed and isinstance(analyzed, dict):
+                    emotions.append(analyzed['dominant_emotion'])
+                else:
+                    emotions.append(None)
+            except Exception:
+                emotions.append(None)
+        return emotions
+
+    def _emotions_batched(self, frames):
+        faces = []
+        for frame in frames:
+            extracted = self.DeepFace.extract_faces(
+                img_path=frame,
+                detector_backend='opencv',
+                enforce_detection=False,
+                align=True,
+            )
+            # extract_faces는 RGB [0, 1] float 얼굴을 반환 → DeepFace.analyze와 같은 48x48 흑백 입력으로 변환
+            face = (extracted[0]["face"][:, :, ::-1] * 255).astype(np.uint8)
+            gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+            h, w = gray.shape
+            size = max(h, w)
+            padded = np.zeros((size, size), dtype=np.uint8)
+            padded[(size - h) // 2:(size - h) // 2 + h, (size - w) // 2:(size - w) // 2 + w] = gray
+            faces.append(cv2.resize(padded, (48, 48)).astype(np.float32) / 255.0)
+
+        predictions = self._emotion_model.predict(np.stack(faces)[..., np.newaxis], verbose=0)
+        return [EMOTION_LABELS[int(np.argmax(p))] for p in predictions]
+
+    # ───────── 비디오 파일 분석 ─────────
+
+    @staticmethod
+    def _sample_frames(file_path, interval_sec=1.0):
         """
-        단일 비디오 파일을 프레임별로 분석합니다 (N 프레임마다 샘플링).
-        로직을 위한 집계된 통계를 반환합니다.
+        비디오에서 interval_sec 간격의 프레임만 디코딩하여 (프레임, 전체 프레임 수 추정) 을 생성합니다.
+        - grab 모드: 건너뛸 프레임은 grab()만 호출 (색 변환/복사 없음), 샘플 프레임만 retrieve()
+        - seek 모드: CAP_PROP_POS_MSEC로 다음 샘플 위치로 바로 이동
+        마지막에 (None, total_frames)를 생성합니다.
         """
-        if not os.path.exists(file_path):
-            logger.error(f"비디오 파일을 찾을 수 없음: {file_path}")
-            return None
-
         cap = cv2.VideoCapture(file_path)
         if not cap.isOpened():
             logger.error(f"비디오 파일을 열 수 없음: {file_path}")
-            return None
+            return
 
         fps = cap.get(cv2.CAP_PROP_FPS)
         if fps <= 0: fps = 30 # 폴백
+        frame_interval = max(1, int(fps * interval_sec))
 
-        frame_interval = int(fps) # 초당 1프레임 분석
-        current_frame = 0
-        
-        analysis_stats = {
-            "total_frames": 0,
-            "analyzed_frames": 0,
-            "emotions": [],
-            "posture_issues": 0,
-            "pose_confidence_scores": []
-        }
+        try:
+            if VIDEO_SAMPLE_MODE == "seek":
+                position_sec = 0.0
+                sampled = 0
+                while True:
+                    cap.set(cv2.CAP_PROP_POS_MSEC, position_sec * 1000)
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    sampled += 1
+                    yield frame, None
+                    position_sec += interval_sec
+                total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                yield None, total if total > 0 else sampled * frame_interval
+            else:
+                current_frame = 0
+                while cap.grab():
+                    if current_frame % frame_interval == 0:
+                        ret, frame = cap.retrieve()
+                        if ret:
+                            yield frame, None
+                    current_frame += 1
+                yield None, current_frame
+        finally:
+            cap.release()
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            if current_frame % frame_interval == 0:
-                # 기존 process_frame 메서드를 위해 프레임을 bytes로 인코딩
-                _, buffer = cv2.imencode('.jpg', frame)
-                frame_bytes = buffer.tobytes()
+    def analyze_video_files(self, file_paths):
+        """
+        여러 비디오 파일의 샘플 프레임을 파일 경계를 넘어 VIDEO_ANALYSIS_BATCH_SIZE개씩 모아 배치 분석합니다.
+        파일별 집계 통계 목록을 반환합니다 (파일이 없거나 열 수 없으면 None).
+        """
+        stats_list = []
+        pending = []  # (stats, frame)
+
+        def flush():
+            if not pending:
+                return
+            for (stats, _), result in zip(pending, self.analyze_frames([f for _, f in pending])):
+                stats["analyzed_frames"] += 1
                 
-                result = self.process_frame(frame_bytes)
+                # 감정 수집
+                if result.get("emotion"):
+                    stats["emotions"].append(result["emotion"])
                 
-                if result:
-                    analysis_stats["analyzed_frames"] += 1
-                    
-                    # 감정 수집
-                    if result.get("emotion"):
-                        analysis_stats["emotions"].append(result["emotion"])
-                    
-                    # 자세 로직 (신뢰도가 높으면 감지됨으로 처리)
-                    if result.get("pose") == "detected":
-                        pass
-                    
-                    # "bad_posture" 로직이 있는 경우
-                    if result.get("pose") == "bad_posture":
-                         analysis_stats["posture_issues"] += 1
-
-            current_frame += 1
-        
-        analysis_stats["total_frames"] = current_frame
-        cap.release()
-        return analysis_stats
+                # "bad_posture" 로직이 있는 경우
+                if result.get("pose") == "bad_posture":
+                     stats["posture_issues"] += 1
+            pending.clear()
+
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                logger.error(f"비디오 파일을 찾을 수 없음: {file_path}")
+                stats_list.append(None)
+                continue
+
+            stats = {
+                "total_frames": 0,
+                "analyzed_frames": 0,
+                "emotions": [],
+                "posture_issues": 0,
+                "pose_confidence_scores": []
+            }
+            opened = False
+            for frame, total_frames in self._sample_frames(file_path):
+                opened = True
+                if frame is None:
+                    stats["total_frames"] = total_frames
+                    continue
+                pending.append((stats, frame))
+                if len(pending) >= VIDEO_ANALYSIS_BATCH_SIZE:
+                    flush()
+            stats_list.append(stats if opened else None)
+
+        flush()
+        return stats_list
+
+    def analyze_video_file(self, file_path: str):
+        """
+        단일 비디오 파일을 분석합니다 (초당 1프레임 샘플링).
+        로직을 위한 집계된 통계를 반환합니다.
+        """
+        return self.analyze_video_files([file_path])[0]
 
     def process_session_videos(self, session_name: str, upload_dir: str):
         """
         upload_dir에서 -{session_name}.webm으로 끝나는 모든 비디오 파일을 찾아 분석합니다.
+        파일을 프로세스 수만큼 나눠 프로세스 풀에서 병렬 분석합니다 (TF/GIL 경합 회피).
         """
         logger.info(f"세션명 {session_name}으로 {upload_dir}에서 비디오 검색 중")
         
@@ -181,35 +313,83 @@ class VideoAnalysisService:
             logger.error(f"업로드 디렉토리가 존재하지 않음: {upload_dir}")
             return aggregated_results
 
-        from concurrent.futures import ThreadPoolExecutor
-
-        video_files = []
-        for filename in os.listdir(upload_dir):
-            if filename.endswith(f"-{session_name}.webm"):
-                video_files.append(os.path.join(upload_dir, filename))
+        video_files = sorted(
+            os.path.join(upload_dir, filename)
+            for filename in os.listdir(upload_dir)
+            if filename.endswith(f"-{session_name}.webm")
+        )
 
         if not video_files:
             logger.info(f"분석할 비디오 파일이 없습니다 (세션: {session_name})")
             return aggregated_results
 
-        logger.info(f"총 {len(video_files)}개의 비디오 파일 병렬 분석 시작...")
+        # 파일을 프로세스 수만큼 나눔 (각 프로세스는 맡은 파일들의 프레임을 배치로 묶어 추론)
+        n_chunks = max(1, min(VIDEO_ANALYSIS_PROCESSES, len(video_files)))
+        chunks = [video_files[i::n_chunks] for i in range(n_chunks)]
+        logger.info(f"총 {len(video_files)}개의 비디오 파일을 {n_chunks}개 프로세스로 분석 시작...")
 
-        # 비디오 파일 분석을 병렬로 수행하여 성능을 강화합니다.
-        with ThreadPoolExecutor() as executor:
-            futures = {executor.submit(self.analyze_video_file, fp): os.path.basename(fp) for fp in video_files}
-            
-            for future in futures:
-                filename = futures[future]
-                try:
-                    stats = future.result()
-                    if stats:
-                        aggregated_results["processed_files"] += 1
-                        aggregated_results["total_emotions"].extend(stats["emotions"])
-                        aggregated_results["posture_issues_total"] += stats["posture_issues"]
-                        aggregated_results["files"].append(filename)
-                except Exception as e:
-                    logger.error(f"비디오 파일 {filename} 분석 중 오류 발생: {e}")
+        chunk_results = None
+        if n_chunks > 1:
+            try:
+                from .video_analysis_worker import analyze_files
+
+                executor = _get_process_pool()
+                chunk_results = list(executor.map(analyze_files, chunks))
+            except Exception as e:
+                logger.error(f"프로세스 풀 분석 실패, 현재 프로세스에서 분석합니다: {e}")
+                _reset_process_pool()
+        if chunk_results is None:
+            chunk_results = [self.analyze_video_files(chunk) for chunk in chunks]
+
+        for chunk, stats_list in zip(chunks, chunk_results):
+            for file_path, stats in zip(chunk, stats_list):
+                if stats:
+                    aggregated_results["processed_files"] += 1
+                    aggregated_results["total_emotions"].extend(stats["emotions"])
+                    aggregated_results["posture_issues_total"] += stats["posture_issues"]
+                    aggregated_results["files"].append(os.path.basename(file_path))
 
         return aggregated_results
 
-video_analysis_service = VideoAnalysisService()
+
+# ---------------------------------------------------------
+# 세션 비디오 분석용 프로세스 풀
+#   - spawn 컨텍스트: TF가 초기화된 부모 프로세스를 fork하지 않도록 함
+#   - 워커 진입점은 video_analysis_worker 모듈에 있음 (import 시 TF/모델을 로드하지 않으므로
+#     initializer가 TF 스레드 수를 먼저 제한한 뒤 워커당 한 번 모델을 로드)
+# ---------------------------------------------------------
+_process_pool = None
+
+
+def _get_process_pool():
+    global _process_pool
+    if _process_pool is None:
+        from . import video_analysis_worker
+
+        _process_pool = ProcessPoolExecutor(
+            max_workers=VIDEO_ANALYSIS_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=video_analysis_worker.init_worker,
+        )
+    return _process_pool
+
+
+def _reset_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+# 모델 로드는 첫 사용 시점으로 지연 (모듈 import만으로 TF 모델을 올리지 않음)
+_video_analysis_service = None
+_service_lock = threading.Lock()
+
+
+def get_video_analysis_service() -> VideoAnalysisService:
+    global _video_analysis_service
+    if _video_analysis_service is None:
+        with _service_lock:
+            if _video_analysis_service is None:
+                _video_analysis_service = VideoAnalysisService()
+    return _video_analysis_service
@@ -0,0 +1,26 @@
+"""
+세션 비디오 분석 프로세스 풀 워커 진입점.
+
+spawn 워커는 initializer/작업 함수를 unpickle하면서 이 모듈을 import합니다.
+이 모듈은 import 시 TensorFlow나 모델을 불러오지 않으므로, init_worker()가
+TF 스레드 환경변수를 설정한 뒤에 video_analysis_service(TF import)를 불러오고
+워커당 한 번 모델을 로드합니다.
+"""
+import os
+
+
+def init_worker():
+    # 워커당 TF 스레드를 1개로 제한하여 프로세스 간 코어 과다 점유 방지 (TF import 전에 설정해야 적용됨)
+    os.environ.setdefault("TF_NUM_INTRAOP_THREADS", "1")
+    os.environ.setdefault("TF_NUM_INTEROP_THREADS", "1")
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+    from .video_analysis_service import get_video_analysis_service
+
+    get_video_analysis_service()
+
+
+def analyze_files(file_paths):
+    from .video_analysis_service import get_video_analysis_service
+
+    return get_video_analysis_service().analyze_video_files(file_paths)
@@ -1,8 +1,11 @@
 import os
 import uuid
+import json
 import shutil
 import sys
+import time
 import asyncio
+import hashlib
 
 from ..config import (
     WAV2LIP_OUTPUT_FOLDER,
@@ -14,6 +17,18 @@ from ..config import (
     logger,
 )
 
+# 상주 워커 사용 여부 (0이면 질문마다 inference.py를 새로 실행하는 기존 방식)
+WAV2LIP_PERSISTENT_WORKER = os.getenv("WAV2LIP_PERSISTENT_WORKER", "1") == "1"
+WAV2LIP_BATCH_SIZE = int(os.getenv("WAV2LIP_BATCH_SIZE", "128"))
+# 워커 초기화(모델 로드 + 얼굴 검출) 대기 한도 / 작업 1건 대기 한도 (초)
+WAV2LIP_WORKER_START_TIMEOUT = float(os.getenv("WAV2LIP_WORKER_START_TIMEOUT", "180"))
+WAV2LIP_JOB_TIMEOUT = float(os.getenv("WAV2LIP_JOB_TIMEOUT", "300"))
+# 워커 초기화 실패 후 재시도까지 대기 (그동안은 기존 방식으로 처리)
+WAV2LIP_WORKER_RETRY_SEC = float(os.getenv("WAV2LIP_WORKER_RETRY_SEC", "60"))
+
+WAV2LIP_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wav2lip_worker.py")
+_PROTOCOL_PREFIX = "@@WAV2LIP "
+
 async def _run_process_exec(cmd_list: list[str], cwd: str | None = None, env: dict | None = None) -> tuple[int, str, str]:
     """
     비동기 subprocess 실행 유틸리티
@@ -54,9 +69,245 @@ async def _convert_audio_to_wav_16k_mono(input_audio_path: str, output_wav_path:
         return False
     return True
 
+class Wav2LipWorkerClient:
+    """
+    상주 Wav2Lip 워커 프로세스(wav2lip_worker.py) 관리자.
+
+    - 첫 요청 시 워커를 띄우고 모델 로드/얼굴 박스 계산이 끝날 때까지 대기합니다.
+    - 작업은 stdin 파이프(로컬 큐)로 보내고, stdout 응답을 작업 ID별 Future로 전달합니다.
+    - 워커가 종료되면 대기 중인 작업을 실패 처리하고 다음 요청 때 다시 띄웁니다.
+    """
+
+    def __init__(self):
+        self._process = None
+        self._reader_task = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._start_lock = asyncio.Lock()
+        self._ready: asyncio.Future | None = None
+        self._retry_after = 0.0
+        self.stats = {"jobs": 0, "failures": 0, "restarts": 0, "last_timings_ms": {}}
+
+    def _alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def _ensure_started(self) -> bool:
+        async with self._start_lock:
+            if self._alive() and self._ready is not None and self._ready.done():
+                return self._ready.result()
+            if time.monotonic() < self._retry_after:
+                return False
+
+            if self._process is not None:
+                self.stats["restarts"] += 1
+
+            wav2lip_dir = os.path.abspath(WAV2LIP_DIR)
+            env = os.environ.copy()
+            existing_pythonpath = env.get("PYTHONPATH", "")
+            env["PYTHONPATH"] = wav2lip_dir + (os.pathsep + existing_pythonpath if existing_pythonpath else "")
+
+            cmd = [
+                sys.executable, WAV2LIP_WORKER_SCRIPT,
+                "--checkpoint_path", os.path.abspath(WAV2LIP_CHECKPOINT),
+                "--face", os.path.abspath(WAV2LIP_FACE_IMAGE),
+                "--ffmpeg", FFMPEG_EXE,
+                "--batch_size", str(WAV2LIP_BATCH_SIZE),
+            ]
+            logger.info("[비디오 생성] 상주 Wav2Lip 워커 시작 중...")
+            try:
+                # stderr는 상속하여 워커 로그가 서버 콘솔에 그대로 출력되도록 함 (파이프 적체 방지)
+                self._process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    cwd=wav2lip_dir,
+                    env=env,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                )
+            except OSError as e:
+                logger.error(f"[비디오 생성] Wav2Lip 워커 실행 실패: {e}")
+                self._process = None
+                self._retry_after = time.monotonic() + WAV2LIP_WORKER_RETRY_SEC
+                return False
+            self._ready = asyncio.get_running_loop().create_future()
+            self._reader_task = asyncio.create_task(self._read_loop(self._process, self._ready))
+
+            try:
+                ok = await asyncio.wait_for(asyncio.shield(self._ready), WAV2LIP_WORKER_START_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.error("[비디오 생성] Wav2Lip 워커 초기화 시간 초과")
+                self._process.kill()
+                ok = False
+            if ok:
+                logger.info("[비디오 생성] 상주 Wav2Lip 워커 준비 완료")
+            else:
+                self._retry_after = time.monotonic() + WAV2LIP_WORKER_RETRY_SEC
+            return ok
+
+    async def _read_loop(self, process, ready: asyncio.Future):
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                text = line.decode("utf-8", errors="replace").strip()
+                if not text.startswith(_PROTOCOL_PREFIX):
+                    continue
+                try:
+                    msg = json.loads(text[len(_PROTOCOL_PREFIX):])
+                except json.JSONDecodeError:
+                    continue
+
+                if msg.get("id") is None:
+                    if not msg.get("ready"):
+                        logger.error(f"[비디오 생성] Wav2Lip 워커 초기화 실패: {msg.get('error')}")
+                    if not ready.done():
+                        ready.set_result(bool(msg.get("ready")))
+                    continue
+
+                future = self._pending.pop(msg["id"], None)
+                if future and not future.done():
+                    future.set_result(msg)
+        finally:
+            # 워커 종료 → 대기 중인 작업 모두 실패 처리
+            if not ready.done():
+                ready.set_result(False)
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result({"ok": False, "error": "Wav2Lip 워커 종료"})
+            self._pending.clear()
+
+    async def render(self, audio_path: str, outfile: str) -> bool:
+        """오디오 → 립싱크 mp4 (최종 H.264 파일을 워커가 직접 인코딩)"""
+        if not await self._ensure_started():
+            return False
+
+        job_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[job_id] = future
+        job = {"id": job_id, "audio": audio_path, "outfile": outfile}
+        try:
+            self._process.stdin.write((json.dumps(job, ensure_ascii=False) + "\n").encode("utf-8"))
+            await self._process.stdin.drain()
+            result = await asyncio.wait_for(future, WAV2LIP_JOB_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            self._pending.pop(job_id, None)
+            logger.error(f"[비디오 생성] Wav2Lip 워커 작업 실패: {e!r}")
+            self.stats["failures"] += 1
+            return False
+
+        self.stats["jobs"] += 1
+        if not result.get("ok"):
+            logger.error(f"[비디오 생성] Wav2Lip 워커 작업 오류: {result.get('error')}")
+            self.stats["failures"] += 1
+            return False
+        self.stats["last_timings_ms"] = result.get("timings_ms", {})
+        logger.info(f"[비디오 생성] 워커 렌더링 완료: {result.get('frames')}프레임, {result.get('timings_ms')}")
+        return os.path.exists(outfile)
+
+
+_worker_client = Wav2LipWorkerClient()
+
+# 같은 오디오에 대한 동시 요청은 하나의 생성 작업을 공유
+_inflight: dict[str, asyncio.Future] = {}
+_face_fingerprint: str | None = None
+
+
+def _video_cache_key(audio_filepath: str) -> str:
+    """오디오 내용 + 얼굴 이미지/가중치 식별자 기반 캐시 키"""
+    global _face_fingerprint
+    if _face_fingerprint is None:
+        parts = []
+        for path in (WAV2LIP_FACE_IMAGE, WAV2LIP_CHECKPOINT):
+            try:
+                st = os.stat(path)
+                parts.append(f"{os.path.abspath(path)}:{st.st_size}:{int(st.st_mtime)}")
+            except OSError:
+                parts.append(path)
+        _face_fingerprint = "|".join(parts)
+
+    h = hashlib.sha256(_face_fingerprint.encode("utf-8"))
+    with open(audio_filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()[:24]
+
+
 async def generate_wav2lip_video(audio_filepath: str) -> str | None:
     """
     Wav2Lip-GAN을 사용하여 정지 이미지(data/man.png)와 입력 오디오로 립싱크 비디오를 생성합니다.
+    - 같은 오디오(해시)로 생성한 비디오가 있으면 재생성 없이 바로 반환합니다.
+    - 상주 워커를 우선 사용하고, 실패 시 질문마다 inference.py를 실행하는 기존 방식으로 폴백합니다.
+
+    Returns:
+        성공 시 비디오 파일의 웹 접근 경로(/uploads/Wav2Lip_mp4/xxx.mp4),
+        실패 시 None 반환
+    """
+    if not os.path.exists(audio_filepath):
+        logger.error(f"[비디오 생성] 입력 오디오 파일이 없습니다: {audio_filepath}")
+        return None
+
+    output_dir = os.path.abspath(WAV2LIP_OUTPUT_FOLDER)
+    os.makedirs(output_dir, exist_ok=True)
+
+    cache_key = _video_cache_key(audio_filepath)
+    cached_filename = f"wav2lip_{cache_key}.mp4"
+    cached_filepath = os.path.join(output_dir, cached_filename)
+    if os.path.exists(cached_filepath):
+        logger.info(f"[비디오 생성] 캐시 적중 (오디오 해시 {cache_key[:8]}): {cached_filename}")
+        return f"/uploads/Wav2Lip_mp4/{cached_filename}"
+
+    existing = _inflight.get(cache_key)
+    if existing is not None:
+        return await asyncio.shield(existing)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    try:
+        result = None
+        t0 = time.perf_counter()
+        if WAV2LIP_PERSISTENT_WORKER and FFMPEG_EXE:
+            # 임시 이름으로 인코딩 후 원자적으로 이동 (부분 파일이 캐시로 노출되지 않도록)
+            temp_filepath = os.path.join(output_dir, f"temp_{cache_key}_{uuid.uuid4().hex[:6]}.mp4")
+            try:
+                if await _worker_client.render(os.path.abspath(audio_filepath), temp_filepath):
+                    os.replace(temp_filepath, cached_filepath)
+                    result = f"/uploads/Wav2Lip_mp4/{cached_filename}"
+            except Exception as e:
+                logger.error(f"[비디오 생성] 상주 워커 처리 중 예외 발생: {e}")
+            finally:
+                if os.path.exists(temp_filepath):
+                    os.remove(temp_filepath)
+
+        if result is None:
+            if WAV2LIP_PERSISTENT_WORKER:
+                logger.warning("[비디오 생성] 상주 워커를 사용할 수 없어 기존 방식(inference.py)으로 생성합니다.")
+            result = await _generate_wav2lip_video_subprocess(audio_filepath, cached_filename)
+
+        if result:
+            logger.info(f"[비디오 생성] 생성 완료 ({(time.perf_counter() - t0) * 1000:.0f}ms): {result}")
+        future.set_result(result)
+        return result
+    except BaseException:
+        if not future.done():
+            future.set_result(None)
+        raise
+    finally:
+        _inflight.pop(cache_key, None)
+
+
+def get_video_gen_stats() -> dict:
+    """상주 워커 처리 현황 (모니터링/디버깅용)"""
+    return {
+        "persistent_worker": WAV2LIP_PERSISTENT_WORKER,
+        "worker_alive": _worker_client._alive(),
+        "inflight": len(_inflight),
+        **_worker_client.stats,
+    }
+
+
+async def _generate_wav2lip_video_subprocess(audio_filepath: str, final_filename: str) -> str | None:
+    """
+    (폴백) 질문마다 inference.py 프로세스를 새로 실행하여 립싱크 비디오를 생성합니다.
+    실행할 때마다 가중치 로드/얼굴 검출/ffmpeg 2회가 반복되므로 상주 워커보다 느립니다.
 
     Returns:
         성공 시 비디오 파일의 웹 접근 경로(/uploads/Wav2Lip_mp4/xxx.mp4),
@@ -75,7 +326,6 @@ async def generate_wav2lip_video(audio_filepath: str) -> str | None:
     temp_filename = f"temp_wav2lip_{uuid.uuid4().hex[:8]}.mp4"
     temp_filepath = os.path.join(output_dir, temp_filename)
 
-    final_filename = f"wav2lip_{uuid.uuid4().hex[:8]}.mp4"
     final_filepath = os.path.join(output_dir, final_filename)
 
     python_exe = sys.executable
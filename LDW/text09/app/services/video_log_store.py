@@ -0,0 +1,271 @@
+import os
+import json
+import time
+import struct
+import threading
+import collections
+from ..config import UPLOAD_FOLDER, logger
+
+# 시간 인덱스: INDEX_STRIDE 건마다 (timestamp, 바이트 오프셋) 16바이트 레코드 1개
+INDEX_STRIDE = int(os.getenv("VIDEO_LOG_INDEX_STRIDE", "32"))
+# 누적 집계 파일 저장 주기 (N건마다). 재시작 시 저장 이후 구간만 재생하여 복구합니다.
+AGGREGATE_FLUSH_EVERY = int(os.getenv("VIDEO_LOG_AGG_FLUSH_EVERY", "20"))
+
+_INDEX_RECORD = struct.Struct("<dQ")
+
+
+def _new_aggregate():
+    return {
+        "total_frames": 0,
+        "emotion_counts": {},
+        "bad_posture_count": 0,
+        "pose_detected_count": 0,
+        "hand_frames": 0,
+        "error_frames": 0,
+        "first_timestamp": None,
+        "last_timestamp": None,
+        "offset": 0,  # 이 집계가 반영한 JSONL 바이트 위치
+    }
+
+
+def _update_aggregate(agg, record):
+    agg["total_frames"] += 1
+    if record.get("error"):
+        agg["error_frames"] += 1
+    emotion = record.get("emotion")
+    if emotion:
+        agg["emotion_counts"][emotion] = agg["emotion_counts"].get(emotion, 0) + 1
+    pose = record.get("pose")
+    if pose == "bad_posture":
+        agg["bad_posture_count"] += 1
+    elif pose == "detected":
+        agg["pose_detected_count"] += 1
+    hands = record.get("hands")
+    if isinstance(hands, (int, float)) and hands > 0:
+        agg["hand_frames"] += 1
+    ts = record.get("timestamp")
+    if ts is not None:
+        if agg["first_timestamp"] is None:
+            agg["first_timestamp"] = ts
+        agg["last_timestamp"] = ts
+
+
+class VideoLogStore:
+    """
+    면접별 프레임 분석 로그 저장소 (append-only).
+
+    파일 구성 (VIDEO_LOGS_DIR/{interview_number}.*):
+      - .jsonl : 프레임 분석 결과 1건 = 1줄 (append만 수행, 기존 내용 재작성 없음)
+      - .idx   : INDEX_STRIDE 건마다 (timestamp, 바이트 오프셋) 고정 길이 레코드
+      - .agg.json : 감정/자세 누적 집계 (쓰기 시 갱신, 주기적으로 저장)
+
+    최근 N초 조회는 인덱스에서 시작 오프셋을 이분 탐색한 뒤 JSONL 꼬리만 읽습니다.
+    기존 {interview_number}.json(배열) 로그는 처음 접근할 때 자동 변환됩니다.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        os.makedirs(base_dir, exist_ok=True)
+        self._guard = threading.Lock()
+        self._locks = {}
+        self._aggregates = {}
+        self._legacy_checked = set()
+        self._pending_flush = collections.Counter()
+
+    # ───────── 경로 / 잠금 ─────────
+
+    def _path(self, interview_number, ext):
+        return os.path.join(self.base_dir, f"{interview_number}{ext}")
+
+    def _lock(self, interview_number):
+        with self._guard:
+            lock = self._locks.get(interview_number)
+            if lock is None:
+                lock = self._locks[interview_number] = threading.Lock()
+            return lock
+
+    # ───────── 쓰기 ─────────
+
+    def append(self, interview_number, record):
+        """분석 결과 1건을 추가합니다 (O(1) I/O)."""
+        with self._lock(interview_number):
+            self._ensure_migrated(interview_number)
+            self._append_locked(interview_number, record)
+            self._pending_flush[interview_number] += 1
+            if self._pending_flush[interview_number] >= AGGREGATE_FLUSH_EVERY:
+                self._flush_aggregate(interview_number)
+
+    def _append_locked(self, interview_number, record):
+        agg = self._load_aggregate(interview_number)
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        log_path = self._path(interview_number, ".jsonl")
+
+        with open(log_path, "ab") as f:
+            offset = f.tell()
+            f.write(line)
+
+        if agg["total_frames"] % INDEX_STRIDE == 0:
+            with open(self._path(interview_number, ".idx"), "ab") as f:
+                f.write(_INDEX_RECORD.pack(float(record.get("timestamp") or 0.0), offset))
+
+        _update_aggregate(agg, record)
+        agg["offset"] = offset + len(line)
+
+    # ───────── 누적 집계 ─────────
+
+    def _load_aggregate(self, interview_number):
+        """메모리 → .agg.json → JSONL 재생 순으로 집계를 복구합니다."""
+        agg = self._aggregates.get(interview_number)
+        if agg is not None:
+            return agg
+
+        agg = _new_aggregate()
+        agg_path = self._path(interview_number, ".agg.json")
+        if os.path.exists(agg_path):
+            try:
+                with open(agg_path, "r", encoding="utf-8") as f:
+                    agg.update(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                agg = _new_aggregate()
+
+        # 마지막 저장 이후 추가된 구간만 재생
+        log_path = self._path(interview_number, ".jsonl")
+        if os.path.exists(log_path) and os.path.getsize(log_path) > agg["offset"]:
+            with open(log_path, "rb") as f:
+                f.seek(agg["offset"])
+                for raw in f:
+                    try:
+                        _update_aggregate(agg, json.loads(raw))
+                    except json.JSONDecodeError:
+                        continue
+                agg["offset"] = f.tell()
+
+        self._aggregates[interview_number] = agg
+        return agg
+
+    def _flush_aggregate(self, interview_number):
+        agg = self._aggregates.get(interview_number)
+        if agg is None:
+            return
+        agg_path = self._path(interview_number, ".agg.json")
+        tmp_path = agg_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(agg, f, ensure_ascii=False)
+        os.replace(tmp_path, agg_path)
+        self._pending_flush[interview_number] = 0
+
+    def get_aggregate(self, interview_number):
+        """누적 집계(감정 분포, 자세 이슈 등)를 반환합니다. 로그가 없으면 None."""
+        with self._lock(interview_number):
+            self._ensure_migrated(interview_number)
+            if not os.path.exists(self._path(interview_number, ".jsonl")):
+                return None
+            agg = self._load_aggregate(interview_number)
+            return json.loads(json.dumps(agg))
+
+    # ───────── 읽기 ─────────
+
+    def _index_offset(self, interview_number, since_ts):
+        """since_ts 이전의 마지막 인덱스 오프셋 (없으면 0)을 이분 탐색으로 찾습니다."""
+        idx_path = self._path(interview_number, ".idx")
+        if not os.path.exists(idx_path):
+            return 0
+        size = _INDEX_RECORD.size
+        with open(idx_path, "rb") as f:
+            count = os.fstat(f.fileno()).st_size // size
+            lo, hi, found = 0, count - 1, 0
+            while lo <= hi:
+                mid = (lo + hi) // 2
+                f.seek(mid * size)
+                ts, offset = _INDEX_RECORD.unpack(f.read(size))
+                if ts < since_ts:
+                    found = offset
+                    lo = mid + 1
+                else:
+                    hi = mid - 1
+        return found
+
+    def read_since(self, interview_number, since_ts):
+        """since_ts 이후(포함)의 로그만 JSONL 꼬리에서 읽어 반환합니다."""
+        with self._lock(interview_number):
+            self._ensure_migrated(interview_number)
+            log_path = self._path(interview_number, ".jsonl")
+            if not os.path.exists(log_path):
+                return []
+            start = self._index_offset(interview_number, since_ts)
+
+        records = []
+        with open(log_path, "rb") as f:
+            f.seek(start)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # 쓰는 중인 마지막 줄
+                try:
+                    record = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("timestamp", 0) >= since_ts:
+                    records.append(record)
+        return records
+
+    def read_recent(self, interview_number, duration_seconds):
+        return self.read_since(interview_number, time.time() - duration_seconds)
+
+    # ───────── 레거시 .json 마이그레이션 ─────────
+
+    def _ensure_migrated(self, interview_number):
+        # 면접당 한 번만 레거시 파일 존재 여부를 확인 (매 프레임 stat 방지)
+        if interview_number in self._legacy_checked:
+            return
+        legacy_path = self._path(interview_number, ".json")
+        if os.path.exists(legacy_path):
+            self._migrate_locked(interview_number, legacy_path)
+        self._legacy_checked.add(interview_number)
+
+    def _migrate_locked(self, interview_number, legacy_path):
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"레거시 비디오 로그 읽기 실패 ({legacy_path}): {e}")
+            legacy = []
+
+        # 이미 JSONL이 있으면 그 앞에 오도록 레거시 기록을 먼저 기록한 뒤 기존 내용을 덧붙임
+        log_path = self._path(interview_number, ".jsonl")
+        existing = []
+        if os.path.exists(log_path):
+            with open(log_path, "rb") as f:
+                existing = [json.loads(raw) for raw in f if raw.strip()]
+        for ext in (".jsonl", ".idx", ".agg.json"):
+            if os.path.exists(self._path(interview_number, ext)):
+                os.remove(self._path(interview_number, ext))
+        self._aggregates.pop(interview_number, None)
+
+        for record in list(legacy if isinstance(legacy, list) else []) + existing:
+            if isinstance(record, dict):
+                self._append_locked(interview_number, record)
+        self._flush_aggregate(interview_number)
+        os.replace(legacy_path, legacy_path + ".migrated")
+        logger.info(f"비디오 로그 마이그레이션 완료: {interview_number} ({len(legacy)}건)")
+
+    def migrate_all(self):
+        """디렉토리의 모든 레거시 .json 로그를 변환하고 변환 건수를 반환합니다."""
+        migrated = 0
+        for name in sorted(os.listdir(self.base_dir)):
+            if not name.endswith(".json") or name.endswith(".agg.json"):
+                continue
+            interview_number = name[: -len(".json")]
+            with self._lock(interview_number):
+                self._migrate_locked(interview_number, os.path.join(self.base_dir, name))
+                self._legacy_checked.add(interview_number)
+            migrated += 1
+        return migrated
+
+
+video_log_store = VideoLogStore(os.path.join(UPLOAD_FOLDER, "video_logs"))
+
+
+if __name__ == "__main__":
+    # 사용법: python -m app.services.video_log_store  (LDW/text09 에서 실행)
+    count = video_log_store.migrate_all()
+    print(f"레거시 비디오 로그 {count}개를 JSONL 형식으로 변환했습니다.")
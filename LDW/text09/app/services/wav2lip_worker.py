@@ -0,0 +1,244 @@
+"""
+상주형 Wav2Lip 워커 프로세스
+
+video_gen_service가 서버 수명 동안 한 번만 띄우는 독립 실행 스크립트입니다.
+(cwd=WAV2LIP_DIR, PYTHONPATH에 WAV2LIP_DIR 포함 상태로 실행)
+
+- 시작 시 GAN 가중치를 한 번만 로드합니다.
+- 정지 얼굴 이미지의 얼굴 박스/96x96 크롭/마스킹 입력 텐서를 미리 계산합니다.
+  얼굴 박스는 이미지 해시 기준으로 디스크에 캐시하여 재시작 시 얼굴 검출도 생략합니다.
+- stdin으로 작업(JSON 한 줄)을 받고, 생성한 프레임을 ffmpeg(libx264) stdin으로 바로
+  흘려보내 중간 mp4/wav 파일 없이 최종 비디오를 만듭니다.
+- 결과는 stdout에 PROTOCOL_PREFIX로 시작하는 JSON 한 줄로 응답합니다.
+  (라이브러리가 stdout에 출력하는 다른 줄과 구분하기 위함)
+
+작업 형식:  {"id": "...", "audio": "입력 오디오 경로", "outfile": "출력 mp4 경로"}
+응답 형식:  @@WAV2LIP {"id": "...", "ok": true, "frames": 123, "timings_ms": {...}}
+"""
+
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+import torch
+
+# Wav2Lip 저장소 내부 모듈 (PYTHONPATH=WAV2LIP_DIR)
+import audio
+import face_detection
+from models import Wav2Lip
+
+PROTOCOL_PREFIX = "@@WAV2LIP "
+
+IMG_SIZE = 96
+MEL_STEP_SIZE = 16
+FPS = 25
+SAMPLE_RATE = 16000
+# inference.py --pads 0 20 0 0 과 동일 (top, bottom, left, right)
+PADS = (0, 20, 0, 0)
+
+
+def log(msg):
+    # stdout은 응답 채널이므로 로그는 stderr로 출력
+    print(f"[Wav2Lip 워커] {msg}", file=sys.stderr, flush=True)
+
+
+def reply(payload):
+    sys.stdout.write(PROTOCOL_PREFIX + json.dumps(payload, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+class Wav2LipWorker:
+    def __init__(self, checkpoint_path, face_image, ffmpeg_exe, batch_size=128):
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.ffmpeg_exe = ffmpeg_exe
+        self.batch_size = batch_size
+
+        t0 = time.perf_counter()
+        self.model = self._load_model(checkpoint_path)
+        log(f"모델 로드 완료 ({self.device}, {(time.perf_counter() - t0) * 1000:.0f}ms)")
+
+        t0 = time.perf_counter()
+        self.frame = cv2.imread(face_image)
+        if self.frame is None:
+            raise RuntimeError(f"얼굴 이미지를 읽을 수 없습니다: {face_image}")
+        self.box = self._face_box(face_image)
+        y1, y2, x1, x2 = self.box
+        face = cv2.resize(self.frame[y1:y2, x1:x2], (IMG_SIZE, IMG_SIZE))
+
+        # 정지 이미지이므로 모든 프레임의 얼굴 입력이 동일 → 마스킹/정규화 결과를 1회만 계산
+        masked = face.copy()
+        masked[IMG_SIZE // 2:] = 0
+        face_input = np.concatenate((masked, face), axis=2) / 255.0
+        self.face_tensor = torch.FloatTensor(
+            np.transpose(face_input[np.newaxis], (0, 3, 1, 2))
+        ).to(self.device)
+        log(f"얼굴 입력 준비 완료 (box={self.box}, {(time.perf_counter() - t0) * 1000:.0f}ms)")
+
+    # ───────── 초기화 ─────────
+
+    def _load_model(self, path):
+        model = Wav2Lip()
+        checkpoint = torch.load(path, map_location=lambda storage, loc: storage)
+        state = {k.replace("module.", ""): v for k, v in checkpoint["state_dict"].items()}
+        model.load_state_dict(state)
+        return model.to(self.device).eval()
+
+    def _face_box(self, face_image):
+        """얼굴 박스 (y1, y2, x1, x2) — 이미지 해시 기준 디스크 캐시"""
+        with open(face_image, "rb") as f:
+            image_hash = hashlib.sha256(f.read()).hexdigest()
+        cache_path = f"{face_image}.facebox.json"
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("sha256") == image_hash and cached.get("pads") == list(PADS):
+                return tuple(cached["box"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        detector = face_detection.FaceAlignment(
+            face_detection.LandmarksType._2D, flip_input=False, device=self.device
+        )
+        rect = detector.get_detections_for_batch(np.array([self.frame]))[0]
+        del detector
+        if rect is None:
+            raise RuntimeError("얼굴을 검출하지 못했습니다. 얼굴 이미지를 확인해주세요.")
+
+        h, w = self.frame.shape[:2]
+        pad_top, pad_bottom, pad_left, pad_right = PADS
+        box = (
+            max(0, rect[1] - pad_top), min(h, rect[3] + pad_bottom),
+            max(0, rect[0] - pad_left), min(w, rect[2] + pad_right),
+        )
+        box = tuple(int(v) for v in box)
+        try:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump({"sha256": image_hash, "pads": list(PADS), "box": box}, f)
+        except OSError as e:
+            log(f"얼굴 박스 캐시 저장 실패: {e}")
+        return box
+
+    # ───────── 작업 처리 ─────────
+
+    def _decode_audio(self, path):
+        """ffmpeg로 16kHz 모노 PCM을 파이프로 디코딩 (중간 wav 파일 없음)"""
+        proc = subprocess.run(
+            [self.ffmpeg_exe, "-v", "error", "-i", path,
+             "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+        )
+        return np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+    def _mel_chunks(self, wav):
+        mel = audio.melspectrogram(wav)
+        if np.isnan(mel.reshape(-1)).sum() > 0:
+            raise ValueError("Mel 스펙트로그램에 NaN이 포함되어 있습니다.")
+        chunks = []
+        mel_idx_multiplier = 80.0 / FPS
+        i = 0
+        while True:
+            start = int(i * mel_idx_multiplier)
+            if start + MEL_STEP_SIZE > mel.shape[1]:
+                chunks.append(mel[:, mel.shape[1] - MEL_STEP_SIZE:])
+                break
+            chunks.append(mel[:, start:start + MEL_STEP_SIZE])
+            i += 1
+        return chunks
+
+    def run_job(self, audio_path, outfile):
+        timings = {}
+        t0 = time.perf_counter()
+        wav = self._decode_audio(audio_path)
+        chunks = self._mel_chunks(wav)
+        timings["audio"] = round((time.perf_counter() - t0) * 1000, 1)
+
+        h, w = self.frame.shape[:2]
+        y1, y2, x1, x2 = self.box
+        encoder = subprocess.Popen(
+            [self.ffmpeg_exe, "-y", "-v", "error",
+             "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{w}x{h}", "-r", str(FPS), "-i", "-",
+             "-i", audio_path,
+             "-vf", "scale=256:256,setsar=1:1",
+             "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+             "-c:a", "aac", "-shortest", "-movflags", "+faststart",
+             outfile],
+            stdin=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+
+        t0 = time.perf_counter()
+        rendered = False
+        try:
+            with torch.no_grad():
+                for start in range(0, len(chunks), self.batch_size):
+                    batch = np.asarray(chunks[start:start + self.batch_size])
+                    mel_tensor = torch.FloatTensor(batch[:, np.newaxis]).to(self.device)
+                    face_batch = self.face_tensor.expand(len(batch), -1, -1, -1)
+                    pred = self.model(mel_tensor, face_batch)
+                    pred = (pred.cpu().numpy().transpose(0, 2, 3, 1) * 255.0).astype(np.uint8)
+
+                    for p in pred:
+                        frame = self.frame.copy()
+                        frame[y1:y2, x1:x2] = cv2.resize(p, (x2 - x1, y2 - y1))
+                        encoder.stdin.write(frame.tobytes())
+            rendered = True
+        except BrokenPipeError:
+            # ffmpeg가 먼저 종료됨 → 아래 rc/stderr로 원인 보고
+            rendered = True
+        finally:
+            try:
+                encoder.stdin.close()
+            except BrokenPipeError:
+                pass
+            if not rendered:
+                # 추론 중 오류 → 인코더를 남겨두지 않고 정리한 뒤 예외 전파
+                encoder.kill()
+                encoder.wait()
+        rc = encoder.wait()
+        timings["render_encode"] = round((time.perf_counter() - t0) * 1000, 1)
+        if rc != 0:
+            err = encoder.stderr.read().decode("utf-8", errors="replace")
+            raise RuntimeError(f"ffmpeg 인코딩 실패 (rc={rc}): {err[-500:]}")
+        return len(chunks), timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상주형 Wav2Lip 워커")
+    parser.add_argument("--checkpoint_path", required=True)
+    parser.add_argument("--face", required=True)
+    parser.add_argument("--ffmpeg", required=True)
+    parser.add_argument("--batch_size", type=int, default=128)
+    args = parser.parse_args()
+
+    try:
+        worker = Wav2LipWorker(args.checkpoint_path, args.face, args.ffmpeg, args.batch_size)
+    except Exception as e:
+        reply({"id": None, "ready": False, "error": str(e)})
+        return 1
+    reply({"id": None, "ready": True, "device": worker.device})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError:
+            continue
+        t0 = time.perf_counter()
+        try:
+            frames, timings = worker.run_job(job["audio"], job["outfile"])
+            timings["total"] = round((time.perf_counter() - t0) * 1000, 1)
+            reply({"id": job.get("id"), "ok": True, "frames": frames, "timings_ms": timings})
+        except Exception as e:
+            log(f"작업 실패: {e}")
+            reply({"id": job.get("id"), "ok": False, "error": str(e)})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -108,6 +108,17 @@ def create_tables():
             )
         ''')
 
+        # 6. resume_cache table (이력서 내용 해시 기준 OCR/요약 캐시)
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS resume_cache (
+                content_hash TEXT PRIMARY KEY,
+                ocr_text TEXT,
+                summary TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
         conn.commit()
         print("All tables checked/created successfully.")
         cur.close()
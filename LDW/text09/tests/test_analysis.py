@@ -6,7 +6,7 @@ import numpy as np
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.services.video_analysis_service import video_analysis_service
+from app.services.video_analysis_service import get_video_analysis_service
 
 def create_dummy_image():
     # Create a 640x480 black image
@@ -27,7 +27,7 @@ def test_analysis():
     img_bytes = encoded_img.tobytes()
     
     try:
-        results = video_analysis_service.process_frame(img_bytes)
+        results = get_video_analysis_service().process_frame(img_bytes)
         print("Analysis Result:")
         print(results)
         
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import cv2
+import numpy as np
+# Add parent directory to path so we can import app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.frame_analysis_scheduler import FrameAnalysisScheduler
+
+class SlowAnalyzer:
+    """실제 모델 대신 일정 시간이 걸리는 분석기"""
+    def __init__(self):
+        self.batch_sizes = []
+
+    def analyze_frames(self, frames):
+        self.batch_sizes.append(len(frames))
+        time.sleep(0.05)
+        return [{"pose": "detected", "emotion": "neutral"} for _ in frames]
+
+def wait_until(condition, timeout=5.0, interval=0.01):
+    """고정 대기 대신 조건이 참이 될 때까지 제한 시간 안에서 폴링"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(interval)
+    return condition()
+
+def test_frame_analysis_scheduler():
+    _, buf = cv2.imencode('.jpg', np.zeros((64, 64, 3), dtype=np.uint8))
+    frame_bytes = buf.tobytes()
+
+    analyzer = SlowAnalyzer()
+    logged = []
+    scheduler = FrameAnalysisScheduler(analyzer, on_result=lambda i, r: logged.append(i), workers=1, batch_size=8)
+
+    def idle():
+        metrics = scheduler.get_metrics()
+        return metrics["pending"] == 0 and metrics["in_flight"] == 0 and len(logged) == metrics["processed"]
+
+    # 1. 첫 제출은 즉시 반환 (완료된 결과 없음)
+    t0 = time.time()
+    result, age_ms = scheduler.submit("A1", frame_bytes)
+    assert result is None and age_ms is None and time.time() - t0 < 0.05, \
+        f"Non-blocking Submit Test Failed: {result}, {age_ms}"
+
+    # 2. 처리 중에 들어온 프레임은 면접별로 최신 1장만 남음 + 여러 면접을 한 배치로
+    for _ in range(5):
+        for interview in ("A1", "B2", "C3"):
+            scheduler.submit(interview, frame_bytes)
+    assert wait_until(idle), f"Scheduler did not drain: {scheduler.get_metrics()}"
+    metrics = scheduler.get_metrics()
+    assert metrics["dropped"] >= 8 and metrics["pending"] == 0 and max(analyzer.batch_sizes) >= 2, \
+        f"Latest-frame-wins Test Failed: {analyzer.batch_sizes}, {metrics}"
+
+    # 3. 이후 제출은 마지막 완료 결과를 돌려주고, 완료 결과는 모두 로깅됨
+    result, age_ms = scheduler.submit("B2", frame_bytes)
+    assert result and result.get("pose") == "detected" and age_ms is not None and len(logged) == metrics["processed"], \
+        f"Last Result Test Failed: {result}, logged={len(logged)}"
+
+    # 4. 디코딩 실패 프레임은 오류 결과로 기록
+    assert wait_until(idle), f"Scheduler did not drain: {scheduler.get_metrics()}"
+    scheduler.submit("D4", b"not-an-image")
+    assert wait_until(lambda: idle() and "D4" in logged), f"Decode error frame was not processed: {scheduler.get_metrics()}"
+    result, _ = scheduler.submit("D4", frame_bytes)
+    assert result and "error" in result, f"Decode Error Test Failed: {result}"
+
+if __name__ == "__main__":
+    test_frame_analysis_scheduler()
+    print("✅ FrameAnalysisScheduler tests passed")
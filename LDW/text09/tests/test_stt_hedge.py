@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+import numpy as np
+# Add parent directory to path so we can import app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.stt_service import HedgedSTT, NO_ANSWER_TEXT
+
+def stub_engine(latency, text):
+    """지정한 지연 후 고정 결과를 반환하는 가짜 STT 엔진"""
+    calls = []
+    def engine(audio, sr):
+        calls.append(time.time())
+        time.sleep(latency)
+        return text
+    engine.calls = calls
+    return engine
+
+def wait_until(condition, timeout=5.0, interval=0.01):
+    """패자 엔진 정리처럼 비동기로 끝나는 상태를 제한 시간 안에서 폴링"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(interval)
+    return condition()
+
+def test_stt_hedge():
+    audio = np.zeros(16000, dtype=np.float32)
+
+    # 1. 주력 엔진이 빠르면 보조 엔진은 시작하지 않음
+    primary, secondary = stub_engine(0.05, "구글 결과"), stub_engine(0.05, "위스퍼 결과")
+    stt = HedgedSTT(primary, secondary)
+    text, engine, info = stt.transcribe(audio, 16000)
+    assert text == "구글 결과" and engine == "google" and not info["hedged"] and not secondary.calls, \
+        f"Fast Primary Test Failed: {text}, {engine}, {info}"
+
+    # 2. 주력 엔진이 느리면 hedge delay 후 보조 엔진 결과를 먼저 사용
+    primary, secondary = stub_engine(3.0, "구글 결과"), stub_engine(0.1, "위스퍼 결과")
+    stt = HedgedSTT(primary, secondary)
+    t0 = time.time()
+    text, engine, info = stt.transcribe(audio, 16000)
+    elapsed = time.time() - t0
+    assert text == "위스퍼 결과" and engine == "whisper" and info["hedged"] and elapsed < 2.9, \
+        f"Slow Primary Hedge Test Failed: {text}, {engine}, {elapsed:.2f}s"
+
+    # 3. 주력 엔진 오류(None)는 기다리지 않고 즉시 보조 엔진으로 전환
+    primary, secondary = stub_engine(0.05, None), stub_engine(0.05, "위스퍼 결과")
+    stt = HedgedSTT(primary, secondary)
+    t0 = time.time()
+    text, engine, _ = stt.transcribe(audio, 16000)
+    assert text == "위스퍼 결과" and engine == "whisper" and time.time() - t0 < 1.0, \
+        f"Primary Error Fallback Test Failed: {text}, {engine}"
+
+    # 4. 보조 엔진 환각 필터 결과(None)는 채택하지 않음
+    primary, secondary = stub_engine(2.5, NO_ANSWER_TEXT), stub_engine(0.05, None)
+    stt = HedgedSTT(primary, secondary)
+    text, engine, _ = stt.transcribe(audio, 16000)
+    assert text == NO_ANSWER_TEXT and engine == "google", f"Rejected Result Test Failed: {text}, {engine}"
+
+    # 5. 주력 엔진이 계속 느리면 hedge delay가 0으로 내려가 보조 엔진을 즉시 시작
+    primary, secondary = stub_engine(0.3, "구글 결과"), stub_engine(0.01, "위스퍼 결과")
+    stt = HedgedSTT(primary, secondary)
+    for _ in range(6):
+        stt._record("google", 7.0, True)
+    stats = stt.get_stats()
+    text, engine, info = stt.transcribe(audio, 16000)
+    assert stats["hedge_delay_ms"] == 0.0 and info["hedged"] and engine == "whisper", \
+        f"Adaptive Delay Test Failed: {stats}, {info}"
+
+    # 6. 진 쪽 주력 엔진은 결과가 버려진 것으로 집계되어야 함 (정리 누락 시 실패)
+    assert wait_until(lambda: stt.get_stats()["engines"]["google"]["discarded"] == 1), \
+        f"Loser Discard Test Failed: {stt.get_stats()['engines']}"
+    engines = stt.get_stats()["engines"]
+    assert engines["whisper"]["wins"] == 1 and engines["google"]["wins"] == 0, f"Winner Count Test Failed: {engines}"
+
+if __name__ == "__main__":
+    test_stt_hedge()
+    print("✅ HedgedSTT tests passed")
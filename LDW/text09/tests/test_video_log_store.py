@@ -0,0 +1,60 @@
+import os
+import sys
+import json
+import time
+import tempfile
+# Add parent directory to path so we can import app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.video_log_store import VideoLogStore, INDEX_STRIDE
+
+def make_record(ts, emotion="happy", pose="detected", hands=0):
+    return {"face_mesh": "detected", "hands": hands, "pose": pose, "emotion": emotion, "timestamp": ts}
+
+def test_video_log_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VideoLogStore(tmp)
+        now = time.time()
+
+        # 1. Append: 10분 분량 (1초 간격) 로그 + 누적 집계
+        total = 600
+        for i in range(total):
+            emotion = "neutral" if i % 3 == 0 else "happy"
+            pose = "bad_posture" if i % 10 == 0 else "detected"
+            store.append("A1", make_record(now - total + i, emotion, pose, hands=i % 2))
+
+        agg = store.get_aggregate("A1")
+        expected_neutral = len([i for i in range(total) if i % 3 == 0])
+        assert (agg["total_frames"] == total and agg["emotion_counts"]["neutral"] == expected_neutral
+                and agg["bad_posture_count"] == total // 10 and agg["hand_frames"] == total // 2), \
+            f"Aggregate Test Failed: {agg}"
+
+        # 2. Recent window: 인덱스 덕분에 꼬리만 읽음
+        recent = store.read_recent("A1", 60)
+        idx_size = os.path.getsize(os.path.join(tmp, "A1.idx"))
+        assert 59 <= len(recent) <= 61 and idx_size == 16 * ((total + INDEX_STRIDE - 1) // INDEX_STRIDE), \
+            f"Recent Window Test Failed: {len(recent)} frames, idx={idx_size}B"
+
+        # 3. Restart: 새 인스턴스가 .agg.json + 미반영 꼬리 재생으로 동일 집계 복구
+        reloaded = VideoLogStore(tmp).get_aggregate("A1")
+        assert reloaded["total_frames"] == total and reloaded["emotion_counts"] == agg["emotion_counts"], \
+            f"Reload Test Failed: {reloaded}"
+
+        # 4. Legacy .json migration
+        legacy = [make_record(now - 5, "sad"), make_record(now - 1, "sad", "bad_posture", hands=2)]
+        with open(os.path.join(tmp, "B2.json"), "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+        store = VideoLogStore(tmp)
+        recent = store.read_recent("B2", 60)
+        agg = store.get_aggregate("B2")
+        assert (len(recent) == 2 and agg["bad_posture_count"] == 1 and agg["hand_frames"] == 1
+                and os.path.exists(os.path.join(tmp, "B2.json.migrated"))
+                and not os.path.exists(os.path.join(tmp, "B2.json"))), \
+            f"Migration Test Failed: {len(recent)} frames, {agg}"
+
+        # 5. Missing interview
+        assert store.get_aggregate("none") is None and store.read_recent("none", 60) == [], "Missing Log Test Failed"
+
+if __name__ == "__main__":
+    test_video_log_store()
+    print("✅ VideoLogStore tests passed")
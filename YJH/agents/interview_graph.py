@@ -46,7 +46,7 @@ llm = ChatOpenAI(
 
 # --- 4. 노드(Node) 함수 정의 ---
 
-def node_analyze_answer(state: InterviewState):
+async def node_analyze_answer(state: InterviewState):
     """
     지원자의 답변을 분석하고 평가합니다.
     (수정사항: 짧은 인사말이나 초기 단계는 평가를 건너뛰어 무한 루프 방지)
@@ -90,7 +90,7 @@ def node_analyze_answer(state: InterviewState):
     try:
         structured_llm = llm.with_structured_output(AnswerAssessment)
         # 최근 5개 턴만 분석
-        response = structured_llm.invoke([evaluator_prompt] + messages[-5:]) 
+        response = await structured_llm.ainvoke([evaluator_prompt] + messages[-5:]) 
         
         return {"last_assessment": response.model_dump()}
         
@@ -108,7 +108,7 @@ def node_analyze_answer(state: InterviewState):
 
 # [수정] node_generate_question 함수 전체 교체 (26.02.05)
 
-def node_generate_question(state: InterviewState):
+async def node_generate_question(state: InterviewState):
     """
     현재 면접 단계에 따라 적절한 질문을 생성합니다.
     - intro: 환영 인사 (기존 로직 유지)
@@ -132,7 +132,7 @@ def node_generate_question(state: InterviewState):
         """
         
         # 가짜 사용자 메시지를 넣어 AI의 첫 마디를 유도
-        msg = llm.invoke([
+        msg = await llm.ainvoke([
             SystemMessage(content=system_prompt),
             HumanMessage(content="면접관님 안녕하세요, 면접 보러 왔습니다.") 
         ])
@@ -182,7 +182,7 @@ def node_generate_question(state: InterviewState):
     chain = prompt | llm
     
     try:
-        response = chain.invoke({"messages": messages})
+        response = await chain.ainvoke({"messages": messages})
         
         return {
             "messages": [response],
@@ -211,5 +211,7 @@ workflow.add_edge("analyze_answer", "generate_question")
 workflow.add_edge("generate_question", END)
 
 # [추가] 체크포인터 설정 (대화 기억 유지용)
+# 노드가 async이므로 app.ainvoke / app.astream으로 실행합니다.
+# (astream(stream_mode="messages")로 질문 생성 토큰을 실시간 스트리밍 가능)
 memory = MemorySaver()
 app = workflow.compile(checkpointer=memory)
\ No newline at end of file
@@ -1,6 +1,7 @@
 import sys
 import os
-import uuid
+import re
+import asyncio
 import traceback
 import shutil # 파일 저장용
 
@@ -8,7 +9,7 @@ import shutil # 파일 저장용
 sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from langchain_core.messages import SystemMessage, HumanMessage
@@ -19,7 +20,7 @@ import json
 # 프로젝트 모듈 임포트
 from YJH.agents.interview_graph import app as interview_graph
 from YJH.services.voice_service import transcribe_audio
-from YJH.services.tts_service import generate_audio
+from YJH.services.tts_service import stream_audio
 from YJH.database import get_db, SessionLocal, engine   # <--- engine 추가!
 from YJH import models                                 # <--- models 통째로 추가!
 # [수정] EvaluationReport 모델 추가 임포트
@@ -30,7 +31,7 @@ from YJH.services.report_service import generate_interview_report
 from YJH.services.vision_service import analyze_face_emotion
 # [추가] 업로드 API 추가 및 RAG 연동 임포트
 from YJH.services.rag_service import process_resume_pdf, get_relevant_context
-from YJH.services.transcript_service import save_transcript # [★추가] 방금 만든 서비스 가져오기
+from YJH.services.transcript_service import transcript_writer # [★추가] 방금 만든 서비스 가져오기
 
 # ==========================================================
 # [★핵심] 서버가 켜질 때, DB에 없던 테이블(Users 등)을 자동 생성합니다.
@@ -65,29 +66,97 @@ class ChatResponse(BaseModel):
 
 
 
+# 서버 종료 시 큐에 남은 대화 기록 저장
+@app.on_event("shutdown")
+def flush_transcripts_on_shutdown():
+    transcript_writer.flush(timeout=10)
+
+
 # 3. 헬스 체크
 @app.get("/")
 async def health_check():
     return {"status": "ok", "message": "AI 면접관(Voice+DB+Report) 준비 완료."}
 
+# ==========================================================
+# [비동기 그래프 실행 헬퍼]
+# - interview_graph 노드는 async이므로 ainvoke/astream으로 실행 (이벤트 루프 블로킹 없음)
+# - 대화 기록 저장은 transcript_writer 큐에 넣고 백그라운드에서 배치 저장
+# ==========================================================
+SENTENCE_END = re.compile(r"(?<=[.?!])\s+")
+
+
+async def stream_graph_tokens(inputs: dict, config: dict):
+    """
+    그래프를 astream으로 실행하며 질문 생성 노드의 토큰을 내보냅니다.
+    yield ("token", 텍스트 조각) ... 마지막에 ("final", 최종 상태)
+    """
+    final_state = {}
+    streamed = False
+    async for mode, chunk in interview_graph.astream(inputs, config=config, stream_mode=["messages", "values"]):
+        if mode == "messages":
+            message, metadata = chunk
+            # 답변 평가 노드(구조화 출력)의 토큰은 사용자에게 보내지 않음
+            if metadata.get("langgraph_node") == "generate_question" and isinstance(message.content, str) and message.content:
+                streamed = True
+                yield "token", message.content
+        else:
+            final_state = chunk
+
+    # 모델 호출 없이 고정 메시지를 반환한 경우(오류 안내 등) 한 번에 전송
+    if not streamed and final_state.get("messages"):
+        yield "token", final_state["messages"][-1].content
+    yield "final", final_state
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def build_voice_prompt(user_text: str, retrieved_context: str, current_emotion: str) -> str:
+    """음성 답변 + 이력서 검색 결과로 그래프 입력 프롬프트를 구성합니다."""
+    if retrieved_context:
+        print(f"📚 [RAG 검색 성공] 이력서 내용 추출됨 (길이: {len(retrieved_context)})")
+        
+        # [프롬프트 강화] 이력서 내용을 바탕으로 질문하도록 강력하게 지시
+        return f"""
+        [System Instruction]
+        You are a strict technical interviewer. 
+        The user just said: "{user_text}"
+        
+        [Resume Context - VERY IMPORTANT]
+        Use the following details from the candidate's resume to generate a relevant follow-up question.
+        Focus on their specific projects and tech stack mentioned below:
+        {retrieved_context}
+        
+        [User Emotion]
+        Current emotion: '{current_emotion}' (If fear/sad, be encouraging. If happy, be professional.)
+        """
+    print("⚠️ [RAG 검색 실패] 관련 이력서 내용 없음 (일반 질문 진행)")
+    # 이력서가 정말 없을 때를 대비한 기본 프롬프트
+    return f"""
+        User Answer: "{user_text}"
+        You are a technical interviewer. The user introduced themselves as a Backend Developer.
+        Ask a standard backend question about Database, API design, or System Architecture.
+        """
+
+
 # 4. 텍스트 대화 엔드포인트
 @app.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(request: ChatRequest):
     """텍스트로 대화하고 DB에 저장합니다."""
-    db = SessionLocal() # DB 세션 열기
     try:
-        # [저장] 사용자 입력
-        save_transcript(db, request.thread_id, "human", request.user_input)
+        # [저장] 사용자 입력 (백그라운드 배치 저장)
+        transcript_writer.enqueue(request.thread_id, "human", request.user_input)
 
         # LangGraph 실행
         config = {"configurable": {"thread_id": request.thread_id}}
         inputs = {"messages": [HumanMessage(content=request.user_input)]}
         
-        result = interview_graph.invoke(inputs, config=config)
+        result = await interview_graph.ainvoke(inputs, config=config)
         last_message = result["messages"][-1]
         
         # [저장] AI 응답
-        save_transcript(db, request.thread_id, "ai", last_message.content)
+        transcript_writer.enqueue(request.thread_id, "ai", last_message.content)
 
         return ChatResponse(
             response=last_message.content,
@@ -97,8 +166,38 @@ async def chat_endpoint(request: ChatRequest):
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close() # DB 세션 닫기
+
+
+# 4-1. 텍스트 대화 스트리밍 엔드포인트 (SSE)
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    /chat과 같지만 질문 생성 토큰을 Server-Sent Events로 즉시 전송합니다.
+    event: token  data: {"delta": "..."}
+    event: done   data: {"response": "...", "current_phase": "...", "question_count": n}
+    """
+    transcript_writer.enqueue(request.thread_id, "human", request.user_input)
+    config = {"configurable": {"thread_id": request.thread_id}}
+    inputs = {"messages": [HumanMessage(content=request.user_input)]}
+
+    async def event_stream():
+        try:
+            async for kind, payload in stream_graph_tokens(inputs, config):
+                if kind == "token":
+                    yield sse_event("token", {"delta": payload})
+                else:
+                    ai_text = payload["messages"][-1].content
+                    transcript_writer.enqueue(request.thread_id, "ai", ai_text)
+                    yield sse_event("done", {
+                        "response": ai_text,
+                        "current_phase": payload.get("phase", "unknown"),
+                        "question_count": payload.get("question_count", 0)
+                    })
+        except Exception as e:
+            traceback.print_exc()
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 
@@ -110,98 +209,122 @@ async def chat_voice_audio_endpoint(
     current_emotion: str = Form("neutral") 
 ):
     """
-    [Full Duplex] 음성 파일 업로드 -> STT -> RAG(강제 주입) -> LangGraph -> TTS -> 음성 파일 반환
+    [Full Duplex] 음성 파일 업로드 -> STT -> RAG(강제 주입) -> LangGraph -> TTS -> 음성 스트리밍 반환
+    - STT와 이력서 요약 검색(STT 결과와 무관)은 동시에 실행합니다.
+    - 질문이 생성되는 동안 완성된 문장부터 TTS로 변환해 mp3 조각을 바로 전송합니다.
     """
-    db = SessionLocal()
     try:
+        # ---------------------------------------------------------
+        # [★핵심 수정] RAG 검색어 전략: "User Input" + "Fixed Keywords"
+        # 사용자가 "안녕하세요"라고만 해도, 뒤에 "기술 스택 프로젝트 경험"을 붙여서
+        # 이력서의 핵심 내용을 강제로 긁어오게 만듭니다.
+        # 검색이 안 될 때 쓰는 '요약(summary)' 검색은 STT와 동시에 미리 실행 (안전장치)
+        # ---------------------------------------------------------
+        summary_task = asyncio.create_task(
+            asyncio.to_thread(get_relevant_context, thread_id, "summary of candidate resume")
+        )
+
         # 1. STT 변환
         audio_bytes = await file.read()
-        user_text = await transcribe_audio(audio_bytes, mimetype=file.content_type)
+        try:
+            user_text = await transcribe_audio(audio_bytes, mimetype=file.content_type)
+        except Exception:
+            summary_task.cancel()
+            raise
         print(f"🎤 User(STT): {user_text} [Emotion: {current_emotion}]")
 
         if not user_text.strip():
+            summary_task.cancel()
             raise HTTPException(status_code=400, detail="음성이 인식되지 않았습니다.")
 
-        # [저장] 사용자 입력
-        save_transcript(db, thread_id, "human", user_text, emotion=current_emotion)
+        # [저장] 사용자 입력 (백그라운드 배치 저장)
+        transcript_writer.enqueue(thread_id, "human", user_text, emotion=current_emotion)
 
-        # ---------------------------------------------------------
-        # [★핵심 수정] RAG 검색어 전략: "User Input" + "Fixed Keywords"
-        # 사용자가 "안녕하세요"라고만 해도, 뒤에 "기술 스택 프로젝트 경험"을 붙여서
-        # 이력서의 핵심 내용을 강제로 긁어오게 만듭니다.
-        # ---------------------------------------------------------
         rag_query = f"{user_text} technical skills project experience strength main stack"
-        retrieved_context = get_relevant_context(thread_id, rag_query)
+        retrieved_context = await asyncio.to_thread(get_relevant_context, thread_id, rag_query)
         
-        # 만약 그래도 검색이 안 되면, '요약(summary)'이라도 가져오라고 한 번 더 시도 (안전장치)
+        # 만약 그래도 검색이 안 되면, 미리 검색해 둔 '요약(summary)' 사용
         if not retrieved_context:
-             retrieved_context = get_relevant_context(thread_id, "summary of candidate resume")
-
-        final_input_text = user_text
-        
-        if retrieved_context:
-            print(f"📚 [RAG 검색 성공] 이력서 내용 추출됨 (길이: {len(retrieved_context)})")
-            
-            # [프롬프트 강화] 이력서 내용을 바탕으로 질문하도록 강력하게 지시
-            final_input_text = f"""
-            [System Instruction]
-            You are a strict technical interviewer. 
-            The user just said: "{user_text}"
-            
-            [Resume Context - VERY IMPORTANT]
-            Use the following details from the candidate's resume to generate a relevant follow-up question.
-            Focus on their specific projects and tech stack mentioned below:
-            {retrieved_context}
-            
-            [User Emotion]
-            Current emotion: '{current_emotion}' (If fear/sad, be encouraging. If happy, be professional.)
-            """
+            retrieved_context = await summary_task
         else:
-            print("⚠️ [RAG 검색 실패] 관련 이력서 내용 없음 (일반 질문 진행)")
-            # 이력서가 정말 없을 때를 대비한 기본 프롬프트
-            final_input_text = f"""
-            User Answer: "{user_text}"
-            You are a technical interviewer. The user introduced themselves as a Backend Developer.
-            Ask a standard backend question about Database, API design, or System Architecture.
-            """
+            summary_task.cancel()
+
+        final_input_text = build_voice_prompt(user_text, retrieved_context, current_emotion)
         # ---------------------------------------------------------
 
-        # 2. LangGraph 실행
+        # 2. LangGraph 실행 (토큰 스트리밍) + 3. 문장 단위 TTS
         config = {"configurable": {"thread_id": thread_id}}
         inputs = {"messages": [HumanMessage(content=final_input_text)]}
-        
-        result = interview_graph.invoke(inputs, config=config)
-        ai_text = result["messages"][-1].content
-        print(f"🤖 AI(Logic): {ai_text}")
-
-        # [저장] AI 응답
-        save_transcript(db, thread_id, "ai", ai_text)
-
-        # 3. TTS 변환 (함수명이 프로젝트마다 다를 수 있으니 확인 필요)
-        # 만약 에러가 난다면 generate_audio 대신 text_to_speech_file 로 바꿔보세요.
+        sentences = asyncio.Queue()
+
+        async def produce_sentences():
+            buffer = ""
+            try:
+                async for kind, payload in stream_graph_tokens(inputs, config):
+                    if kind == "token":
+                        buffer += payload
+                        parts = SENTENCE_END.split(buffer)
+                        for sentence in parts[:-1]:
+                            await sentences.put(sentence)
+                        buffer = parts[-1]
+                    else:
+                        ai_text = payload["messages"][-1].content
+                        print(f"🤖 AI(Logic): {ai_text}")
+                        # [저장] AI 응답
+                        transcript_writer.enqueue(thread_id, "ai", ai_text)
+                if buffer.strip():
+                    await sentences.put(buffer)
+                await sentences.put(None)
+            except Exception as e:
+                # 오류를 큐로 전달 → 응답 전이면 500, 스트리밍 중이면 스트림을 오류로 종료
+                traceback.print_exc()
+                await sentences.put(e)
+
+        producer = asyncio.create_task(produce_sentences())
+
+        # 첫 문장(또는 오류)이 나올 때까지 기다린 뒤 응답 시작 → 그래프/LLM 오류는 500으로 반환
         try:
-            # 기존 코드에 있던 함수 사용 (generate_audio 라고 가정)
-            output_filename = f"response_{uuid.uuid4()}.mp3"
-            audio_path = await generate_audio(ai_text, output_file=output_filename)
-        except NameError:
-            # 만약 generate_audio가 없으면 text_to_speech_file 시도 (안전장치)
-            audio_path = await text_to_speech_file(ai_text)
-
-        # 4. 파일 반환
-        return FileResponse(audio_path, media_type="audio/mpeg", filename="ai_response.mp3")
+            first = await sentences.get()
+        except BaseException:
+            producer.cancel()
+            raise
+        if isinstance(first, Exception):
+            raise HTTPException(status_code=500, detail=str(first))
+
+        async def audio_stream():
+            sentence = first
+            try:
+                while sentence is not None:
+                    if isinstance(sentence, Exception):
+                        # 이미 200 헤더가 전송됨 → 잘린 mp3를 정상 종료로 보내지 않도록 스트림을 중단
+                        raise sentence
+                    async for chunk in stream_audio(sentence):
+                        yield chunk
+                    sentence = await sentences.get()
+            finally:
+                producer.cancel()
+
+        # 4. 음성 스트리밍 반환
+        return StreamingResponse(
+            audio_stream(),
+            media_type="audio/mpeg",
+            headers={"Content-Disposition": 'attachment; filename="ai_response.mp3"'}
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
 
 
 # 6. [업그레이드] 면접 결과 리포트 생성 API (엄격한 평가 모드)
 @app.post("/report/{thread_id}")
 async def create_report_endpoint(thread_id: str):
     print(f"📊 [리포트 생성 요청] Thread ID: {thread_id}")
+
+    # 아직 큐에 남아 있는 대화 기록을 먼저 저장
+    await asyncio.to_thread(transcript_writer.flush, thread_id)
     
     db = SessionLocal()
     try:
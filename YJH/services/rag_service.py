@@ -2,50 +2,258 @@
 # 이력서를 텍스트로 변환하고, 검색 가능한 형태로 저장
 
 import os
+import json
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 
-# [메모리 저장소] 세션별 벡터 스토어를 임시 저장 (실무에선 Redis나 파일 저장 권장)
-# 구조: { "session_id": vectorstore_object }
-vector_store_memory = {}
+# ==========================================================
+# [설정] 디스크 저장소 + 메모리 LRU
+# ==========================================================
+# 벡터 인덱스 저장 위치 (서버 재시작 후에도 유지)
+RAG_STORE_DIR = os.getenv("RAG_STORE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vector_store"))
+# 메모리에 올려둘 인덱스 최대 개수 (초과 시 가장 오래 안 쓴 인덱스부터 내림, 디스크에는 남음)
+RAG_MAX_HOT_INDEXES = int(os.getenv("RAG_MAX_HOT_INDEXES", "32"))
+# 임베딩 API 1회 호출당 청크 수
+RAG_EMBED_BATCH_SIZE = int(os.getenv("RAG_EMBED_BATCH_SIZE", "64"))
+# 임베딩 백엔드: openai (기본) / local (API 없이 동작하는 해시 임베딩, 테스트용)
+RAG_EMBEDDING_BACKEND = os.getenv("RAG_EMBEDDING_BACKEND", "openai")
+
+INDEX_DIR = os.path.join(RAG_STORE_DIR, "indexes")    # {content_hash}/index.faiss, index.pkl
+THREAD_DIR = os.path.join(RAG_STORE_DIR, "threads")   # {thread_id}.json -> content_hash
+
+
+class LocalHashEmbeddings(Embeddings):
+    """
+    API 호출 없이 동작하는 대체 임베딩 (문자 2~3-gram 해싱).
+    테스트나 오프라인 환경에서 OpenAIEmbeddings 대신 사용합니다.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _embed(self, text: str):
+        vec = np.zeros(self.dim, dtype=np.float32)
+        compact = "".join((text or "").lower().split())
+        for n in (2, 3):
+            for i in range(len(compact) - n + 1):
+                digest = hashlib.blake2b(compact[i:i + n].encode("utf-8"), digest_size=8).digest()
+                vec[int.from_bytes(digest, "little") % self.dim] += 1.0
+        vec = np.log1p(vec)
+        norm = np.linalg.norm(vec)
+        return (vec / norm if norm else vec).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+# ==========================================================
+# [임베딩 백엔드] 교체 가능 (테스트에서는 set_embedding_backend로 주입)
+# ==========================================================
+_embeddings = None
+_embeddings_id = None
+
+
+def set_embedding_backend(embeddings: Embeddings, backend_id: str):
+    """
+    임베딩 백엔드를 교체합니다.
+    backend_id는 저장된 인덱스 구분에 쓰이므로 모델이 다르면 다른 값을 써야 합니다.
+    """
+    global _embeddings, _embeddings_id
+    with _lock:
+        _embeddings, _embeddings_id = embeddings, backend_id
+        # 다른 백엔드로 만든 인덱스와 섞이지 않도록 메모리 캐시 초기화
+        _hot_indexes.clear()
+
+
+def get_embedding_backend():
+    global _embeddings, _embeddings_id
+    if _embeddings is None:
+        if RAG_EMBEDDING_BACKEND == "local":
+            _embeddings, _embeddings_id = LocalHashEmbeddings(), "local-hash-512"
+        else:
+            embeddings = OpenAIEmbeddings(chunk_size=RAG_EMBED_BATCH_SIZE)
+            _embeddings, _embeddings_id = embeddings, f"openai-{embeddings.model}"
+    return _embeddings, _embeddings_id
+
+
+# ==========================================================
+# [메모리 LRU] content_hash -> FAISS 벡터 스토어
+# ==========================================================
+_lock = threading.RLock()
+_hot_indexes = OrderedDict()
+# thread_id -> content_hash (디스크 매핑 파일의 메모리 캐시, 크기 제한)
+_thread_hashes = OrderedDict()
+_MAX_THREAD_CACHE = RAG_MAX_HOT_INDEXES * 8
+# 같은 이력서를 동시에 업로드해도 임베딩은 한 번만 (해시별 고정 개수 잠금)
+_build_locks = [threading.Lock() for _ in range(32)]
+
+
+def _remember(cache: OrderedDict, key, value, limit):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+def _content_key(file_path: str, backend_id: str) -> str:
+    """이력서 파일 내용 + 임베딩 백엔드 기준 해시 (같은 PDF면 파일명이 달라도 같은 키)"""
+    h = hashlib.sha256(backend_id.encode("utf-8"))
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _index_path(content_hash: str) -> str:
+    return os.path.join(INDEX_DIR, content_hash)
+
+
+def _thread_path(thread_id: str) -> str:
+    safe = hashlib.sha1(thread_id.encode("utf-8")).hexdigest()
+    return os.path.join(THREAD_DIR, f"{safe}.json")
+
+
+def _link_thread(thread_id: str, content_hash: str):
+    os.makedirs(THREAD_DIR, exist_ok=True)
+    path = _thread_path(thread_id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"thread_id": thread_id, "content_hash": content_hash}, f)
+    os.replace(tmp_path, path)
+    with _lock:
+        _remember(_thread_hashes, thread_id, content_hash, _MAX_THREAD_CACHE)
+
+
+def _resolve_thread(thread_id: str):
+    with _lock:
+        if thread_id in _thread_hashes:
+            _thread_hashes.move_to_end(thread_id)
+            return _thread_hashes[thread_id]
+    try:
+        with open(_thread_path(thread_id), "r", encoding="utf-8") as f:
+            content_hash = json.load(f)["content_hash"]
+    except (OSError, ValueError, KeyError):
+        return None
+    with _lock:
+        _remember(_thread_hashes, thread_id, content_hash, _MAX_THREAD_CACHE)
+    return content_hash
+
+
+def _load_index(content_hash: str):
+    """메모리 LRU → 디스크 순으로 인덱스를 찾습니다."""
+    with _lock:
+        if content_hash in _hot_indexes:
+            _hot_indexes.move_to_end(content_hash)
+            return _hot_indexes[content_hash]
+
+    path = _index_path(content_hash)
+    if not os.path.exists(os.path.join(path, "index.faiss")):
+        return None
+
+    embeddings, _ = get_embedding_backend()
+    try:
+        # 가능하면 인덱스 본체는 mmap으로 열어 여러 인덱스가 올라가도 상주 메모리를 줄임 (파일은 한 번만 읽음)
+        import faiss
+        vectorstore = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True,
+                                       io_flags=faiss.IO_FLAG_MMAP)
+    except Exception:
+        # mmap을 지원하지 않는 faiss/langchain 버전이나 인덱스 타입이면 일반 로드
+        vectorstore = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+
+    with _lock:
+        _remember(_hot_indexes, content_hash, vectorstore, RAG_MAX_HOT_INDEXES)
+    return vectorstore
+
+
+def _build_lock(content_hash: str):
+    return _build_locks[int(content_hash[:8], 16) % len(_build_locks)]
+
+
+def index_resume_documents(thread_id: str, content_hash: str, documents) -> int:
+    """
+    분할된 문서 청크를 배치 임베딩하여 FAISS 인덱스를 만들고 디스크에 저장합니다.
+    반환값: 청크 수
+    """
+    embeddings, _ = get_embedding_backend()
+    texts = [doc.page_content for doc in documents]
+    metadatas = [doc.metadata for doc in documents]
+
+    # 배치 단위로 임베딩 (청크마다 API를 호출하지 않음)
+    vectors = []
+    for i in range(0, len(texts), RAG_EMBED_BATCH_SIZE):
+        vectors.extend(embeddings.embed_documents(texts[i:i + RAG_EMBED_BATCH_SIZE]))
+
+    vectorstore = FAISS.from_embeddings(list(zip(texts, vectors)), embeddings, metadatas=metadatas)
+
+    path = _index_path(content_hash)
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    vectorstore.save_local(tmp_path)
+    if os.path.exists(path):
+        # 동시에 같은 내용을 저장한 경우 먼저 저장된 것을 사용
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    else:
+        os.replace(tmp_path, path)
+
+    with _lock:
+        _remember(_hot_indexes, content_hash, vectorstore, RAG_MAX_HOT_INDEXES)
+    _link_thread(thread_id, content_hash)
+    return len(texts)
+
 
 def process_resume_pdf(thread_id: str, file_path: str):
     """
     PDF 이력서를 읽어서 청크로 나누고, 벡터 DB(FAISS)에 저장합니다.
+    같은 내용의 이력서가 이미 처리되어 있으면 PDF 파싱/임베딩 없이 기존 벡터를 재사용합니다.
     """
     try:
-        # 1. PDF 로드
-        loader = PyPDFLoader(file_path)
-        documents = loader.load()
-
-        # [추가] 텍스트 전처리: 불필요한 줄바꿈 제거
-        for doc in documents:
-            # 줄바꿈을 공백으로 변경하고, 다중 공백을 하나로 줄임
-            doc.page_content = doc.page_content.replace('\n', ' ').replace('  ', ' ')
-        
-        # 2. 텍스트 분할 (청크 단위로 쪼개기)
-        # 이력서는 구조가 중요하므로 청크 사이즈를 적절히 조절
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", " ", ""]
-        )
-        splits = text_splitter.split_documents(documents)
-
-        # [추가] 첫 번째 청크 내용 찍어보기
-        if len(splits) > 0:
-            print(f"📄 [PDF 내용 확인]: {splits[0].page_content[:200]}...") # 앞 200자만 출력
-        
-        # 3. 임베딩 및 벡터 저장소 생성 (FAISS)
-        embeddings = OpenAIEmbeddings()
-        vectorstore = FAISS.from_documents(splits, embeddings)
-        
-        # 4. 메모리에 저장 (세션 ID 키값)
-        vector_store_memory[thread_id] = vectorstore
-        
-        print(f"📄 [RAG] 이력서 처리 완료: {len(splits)}개 청크 생성 (Session: {thread_id})")
+        _, backend_id = get_embedding_backend()
+        content_hash = _content_key(file_path, backend_id)
+
+        with _build_lock(content_hash):
+            # 0. 내용 해시 캐시 확인 (메모리 → 디스크)
+            if _load_index(content_hash) is not None:
+                _link_thread(thread_id, content_hash)
+                print(f"📄 [RAG] 동일 이력서 벡터 재사용 (hash: {content_hash[:12]}, Session: {thread_id})")
+                return True
+
+            # 1. PDF 로드
+            loader = PyPDFLoader(file_path)
+            documents = loader.load()
+
+            # [추가] 텍스트 전처리: 불필요한 줄바꿈 제거
+            for doc in documents:
+                # 줄바꿈을 공백으로 변경하고, 다중 공백을 하나로 줄임
+                doc.page_content = doc.page_content.replace('\n', ' ').replace('  ', ' ')
+
+            # 2. 텍스트 분할 (청크 단위로 쪼개기)
+            # 이력서는 구조가 중요하므로 청크 사이즈를 적절히 조절
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=1000,
+                chunk_overlap=200,
+                separators=["\n\n", "\n", " ", ""]
+            )
+            splits = text_splitter.split_documents(documents)
+
+            # [추가] 첫 번째 청크 내용 찍어보기
+            if len(splits) > 0:
+                print(f"📄 [PDF 내용 확인]: {splits[0].page_content[:200]}...") # 앞 200자만 출력
+
+            # 3. 임베딩(배치) 및 벡터 저장소 생성 (FAISS) → 디스크 저장 + 세션 연결
+            chunk_count = index_resume_documents(thread_id, content_hash, splits)
+
+        print(f"📄 [RAG] 이력서 처리 완료: {chunk_count}개 청크 생성 (Session: {thread_id})")
         return True
 
     except Exception as e:
@@ -56,18 +264,31 @@ def get_relevant_context(thread_id: str, query: str) -> str:
     """
     사용자의 질문이나 현재 대화 주제와 관련된 이력서 내용을 검색합니다.
     """
-    if thread_id not in vector_store_memory:
+    content_hash = _resolve_thread(thread_id)
+    if content_hash is None:
         return "" # 등록된 이력서 없음
-    
+
     try:
-        vectorstore = vector_store_memory[thread_id]
+        vectorstore = _load_index(content_hash)
+        if vectorstore is None:
+            return ""
         # 유사도 검색 (상위 3개 청크 추출)
         results = vectorstore.similarity_search(query, k=3)
-        
+
         # 검색된 텍스트 합치기
         context_text = "\n\n".join([doc.page_content for doc in results])
         return context_text
-        
+
     except Exception as e:
         print(f"❌ [Retrieval Error]: {e}")
-        return ""
\ No newline at end of file
+        return ""
+
+def get_rag_store_stats() -> dict:
+    """메모리에 올라간 인덱스 현황"""
+    with _lock:
+        return {
+            "hot_indexes": len(_hot_indexes),
+            "max_hot_indexes": RAG_MAX_HOT_INDEXES,
+            "cached_threads": len(_thread_hashes),
+            "store_dir": RAG_STORE_DIR,
+        }
@@ -1,6 +1,10 @@
 # YJH/services/transcript_service.py
 
+import queue
+import threading
+import time
 from sqlalchemy.orm import Session
+from YJH.database import SessionLocal
 from YJH.models import Transcript, InterviewSession
 
 def save_transcript(db: Session, thread_id: str, sender: str, content: str, emotion: str = None):
@@ -29,4 +33,136 @@ def save_transcript(db: Session, thread_id: str, sender: str, content: str, emot
     db.commit()
     db.refresh(transcript)
     
-    return transcript
\ No newline at end of file
+    return transcript
+
+# ==========================================================
+# [비동기 배치 저장] 요청 처리 경로(이벤트 루프)에서 DB를 기다리지 않도록
+# 대화 기록을 큐에 넣고, 백그라운드 스레드가 모아서 한 트랜잭션으로 저장합니다.
+# ==========================================================
+class TranscriptWriter:
+    """
+    대화 기록 배치 저장기.
+    - enqueue()는 즉시 반환합니다 (이벤트 루프 블로킹 없음).
+    - flush_interval 동안 모인 기록(최대 max_batch개)을 세션 조회 1회 + commit 1회로 저장합니다.
+    - 같은 큐를 순서대로 처리하므로 human → ai 저장 순서가 유지됩니다.
+    - 배치 저장이 실패하면 1회 재시도 후 한 건씩 저장하여 문제가 된 기록만 버립니다.
+    - flush()는 큐에 표시(sentinel)를 넣고 그 앞의 기록까지만 기다립니다
+      (다른 세션의 기록이 계속 들어와도 대기 시간이 늘어나지 않음).
+    """
+
+    def __init__(self, flush_interval: float = 0.2, max_batch: int = 200):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._pending = {}  # thread_id -> 아직 저장되지 않은 기록 수
+        self._pending_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="transcript-writer", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, thread_id: str, sender: str, content: str, emotion: str = None):
+        self._ensure_started()
+        with self._pending_lock:
+            self._pending[thread_id] = self._pending.get(thread_id, 0) + 1
+        self._queue.put((thread_id, sender, content, emotion))
+
+    def flush(self, thread_id: str = None, timeout: float = None) -> bool:
+        """
+        지금까지 넣은 기록이 저장될 때까지 대기합니다 (리포트 생성 전, 서버 종료 시).
+        - thread_id를 주면 그 세션에 대기 중인 기록이 없을 때 바로 반환합니다.
+        - 호출 이후에 들어온 기록은 기다리지 않습니다.
+        """
+        if self._thread is None:
+            return True
+        if thread_id is not None:
+            with self._pending_lock:
+                if not self._pending.get(thread_id):
+                    return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            items = [item for item in batch if not isinstance(item, threading.Event)]
+            try:
+                if items:
+                    self._persist(items)
+            finally:
+                with self._pending_lock:
+                    for item in items:
+                        left = self._pending.get(item[0], 0) - 1
+                        if left > 0:
+                            self._pending[item[0]] = left
+                        else:
+                            self._pending.pop(item[0], None)
+                # 표시보다 앞선 기록은 이 배치 또는 이전 배치에서 처리 완료
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+
+    def _persist(self, items):
+        """
+        배치를 저장합니다. 실패하면 한 번 더 시도하고(일시적 DB 오류),
+        그래도 실패하면 한 건씩 저장하여 문제가 된 기록만 버립니다.
+        """
+        for attempt in (1, 2):
+            try:
+                self._write_batch(items)
+                return
+            except Exception as e:
+                print(f"⚠️ [Transcript] 배치 저장 실패 ({len(items)}건, 시도 {attempt}/2): {e}")
+
+        for item in items:
+            try:
+                self._write_batch([item])
+            except Exception as e:
+                thread_id, sender, content, _ = item
+                preview = str(content)[:30]
+                print(f"❌ [Transcript] 기록 저장 실패 (thread_id={thread_id}, sender={sender}, "
+                      f"content={preview!r}): {e}")
+
+    def _write_batch(self, batch):
+        db = SessionLocal()
+        try:
+            thread_ids = {item[0] for item in batch}
+            sessions = {
+                s.thread_id: s
+                for s in db.query(InterviewSession).filter(InterviewSession.thread_id.in_(thread_ids)).all()
+            }
+            # 세션이 없으면 새로 생성 (안전 장치)
+            for thread_id in thread_ids - sessions.keys():
+                sessions[thread_id] = InterviewSession(thread_id=thread_id)
+                db.add(sessions[thread_id])
+            db.flush()
+
+            db.add_all([
+                Transcript(session_id=sessions[thread_id].id, sender=sender, content=content, emotion=emotion)
+                for thread_id, sender, content, emotion in batch
+            ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+transcript_writer = TranscriptWriter()
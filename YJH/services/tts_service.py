@@ -33,4 +33,21 @@ async def generate_audio(text: str, output_file: str = "output_speech.mp3"):
     except Exception as e:
         print(f"❌ [TTS 오류 발생]: {e}")
         # 오류 발생 시 None을 반환하여 메인 로직에서 처리하도록 함
-        return None
\ No newline at end of file
+        return None
+
+async def stream_audio(text: str, chunk_size: int = 4096):
+    """
+    OpenAI TTS 응답을 파일로 저장하지 않고 받는 즉시 조각(bytes) 단위로 내보냅니다.
+    (음성 대화 엔드포인트에서 문장 단위로 이어 붙여 스트리밍)
+    """
+    try:
+        async with client.audio.speech.with_streaming_response.create(
+            model="tts-1",
+            voice="alloy",
+            input=text,
+            response_format="mp3"
+        ) as response:
+            async for chunk in response.iter_bytes(chunk_size):
+                yield chunk
+    except Exception as e:
+        print(f"❌ [TTS 스트리밍 오류 발생]: {e}")
@@ -0,0 +1,122 @@
+# 동시 면접 세션 부하 테스트
+#
+# 여러 세션이 동시에 /chat 또는 /chat/stream을 호출할 때의 처리량과 지연을 측정합니다.
+# 변경 전(동기 invoke) 서버와 변경 후(ainvoke/astream) 서버에 각각 실행해 비교합니다.
+#
+# 사용 예:
+#   uvicorn YJH.main_yjh:app --port 8000
+#   python YJH/tests/load_test_chat.py --sessions 20 --turns 3 --path /chat
+#   python YJH/tests/load_test_chat.py --sessions 20 --turns 3 --path /chat/stream
+#
+# 측정 항목:
+#   - turns/s      : 전체 처리량 (완료된 대화 턴 수 / 전체 소요 시간)
+#   - latency p50/p95 : 요청 시작 ~ 응답 완료
+#   - ttft p50/p95 : 요청 시작 ~ 첫 토큰 (스트리밍 경로만)
+#   - health p95   : 부하 중 GET / 응답 시간 (이벤트 루프가 막히면 크게 증가)
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+import httpx
+
+ANSWERS = [
+    "안녕하세요, 백엔드 개발자로 지원한 지원자입니다.",
+    "FastAPI와 PostgreSQL로 예약 서비스를 개발했고, 트래픽이 몰릴 때 커넥션 풀 설정을 조정해 응답 시간을 줄였습니다.",
+    "Redis 캐시를 도입해 조회 API의 DB 부하를 절반 이하로 줄였고, 캐시 무효화는 이벤트 기반으로 처리했습니다.",
+]
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def run_turn(client, path, thread_id, text, stats):
+    t0 = time.perf_counter()
+    payload = {"user_input": text, "thread_id": thread_id}
+    if path.endswith("/stream"):
+        first_token = None
+        async with client.stream("POST", path, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("event: token") and first_token is None:
+                    first_token = time.perf_counter() - t0
+                elif line.startswith("event: error"):
+                    raise RuntimeError("stream error event")
+        if first_token is not None:
+            stats["ttft"].append(first_token)
+    else:
+        response = await client.post(path, json=payload)
+        response.raise_for_status()
+    stats["latency"].append(time.perf_counter() - t0)
+
+
+async def run_session(client, path, turns, stats):
+    thread_id = f"load_{uuid.uuid4().hex[:8]}"
+    for i in range(turns):
+        try:
+            await run_turn(client, path, thread_id, ANSWERS[i % len(ANSWERS)], stats)
+        except Exception as e:
+            stats["errors"].append(str(e))
+
+
+async def probe_health(client, stop, stats):
+    """부하 중에도 가벼운 요청이 바로 처리되는지 확인"""
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            await client.get("/")
+            stats["health"].append(time.perf_counter() - t0)
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+
+
+async def main(args):
+    stats = {"latency": [], "ttft": [], "health": [], "errors": []}
+    limits = httpx.Limits(max_connections=args.sessions + 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe_health(client, stop, stats))
+        t0 = time.perf_counter()
+        await asyncio.gather(*(run_session(client, args.path, args.turns, stats) for _ in range(args.sessions)))
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        await prober
+
+    completed = len(stats["latency"])
+    result = {
+        "path": args.path,
+        "sessions": args.sessions,
+        "turns_per_session": args.turns,
+        "completed_turns": completed,
+        "errors": len(stats["errors"]),
+        "elapsed_s": round(elapsed, 2),
+        "turns_per_s": round(completed / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_s": round(percentile(stats["latency"], 50), 2),
+        "latency_p95_s": round(percentile(stats["latency"], 95), 2),
+        "ttft_p50_s": round(percentile(stats["ttft"], 50), 2),
+        "ttft_p95_s": round(percentile(stats["ttft"], 95), 2),
+        "health_p95_ms": round(percentile(stats["health"], 95) * 1000, 1),
+        "health_mean_ms": round(statistics.mean(stats["health"]) * 1000, 1) if stats["health"] else 0.0,
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if stats["errors"]:
+        print(f"⚠️ 오류 예시: {stats['errors'][0]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="YJH 채팅 엔드포인트 동시 세션 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/chat", help="/chat 또는 /chat/stream")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+# 이력서 벡터 저장소(디스크 + LRU + 내용 해시 재사용) 동작 테스트
+import sys
+import os
+import tempfile
+
+# 프로젝트 루트 경로 설정
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(os.path.dirname(__file__)))))
+
+# 테스트용 임시 저장소 + 로컬 임베딩 (OpenAI API 호출 없음)
+os.environ["RAG_STORE_DIR"] = tempfile.mkdtemp(prefix="rag_store_")
+os.environ["RAG_MAX_HOT_INDEXES"] = "2"
+
+from langchain_core.documents import Document
+from YJH.services import rag_service
+
+
+class CountingEmbeddings(rag_service.LocalHashEmbeddings):
+    """임베딩 호출 횟수를 세는 로컬 임베딩"""
+    def __init__(self):
+        super().__init__()
+        self.document_calls = 0
+
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        return super().embed_documents(texts)
+
+
+def make_docs(name):
+    return [
+        Document(page_content=f"{name} 지원자는 FastAPI와 PostgreSQL로 면접 서비스를 개발했습니다."),
+        Document(page_content=f"{name} 지원자는 React 프론트엔드와 WebSocket 실시간 통신을 구현했습니다."),
+        Document(page_content=f"{name} 지원자의 강점은 팀 협업과 문제 해결 능력입니다."),
+    ]
+
+
+def write_pdf(path, lines):
+    """텍스트 줄이 들어 있는 최소 PDF 파일 생성 (외부 라이브러리 없이)"""
+    stream = "BT /F1 12 Tf 72 720 Td 14 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def test_rag_store():
+    embeddings = CountingEmbeddings()
+    rag_service.set_embedding_backend(embeddings, "test-local")
+
+    # 1. 인덱스 생성 + 검색
+    rag_service.index_resume_documents("thread_a", "a" * 64, make_docs("홍길동"))
+    context = rag_service.get_relevant_context("thread_a", "WebSocket 실시간 통신")
+    assert "WebSocket" in context, f"검색 실패: {context}"
+
+    # 2. LRU: 최대 2개만 메모리에 유지
+    rag_service.index_resume_documents("thread_b", "b" * 64, make_docs("김철수"))
+    rag_service.index_resume_documents("thread_c", "c" * 64, make_docs("이영희"))
+    stats = rag_service.get_rag_store_stats()
+    assert stats["hot_indexes"] == 2, f"LRU 제한 실패: {stats}"
+
+    # 3. 메모리에서 내려간 인덱스도 디스크에서 다시 로드 (임베딩 재계산 없음)
+    calls = embeddings.document_calls
+    rag_service._thread_hashes.clear()
+    context = rag_service.get_relevant_context("thread_a", "PostgreSQL")
+    assert "PostgreSQL" in context, f"디스크 재로드 실패: {context}"
+    assert embeddings.document_calls == calls, "디스크 재로드 중 임베딩 재계산"
+    stats = rag_service.get_rag_store_stats()
+    assert stats["hot_indexes"] == 2, f"재로드 후 LRU 제한 실패: {stats}"
+
+    # 4. 같은 PDF(파일명만 다름)를 다른 세션이 올리면 파싱/임베딩 없이 기존 벡터 재사용
+    pdf_dir = tempfile.mkdtemp(prefix="rag_pdf_")
+    lines = ["Resume of Park Minsu", "Built a Kafka streaming pipeline with Spark", "Led a team of four engineers"]
+    first_pdf = os.path.join(pdf_dir, "resume_d.pdf")
+    second_pdf = os.path.join(pdf_dir, "resume_e.pdf")
+    write_pdf(first_pdf, lines)
+    write_pdf(second_pdf, lines)
+
+    calls = embeddings.document_calls
+    assert rag_service.process_resume_pdf("thread_d", first_pdf), "첫 번째 PDF 처리 실패"
+    assert embeddings.document_calls == calls + 1, f"첫 번째 PDF 임베딩 호출 수: {embeddings.document_calls - calls}"
+    calls = embeddings.document_calls
+    assert rag_service.process_resume_pdf("thread_e", second_pdf), "두 번째 PDF 처리 실패"
+    assert embeddings.document_calls == calls, f"내용 해시 재사용 실패: 임베딩 {embeddings.document_calls - calls}회 재계산"
+    context = rag_service.get_relevant_context("thread_e", "Kafka streaming")
+    assert "Kafka" in context, f"재사용 인덱스 검색 실패: {context!r}"
+
+    # 5. 등록되지 않은 세션
+    assert rag_service.get_relevant_context("unknown", "test") == "", "미등록 세션 처리 실패"
+
+
+if __name__ == "__main__":
+    test_rag_store()
+    print("✅ RAG 저장소 테스트 통과")
@@ -1,7 +1,10 @@
 import os
 import re
+import time
+import asyncio
 from dataclasses import asdict
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from .models import Turn
 
@@ -20,16 +23,26 @@ def clean_text(s: str) -> str:
     return s
 
 
+# 질문 유형 키워드 (선언 순서 = 우선순위)
+QUESTION_TYPE_KEYWORDS: List[Tuple[str, List[str]]] = [
+    ("experience", ["경험", "사례", "활동", "수행", "프로젝트", "갈등", "해결"]),
+    ("competency", ["역량", "강점", "준비", "노력", "개발", "전문성", "자기개발"]),
+    ("motivation", ["지원", "동기", "포부", "계획", "비전", "성장", "목표"]),
+    ("job_understanding", ["직무", "역할", "특징", "정의", "중요성", "덕목"]),
+]
+_KEYWORD_RANK = {
+    kw: rank for rank, (_, kws) in reversed(list(enumerate(QUESTION_TYPE_KEYWORDS))) for kw in kws
+}
+# 전방탐색 패턴으로 모든 위치의 키워드를 겹침 없이 놓치지 않고 한 번의 스캔으로 찾음
+_QUESTION_TYPE_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_KEYWORD_RANK, key=_KEYWORD_RANK.get)) + "))"
+)
+
+
+@lru_cache(maxsize=1024)
 def classify_question(q: str) -> str:
-    if any(k in q for k in ["경험", "사례", "활동", "수행", "프로젝트", "갈등", "해결"]):
-        return "experience"
-    if any(k in q for k in ["역량", "강점", "준비", "노력", "개발", "전문성", "자기개발"]):
-        return "competency"
-    if any(k in q for k in ["지원", "동기", "포부", "계획", "비전", "성장", "목표"]):
-        return "motivation"
-    if any(k in q for k in ["직무", "역할", "특징", "정의", "중요성", "덕목"]):
-        return "job_understanding"
-    return "other"
+    ranks = [_KEYWORD_RANK[m.group(1)] for m in _QUESTION_TYPE_RE.finditer(q)]
+    return QUESTION_TYPE_KEYWORDS[min(ranks)][0] if ranks else "other"
 
 
 FOLLOW_UP: Dict[str, str] = {
@@ -73,7 +86,11 @@ def build_llm() -> Optional[object]:
     return ChatOpenAI(model=model, temperature=temp)
 
 
-def llm_next_question(llm, history: List[object], prev_q: str, prev_type: str, user_answer: str) -> str:
+# 룰 기반 질문을 먼저 보내고, LLM 질문이 이 시간 안에 완성되면 교체 (초)
+LLM_UPGRADE_DEADLINE_SEC = float(os.getenv("LLM_UPGRADE_DEADLINE_SEC", "4.0"))
+
+
+def build_llm_messages(history: List[object], prev_q: str, prev_type: str, user_answer: str) -> List[object]:
     prompt = (
         f"[이전 질문 유형] {prev_type}\n"
         f"[이전 질문] {prev_q}\n"
@@ -83,15 +100,40 @@ def llm_next_question(llm, history: List[object], prev_q: str, prev_type: str, u
     messages = [SystemMessage(content=SYSTEM_PROMPT)]
     messages.extend(history[-6:])
     messages.append(HumanMessage(content=prompt))
-    resp = llm.invoke(messages)
+    return messages
+
+
+def llm_next_question(llm, history: List[object], prev_q: str, prev_type: str, user_answer: str) -> str:
+    resp = llm.invoke(build_llm_messages(history, prev_q, prev_type, user_answer))
     q = resp.content.strip().split("\n")[0].strip()
     return q
 
 
+async def astream_llm_question(llm, messages: List[object]) -> AsyncIterator[str]:
+    """
+    LLM 꼬리 질문을 토큰 단위로 내보냅니다.
+    한 문장(첫 줄)만 사용하므로 줄바꿈이 나오면 생성을 멈춥니다.
+    """
+    started = False
+    async for chunk in llm.astream(messages):
+        text = chunk.content if isinstance(chunk.content, str) else ""
+        if not started:
+            text = text.lstrip()
+            started = bool(text)
+        if "\n" in text:
+            head = text.split("\n")[0]
+            if head:
+                yield head
+            return
+        if text:
+            yield text
+
+
 class InterviewEngine:
     """
     - 룰 기반으로 100% 동작
     - LLM이 가능하면 next_question만 LLM로 '옵션' 사용
+    - astep(): 룰 기반 질문을 즉시 내보내고 LLM 질문은 스트리밍 후 deadline 안에 완성되면 교체
     """
 
     def __init__(self, use_llm: bool = False):
@@ -138,6 +180,73 @@ class InterviewEngine:
         }
         return clean_text(next_q), debug
 
+    async def astep(self, user_answer: str, deadline: float = LLM_UPGRADE_DEADLINE_SEC) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        비동기 턴 진행 (이벤트 루프를 막지 않음).
+        다음 이벤트를 순서대로 내보냅니다.
+          ("question", {"turn", "text", "q_type", "source": "rule"})  - 룰 기반 질문 (즉시)
+          ("question.delta", {"turn", "delta"})                        - LLM 토큰 (use_llm일 때)
+          ("question.update", {"turn", "text", "q_type", "source": "llm"}) - deadline 안에 완성된 LLM 질문으로 교체
+          ("debug", {...})
+        deadline을 넘기면 LLM 생성을 취소하고 룰 기반 질문을 그대로 유지합니다.
+        """
+        if not self.turns:
+            raise ValueError("Interview not started. Call start() and set first question in session.")
+
+        prev = self.turns[-1]
+        ua = clean_text(user_answer)
+        prev.user_answer = ua
+
+        # 1) 룰 기반 질문을 먼저 확정해서 보냄
+        t_next = self.add_question(rule_next_question(prev.question, prev.q_type, ua))
+        yield "question", {"turn": t_next.turn, "text": t_next.question, "q_type": t_next.q_type, "source": "rule"}
+
+        debug = {
+            "prev_q_type": prev.q_type,
+            "used_llm": self.llm is not None,
+            "turn": prev.turn,
+            "upgraded": False,
+        }
+
+        # 2) LLM 질문 스트리밍 → deadline 안에 완성되면 같은 턴을 교체
+        if self.llm is not None and SystemMessage is not None:
+            messages = build_llm_messages(self.history, prev.question, prev.q_type, ua)
+            t0 = time.monotonic()
+            parts: List[str] = []
+            stream = astream_llm_question(self.llm, messages)
+            try:
+                while True:
+                    remaining = deadline - (time.monotonic() - t0)
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    try:
+                        delta = await asyncio.wait_for(stream.__anext__(), timeout=remaining)
+                    except StopAsyncIteration:
+                        break
+                    parts.append(delta)
+                    yield "question.delta", {"turn": t_next.turn, "delta": delta}
+
+                llm_q = clean_text("".join(parts))
+                if llm_q:
+                    t_next.question = llm_q
+                    t_next.q_type = classify_question(llm_q)
+                    debug["upgraded"] = True
+                    yield "question.update", {"turn": t_next.turn, "text": t_next.question, "q_type": t_next.q_type, "source": "llm"}
+            except asyncio.TimeoutError:
+                debug["llm_timeout"] = True
+            except Exception as e:
+                debug["llm_error"] = repr(e)
+            finally:
+                await stream.aclose()
+            debug["llm_ms"] = round((time.monotonic() - t0) * 1000, 1)
+
+        if HumanMessage is not None and AIMessage is not None:
+            self.history.append(HumanMessage(content=prev.question))
+            self.history.append(AIMessage(content=ua))
+
+        debug["q_type"] = t_next.q_type
+        yield "debug", debug
+
     def add_question(self, question: str, user_answer: str = "") -> Turn:
         q = clean_text(question)
         qt = classify_question(q)
@@ -0,0 +1,123 @@
+# 동시 세션 WS 부하 테스트 (test_ws.py 흐름을 N개 세션으로 동시에 실행)
+#
+# 사용 예:
+#   uvicorn rt_api.main:app --port 8000
+#   python load_test_ws.py --sessions 50 --turns 3
+#   python load_test_ws.py --sessions 50 --turns 3 --use-llm
+#
+# 측정 항목:
+#   - question p50/p95 : 답변 전송 ~ 룰 기반 질문(question) 수신
+#   - update p50/p95   : 답변 전송 ~ LLM 교체 질문(question.update) 수신 (use_llm일 때)
+#   - upgraded         : deadline 안에 LLM 질문으로 교체된 비율
+#   - health p95       : 부하 중 GET / 응답 시간 (이벤트 루프가 막히면 크게 증가)
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+import websockets
+
+FIRST_QUESTION = "지원 직무의 특징과 역할에 대해 아는 대로 말해주세요! (700자)"
+ANSWERS = [
+    "데이터를 수집·정리하고 문제를 구조화해 의사결정을 돕는 역할이라 생각합니다.",
+    "프로젝트에서 결측치가 많은 로그 데이터를 정제해 대시보드 지표 정확도를 높였습니다.",
+    "팀원과 의견이 달랐을 때 기준 지표를 먼저 합의하고 실험 결과로 결정했습니다.",
+]
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def run_turn(ws, text, stats):
+    t0 = time.perf_counter()
+    await ws.send(json.dumps({"type": "answer", "payload": {"text": text}}))
+    while True:
+        msg = json.loads(await ws.recv())
+        if msg["type"] == "question":
+            stats["question"].append(time.perf_counter() - t0)
+        elif msg["type"] == "question.update":
+            stats["update"].append(time.perf_counter() - t0)
+        elif msg["type"] == "error":
+            raise RuntimeError(msg["payload"].get("message"))
+        elif msg["type"] == "debug":
+            # debug는 한 턴의 마지막 이벤트
+            stats["turns"] += 1
+            stats["upgraded"] += int(bool(msg["payload"].get("upgraded")))
+            return
+
+
+async def run_session(client, ws_base, turns, use_llm, stats):
+    try:
+        r = await client.post("/session/start", json={"first_question": FIRST_QUESTION, "use_llm": use_llm})
+        r.raise_for_status()
+        session_id = r.json()["session_id"]
+
+        async with websockets.connect(f"{ws_base}/ws?session_id={session_id}") as ws:
+            await ws.recv()  # session.ready
+            for i in range(turns):
+                await run_turn(ws, ANSWERS[i % len(ANSWERS)], stats)
+            await ws.send(json.dumps({"type": "session.stop"}))
+    except Exception as e:
+        stats["errors"].append(repr(e))
+
+
+async def probe_health(client, stop, stats):
+    """부하 중에도 가벼운 요청이 바로 처리되는지 확인"""
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            await client.get("/")
+            stats["health"].append(time.perf_counter() - t0)
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+
+
+async def main(args):
+    stats = {"question": [], "update": [], "health": [], "errors": [], "turns": 0, "upgraded": 0}
+    ws_base = args.base_url.replace("http://", "ws://").replace("https://", "wss://")
+    limits = httpx.Limits(max_connections=args.sessions + 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe_health(client, stop, stats))
+        t0 = time.perf_counter()
+        await asyncio.gather(*(run_session(client, ws_base, args.turns, args.use_llm, stats) for _ in range(args.sessions)))
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        await prober
+
+    result = {
+        "sessions": args.sessions,
+        "turns_per_session": args.turns,
+        "use_llm": args.use_llm,
+        "completed_turns": stats["turns"],
+        "errors": len(stats["errors"]),
+        "elapsed_s": round(elapsed, 2),
+        "turns_per_s": round(stats["turns"] / elapsed, 2) if elapsed else 0.0,
+        "question_p50_ms": round(percentile(stats["question"], 50) * 1000, 1),
+        "question_p95_ms": round(percentile(stats["question"], 95) * 1000, 1),
+        "update_p50_ms": round(percentile(stats["update"], 50) * 1000, 1),
+        "update_p95_ms": round(percentile(stats["update"], 95) * 1000, 1),
+        "upgraded_ratio": round(stats["upgraded"] / stats["turns"], 3) if stats["turns"] else 0.0,
+        "health_p95_ms": round(percentile(stats["health"], 95) * 1000, 1),
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if stats["errors"]:
+        print("오류 예시:", stats["errors"][0])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="realtime_api WS 동시 세션 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--use-llm", action="store_true")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))
@@ -162,8 +162,11 @@
 
 # [4] =====================
 
+import os
 import json
+import time
 import uuid
+import asyncio
 from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
@@ -187,9 +190,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# session_id -> {"engine": InterviewEngine}
+# session_id -> {"engine": InterviewEngine, "last_active": float, "connections": int}
 SESSIONS: Dict[str, Dict[str, Any]] = {}
 
+# WS 연결이 없고 이 시간(초) 동안 활동이 없는 세션은 정리
+SESSION_IDLE_TTL_SEC = float(os.getenv("SESSION_IDLE_TTL_SEC", "1800"))
+SESSION_SWEEP_INTERVAL_SEC = float(os.getenv("SESSION_SWEEP_INTERVAL_SEC", "60"))
+
+
+def new_session(engine: InterviewEngine) -> Dict[str, Any]:
+    return {"engine": engine, "last_active": time.monotonic(), "connections": 0}
+
+
+def touch(session: Dict[str, Any]):
+    session["last_active"] = time.monotonic()
+
+
+def expire_idle_sessions(now: Optional[float] = None) -> int:
+    now = time.monotonic() if now is None else now
+    expired = [
+        sid for sid, s in SESSIONS.items()
+        if s["connections"] == 0 and now - s["last_active"] > SESSION_IDLE_TTL_SEC
+    ]
+    for sid in expired:
+        SESSIONS.pop(sid, None)
+    return len(expired)
+
+
+async def sweep_sessions():
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL_SEC)
+        n = expire_idle_sessions()
+        if n:
+            print(f"SESSION SWEEP: expired {n}, active {len(SESSIONS)}")
+
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    app.state.session_sweeper = asyncio.create_task(sweep_sessions())
+
+
+@app.on_event("shutdown")
+async def stop_session_sweeper():
+    app.state.session_sweeper.cancel()
+
 
 async def send_event(ws: WebSocket, session_id: str, type_: str, payload: dict):
     evt = ServerEvent(type=type_, session_id=session_id, payload=payload)
@@ -224,7 +268,7 @@ def start_session(req: StartSessionReq):
     q1 = engine.start(first_q)
     t1 = engine.add_question(q1)
 
-    SESSIONS[session_id] = {"engine": engine}
+    SESSIONS[session_id] = new_session(engine)
 
     return StartSessionRes(
         session_id=session_id,
@@ -235,6 +279,25 @@ def start_session(req: StartSessionReq):
 
 
 # ---------- WS (실시간 대화 이벤트) ----------
+async def answer_worker(ws: WebSocket, session_id: str, session: Dict[str, Any], answers: asyncio.Queue):
+    """
+    답변을 순서대로 처리 (수신 루프와 분리해서 LLM 생성 중에도 WS 수신이 막히지 않음)
+    - question: 룰 기반 질문 즉시 전송
+    - question.delta: LLM 토큰 스트리밍
+    - question.update: deadline 안에 LLM 질문이 완성되면 같은 turn을 교체
+    """
+    engine: InterviewEngine = session["engine"]
+    while True:
+        answer_text = await answers.get()
+        try:
+            async for type_, payload in engine.astep(answer_text):
+                await send_event(ws, session_id, type_, payload)
+                touch(session)
+        except Exception as e:
+            print("ANSWER ERROR:", repr(e))
+            await send_event(ws, session_id, "error", {"message": f"failed to generate question: {e}"})
+
+
 @app.websocket("/ws")
 async def ws_endpoint(ws: WebSocket, session_id: Optional[str] = None):
     """
@@ -257,6 +320,11 @@ async def ws_endpoint(ws: WebSocket, session_id: Optional[str] = None):
         await ws.close()
         return
 
+    session["connections"] += 1
+    touch(session)
+    answers: asyncio.Queue = asyncio.Queue()
+    worker = asyncio.create_task(answer_worker(ws, session_id, session, answers))
+
     await send_event(ws, session_id, "session.ready", {"message": "ws connected"})
 
     try:
@@ -272,6 +340,7 @@ async def ws_endpoint(ws: WebSocket, session_id: Optional[str] = None):
             if "text" not in msg or msg["text"] is None:
                 continue
 
+            touch(session)
             try:
                 evt = ClientEvent(**json.loads(msg["text"]))
             except Exception as e:
@@ -280,19 +349,12 @@ async def ws_endpoint(ws: WebSocket, session_id: Optional[str] = None):
 
             # WS에서는 이제 session.start를 굳이 안 써도 됨(REST에서 이미 시작함)
             if evt.type == "answer":
-                engine: InterviewEngine = session["engine"]
-
                 answer_text = str(evt.payload.get("text", "")).strip()
                 if not answer_text:
                     await send_event(ws, session_id, "error", {"message": "answer text is required"})
                     continue
 
-                engine.turns[-1].user_answer = answer_text
-                next_q, debug = engine.step(answer_text)
-                t_next = engine.add_question(next_q)
-
-                await send_event(ws, session_id, "question", {"turn": t_next.turn, "text": t_next.question})
-                await send_event(ws, session_id, "debug", {"q_type": t_next.q_type, **debug})
+                answers.put_nowait(answer_text)
 
             elif evt.type == "session.stop":
                 SESSIONS.pop(session_id, None)
@@ -300,3 +362,7 @@ async def ws_endpoint(ws: WebSocket, session_id: Optional[str] = None):
 
     except Exception as e:
         print("WS ERROR:", repr(e))
+    finally:
+        worker.cancel()
+        session["connections"] -= 1
+        touch(session)
@@ -25,7 +25,7 @@ class ClientEvent(BaseModel):
     payload: Dict[str, Any] = {}
     session_id: Optional[str] = None
 
-ServerEventType = Literal["session.ready", "question", "debug", "error"]
+ServerEventType = Literal["session.ready", "question", "question.delta", "question.update", "debug", "error"]
 
 class ServerEvent(BaseModel):
     type: ServerEventType